@@ -0,0 +1,38 @@
+"""
+Shared LangChain chat models for SKYT agents
+One chat model per (model, temperature); OpenAI models ride on the pooled
+keep-alive HTTP client from src.http_pool instead of opening their own.
+"""
+
+import sys
+import os
+import threading
+from typing import Dict, Tuple, Any
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.http_pool import get_client_pool
+
+_chat_models: Dict[Tuple[str, float], Any] = {}
+_chat_models_lock = threading.Lock()
+
+
+def get_chat_model(model: str, temperature: float = 0.0):
+    """Shared ChatOpenAI/ChatAnthropic instance for a model and temperature"""
+    key = (model, temperature)
+    with _chat_models_lock:
+        if key in _chat_models:
+            return _chat_models[key]
+
+        if "gpt" in model:
+            from langchain_openai import ChatOpenAI
+            llm = ChatOpenAI(model=model, temperature=temperature,
+                             http_client=get_client_pool().http_client("openai", model))
+        elif "claude" in model:
+            from langchain_anthropic import ChatAnthropic
+            llm = ChatAnthropic(model=model, temperature=temperature)
+        else:
+            raise ValueError(f"Unsupported model: {model}")
+
+        _chat_models[key] = llm
+        return llm
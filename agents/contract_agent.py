@@ -13,19 +13,20 @@ from enum import Enum
 from langchain_core.tools import tool
 from langchain.agents import AgentExecutor, create_openai_functions_agent
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
 from langchain_core.messages import HumanMessage, AIMessage
 
 # SKYT imports
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.contract import Contract
 from src.oracle_system import OracleSystem
-from src.code_transformer import CodeTransformer
 from src.canon_system import CanonSystem
 from src.foundational_properties import FoundationalProperties
+from src.fingerprint import code_fingerprint
+from agents.chat_models import get_chat_model
+from agents.tool_runtime import (ToolRuntime, get_tool_runtime, tool_key, load_contract,
+                                 extract_properties, oracle_check, canonical_distance,
+                                 transform_to_canon, canon_library_fingerprint)
 
 
 class ViolationType(Enum):
@@ -63,7 +64,8 @@ class ContractAdherenceAgent:
     Autonomous agent that ensures LLM-generated code adheres to contracts
     """
     
-    def __init__(self, model: str = "gpt-4o", temperature: float = 0.0):
+    def __init__(self, model: str = "gpt-4o", temperature: float = 0.0,
+                 runtime: Optional[ToolRuntime] = None):
         self.model = model
         self.temperature = temperature
         
@@ -72,13 +74,12 @@ class ContractAdherenceAgent:
         self.canon_system = CanonSystem()
         self.properties_extractor = FoundationalProperties()
         
+        # Tool results are memoized across agents; LangChain runs these sync
+        # tools off the event loop, the async helpers use the worker pool
+        self.runtime = runtime or get_tool_runtime()
+        
         # Initialize LLM
-        if "gpt" in model:
-            self.llm = ChatOpenAI(model=model, temperature=temperature)
-        elif "claude" in model:
-            self.llm = ChatAnthropic(model=model, temperature=temperature)
-        else:
-            raise ValueError(f"Unsupported model: {model}")
+        self.llm = get_chat_model(model, temperature)
         
         # Setup tools
         self.tools = self._create_tools()
@@ -92,6 +93,12 @@ class ContractAdherenceAgent:
             handle_parsing_errors=True
         )
     
+    def _canon_key(self, tool_name: str, code: str, contract_id: str):
+        """(canon data, cache key) for tools whose result depends on the stored canon"""
+        canon_data = self.canon_system.load_canon(contract_id)
+        canon_code = canon_data.get("canonical_code") if canon_data else None
+        return canon_data, tool_key(tool_name, code, contract_id, code_fingerprint(canon_code))
+    
     def _create_tools(self) -> List:
         """Create tools for the agent"""
         
@@ -99,7 +106,7 @@ class ContractAdherenceAgent:
         def analyze_code_structure(code: str) -> str:
             """Analyze code structure and identify potential violations"""
             try:
-                properties = self.properties_extractor.extract_all_properties(code)
+                properties = self.runtime.run_sync(tool_key("properties", code), extract_properties, code)
                 
                 analysis = []
                 
@@ -126,15 +133,17 @@ class ContractAdherenceAgent:
             """Run oracle tests to check behavioral compliance"""
             try:
                 # Load contract
-                contract = Contract(f"contracts/templates.json", contract_id)
+                contract = load_contract(contract_id)
                 
                 # Run oracle tests
-                result = self.oracle_system.validate_code(code, contract.data)
+                result = self.runtime.run_sync(tool_key("oracle", code, contract_id),
+                                               oracle_check, code, contract.data)
+                pass_rate = result.get("pass_rate", 0.0)
                 
-                if result.passed:
-                    return f"PASS: All oracle tests passed (pass rate: {result.pass_rate:.1%})"
+                if result.get("passed"):
+                    return f"PASS: All oracle tests passed (pass rate: {pass_rate:.1%})"
                 else:
-                    return f"FAIL: Oracle tests failed (pass rate: {result.pass_rate:.1%}) - {result.error}"
+                    return f"FAIL: Oracle tests failed (pass rate: {pass_rate:.1%}) - {result.get('error')}"
                     
             except Exception as e:
                 return f"Error running oracle tests: {str(e)}"
@@ -144,14 +153,13 @@ class ContractAdherenceAgent:
             """Calculate distance to canonical anchor"""
             try:
                 # Load canon
-                canon_data = self.canon_system.load_canon(contract_id)
+                canon_data, key = self._canon_key("distance", code, contract_id)
                 if not canon_data:
                     return f"No canonical anchor found for contract: {contract_id}"
                 
                 # Calculate distance
                 canon_properties = canon_data.get("foundational_properties", {})
-                code_properties = self.properties_extractor.extract_all_properties(code)
-                distance = self.properties_extractor.calculate_distance(canon_properties, code_properties)
+                distance = self.runtime.run_sync(key, canonical_distance, code, canon_properties)
                 
                 return f"Canonical distance: {distance:.3f} (threshold: 0.1)"
                 
@@ -163,11 +171,13 @@ class ContractAdherenceAgent:
             """Transform code to match canonical form"""
             try:
                 # Load contract
-                contract = Contract(f"contracts/templates.json", contract_id)
+                contract = load_contract(contract_id)
+                key = tool_key("transform", code, contract_id,
+                               canon_library_fingerprint(self.canon_system, contract_id))
                 
                 # Transform
-                transformer = CodeTransformer(self.canon_system)
-                result = transformer.transform_to_canon(code, contract_id, contract=contract.data)
+                result = self.runtime.run_sync(key, transform_to_canon, code, contract_id,
+                                               contract.data, self.canon_system.canon_storage_dir)
                 
                 if result["success"]:
                     return f"TRANSFORM_SUCCESS: Code transformed successfully (final distance: {result['final_distance']:.3f})"
@@ -271,6 +281,21 @@ Please:
             # Fallback to basic analysis if agent fails
             return await self._fallback_analysis(code, contract_id, str(e))
     
+    async def ensure_compliance_batch(self, codes: List[str], contract_id: str,
+                                      max_concurrency: int = 4) -> List[ComplianceResult]:
+        """
+        Check several candidates concurrently (results in input order)
+        
+        Args:
+            codes: Candidate implementations
+            contract_id: ID of the contract to check against
+            max_concurrency: Maximum agent runs at once
+        """
+        return await self.runtime.gather_bounded(
+            [lambda code=code: self.ensure_compliance(code, contract_id) for code in codes],
+            max_concurrency
+        )
+    
     def _parse_violations(self, agent_output: str) -> List[Violation]:
         """Parse violations from agent output"""
         violations = []
@@ -305,27 +330,38 @@ Please:
         metrics = {}
         
         try:
+            # Independent tool calls run concurrently on the worker pool
+            contract = load_contract(contract_id)
+            calls = [
+                self.runtime.run(tool_key("properties", original_code), extract_properties, original_code),
+                self.runtime.run(tool_key("oracle", original_code, contract_id),
+                                 oracle_check, original_code, contract.data),
+            ]
+            canon_data = None
+            if transformed_code:
+                calls.append(self.runtime.run(tool_key("properties", transformed_code),
+                                              extract_properties, transformed_code))
+                canon_data, key = self._canon_key("distance", transformed_code, contract_id)
+                if canon_data:
+                    calls.append(self.runtime.run(key, canonical_distance, transformed_code,
+                                                  canon_data.get("foundational_properties", {})))
+            
+            results = await asyncio.gather(*calls)
+            
             # Original code metrics
-            original_properties = self.properties_extractor.extract_all_properties(original_code)
+            original_properties, oracle_result = results[0], results[1]
             metrics["original_complexity"] = original_properties.get("complexity_class", "unknown")
             
             # Transformed code metrics (if available)
             if transformed_code:
-                transformed_properties = self.properties_extractor.extract_all_properties(transformed_code)
-                metrics["transformed_complexity"] = transformed_properties.get("complexity_class", "unknown")
+                metrics["transformed_complexity"] = results[2].get("complexity_class", "unknown")
                 
                 # Distance to canon
-                canon_data = self.canon_system.load_canon(contract_id)
                 if canon_data:
-                    canon_properties = canon_data.get("foundational_properties", {})
-                    metrics["canon_distance"] = self.properties_extractor.calculate_distance(
-                        canon_properties, transformed_properties
-                    )
+                    metrics["canon_distance"] = results[3]
             
             # Oracle test results
-            contract = Contract(f"contracts/templates.json", contract_id)
-            oracle_result = self.oracle_system.validate_code(original_code, contract.data)
-            metrics["oracle_pass_rate"] = oracle_result.pass_rate
+            metrics["oracle_pass_rate"] = oracle_result.get("pass_rate", 0.0)
             
         except Exception as e:
             metrics["error"] = str(e)
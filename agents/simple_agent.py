@@ -16,20 +16,18 @@ load_dotenv()
 # LangChain imports
 from langchain_core.tools import tool
 from langchain_core.messages import HumanMessage, AIMessage
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
 
 # SKYT imports
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.contract import Contract
 from src.oracle_system import OracleSystem
-from src.code_transformer import CodeTransformer
 from src.canon_system import CanonSystem
 from src.foundational_properties import FoundationalProperties
-
-# Path to contracts (relative to main repo)
-CONTRACTS_PATH = os.path.join(os.path.dirname(__file__), '..', 'contracts', 'templates.json')
+from src.fingerprint import code_fingerprint
+from agents.chat_models import get_chat_model
+from agents.tool_runtime import (ToolRuntime, get_tool_runtime, tool_key, load_contract,
+                                 extract_properties, oracle_check, canonical_distance,
+                                 transform_to_canon, canon_library_fingerprint)
 
 
 class ViolationType(Enum):
@@ -67,7 +65,8 @@ class SimpleContractAgent:
     Simplified contract adherence agent without complex LangChain agent setup
     """
     
-    def __init__(self, model: str = "gpt-4o", temperature: float = 0.0):
+    def __init__(self, model: str = "gpt-4o", temperature: float = 0.0,
+                 runtime: Optional[ToolRuntime] = None):
         self.model = model
         self.temperature = temperature
         
@@ -76,18 +75,16 @@ class SimpleContractAgent:
         self.canon_system = CanonSystem()
         self.properties_extractor = FoundationalProperties()
         
+        # Tools run on the shared worker pool; results are memoized across agents
+        self.runtime = runtime or get_tool_runtime()
+        
         # Initialize LLM
-        if "gpt" in model:
-            self.llm = ChatOpenAI(model=model, temperature=temperature)
-        elif "claude" in model:
-            self.llm = ChatAnthropic(model=model, temperature=temperature)
-        else:
-            raise ValueError(f"Unsupported model: {model}")
+        self.llm = get_chat_model(model, temperature)
     
     async def analyze_code_structure(self, code: str) -> Dict[str, Any]:
         """Analyze code structure and identify potential violations"""
         try:
-            properties = self.properties_extractor.extract_all_properties(code)
+            properties = await self.runtime.run(tool_key("properties", code), extract_properties, code)
             
             violations = []
             
@@ -139,10 +136,11 @@ class SimpleContractAgent:
         """Run oracle tests to check behavioral compliance"""
         try:
             # Load contract
-            contract = Contract.from_template(CONTRACTS_PATH, contract_id)
+            contract = load_contract(contract_id)
             
             # Run oracle tests
-            result = self.oracle_system.run_oracle_tests(code, contract.data)
+            result = await self.runtime.run(tool_key("oracle", code, contract_id),
+                                            oracle_check, code, contract.data)
             
             if not result.get("passed", False):
                 return {
@@ -187,8 +185,10 @@ class SimpleContractAgent:
             
             # Calculate distance
             canon_properties = canon_data.get("foundational_properties", {})
-            code_properties = self.properties_extractor.extract_all_properties(code)
-            distance = self.properties_extractor.calculate_distance(canon_properties, code_properties)
+            distance = await self.runtime.run(
+                tool_key("distance", code, contract_id, code_fingerprint(canon_data.get("canonical_code"))),
+                canonical_distance, code, canon_properties
+            )
             
             return {
                 "distance": distance,
@@ -207,11 +207,13 @@ class SimpleContractAgent:
         """Transform code to match canonical form"""
         try:
             # Load contract
-            contract = Contract.from_template(CONTRACTS_PATH, contract_id)
+            contract = load_contract(contract_id)
             
             # Transform
-            transformer = CodeTransformer(self.canon_system)
-            result = transformer.transform_to_canon(code, contract_id, contract=contract.data)
+            result = await self.runtime.run(
+                tool_key("transform", code, contract_id, canon_library_fingerprint(self.canon_system, contract_id)),
+                transform_to_canon, code, contract_id, contract.data, self.canon_system.canon_storage_dir
+            )
             
             if result["success"]:
                 return {
@@ -267,21 +269,26 @@ Provide concrete code suggestions."""
         
         print(f"🔍 Analyzing code for contract: {contract_id}")
         
-        # Step 1: Analyze code structure
-        structure_result = await self.analyze_code_structure(code)
-        violations = structure_result["violations"]
+        # Steps 1-3 are independent: structure analysis, oracle tests and
+        # canonical distance run concurrently on the worker pool
+        structure_result, oracle_result, distance_result = await asyncio.gather(
+            self.analyze_code_structure(code),
+            self.run_oracle_tests(code, contract_id),
+            self.calculate_canonical_distance(code, contract_id)
+        )
+        
+        # Step 1: Code structure
+        violations = list(structure_result["violations"])
         
         print(f"📊 Found {len(violations)} structural violations")
         
-        # Step 2: Run oracle tests
-        oracle_result = await self.run_oracle_tests(code, contract_id)
+        # Step 2: Oracle tests
         if oracle_result["violation"]:
             violations.append(oracle_result["violation"])
         
         print(f"🧪 Oracle tests: {'PASS' if oracle_result['passed'] else 'FAIL'}")
         
-        # Step 3: Calculate canonical distance
-        distance_result = await self.calculate_canonical_distance(code, contract_id)
+        # Step 3: Canonical distance
         if distance_result.get("distance") and distance_result["distance"] > 0.1:
             violations.append(Violation(
                 type=ViolationType.STRUCTURAL_VIOLATION,
@@ -291,19 +298,25 @@ Provide concrete code suggestions."""
         
         print(f"📏 Canonical distance: {distance_result.get('distance', 'N/A')}")
         
-        # Step 4: Get AI suggestions if there are violations
-        ai_suggestion = None
-        if violations:
+        # Steps 4-5 are independent too: the AI suggestion (LLM latency) and
+        # the transformation (CPU) overlap
+        needs_suggestion = bool(violations)
+        needs_transform = len([v for v in violations if v.severity in ["medium", "high", "critical"]]) > 0
+        if needs_suggestion:
             print("🤖 Getting AI suggestions for fixes...")
-            ai_suggestion = await self.get_ai_suggestion(code, violations, contract_id)
+        if needs_transform:
+            print("🔧 Attempting code transformation...")
+        
+        ai_suggestion, transform_result = await asyncio.gather(
+            self.get_ai_suggestion(code, violations, contract_id) if needs_suggestion else _none(),
+            self.transform_to_canonical(code, contract_id) if needs_transform else _none()
+        )
         
-        # Step 5: Attempt transformation if needed
+        # Step 5: Transformation result
         transformed_code = None
         transformation_success = False
         
-        if len([v for v in violations if v.severity in ["medium", "high", "critical"]]) > 0:
-            print("🔧 Attempting code transformation...")
-            transform_result = await self.transform_to_canonical(code, contract_id)
+        if transform_result is not None:
             if transform_result["success"]:
                 transformed_code = transform_result["transformed_code"]
                 transformation_success = True
@@ -334,6 +347,25 @@ Provide concrete code suggestions."""
             transformed_code=transformed_code,
             transformation_success=transformation_success
         )
+    
+    async def ensure_compliance_batch(self, codes: List[str], contract_id: str,
+                                      max_concurrency: int = 4) -> List[ComplianceResult]:
+        """
+        Check several candidates concurrently (results in input order)
+        
+        Args:
+            codes: Candidate implementations
+            contract_id: ID of the contract to check against
+            max_concurrency: Maximum candidates checked at once
+        """
+        return await self.runtime.gather_bounded(
+            [lambda code=code: self.ensure_compliance(code, contract_id) for code in codes],
+            max_concurrency
+        )
+
+
+async def _none():
+    return None
 
 
 # Test function
@@ -0,0 +1,221 @@
+"""
+Tool runtime for the SKYT contract agents
+Runs the CPU-bound SKYT tools (property extraction, oracle, distance,
+transformation) on a worker pool instead of the event loop, memoizes their
+results by (tool, code fingerprint, contract id, canon fingerprint) across
+agent sessions, and fans independent tool calls out concurrently.
+
+The worker functions are module-level and take plain data, so the pool can
+be threads (default) or processes.
+"""
+
+import os
+import sys
+import asyncio
+import threading
+from functools import lru_cache
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Dict, Any, Optional, Tuple, Callable, List, Hashable
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.contract import Contract
+from src.fingerprint import code_fingerprint, fingerprint
+
+# Path to contracts (relative to main repo)
+CONTRACTS_PATH = os.path.join(os.path.dirname(__file__), '..', 'contracts', 'templates.json')
+
+
+@lru_cache(maxsize=None)
+def load_contract(contract_id: str) -> Contract:
+    """Contract template, parsed once per process"""
+    return Contract.from_template(CONTRACTS_PATH, contract_id)
+
+
+# === Worker functions (run on the pool; one set of SKYT components per worker process) ===
+
+_components: Dict[Hashable, Any] = {}
+_components_lock = threading.Lock()
+
+
+def _component(key: Hashable, factory: Callable[[], Any]):
+    with _components_lock:
+        if key not in _components:
+            _components[key] = factory()
+        return _components[key]
+
+
+def extract_properties(code: str) -> Dict[str, Any]:
+    """Foundational properties of code"""
+    from src.foundational_properties import FoundationalProperties
+    extractor = _component("properties", FoundationalProperties)
+    return extractor.extract_all_properties(code)
+
+
+def oracle_check(code: str, contract_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Oracle test results for code against a contract"""
+    from src.oracle_system import OracleSystem
+    oracle = _component("oracle", OracleSystem)
+    return oracle.run_oracle_tests(code, contract_data)
+
+
+def canonical_distance(code: str, canon_properties: Dict[str, Any]) -> float:
+    """Distance from code to a canon's properties"""
+    from src.foundational_properties import FoundationalProperties
+    extractor = _component("properties", FoundationalProperties)
+    return extractor.calculate_distance(canon_properties, extract_properties(code))
+
+
+def transform_to_canon(code: str, contract_id: str, contract_data: Dict[str, Any],
+                       canon_dir: str) -> Dict[str, Any]:
+    """CodeTransformer.transform_to_canon against the canons stored in canon_dir"""
+    from src.canon_system import CanonSystem
+    from src.code_transformer import CodeTransformer
+    transformer = _component(("transformer", canon_dir),
+                             lambda: CodeTransformer(CanonSystem(canon_dir)))
+    return transformer.transform_to_canon(code, contract_id, contract=contract_data)
+
+
+# === Memoization ===
+
+class ToolResultCache:
+    """Thread-safe LRU of tool results, shared by every agent in the process"""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Tuple[bool, Any]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key: Tuple, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def tool_key(tool: str, code: str, contract_id: Optional[str] = None,
+             variant: Optional[str] = None) -> Tuple:
+    """Cache key: tool name, code fingerprint, contract id, canon/contract fingerprint"""
+    return (tool, code_fingerprint(code), contract_id, variant)
+
+
+def canon_library_fingerprint(canon_system, contract_id: str) -> str:
+    """Fingerprint of every canon of a contract (transform_to_canon targets the nearest one)"""
+    return fingerprint([canon.get("canonical_code") for canon in canon_system.load_canon_library(contract_id)])
+
+
+# === Runtime ===
+
+class ToolRuntime:
+    """
+    Worker pool plus result cache for agent tools
+
+    Args:
+        max_workers: Pool size
+        use_processes: Use a process pool (true CPU parallelism) instead of threads
+        cache: Result cache; defaults to a new ToolResultCache
+    """
+
+    def __init__(self, max_workers: int = 4, use_processes: bool = False,
+                 cache: Optional[ToolResultCache] = None):
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self.cache = cache if cache is not None else ToolResultCache()
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+
+    @property
+    def executor(self) -> Executor:
+        with self._executor_lock:
+            if self._executor is None:
+                pool_class = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+                self._executor = pool_class(max_workers=self.max_workers)
+            return self._executor
+
+    async def run(self, key: Tuple, func: Callable, *args) -> Any:
+        """
+        Cached result for key, else func(*args) on the worker pool
+
+        Concurrent calls with the same key share one execution. Cached
+        results are shared between callers and must be treated as read-only.
+        """
+        found, value = self.cache.get(key)
+        if found:
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, func, *args)
+        self._inflight[key] = future
+        try:
+            value = await future
+        finally:
+            self._inflight.pop(key, None)
+        self.cache.put(key, value)
+        return value
+
+    def run_sync(self, key: Tuple, func: Callable, *args) -> Any:
+        """Cached result for key, else func(*args) in the calling thread (sync tools)"""
+        found, value = self.cache.get(key)
+        if found:
+            return value
+        value = func(*args)
+        self.cache.put(key, value)
+        return value
+
+    async def gather_bounded(self, coroutine_factories: List[Callable[[], Any]],
+                             max_concurrency: int) -> List[Any]:
+        """Await coroutines with at most max_concurrency running at once, results in order"""
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def bounded(factory):
+            async with semaphore:
+                return await factory()
+
+        return await asyncio.gather(*(bounded(factory) for factory in coroutine_factories))
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+_default_runtime: Optional[ToolRuntime] = None
+_default_runtime_lock = threading.Lock()
+
+
+def get_tool_runtime() -> ToolRuntime:
+    """Process-wide tool runtime shared across agent sessions"""
+    global _default_runtime
+    with _default_runtime_lock:
+        if _default_runtime is None:
+            _default_runtime = ToolRuntime()
+        return _default_runtime
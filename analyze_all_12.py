@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 """Complete analysis for all 12 contracts"""
 
-import pandas as pd
 import numpy as np
-from scipy import stats
 
-df = pd.read_csv('outputs/metrics_summary.csv')
+from src.analysis_engine import AnalysisEngine
+
+engine = AnalysisEngine(n_resamples=1000, ci_method='BCa')
+df = engine.frame
 
 print('='*80)
 print('COMPLETE SKYT ANALYSIS - ALL 12 CONTRACTS')
@@ -19,14 +20,13 @@ print(f'Total LLM generations: {len(df) * 20}')
 print('\n' + '='*80)
 print('OVERALL METRICS')
 print('='*80)
+overall = engine.overall()
 for metric in ['R_raw', 'R_behavioral', 'R_structural', 'Delta_rescue']:
-    vals = df[metric].dropna()
-    mean = vals.mean()
-    ci = stats.bootstrap((vals.values,), np.mean, confidence_level=0.95, n_resamples=1000).confidence_interval
-    print(f'{metric:15} Mean: {mean:.3f} [{ci.low:.3f}, {ci.high:.3f}]')
+    row = overall.loc[metric]
+    print(f'{metric:15} Mean: {row["mean"]:.3f} [{row["ci_low"]:.3f}, {row["ci_high"]:.3f}]')
 
-raw_mean = df['R_raw'].mean()
-struct_mean = df['R_structural'].mean()
+raw_mean = overall.loc['R_raw', 'mean']
+struct_mean = overall.loc['R_structural', 'mean']
 improve = struct_mean - raw_mean
 print(f'\nImprovement (R_struct - R_raw): {improve:.3f} ({improve/raw_mean*100:.1f}%)')
 
@@ -34,75 +34,46 @@ print(f'\nImprovement (R_struct - R_raw): {improve:.3f} ({improve/raw_mean*100:.
 print('\n' + '='*80)
 print('MODEL COMPARISON')
 print('='*80)
-for model in sorted(df['model'].unique()):
-    mdf = df[df['model'] == model]
-    raw = mdf['R_raw'].mean()
-    struct = mdf['R_structural'].mean()
-    delta = struct - raw
-    pct = (delta/raw*100) if raw > 0 else 0
-    print(f'{model:35} R_raw={raw:.3f} R_struct={struct:.3f} D={delta:+.3f} ({pct:+.1f}%)')
+for model, row in engine.improvement('model').iterrows():
+    print(f'{model:35} R_raw={row.R_raw:.3f} R_struct={row.R_structural:.3f} D={row.delta:+.3f} ({row.delta_pct:+.1f}%)')
 
 # Per contract
 print('\n' + '='*80)
 print('CONTRACT COMPARISON')
 print('='*80)
-contracts_data = []
-for contract in sorted(df['contract_id'].unique()):
-    cdf = df[df['contract_id'] == contract]
-    raw = cdf['R_raw'].mean()
-    struct = cdf['R_structural'].mean()
-    delta = struct - raw
-    pct = (delta/raw*100) if raw > 0 else 0
-    contracts_data.append((contract, raw, struct, delta, pct))
-    print(f'{contract:25} R_raw={raw:.3f} R_struct={struct:.3f} D={delta:+.3f} ({pct:+.1f}%)')
+for contract, row in engine.improvement('contract').iterrows():
+    print(f'{contract:25} R_raw={row.R_raw:.3f} R_struct={row.R_structural:.3f} D={row.delta:+.3f} ({row.delta_pct:+.1f}%)')
 
 # Temperature effect
 print('\n' + '='*80)
 print('TEMPERATURE EFFECT')
 print('='*80)
-for temp in sorted(df['decoding_temperature'].unique()):
-    tdf = df[df['decoding_temperature'] == temp]
-    raw = tdf['R_raw'].mean()
-    struct = tdf['R_structural'].mean()
-    delta = struct - raw
-    pct = (delta/raw*100) if raw > 0 else 0
-    print(f'T={temp:.1f}  R_raw={raw:.3f} R_struct={struct:.3f} D={delta:+.3f} ({pct:+.1f}%)')
+temperatures = engine.improvement('temperature')
+for temp, row in temperatures.iterrows():
+    print(f'T={temp:.1f}  R_raw={row.R_raw:.3f} R_struct={row.R_structural:.3f} D={row.delta:+.3f} ({row.delta_pct:+.1f}%)')
 
 # Statistical tests
 print('\n' + '='*80)
 print('STATISTICAL SIGNIFICANCE (Fisher Exact + Cohen h)')
 print('='*80)
+# One-sided: does structural repeatability exceed raw repeatability?
+significance = engine.significance(alternative='greater').sort_values('p_value', kind='stable')
+n_tests = len(significance)
+# Cohen's h from the mean proportions
+significance['cohens_h'] = 2 * (np.arcsin(np.sqrt(significance['R_structural'])) -
+                                np.arcsin(np.sqrt(significance['R_raw'])))
+
+# Holm-Bonferroni over the sorted p-values
 sig_count = 0
-results = []
-for contract in sorted(df['contract_id'].unique()):
-    cdf = df[df['contract_id'] == contract]
-    n = len(cdf) * 20  # total trials
-    
-    raw_pass = int(cdf['R_raw'].mean() * n)
-    raw_fail = n - raw_pass
-    struct_pass = int(cdf['R_structural'].mean() * n)
-    struct_fail = n - struct_pass
-    
-    table = [[raw_pass, raw_fail], [struct_pass, struct_fail]]
-    _, p = stats.fisher_exact(table, alternative='less')
-    
-    # Cohen's h
-    p1 = cdf['R_raw'].mean()
-    p2 = cdf['R_structural'].mean()
-    h = 2 * (np.arcsin(np.sqrt(p2)) - np.arcsin(np.sqrt(p1)))
-    
-    results.append((contract, p, h))
-
-# Sort by p-value for Holm-Bonferroni
-results.sort(key=lambda x: x[1])
-for i, (contract, p, h) in enumerate(results):
-    adjusted_alpha = 0.05 / (12 - i)
-    sig = '*' if p < adjusted_alpha else ''
+for i, (contract, row) in enumerate(significance.iterrows()):
+    adjusted_alpha = 0.05 / (n_tests - i)
+    sig = '*' if row.p_value < adjusted_alpha else ''
     if sig: sig_count += 1
+    h = row.cohens_h
     size = 'large' if abs(h) >= 0.8 else 'medium' if abs(h) >= 0.5 else 'small' if abs(h) >= 0.2 else 'negligible'
-    print(f'{contract:25} p={p:.4f}{sig:2} h={h:.3f} ({size})')
+    print(f'{contract:25} p={row.p_value:.4f}{sig:2} h={h:.3f} ({size})')
 
-print(f'\nSignificant after Holm-Bonferroni: {sig_count}/12')
+print(f'\nSignificant after Holm-Bonferroni: {sig_count}/{n_tests}')
 
 # Summary
 print('\n' + '='*80)
@@ -114,24 +85,26 @@ DATASET:
   - 20 runs per config = 3,600 total LLM generations
 
 REPEATABILITY:
-  - Raw (R_raw):        {df['R_raw'].mean():.1%} mean
-  - Behavioral (R_beh): {df['R_behavioral'].mean():.1%} mean  
-  - Structural (R_str): {df['R_structural'].mean():.1%} mean
+  - Raw (R_raw):        {raw_mean:.1%} mean
+  - Behavioral (R_beh): {overall.loc['R_behavioral', 'mean']:.1%} mean  
+  - Structural (R_str): {struct_mean:.1%} mean
 
 IMPROVEMENT:
   - Absolute: {struct_mean - raw_mean:.1%}
   - Relative: {(struct_mean - raw_mean)/raw_mean*100:.1f}%
 
 SIGNIFICANCE:
-  - {sig_count}/12 contracts show significant improvement
-  - {sum(1 for _,_,h in results if abs(h) >= 0.5)}/12 contracts have medium+ effect size
+  - {sig_count}/{n_tests} contracts show significant improvement
+  - {int((significance['cohens_h'].abs() >= 0.5).sum())}/{n_tests} contracts have medium+ effect size
 
 TEMPERATURE EFFECT:
-  - T=0.0: {df[df['decoding_temperature']==0.0]['R_raw'].mean():.1%} raw
-  - T=1.0: {df[df['decoding_temperature']==1.0]['R_raw'].mean():.1%} raw
+  - T=0.0: {temperatures.loc[0.0, 'R_raw']:.1%} raw
+  - T=1.0: {temperatures.loc[1.0, 'R_raw']:.1%} raw
   - SKYT maintains higher repeatability across all temperatures
 ''')
 
 print('='*80)
 print('ANALYSIS COMPLETE')
 print('='*80)
+
+engine.save_cache()
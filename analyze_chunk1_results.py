@@ -5,8 +5,8 @@ Compare transformation success rates before and after removing the rule.
 """
 
 import pandas as pd
-import json
-import glob
+
+from src.results_catalog import open_catalog
 
 def main():
     print("="*80)
@@ -67,18 +67,18 @@ def main():
     print("="*80)
     
     # Check transformation success in detail
-    new_files = sorted(glob.glob('outputs/is_prime_strict_temp*.json'))[-10:]
+    catalog = open_catalog()
+    new_runs = catalog.query(contract_id='is_prime_strict', limit=10)
     
-    if new_files:
-        print(f"\nAnalyzing {len(new_files)} new experiment files...")
+    if new_runs:
+        print(f"\nAnalyzing {len(new_runs)} new experiment files...")
         
         total_trans = 0
         successful_trans = 0
         
-        for filepath in new_files:
+        for run in new_runs:
             try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = catalog.load_fields(run, 'transformation_results')
                 
                 trans_results = data.get('transformation_results', [])
                 for t in trans_results:
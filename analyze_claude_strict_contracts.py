@@ -4,9 +4,8 @@ Analyze Claude's behavior on strict contracts (binary_search_strict and lru_cach
 to understand transformation patterns and success rates.
 """
 
-import json
-import glob
 from collections import defaultdict
+from src.result_io import load_result, result_files
 
 print("="*80)
 print("CLAUDE ANALYSIS: STRICT CONTRACTS")
@@ -23,13 +22,12 @@ for contract in contracts:
     
     # Find Claude files for this contract
     pattern = f"outputs/{contract}_temp*.json"
-    files = sorted(glob.glob(pattern))
+    files = sorted(result_files(pattern))
     
     claude_files = []
     for filepath in files:
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_result(filepath)
             if 'claude' in data.get('model', '').lower():
                 claude_files.append(filepath)
         except:
@@ -45,8 +43,7 @@ for contract in contracts:
     temp_results = {}
     
     for filepath in claude_files:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_result(filepath)
         
         temp = data.get('temperature', 'unknown')
         metrics = data.get('metrics', {})
@@ -1,12 +1,11 @@
 #!/usr/bin/env python3
 """Interim statistical analysis of experiment results"""
 
-import pandas as pd
-import sys
-sys.path.insert(0, 'src')
-from enhanced_stats import compare_repeatability_rigorous, format_rigorous_report
+from src.enhanced_stats import compare_repeatability_rigorous, format_rigorous_report
+from src.analysis_engine import AnalysisEngine
 
-df = pd.read_csv('outputs/metrics_summary.csv')
+engine = AnalysisEngine()
+df = engine.frame
 
 print('='*80)
 print('PRELIMINARY STATISTICAL ANALYSIS')
@@ -15,17 +14,14 @@ print('='*80)
 
 # Per-model analysis
 print('\n## MODEL COMPARISON ##\n')
-for model in df['model'].unique():
-    model_df = df[df['model'] == model]
-    r_raw_mean = model_df['R_raw'].mean()
-    r_raw_std = model_df['R_raw'].std()
-    r_struct_mean = model_df['R_structural'].mean()
-    r_struct_std = model_df['R_structural'].std()
-    delta_mean = model_df['Delta_rescue'].mean()
-    delta_std = model_df['Delta_rescue'].std()
+models = engine.summary('model', ['R_raw', 'R_structural', 'Delta_rescue'], sort=False)
+for model, row in models.iterrows():
+    r_raw_mean, r_raw_std = row['R_raw', 'mean'], row['R_raw', 'std']
+    r_struct_mean, r_struct_std = row['R_structural', 'mean'], row['R_structural', 'std']
+    delta_mean, delta_std = row['Delta_rescue', 'mean'], row['Delta_rescue', 'std']
     
     print(f'{model}:')
-    print(f'  N experiments: {len(model_df)}')
+    print(f'  N experiments: {int(row["R_raw", "count"])}')
     print(f'  R_raw:        {r_raw_mean:.3f} +/- {r_raw_std:.3f}')
     print(f'  R_structural: {r_struct_mean:.3f} +/- {r_struct_std:.3f}')
     print(f'  Delta_rescue: {delta_mean:.3f} +/- {delta_std:.3f}')
@@ -34,9 +30,8 @@ for model in df['model'].unique():
 
 # Per-contract analysis
 print('\n## CONTRACT COMPARISON ##\n')
-for contract in df['contract_id'].unique():
-    contract_df = df[df['contract_id'] == contract]
-    print(f'{contract}: N={len(contract_df)}, R_raw={contract_df["R_raw"].mean():.3f}, R_structural={contract_df["R_structural"].mean():.3f}')
+for contract, row in engine.improvement('contract', sort=False).iterrows():
+    print(f'{contract}: N={int(row.n)}, R_raw={row.R_raw:.3f}, R_structural={row.R_structural:.3f}')
 
 # Run rigorous analysis
 print('\n' + '='*80)
@@ -52,6 +47,5 @@ print(format_rigorous_report(analysis))
 
 # Temperature effect
 print('\n## TEMPERATURE EFFECT ##\n')
-for temp in sorted(df['decoding_temperature'].unique()):
-    temp_df = df[df['decoding_temperature'] == temp]
-    print(f'Temp {temp}: R_raw={temp_df["R_raw"].mean():.3f}, R_structural={temp_df["R_structural"].mean():.3f}')
+for temp, row in engine.improvement('temperature').iterrows():
+    print(f'Temp {temp}: R_raw={row.R_raw:.3f}, R_structural={row.R_structural:.3f}')
@@ -1,12 +1,10 @@
 #!/usr/bin/env python3
-import json
-import glob
+from src.result_io import load_result, result_files
 
-files = sorted(glob.glob('outputs/is_prime_strict_temp0.0_*.json'))[-2:]
+files = sorted(result_files('outputs/is_prime_strict_temp0.0_*.json'))[-2:]
 
 for filepath in files:
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_result(filepath)
     
     print("="*80)
     print(f"File: {filepath.split('/')[-1]}")
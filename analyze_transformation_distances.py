@@ -3,15 +3,14 @@
 Analyze the actual distances being calculated for transformations.
 """
 
-import json
-import glob
+from src.result_io import load_result, result_files
 
 def main():
     print("="*80)
     print("TRANSFORMATION DISTANCE ANALYSIS")
     print("="*80)
     
-    files = sorted(glob.glob('outputs/is_prime_strict_temp*.json'))[-15:]
+    files = sorted(result_files('outputs/is_prime_strict_temp*.json'))[-15:]
     
     by_model = {
         'gpt-4o-mini': [],
@@ -21,8 +20,7 @@ def main():
     
     for filepath in files:
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_result(filepath)
             
             model = data.get('model', 'unknown')
             if model in by_model:
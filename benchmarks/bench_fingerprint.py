@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: stable structural fingerprints vs the legacy hash()-based signature
+
+The legacy signature (str(hash(frozenset(...))) per key property) is salted
+per process; structural_fingerprint() serializes deterministically and digests
+with BLAKE2b. This compares their cost on real outputs from outputs/*.json.
+
+Usage:
+    python benchmarks/bench_fingerprint.py [--files 20] [--repeat 5]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.foundational_properties import FoundationalProperties
+from src.fingerprint import structural_fingerprint, STRUCTURAL_KEY_PROPERTIES
+from src.result_io import load_result, result_files
+
+
+def legacy_signature(properties):
+    """The pre-fingerprint _create_structural_signature implementation"""
+    signature_parts = []
+    for prop_name in STRUCTURAL_KEY_PROPERTIES:
+        prop_value = properties.get(prop_name)
+        if prop_value:
+            if isinstance(prop_value, dict):
+                try:
+                    hashable_items = []
+                    for k, v in prop_value.items():
+                        if isinstance(v, (list, dict)):
+                            hashable_items.append((k, str(v)))
+                        else:
+                            hashable_items.append((k, v))
+                    signature_parts.append(str(hash(frozenset(hashable_items))))
+                except Exception:
+                    signature_parts.append(str(hash(str(prop_value))))
+            else:
+                signature_parts.append(str(hash(str(prop_value))))
+        else:
+            signature_parts.append("None")
+    return "_".join(signature_parts)
+
+
+def load_corpus(max_files):
+    """Raw outputs from the stored experiment results"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    codes = []
+    for path in sorted(result_files(os.path.join(root, "outputs", "*.json")))[:max_files]:
+        try:
+            codes.extend(load_result(path).get("raw_outputs", []))
+        except (OSError, ValueError):
+            continue
+    return codes
+
+
+def time_it(func, items, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark structural fingerprints")
+    parser.add_argument("--files", type=int, default=20, help="Number of outputs/*.json files to load")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    codes = load_corpus(args.files)
+    extractor = FoundationalProperties()
+    properties = [extractor.extract_all_properties(code) for code in codes]
+    print(f"Corpus: {len(properties)} outputs from {args.files} result files")
+
+    if not properties:
+        print("No outputs found - nothing to benchmark")
+        return
+
+    legacy = time_it(legacy_signature, properties, args.repeat)
+    stable = time_it(structural_fingerprint, properties, args.repeat)
+
+    n = len(properties)
+    print(f"{'path':<28}{'total (ms)':>12}{'per call (us)':>16}")
+    print(f"{'legacy hash() signature':<28}{legacy * 1000:>12.2f}{legacy / n * 1e6:>16.2f}")
+    print(f"{'structural_fingerprint':<28}{stable * 1000:>12.2f}{stable / n * 1e6:>16.2f}")
+    print(f"Ratio (stable / legacy): {stable / legacy:.2f}x")
+
+    legacy_groups = len(set(legacy_signature(p) for p in properties))
+    stable_groups = len(set(structural_fingerprint(p) for p in properties))
+    print(f"Distinct signatures: legacy={legacy_groups}, stable={stable_groups}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark: how canonicalization scales with program size and sample count
+
+Uses the synthetic stress corpus (stress_corpus.py), so no LLM is called:
+  - program size: multi-function programs of growing size through
+    FoundationalProperties.extract_all_properties and
+    TransformationPipeline.transform_code (one mutated program towards another)
+  - sample count: growing sets of equivalent variants of one contract's canon
+    through ComprehensiveMetrics.calculate_comprehensive_metrics
+
+Usage:
+    python benchmarks/bench_scaling.py [--sizes 1,4,16,64] [--samples 10,50,200]
+                                       [--contract fibonacci_basic] [--repeat 3]
+                                       [--output scaling.json]
+"""
+
+import os
+import sys
+import io
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.contract import Contract
+from src.canon_system import CanonSystem
+from src.metrics import ComprehensiveMetrics
+from src.foundational_properties import FoundationalProperties
+from src.transformations.transformation_pipeline import TransformationPipeline
+from benchmarks.stress_corpus import load_canons, generate_variants, synthetic_program
+
+
+def best_time(func, repeat):
+    """Fastest of `repeat` runs, with the pipeline's debug output discarded"""
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def scale_program_size(canons, sizes, repeat):
+    extractor = FoundationalProperties()
+    canon_codes = [entry["canon_code"] for entry in canons.values()]
+    rows = []
+
+    for size in sizes:
+        target = synthetic_program(canon_codes, size, seed=0)
+        variant = synthetic_program(canon_codes, size, seed=1)
+        lines = len(target.splitlines())
+        pipeline = TransformationPipeline()
+
+        extract = best_time(lambda: extractor.extract_all_properties(variant), repeat)
+        transform = best_time(lambda: pipeline.transform_code(variant, target), repeat)
+        rows.append({"functions": size, "lines": lines,
+                     "extract_ms": extract * 1000, "transform_ms": transform * 1000,
+                     "extract_us_per_line": extract / lines * 1e6})
+    return rows
+
+
+def scale_sample_count(canons, contract_id, counts, repeat):
+    entry = canons[contract_id]
+    contract = dict(entry["contract"], id=contract_id)
+    variants = generate_variants(entry["canon_code"], max(counts), seed=0)
+    rows = []
+
+    with tempfile.TemporaryDirectory() as canon_dir:
+        canon_system = CanonSystem(canon_dir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            canon_system.create_canon(Contract(contract), entry["canon_code"], require_oracle_pass=False)
+        metrics = ComprehensiveMetrics(canon_system)
+
+        for count in counts:
+            samples = variants[:count]
+            elapsed = best_time(lambda: metrics.calculate_comprehensive_metrics(
+                samples, samples, contract, contract_id), repeat)
+            rows.append({"samples": len(samples), "metrics_ms": elapsed * 1000,
+                         "ms_per_sample": elapsed * 1000 / max(1, len(samples))})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark canonicalization scaling")
+    parser.add_argument("--sizes", default="1,2,4,8,16,32,64", help="Functions per synthetic program")
+    parser.add_argument("--samples", default="10,25,50,100,200", help="Sample counts for metrics")
+    parser.add_argument("--contract", default="fibonacci_basic", help="Contract for the sample sweep")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is reported)")
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args()
+
+    canons = load_canons()
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    counts = [int(s) for s in args.samples.split(",") if s]
+
+    size_rows = scale_program_size(canons, sizes, args.repeat)
+    print(f"{'functions':>10}{'lines':>8}{'extract (ms)':>14}{'us/line':>10}{'transform (ms)':>16}")
+    for row in size_rows:
+        print(f"{row['functions']:>10}{row['lines']:>8}{row['extract_ms']:>14.2f}"
+              f"{row['extract_us_per_line']:>10.1f}{row['transform_ms']:>16.2f}")
+
+    sample_rows = scale_sample_count(canons, args.contract, counts, args.repeat)
+    print(f"\n{'samples':>10}{'metrics (ms)':>14}{'ms/sample':>12}   ({args.contract})")
+    for row in sample_rows:
+        print(f"{row['samples']:>10}{row['metrics_ms']:>14.2f}{row['ms_per_sample']:>12.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"program_size": size_rows, "sample_count": sample_rows,
+                       "contract_id": args.contract, "repeat": args.repeat}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Build the committed benchmark corpus from stored experiment results
+
+Takes, per contract, the contract spec, the canonical code and up to
+--per-contract distinct (raw, repaired) output pairs from outputs/*.json
+(files in sorted order) and writes them to benchmarks/corpus.json, so the
+suite measures the same snippets on every machine and checkout.
+
+Usage:
+    python benchmarks/build_corpus.py [--per-contract 8] [--output benchmarks/corpus.json]
+"""
+
+import os
+import sys
+import json
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.result_io import load_result, result_files
+DEFAULT_CORPUS = os.path.join(ROOT, "benchmarks", "corpus.json")
+CORPUS_VERSION = 1
+
+
+def build_corpus(results_dir: str, per_contract: int):
+    """Contract id -> {contract, canon_code, snippets: [{raw, repaired}]}"""
+    contracts = {}
+
+    for path in sorted(result_files(os.path.join(results_dir, "*.json"))):
+        try:
+            result = load_result(path)
+        except (OSError, ValueError):
+            continue
+        if not isinstance(result, dict):
+            continue
+
+        contract_id = result.get("contract_id")
+        canon_code = (result.get("canon_data") or {}).get("canonical_code")
+        raw_outputs = result.get("raw_outputs") or []
+        if not contract_id or not canon_code or not raw_outputs:
+            continue
+
+        entry = contracts.setdefault(contract_id, {
+            "contract": result.get("contract", {}),
+            "canon_code": canon_code,
+            "snippets": [],
+        })
+        seen = {snippet["raw"] for snippet in entry["snippets"]}
+        repaired_outputs = result.get("repaired_outputs") or raw_outputs
+
+        for raw, repaired in zip(raw_outputs, repaired_outputs):
+            if len(entry["snippets"]) >= per_contract:
+                break
+            if raw and raw not in seen:
+                seen.add(raw)
+                entry["snippets"].append({"raw": raw, "repaired": repaired or raw})
+
+    return {"version": CORPUS_VERSION, "per_contract": per_contract,
+            "contracts": dict(sorted(contracts.items()))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the benchmark corpus")
+    parser.add_argument("--results-dir", default=os.path.join(ROOT, "outputs"))
+    parser.add_argument("--per-contract", type=int, default=8)
+    parser.add_argument("--output", default=DEFAULT_CORPUS)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.results_dir, args.per_contract)
+    with open(args.output, "w") as f:
+        json.dump(corpus, f, indent=1)
+
+    total = sum(len(c["snippets"]) for c in corpus["contracts"].values())
+    print(f"Wrote {total} snippets for {len(corpus['contracts'])} contracts to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
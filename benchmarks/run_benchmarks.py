@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the canonicalization hot paths
+
+Times each pipeline stage per contract on the committed corpus
+(benchmarks/corpus.json, see build_corpus.py) and reports throughput
+(snippets/s) and p50/p95 latency. Results can be saved as a baseline and
+later runs compared against it; any stage/contract whose p50 latency grows
+beyond --threshold is reported as a regression (exit status 1).
+
+Usage:
+    python benchmarks/run_benchmarks.py [--targets extract_properties,calculate_distance]
+                                        [--contracts fibonacci_basic] [--repeat 3] [--warmup 1]
+                                        [--output results.json]
+                                        [--baseline benchmarks/baseline.json] [--threshold 0.25]
+                                        [--min-delta-ms 0.5]
+                                        [--save-baseline]
+"""
+
+import os
+import sys
+import io
+import json
+import time
+import platform
+import argparse
+import tempfile
+import contextlib
+from datetime import datetime
+from typing import Dict, Any, List, Callable
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.contract import Contract
+from src.canon_system import CanonSystem
+from src.oracle_system import OracleSystem
+from src.code_transformer import CodeTransformer
+from src.metrics import ComprehensiveMetrics
+from src.foundational_properties import FoundationalProperties
+from src.transformations.transformation_pipeline import TransformationPipeline
+
+DEFAULT_CORPUS = os.path.join(ROOT, "benchmarks", "corpus.json")
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+RESULTS_VERSION = 1
+ALL_CONTRACTS = "_all"
+
+
+def summarize(latencies: List[float], snippets: int) -> Dict[str, Any]:
+    """Throughput and latency percentiles for one stage (latencies in seconds)"""
+    total = float(sum(latencies))
+    values = np.array(latencies, dtype=float)
+    return {
+        "calls": len(latencies),
+        "snippets": snippets,
+        "total_s": total,
+        "throughput": snippets / total if total > 0 else None,
+        "p50_ms": float(np.percentile(values, 50)) * 1000 if values.size else None,
+        "p95_ms": float(np.percentile(values, 95)) * 1000 if values.size else None,
+    }
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any],
+                        threshold: float, min_delta_ms: float = 0.5) -> List[Dict[str, Any]]:
+    """
+    Stage/contract pairs whose p50 latency regressed beyond the threshold
+
+    Args:
+        results: Current run (run_benchmarks output)
+        baseline: Stored run to compare against
+        threshold: Allowed relative slowdown (0.25 = 25%)
+        min_delta_ms: Slowdowns smaller than this are timer noise, not regressions
+    """
+    regressions = []
+    for target, per_contract in results.get("results", {}).items():
+        base_target = baseline.get("results", {}).get(target, {})
+        for contract_id, current in per_contract.items():
+            base = base_target.get(contract_id)
+            if not base or not base.get("p50_ms") or current.get("p50_ms") is None:
+                continue
+
+            ratio = current["p50_ms"] / base["p50_ms"]
+            if ratio > 1.0 + threshold and current["p50_ms"] - base["p50_ms"] >= min_delta_ms:
+                regressions.append({
+                    "target": target,
+                    "contract_id": contract_id,
+                    "baseline_p50_ms": base["p50_ms"],
+                    "current_p50_ms": current["p50_ms"],
+                    "ratio": ratio,
+                })
+    return regressions
+
+
+class BenchmarkContext:
+    """Pipeline components for one contract, with its canon stored in a scratch directory"""
+
+    def __init__(self, contract_id: str, entry: Dict[str, Any], canon_dir: str):
+        self.contract_id = contract_id
+        self.contract = entry["contract"]
+        self.canon_code = entry["canon_code"]
+        self.raw = [snippet["raw"] for snippet in entry["snippets"]]
+        self.repaired = [snippet["repaired"] for snippet in entry["snippets"]]
+
+        self.canon_system = CanonSystem(canon_dir)
+        self.canon_system.create_canon(Contract(dict(self.contract, id=contract_id)),
+                                       self.canon_code, require_oracle_pass=False)
+        self.extractor = FoundationalProperties()
+        self.oracle_system = OracleSystem()
+        self.transformer = CodeTransformer(self.canon_system)
+        self.pipeline = TransformationPipeline(contract=self.contract)
+        self.metrics = ComprehensiveMetrics(self.canon_system)
+
+        self.canon_properties = self.extractor.extract_all_properties(self.canon_code)
+        self.raw_properties = [self.extractor.extract_all_properties(code) for code in self.raw]
+
+
+def _per_snippet(func: Callable[[BenchmarkContext, int], Any]):
+    def run(ctx: BenchmarkContext):
+        return [lambda i=i: func(ctx, i) for i in range(len(ctx.raw))], len(ctx.raw)
+    return run
+
+
+def _whole_contract(func: Callable[[BenchmarkContext], Any]):
+    def run(ctx: BenchmarkContext):
+        return [lambda: func(ctx)], len(ctx.raw)
+    return run
+
+
+# Stage name -> builder of (calls, snippets covered) for one contract
+TARGETS = {
+    "extract_properties": _per_snippet(
+        lambda ctx, i: ctx.extractor.extract_all_properties(ctx.raw[i])),
+    "calculate_distance": _per_snippet(
+        lambda ctx, i: ctx.extractor.calculate_distance(ctx.canon_properties, ctx.raw_properties[i],
+                                                        ctx.contract)),
+    "run_oracle_tests": _per_snippet(
+        lambda ctx, i: ctx.oracle_system.run_oracle_tests(ctx.raw[i], ctx.contract)),
+    "transform_code": _per_snippet(
+        lambda ctx, i: ctx.pipeline.transform_code(ctx.raw[i], ctx.canon_code, contract=ctx.contract,
+                                                   contract_id=ctx.contract_id)),
+    "transform_to_canon": _per_snippet(
+        lambda ctx, i: ctx.transformer.transform_to_canon(ctx.raw[i], ctx.contract_id,
+                                                          contract=ctx.contract,
+                                                          oracle_system=ctx.oracle_system)),
+    "comprehensive_metrics": _whole_contract(
+        lambda ctx: ctx.metrics.calculate_comprehensive_metrics(ctx.raw, ctx.repaired, ctx.contract,
+                                                                ctx.contract_id)),
+}
+
+
+def run_benchmarks(corpus: Dict[str, Any], targets: List[str], contracts: List[str] = None,
+                   repeat: int = 3, warmup: int = 1) -> Dict[str, Any]:
+    """
+    Time every target on every contract of the corpus
+
+    Each call is timed individually after `warmup` untimed passes; pipeline
+    output is discarded so debug printing does not reach the terminal.
+    """
+    results: Dict[str, Dict[str, Any]] = {target: {} for target in targets}
+    overall: Dict[str, tuple] = {target: ([], 0) for target in targets}
+    sink = io.StringIO()
+
+    with tempfile.TemporaryDirectory() as canon_dir:
+        for contract_id, entry in corpus["contracts"].items():
+            if contracts and contract_id not in contracts:
+                continue
+            if not entry["snippets"]:
+                continue
+
+            with contextlib.redirect_stdout(sink):
+                ctx = BenchmarkContext(contract_id, entry, canon_dir)
+
+            for target in targets:
+                calls, snippets = TARGETS[target](ctx)
+                latencies = []
+                for attempt in range(warmup + repeat):
+                    for call in calls:
+                        start = time.perf_counter()
+                        with contextlib.redirect_stdout(sink):
+                            call()
+                        if attempt >= warmup:
+                            latencies.append(time.perf_counter() - start)
+                    sink.seek(0)
+                    sink.truncate()
+
+                results[target][contract_id] = summarize(latencies, snippets * repeat)
+                all_latencies, all_snippets = overall[target]
+                overall[target] = (all_latencies + latencies, all_snippets + snippets * repeat)
+
+    for target, (latencies, snippets) in overall.items():
+        if latencies:
+            results[target][ALL_CONTRACTS] = summarize(latencies, snippets)
+
+    return {
+        "version": RESULTS_VERSION,
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "warmup": warmup,
+        "results": results,
+    }
+
+
+def print_report(results: Dict[str, Any]):
+    print(f"{'target':<24}{'contract':<24}{'snippets/s':>12}{'p50 (ms)':>12}{'p95 (ms)':>12}")
+    for target, per_contract in results["results"].items():
+        for contract_id, row in per_contract.items():
+            throughput = f"{row['throughput']:.1f}" if row["throughput"] else "-"
+            print(f"{target:<24}{contract_id:<24}{throughput:>12}"
+                  f"{row['p50_ms']:>12.2f}{row['p95_ms']:>12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the canonicalization hot paths")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--targets", default=",".join(TARGETS),
+                        help=f"Comma-separated subset of: {', '.join(TARGETS)}")
+    parser.add_argument("--contracts", default="", help="Comma-separated contract ids (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the corpus per target")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed passes before timing")
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline", help="Compare against this results JSON")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed relative p50 slowdown before flagging a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5,
+                        help="Ignore p50 slowdowns smaller than this (timer noise)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help=f"Store this run as the baseline ({DEFAULT_BASELINE})")
+    args = parser.parse_args()
+
+    targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+    unknown = [t for t in targets if t not in TARGETS]
+    if unknown:
+        parser.error(f"Unknown targets: {', '.join(unknown)}")
+    contracts = [c.strip() for c in args.contracts.split(",") if c.strip()]
+
+    with open(args.corpus, "r") as f:
+        corpus = json.load(f)
+
+    results = run_benchmarks(corpus, targets, contracts, args.repeat, args.warmup)
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(DEFAULT_BASELINE, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {DEFAULT_BASELINE}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.threshold, args.min_delta_ms)
+        for r in regressions:
+            print(f"REGRESSION {r['target']}/{r['contract_id']}: p50 {r['baseline_p50_ms']:.2f}ms -> "
+                  f"{r['current_p50_ms']:.2f}ms ({r['ratio']:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Synthetic stress corpus for scaling tests of canonicalization
+
+Starting from each contract's canon (benchmarks/corpus.json), generates
+families of semantically equivalent variants by composing the inverses of
+the repair transformations, plus larger multi-function programs, so the
+pipeline can be measured at sizes and sample counts no LLM run produced.
+
+Mutators (each is the inverse of an existing normalization):
+    alpha_rename        - fresh local names        (inverse of variable normalization)
+    reorder_statements  - swap independent assigns (inverse of statement ordering)
+    boolean_rewrites    - c -> (c) == True, a != b -> not a == b,
+                          not xs -> len(xs) == 0   (inverse of len_zero_to_not /
+                                                    boolean_redundancy_removal)
+    redundant_precheck  - repeat a leading guard   (inverse of remove_optimization_prechecks)
+    exit_style          - early return <-> single exit, ternary -> if/else,
+                          return expr -> temp + return
+                                                   (inverse of if_else_to_ternary /
+                                                    separate_to_inline_return)
+    add_docstring       - docstrings               (inverse of remove_comments_and_docstrings)
+
+Usage:
+    python benchmarks/stress_corpus.py [--variants 200] [--seed 0] [--verify]
+                                       [--output stress_corpus.json]
+"""
+
+import os
+import sys
+import ast
+import copy
+import json
+import random
+import argparse
+import builtins
+from typing import Dict, Any, List, Optional, Set, Callable
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CORPUS = os.path.join(ROOT, "benchmarks", "corpus.json")
+
+# Calls treated as side-effect free when deciding whether code may move or repeat
+PURE_CALLS = {"len", "abs", "min", "max", "int", "float", "str", "bool", "range", "isinstance"}
+NAME_POOL = ["value", "item", "tmp", "acc", "cur", "idx", "res", "val", "elem", "count",
+             "data", "node", "left_v", "right_v", "aux", "state", "step", "part"]
+BUILTIN_NAMES = set(dir(builtins))
+
+
+def _names(node: ast.AST) -> Set[str]:
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+
+
+def _is_pure(node: ast.AST) -> bool:
+    """No calls other than PURE_CALLS, no attribute stores, no yields/awaits"""
+    for sub in ast.walk(node):
+        if isinstance(sub, ast.Call):
+            if not (isinstance(sub.func, ast.Name) and sub.func.id in PURE_CALLS):
+                return False
+        elif isinstance(sub, (ast.Yield, ast.YieldFrom, ast.Await, ast.NamedExpr, ast.Lambda)):
+            return False
+    return True
+
+
+def _functions(tree: ast.AST) -> List[ast.FunctionDef]:
+    return [n for n in ast.walk(tree) if isinstance(n, ast.FunctionDef)]
+
+
+def _blocks(tree: ast.AST):
+    """Every statement list in the tree (bodies, else/finally branches)"""
+    for node in ast.walk(tree):
+        for field in ("body", "orelse", "finalbody"):
+            block = getattr(node, field, None)
+            if isinstance(block, list) and block and isinstance(block[0], ast.stmt):
+                yield block
+
+
+class _FreshNames:
+    """Names not used anywhere in the module"""
+
+    def __init__(self, tree: ast.AST, rng: random.Random):
+        self.used = _names(tree) | {a.arg for a in ast.walk(tree) if isinstance(a, ast.arg)}
+        self.used |= {n.name for n in ast.walk(tree)
+                      if isinstance(n, (ast.FunctionDef, ast.ClassDef))}
+        self.used |= BUILTIN_NAMES
+        self.rng = rng
+
+    def __call__(self) -> str:
+        base = self.rng.choice(NAME_POOL)
+        name, i = base, 1
+        while name in self.used:
+            name, i = f"{base}_{i}", i + 1
+        self.used.add(name)
+        return name
+
+
+# === Mutators: (tree, rng, fresh) -> None, editing the tree in place ===
+
+def alpha_rename(tree: ast.Module, rng: random.Random, fresh: _FreshNames):
+    """Rename parameters and locals of simple functions (no nested scopes or globals)"""
+    for func in _functions(tree):
+        nested = [n for n in ast.walk(func) if n is not func and isinstance(
+            n, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef,
+                ast.Global, ast.Nonlocal))]
+        if nested:
+            continue
+
+        local = {a.arg for a in func.args.args if a.arg not in ("self", "cls")}
+        local |= {n.id for n in ast.walk(func) if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Store)}
+        local = sorted(local)
+        if not local:
+            continue
+
+        chosen = rng.sample(local, k=rng.randint(1, len(local)))
+        mapping = {old: fresh() for old in chosen}
+        for arg in func.args.args:
+            if arg.arg in mapping:
+                arg.arg = mapping[arg.arg]
+        for node in ast.walk(func):
+            if isinstance(node, ast.Name) and node.id in mapping:
+                node.id = mapping[node.id]
+
+
+def reorder_statements(tree: ast.Module, rng: random.Random, fresh: _FreshNames):
+    """Swap adjacent pure assignments that neither read nor write each other's names"""
+    def simple_assign(stmt):
+        return (isinstance(stmt, ast.Assign) and _is_pure(stmt.value) and
+                all(isinstance(t, ast.Name) or
+                    (isinstance(t, ast.Tuple) and all(isinstance(e, ast.Name) for e in t.elts))
+                    for t in stmt.targets))
+
+    for block in list(_blocks(tree)):
+        for i in range(len(block) - 1):
+            a, b = block[i], block[i + 1]
+            if not (simple_assign(a) and simple_assign(b)) or rng.random() < 0.5:
+                continue
+            writes_a = set().union(*(_names(t) for t in a.targets))
+            writes_b = set().union(*(_names(t) for t in b.targets))
+            if writes_a & (writes_b | _names(b.value)) or writes_b & _names(a.value):
+                continue
+            block[i], block[i + 1] = b, a
+
+
+def boolean_rewrites(tree: ast.Module, rng: random.Random, fresh: _FreshNames):
+    """Redundant but equivalent boolean forms"""
+    collections: Set[str] = set()
+    rebound: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                for name in _names(target):
+                    if isinstance(node.value, (ast.List, ast.Dict, ast.Set, ast.ListComp,
+                                               ast.DictComp, ast.SetComp)) and isinstance(target, ast.Name):
+                        collections.add(name)
+                    else:
+                        rebound.add(name)
+        elif isinstance(node, (ast.AugAssign, ast.AnnAssign, ast.For, ast.comprehension, ast.arg)):
+            target = getattr(node, "target", None)
+            rebound |= _names(target) if target is not None else {node.arg}
+    collections -= rebound
+
+    class Rewriter(ast.NodeTransformer):
+        def visit_UnaryOp(self, node):
+            self.generic_visit(node)
+            if (isinstance(node.op, ast.Not) and isinstance(node.operand, ast.Name)
+                    and node.operand.id in collections and rng.random() < 0.7):
+                return ast.Compare(left=ast.Call(func=ast.Name("len", ast.Load()),
+                                                 args=[node.operand], keywords=[]),
+                                   ops=[ast.Eq()], comparators=[ast.Constant(0)])
+            return node
+
+        def visit_Compare(self, node):
+            self.generic_visit(node)
+            if len(node.ops) == 1 and isinstance(node.ops[0], ast.NotEq) and rng.random() < 0.5:
+                return ast.UnaryOp(op=ast.Not(), operand=ast.Compare(
+                    left=node.left, ops=[ast.Eq()], comparators=node.comparators))
+            return node
+
+        def _wrap_test(self, node):
+            self.generic_visit(node)
+            if isinstance(node.test, ast.Compare) and rng.random() < 0.5:
+                node.test = ast.Compare(left=node.test, ops=[ast.Eq()], comparators=[ast.Constant(True)])
+            return node
+
+        visit_If = _wrap_test
+        visit_While = _wrap_test
+
+    Rewriter().visit(tree)
+
+
+def redundant_precheck(tree: ast.Module, rng: random.Random, fresh: _FreshNames):
+    """Repeat a leading pure guard (`if c: return x`); the copy can never fire"""
+    for func in _functions(tree):
+        body = func.body
+        start = 1 if body and isinstance(body[0], ast.Expr) and isinstance(
+            getattr(body[0], "value", None), ast.Constant) else 0
+        if len(body) <= start:
+            continue
+        guard = body[start]
+        # Only the test is re-evaluated (the copy's body is unreachable), so it must be pure
+        if (isinstance(guard, ast.If) and not guard.orelse and len(guard.body) == 1
+                and isinstance(guard.body[0], (ast.Return, ast.Raise)) and _is_pure(guard.test)):
+            body.insert(start + 1, copy.deepcopy(guard))
+
+
+def exit_style(tree: ast.Module, rng: random.Random, fresh: _FreshNames):
+    """Switch between early-return, single-exit, ternary and temp-variable return forms"""
+    for func in _functions(tree):
+        body = func.body
+
+        # if c: return a / else: return b  ->  if c: return a; return b
+        last = body[-1] if body else None
+        if (isinstance(last, ast.If) and len(last.body) == 1 and isinstance(last.body[0], ast.Return)
+                and len(last.orelse) == 1 and isinstance(last.orelse[0], ast.Return)
+                and rng.random() < 0.5):
+            tail = last.orelse
+            last.orelse = []
+            body.extend(tail)
+
+        # if c: return a; return b  ->  if c: r = a / else: r = b; return r
+        elif (len(body) >= 2 and isinstance(body[-1], ast.Return) and body[-1].value is not None
+              and isinstance(body[-2], ast.If) and not body[-2].orelse and len(body[-2].body) == 1
+              and isinstance(body[-2].body[0], ast.Return) and body[-2].body[0].value is not None
+              and rng.random() < 0.5):
+            result = fresh()
+            guard, final = body[-2], body[-1]
+            guard.body = [ast.Assign(targets=[ast.Name(result, ast.Store())], value=guard.body[0].value)]
+            guard.orelse = [ast.Assign(targets=[ast.Name(result, ast.Store())], value=final.value)]
+            body[-1] = ast.Return(value=ast.Name(result, ast.Load()))
+
+    class Returns(ast.NodeTransformer):
+        def visit_Return(self, node):
+            # return a if c else b  ->  if c: return a / else: return b
+            if isinstance(node.value, ast.IfExp) and rng.random() < 0.7:
+                return ast.If(test=node.value.test, body=[ast.Return(node.value.body)],
+                              orelse=[ast.Return(node.value.orelse)])
+            # return expr  ->  r = expr; return r
+            if (node.value is not None and not isinstance(node.value, (ast.Name, ast.Constant))
+                    and rng.random() < 0.3):
+                result = fresh()
+                return [ast.Assign(targets=[ast.Name(result, ast.Store())], value=node.value),
+                        ast.Return(value=ast.Name(result, ast.Load()))]
+            return node
+
+    Returns().visit(tree)
+
+
+def add_docstring(tree: ast.Module, rng: random.Random, fresh: _FreshNames):
+    """Docstrings on functions that have none"""
+    for func in _functions(tree):
+        if ast.get_docstring(func) is None and rng.random() < 0.7:
+            func.body.insert(0, ast.Expr(ast.Constant(f"{func.name.replace('_', ' ').strip()}.")))
+
+
+MUTATORS: Dict[str, Callable] = {
+    "alpha_rename": alpha_rename,
+    "reorder_statements": reorder_statements,
+    "boolean_rewrites": boolean_rewrites,
+    "redundant_precheck": redundant_precheck,
+    "exit_style": exit_style,
+    "add_docstring": add_docstring,
+}
+
+
+def mutate(code: str, rng: random.Random, mutators: Optional[List[str]] = None) -> str:
+    """One variant: a random subset of mutators applied in random order"""
+    tree = ast.parse(code)
+    names = list(mutators or MUTATORS)
+    rng.shuffle(names)
+    chosen = names[:rng.randint(1, len(names))]
+
+    fresh = _FreshNames(tree, rng)
+    for name in chosen:
+        MUTATORS[name](tree, rng, fresh)
+    return ast.unparse(ast.fix_missing_locations(tree)) + "\n"
+
+
+def generate_variants(canon_code: str, count: int, seed: int = 0,
+                      mutators: Optional[List[str]] = None, max_attempts: int = 20) -> List[str]:
+    """
+    Up to `count` distinct variants of a canon (deterministic for a seed)
+
+    Gives up early when the canon's variant space is exhausted, i.e. after
+    count * max_attempts draws.
+    """
+    rng = random.Random(seed)
+    variants: List[str] = []
+    seen = {ast.unparse(ast.parse(canon_code)) + "\n"}
+
+    for _ in range(count * max_attempts):
+        if len(variants) >= count:
+            break
+        variant = mutate(canon_code, rng, mutators)
+        if variant not in seen:
+            seen.add(variant)
+            variants.append(variant)
+    return variants
+
+
+def synthetic_program(canon_codes: List[str], num_functions: int, seed: int = 0) -> str:
+    """
+    Multi-function program of `num_functions` top-level definitions
+
+    Definitions are drawn from the canons, renamed with a numeric suffix (and
+    their internal references rewritten) and individually mutated, so size
+    grows without repeating identical code.
+    """
+    rng = random.Random(seed)
+    definitions = []
+    imports = set()
+
+    for code in canon_codes:
+        tree = ast.parse(code)
+        for stmt in tree.body:
+            if isinstance(stmt, (ast.Import, ast.ImportFrom)):
+                imports.add(ast.unparse(stmt))
+            elif isinstance(stmt, (ast.FunctionDef, ast.ClassDef)):
+                definitions.append(ast.unparse(ast.Module(body=[stmt], type_ignores=[])))
+
+    if not definitions:
+        return ""
+
+    parts = sorted(imports)
+    for index in range(num_functions):
+        source = definitions[index % len(definitions)]
+        tree = ast.parse(source)
+        top = tree.body[0]
+        renamed = f"{top.name}_{index}"
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name) and node.id == top.name:
+                node.id = renamed
+        top.name = renamed
+        parts.append(mutate(ast.unparse(tree), rng).rstrip())
+
+    return "\n\n\n".join(parts) + "\n"
+
+
+def load_canons(corpus_path: str = DEFAULT_CORPUS) -> Dict[str, Dict[str, Any]]:
+    """contract_id -> {contract, canon_code} from the committed benchmark corpus"""
+    with open(corpus_path, "r") as f:
+        corpus = json.load(f)
+    return {cid: {"contract": entry["contract"], "canon_code": entry["canon_code"]}
+            for cid, entry in corpus["contracts"].items()}
+
+
+def verify_variants(variants: List[str], contract: Dict[str, Any]) -> List[str]:
+    """Variants that still pass the contract's oracle tests"""
+    sys.path.insert(0, ROOT)
+    from src.oracle_system import OracleSystem
+
+    oracle = OracleSystem()
+    return [code for code in variants if oracle.run_oracle_tests(code, contract).get("passed")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic stress corpus")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Corpus with canons per contract")
+    parser.add_argument("--variants", type=int, default=200, help="Variants per contract")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verify", action="store_true", help="Keep only oracle-passing variants")
+    parser.add_argument("--output", default=os.path.join(ROOT, "benchmarks", "stress_corpus.json"))
+    args = parser.parse_args()
+
+    stress = {"seed": args.seed, "contracts": {}}
+    for contract_id, entry in load_canons(args.corpus).items():
+        variants = generate_variants(entry["canon_code"], args.variants, args.seed)
+        if args.verify:
+            variants = verify_variants(variants, entry["contract"])
+        stress["contracts"][contract_id] = {
+            "contract": entry["contract"],
+            "canon_code": entry["canon_code"],
+            "variants": variants,
+        }
+        print(f"{contract_id:<24}{len(variants):>6} variants")
+
+    with open(args.output, "w") as f:
+        json.dump(stress, f, indent=1)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,8 @@
 #!/usr/bin/env python3
 """Check what Claude data we have for strict contracts"""
 
-import json
-import glob
 import os
+from src.result_io import load_result, result_files
 
 print("="*80)
 print("CLAUDE DATA AVAILABILITY FOR STRICT CONTRACTS")
@@ -20,7 +19,7 @@ for contract in strict_contracts:
     
     # Find all files for this contract
     pattern = f"outputs/{contract}_temp*.json"
-    files = sorted(glob.glob(pattern))
+    files = sorted(result_files(pattern))
     
     if not files:
         print(f"  ❌ No data files found")
@@ -33,8 +32,7 @@ for contract in strict_contracts:
     
     for filepath in files:
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_result(filepath)
             
             model = data.get('model', 'unknown')
             temp = data.get('temperature', 'unknown')
@@ -67,13 +65,12 @@ print("="*80)
 total_claude_files = 0
 for contract in strict_contracts:
     pattern = f"outputs/{contract}_temp*.json"
-    files = glob.glob(pattern)
+    files = result_files(pattern)
     
     claude_count = 0
     for filepath in files:
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = load_result(filepath)
             if 'claude' in data.get('model', '').lower():
                 claude_count += 1
         except:
@@ -1,19 +1,17 @@
 #!/usr/bin/env python3
 """Check the actual JSON structure of Claude experiment files"""
 
-import json
-import glob
+from src.result_io import load_result, result_files
 
 # Find Claude experiment files
-files = sorted(glob.glob('outputs/*_strict_temp*.json'))
+files = sorted(result_files('outputs/*_strict_temp*.json'))
 
 claude_files = []
 for f in files:
     try:
-        with open(f, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-            if data.get('model') == 'claude-sonnet-4-5-20250929':
-                claude_files.append(f)
+        data = load_result(f)
+        if data.get('model') == 'claude-sonnet-4-5-20250929':
+            claude_files.append(f)
     except:
         pass
 
@@ -25,8 +23,7 @@ if not claude_files:
 latest = claude_files[-1]
 print(f"Checking: {latest}\n")
 
-with open(latest, 'r', encoding='utf-8') as f:
-    data = json.load(f)
+data = load_result(latest)
 
 print("Top-level keys in experiment result:")
 for key in sorted(data.keys()):
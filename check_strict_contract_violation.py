@@ -3,17 +3,14 @@
 Check if gpt-4o and Claude outputs violate the STRICT contract.
 """
 
-import json
+from src.result_io import load_result
 
 # Load outputs
-with open('outputs/is_prime_strict_temp0.0_20260124_204015.json', 'r', encoding='utf-8') as f:
-    gpt4o_mini_data = json.load(f)
+gpt4o_mini_data = load_result('outputs/is_prime_strict_temp0.0_20260124_204015.json')
 
-with open('outputs/is_prime_strict_temp0.0_20260124_204321.json', 'r', encoding='utf-8') as f:
-    gpt4o_data = json.load(f)
+gpt4o_data = load_result('outputs/is_prime_strict_temp0.0_20260124_204321.json')
 
-with open('outputs/is_prime_strict_temp0.3_20260124_204350.json', 'r', encoding='utf-8') as f:
-    claude_data = json.load(f)
+claude_data = load_result('outputs/is_prime_strict_temp0.3_20260124_204350.json')
 
 contract = gpt4o_mini_data['contract']
 
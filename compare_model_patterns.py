@@ -4,7 +4,8 @@ Compare actual code patterns generated by each model vs canon.
 """
 
 import json
-import glob
+
+from src.results_catalog import open_catalog
 
 def main():
     print("="*80)
@@ -20,7 +21,8 @@ def main():
     print(canon_code)
     
     # Get latest experiments
-    files = sorted(glob.glob('outputs/is_prime_strict_temp*.json'))[-15:]
+    catalog = open_catalog()
+    experiments = catalog.query(contract_id='is_prime_strict', limit=15)
     
     by_model = {
         'gpt-4o-mini': [],
@@ -28,14 +30,11 @@ def main():
         'claude-sonnet-4-5-20250929': []
     }
     
-    for filepath in files:
+    for experiment in experiments:
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            model = data.get('model', 'unknown')
+            model = experiment['model']
             if model in by_model:
-                llm_outputs = data.get('llm_outputs', [])
+                llm_outputs = catalog.load_fields(experiment, 'llm_outputs').get('llm_outputs', [])
                 if llm_outputs:
                     by_model[model].append(llm_outputs[0])  # First output
         except:
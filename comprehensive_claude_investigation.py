@@ -4,23 +4,21 @@ Comprehensive investigation of Claude transformation failures.
 Analyzes all 15 Claude experiments to understand why transformations fail.
 """
 
-import json
-import glob
 from collections import defaultdict
+from src.result_io import load_result, result_files
 
 def analyze_claude_experiments():
     """Analyze all Claude experiment files"""
     
     # Find all Claude experiment files
-    files = sorted(glob.glob('outputs/*_strict_temp*.json'))
+    files = sorted(result_files('outputs/*_strict_temp*.json'))
     
     claude_files = []
     for f in files:
         try:
-            with open(f, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                if data.get('model') == 'claude-sonnet-4-5-20250929':
-                    claude_files.append(f)
+            data = load_result(f)
+            if data.get('model') == 'claude-sonnet-4-5-20250929':
+                claude_files.append(f)
         except:
             pass
     
@@ -40,8 +38,7 @@ def analyze_claude_experiments():
     
     # Analyze each experiment
     for idx, filepath in enumerate(claude_files, 1):
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_result(filepath)
         
         contract_id = data.get('contract_id')
         temp = data.get('temperature')
@@ -137,24 +134,23 @@ def compare_claude_vs_openai_code():
     print("=" * 80)
     
     # Get one example from each model for is_prime_strict
-    files = glob.glob('outputs/is_prime_strict_temp1.0_*.json')
+    files = result_files('outputs/is_prime_strict_temp1.0_*.json')
     
     claude_example = None
     openai_example = None
     
     for f in files:
         try:
-            with open(f, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                model = data.get('model')
-                
-                if model == 'claude-sonnet-4-5-20250929' and not claude_example:
-                    claude_example = data
-                elif model in ['gpt-4o-mini', 'gpt-4o'] and not openai_example:
-                    openai_example = data
-                
-                if claude_example and openai_example:
-                    break
+            data = load_result(f)
+            model = data.get('model')
+            
+            if model == 'claude-sonnet-4-5-20250929' and not claude_example:
+                claude_example = data
+            elif model in ['gpt-4o-mini', 'gpt-4o'] and not openai_example:
+                openai_example = data
+            
+            if claude_example and openai_example:
+                break
         except:
             pass
     
@@ -224,10 +220,9 @@ def analyze_transformation_pipeline():
     print("=" * 80)
     
     # Get a Claude experiment with detailed transformation data
-    claude_file = sorted(glob.glob('outputs/*_strict_temp*.json'))[-1]
+    claude_file = sorted(result_files('outputs/*_strict_temp*.json'))[-1]
     
-    with open(claude_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_result(claude_file)
     
     if data.get('model') != 'claude-sonnet-4-5-20250929':
         print("Latest file is not Claude, skipping detailed analysis")
@@ -4,20 +4,18 @@ Deep dive into why Claude transformations fail.
 Focus on the actual transformation mechanics.
 """
 
-import json
-import glob
 import ast
+from src.result_io import load_result, result_files
 
 def get_claude_example():
     """Get a Claude experiment for detailed analysis"""
-    files = glob.glob('outputs/*_strict_temp*.json')
+    files = result_files('outputs/*_strict_temp*.json')
     
     for f in files:
         try:
-            with open(f, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                if data.get('model') == 'claude-sonnet-4-5-20250929':
-                    return f, data
+            data = load_result(f)
+            if data.get('model') == 'claude-sonnet-4-5-20250929':
+                return f, data
         except:
             pass
     return None, None
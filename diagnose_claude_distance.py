@@ -3,9 +3,8 @@
 Diagnose why Claude transformations all result in exactly 0.2083 distance.
 """
 
-import json
-import glob
 from src.foundational_properties import FoundationalProperties
+from src.result_io import load_result, result_files
 
 def main():
     print("="*80)
@@ -13,16 +12,15 @@ def main():
     print("="*80)
     
     # Get a Claude experiment
-    files = sorted(glob.glob('outputs/is_prime_strict_temp*.json'))
+    files = sorted(result_files('outputs/is_prime_strict_temp*.json'))
     
     claude_file = None
     for f in files:
         try:
-            with open(f, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                if data.get('model') == 'claude-sonnet-4-5-20250929':
-                    claude_file = f
-                    break
+            data = load_result(f)
+            if data.get('model') == 'claude-sonnet-4-5-20250929':
+                claude_file = f
+                break
         except:
             pass
     
@@ -32,8 +30,7 @@ def main():
     
     print(f"\nAnalyzing: {claude_file}")
     
-    with open(claude_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_result(claude_file)
     
     canon_data = data.get('canon_data', {})
     canon_code = canon_data.get('code', '')
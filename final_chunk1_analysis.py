@@ -4,7 +4,7 @@ Final analysis of Chunk 1 results with correct canon.
 """
 
 import json
-import glob
+from src.result_io import load_result, result_files
 
 def main():
     # Load canon
@@ -21,7 +21,7 @@ def main():
     print(canon_code)
     
     # Get latest experiment files
-    files = sorted(glob.glob('outputs/is_prime_strict_temp*.json'))[-15:]
+    files = sorted(result_files('outputs/is_prime_strict_temp*.json'))[-15:]
     
     results_by_model = {
         'gpt-4o-mini': {'outputs': [], 'matches': 0, 'total': 0},
@@ -30,8 +30,7 @@ def main():
     }
     
     for filepath in files:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_result(filepath)
         
         model = data.get('model', 'unknown')
         if model in results_by_model:
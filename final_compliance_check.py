@@ -3,10 +3,9 @@
 Final compliance check: Does adding optimizations violate the contract?
 """
 
-import json
+from src.result_io import load_result
 
-with open('outputs/is_prime_strict_temp0.3_20260124_204350.json', 'r', encoding='utf-8') as f:
-    claude_data = json.load(f)
+claude_data = load_result('outputs/is_prime_strict_temp0.3_20260124_204350.json')
 
 claude_code = claude_data['raw_outputs'][0]
 
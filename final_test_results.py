@@ -1,21 +1,19 @@
 #!/usr/bin/env python3
 """Analyze final test results for all 3 models"""
 
-import json
-import glob
+from src.result_io import load_result, result_files
 
 print("="*80)
 print("FINAL TEST RESULTS: is_prime_strict (3 runs each)")
 print("="*80)
 
 # Get latest results for each model
-files = sorted(glob.glob('outputs/is_prime_strict_temp0.0_*.json'))[-2:]
+files = sorted(result_files('outputs/is_prime_strict_temp0.0_*.json'))[-2:]
 
 results_summary = []
 
 for filepath in files:
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_result(filepath)
     
     model = data['model']
     
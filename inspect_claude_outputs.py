@@ -1,14 +1,14 @@
 #!/usr/bin/env python3
 """Inspect actual Claude outputs to understand what patterns they generate"""
 
-import json
-import glob
+from src.results_catalog import open_catalog
 
 print("="*80)
 print("CLAUDE OUTPUT INSPECTION")
 print("="*80)
 
 contracts = ['binary_search_strict', 'lru_cache_strict']
+catalog = open_catalog()
 
 for contract in contracts:
     print(f"\n{'='*80}")
@@ -16,26 +16,13 @@ for contract in contracts:
     print(f"{'='*80}")
     
     # Get temp 0.0 file (most deterministic)
-    pattern = f"outputs/{contract}_temp0.0_*.json"
-    files = glob.glob(pattern)
+    claude_runs = catalog.query(contract_id=contract, temperature=0.0, model_like='%claude%')
     
-    claude_file = None
-    for filepath in files:
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            if 'claude' in data.get('model', '').lower():
-                claude_file = filepath
-                break
-        except:
-            pass
-    
-    if not claude_file:
+    if not claude_runs:
         print("  ❌ No Claude temp 0.0 data found")
         continue
     
-    with open(claude_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = catalog.load_fields(claude_runs[0], 'raw_outputs', 'canon')
     
     raw_outputs = data.get('raw_outputs', [])
     canon_code = data.get('canon', {}).get('canonical_code', '')
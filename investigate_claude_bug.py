@@ -1,11 +1,10 @@
 #!/usr/bin/env python3
 """Investigate why Claude experiments show R_anchor_post = 0.0"""
 
-import json
-import glob
+from src.result_io import load_result, result_files
 
 # Find latest Claude experiment files
-files = sorted(glob.glob('outputs/*_strict_temp*.json'))
+files = sorted(result_files('outputs/*_strict_temp*.json'))
 
 # Check which files are Claude experiments
 print("Checking experiment files for Claude model...\n")
@@ -13,10 +12,9 @@ print("Checking experiment files for Claude model...\n")
 claude_files = []
 for f in files:
     try:
-        with open(f, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-            if data.get('model') == 'claude-sonnet-4-5-20250929':
-                claude_files.append(f)
+        data = load_result(f)
+        if data.get('model') == 'claude-sonnet-4-5-20250929':
+            claude_files.append(f)
     except:
         pass
 
@@ -30,8 +28,7 @@ if not claude_files:
 latest = claude_files[-1]
 print(f"Analyzing: {latest}\n")
 
-with open(latest, 'r', encoding='utf-8') as f:
-    data = json.load(f)
+data = load_result(latest)
 
 print("=" * 80)
 print("EXPERIMENT INFO")
@@ -4,26 +4,26 @@ Deep investigation into why gpt-4o and Claude transformations are failing
 even after removing Rule 15.5.
 """
 
-import json
-import glob
 import os
 
+from src.results_catalog import open_catalog
+
 def analyze_latest_experiments():
     print("="*80)
     print("INVESTIGATING TRANSFORMATION FAILURES")
     print("="*80)
     
     # Get latest is_prime_strict experiments
-    files = sorted(glob.glob('outputs/is_prime_strict_temp*.json'))
+    catalog = open_catalog()
+    
+    # Analyze last 15 files (5 per model)
+    latest = catalog.query(contract_id='is_prime_strict', limit=15)
     
-    if not files:
+    if not latest:
         print("No experiment files found!")
         return
     
-    # Analyze last 15 files (5 per model)
-    latest_files = files[-15:]
-    
-    print(f"\nAnalyzing {len(latest_files)} latest experiment files...")
+    print(f"\nAnalyzing {len(latest)} latest experiment files...")
     
     by_model = {
         'gpt-4o-mini': [],
@@ -31,19 +31,17 @@ def analyze_latest_experiments():
         'claude-sonnet-4-5-20250929': []
     }
     
-    for filepath in latest_files:
+    for experiment in latest:
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            model = data.get('model', 'unknown')
+            model = experiment['model']
             if model in by_model:
                 by_model[model].append({
-                    'file': os.path.basename(filepath),
-                    'data': data
+                    'file': os.path.basename(experiment['path']),
+                    'data': catalog.load_fields(experiment, 'canon_created', 'canon_data',
+                                                'transformation_results')
                 })
         except Exception as e:
-            print(f"Error reading {filepath}: {e}")
+            print(f"Error reading {experiment['path']}: {e}")
     
     print("\n" + "="*80)
     print("ANALYSIS BY MODEL")
@@ -8,7 +8,10 @@ import argparse
 import sys
 import os
 from src.comprehensive_experiment import ComprehensiveExperiment
-from src.config import OUTPUTS_DIR
+from src.adaptive_sampling import AdaptiveSamplingConfig
+from src.job_queue import JobQueue, QUEUE_FILENAME
+from src.worker import enqueue_experiment
+from src.config import OUTPUTS_DIR, ADAPTIVE_MIN_RUNS, ADAPTIVE_CI_WIDTH, ADAPTIVE_CONFIDENCE, RESULTS_GZIP
 
 
 def main():
@@ -32,6 +35,16 @@ Examples:
   
   # Run multiple contracts
   python main.py --contract fibonacci_basic fibonacci_recursive --runs 10
+  
+  # Adaptive sampling: at most 20 runs, stop once R_raw/R_anchor_post CIs are tight
+  python main.py --contract fibonacci_basic --runs 20 --adaptive --ci-width 0.3
+  
+  # Resume an interrupted run from its journal (only missing work is redone)
+  python main.py --contract fibonacci_basic --runs 20 --resume
+  
+  # Worker mode: enqueue a sweep, then start workers (any number, any machine)
+  python main.py --contract fibonacci_basic --sweep --runs 20 --enqueue
+  python -m src.worker
         """
     )
     
@@ -46,7 +59,59 @@ Examples:
         "--runs",
         type=int,
         default=5,
-        help="Number of LLM runs per experiment (default: 5)"
+        help="Number of LLM runs per experiment (default: 5; the maximum budget with --adaptive)"
+    )
+    
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Stop sampling once the R_raw and R_anchor_post confidence intervals are narrow enough"
+    )
+    
+    parser.add_argument(
+        "--min-runs",
+        type=int,
+        default=ADAPTIVE_MIN_RUNS,
+        help=f"Runs before the adaptive stopping rule is first checked (default: {ADAPTIVE_MIN_RUNS})"
+    )
+    
+    parser.add_argument(
+        "--ci-width",
+        type=float,
+        default=ADAPTIVE_CI_WIDTH,
+        help=f"Target Wilson CI width for adaptive sampling (default: {ADAPTIVE_CI_WIDTH})"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume from the run journal in <output-dir>/journals, redoing only missing work"
+    )
+    
+    parser.add_argument(
+        "--gzip-results",
+        action="store_true",
+        default=RESULTS_GZIP,
+        help="Write result files as <experiment_id>.json.gz (default: SKYT_RESULTS_GZIP)"
+    )
+    
+    parser.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="Enqueue the experiments as jobs for `python -m src.worker` instead of running them"
+    )
+    
+    parser.add_argument(
+        "--queue",
+        default=None,
+        help="Job queue database for --enqueue (default: <output-dir>/job_queue.sqlite)"
+    )
+    
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=ADAPTIVE_CONFIDENCE,
+        help=f"Confidence level of the adaptive stopping intervals (default: {ADAPTIVE_CONFIDENCE})"
     )
     
     parser.add_argument(
@@ -108,8 +173,30 @@ Examples:
         print(f"❌ Error: Contract templates file not found: {args.templates}")
         sys.exit(1)
     
+    adaptive = None
+    if args.adaptive:
+        try:
+            adaptive = AdaptiveSamplingConfig(min_runs=args.min_runs, target_ci_width=args.ci_width,
+                                              confidence=args.confidence)
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+    
+    if args.enqueue:
+        if adaptive:
+            print("❌ Error: --adaptive is not supported with --enqueue")
+            sys.exit(1)
+        queue = JobQueue(args.queue or os.path.join(args.output_dir, QUEUE_FILENAME))
+        temperatures = args.temperatures if args.sweep else [args.temperature]
+        added = sum(enqueue_experiment(queue, args.templates, contract_id, args.model, temperature,
+                                       args.runs, args.output_dir)
+                    for contract_id in args.contract for temperature in temperatures)
+        print(f"📥 Enqueued {added} job(s) in {queue.db_path}")
+        print(f"👷 Start workers with: python -m src.worker --queue {queue.db_path}")
+        return
+    
     # Initialize experiment system
-    experiment = ComprehensiveExperiment(args.output_dir, model=args.model)
+    experiment = ComprehensiveExperiment(args.output_dir, model=args.model, compress_results=args.gzip_results)
     
     # Enable debug mode for transformation pipeline
     debug_mode = True  
@@ -128,7 +215,9 @@ Examples:
                     args.templates, 
                     contract_id, 
                     args.temperatures,
-                    args.runs
+                    args.runs,
+                    adaptive=adaptive,
+                    resume=args.resume
                 )
                 
                 if "error" in result:
@@ -156,7 +245,9 @@ Examples:
                     args.templates,
                     contract_id,
                     args.runs,
-                    args.temperature
+                    args.temperature,
+                    adaptive=adaptive,
+                    resume=args.resume
                 )
                 
                 if "error" in result:
@@ -4,8 +4,7 @@ Re-analyze Chunk 1 with CORRECT success criteria:
 Success = Oracle Pass AND Contract Compliance (NOT canon matching)
 """
 
-import json
-import glob
+from src.result_io import load_result, result_files
 
 def check_contract_compliance_simple(code, contract):
     """Simple contract compliance check"""
@@ -37,7 +36,7 @@ def main():
     print("\n✅ Success = Oracle Pass AND Contract Compliance")
     print("❌ Canon matching is NOT required")
     
-    files = sorted(glob.glob('outputs/is_prime_strict_temp*.json'))[-15:]
+    files = sorted(result_files('outputs/is_prime_strict_temp*.json'))[-15:]
     
     results_by_model = {
         'gpt-4o-mini': {'total': 0, 'oracle_pass': 0, 'contract_compliant': 0, 'both': 0},
@@ -46,8 +45,7 @@ def main():
     }
     
     for filepath in files:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_result(filepath)
         
         model = data.get('model', 'unknown')
         if model not in results_by_model:
@@ -12,10 +12,11 @@ Options:
 
 import sys
 import os
-import csv
 import argparse
 from pathlib import Path
 
+from src.metrics_sink import MetricsSink
+
 # Paper-reported configurations
 PAPER_TASKS = ["binary_search", "balanced_brackets", "slugify"]
 ALL_TASKS = [
@@ -43,10 +44,9 @@ def verify_existing_results():
         print(f"❌ Missing: {csv_path}")
         return False
     
-    # Read CSV
-    with open(csv_path, 'r') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    # Load only the columns being verified
+    rows = MetricsSink(str(csv_path.parent)).load_rows(
+        ["contract_id", "model", "decoding_temperature", "R_raw", "R_anchor_pre", "R_anchor_post", "Delta_rescue"])
     
     print(f"\n✓ Found {len(rows)} experiment configurations")
     
@@ -4,30 +4,13 @@ Full Statistical Analysis for SKYT Experiment
 Implements Prof. Nasser's recommendations
 """
 
-import pandas as pd
-import numpy as np
-import sys
-sys.path.insert(0, 'src')
-from enhanced_stats import (
-    compare_repeatability_rigorous,
-    format_rigorous_report,
-    wilson_confidence_interval,
-    bootstrap_confidence_interval,
-    fishers_exact_test,
-    effect_size_proportions,
-    holm_bonferroni_correction
-)
-
-# Load data
-df = pd.read_csv('outputs/metrics_summary.csv')
-
-# Filter to valid 8 contracts
+from src.analysis_engine import AnalysisEngine
+
+# Valid 8 contracts, duplicates removed (keep last)
 valid_contracts = ['balanced_brackets', 'binary_search', 'fibonacci_basic', 
                    'fibonacci_recursive', 'gcd', 'lru_cache', 'merge_sort', 'slugify']
-df = df[df['contract_id'].isin(valid_contracts)]
-
-# Remove duplicates (keep last)
-df = df.drop_duplicates(subset=['contract_id', 'model', 'decoding_temperature'], keep='last')
+engine = AnalysisEngine(contracts=valid_contracts, latest_only=True)
+df = engine.frame
 
 print('='*80)
 print('SKYT FULL STATISTICAL ANALYSIS - MSR 2026 Camera-Ready')
@@ -45,22 +28,18 @@ print('\n' + '='*80)
 print('SECTION 1: OVERALL METRICS')
 print('='*80)
 
+overall = engine.overall()
 for metric in ['R_raw', 'R_behavioral', 'R_structural', 'Delta_rescue']:
-    values = df[metric].dropna()
-    mean = values.mean()
-    std = values.std()
-    ci_low, ci_high = bootstrap_confidence_interval(values.tolist(), np.mean, 0.95, 10000)
+    row = overall.loc[metric]
     print(f'\n{metric}:')
-    print(f'  Mean: {mean:.3f} [{ci_low:.3f}, {ci_high:.3f}] (95% CI)')
-    print(f'  Std:  {std:.3f}')
-    print(f'  Range: [{values.min():.3f}, {values.max():.3f}]')
+    print(f'  Mean: {row["mean"]:.3f} [{row.ci_low:.3f}, {row.ci_high:.3f}] (95% CI)')
+    print(f'  Std:  {row["std"]:.3f}')
+    print(f'  Range: [{row["min"]:.3f}, {row["max"]:.3f}]')
 
 # Overall improvement
-improvement = df['R_structural'] - df['R_raw']
-imp_mean = improvement.mean()
-imp_ci = bootstrap_confidence_interval(improvement.tolist(), np.mean, 0.95, 10000)
+imp = overall.loc['improvement']
 print(f'\nOverall Improvement (R_structural - R_raw):')
-print(f'  Mean: {imp_mean:.3f} [{imp_ci[0]:.3f}, {imp_ci[1]:.3f}] (95% CI)')
+print(f'  Mean: {imp["mean"]:.3f} [{imp.ci_low:.3f}, {imp.ci_high:.3f}] (95% CI)')
 
 # ============================================================================
 # SECTION 2: MODEL COMPARISON
@@ -69,26 +48,12 @@ print('\n' + '='*80)
 print('SECTION 2: MODEL COMPARISON')
 print('='*80)
 
-model_stats = []
-for model in df['model'].unique():
-    model_df = df[df['model'] == model]
-    r_raw = model_df['R_raw'].mean()
-    r_struct = model_df['R_structural'].mean()
-    r_raw_ci = bootstrap_confidence_interval(model_df['R_raw'].tolist(), np.mean, 0.95, 5000)
-    r_struct_ci = bootstrap_confidence_interval(model_df['R_structural'].tolist(), np.mean, 0.95, 5000)
-    
+for model, row in engine.improvement('model', with_ci=True, sort=False).iterrows():
     print(f'\n{model}:')
-    print(f'  N experiments: {len(model_df)}')
-    print(f'  R_raw:        {r_raw:.3f} [{r_raw_ci[0]:.3f}, {r_raw_ci[1]:.3f}]')
-    print(f'  R_structural: {r_struct:.3f} [{r_struct_ci[0]:.3f}, {r_struct_ci[1]:.3f}]')
-    print(f'  Improvement:  {r_struct - r_raw:.3f} ({100*(r_struct - r_raw)/r_raw:.1f}%)')
-    
-    model_stats.append({
-        'model': model,
-        'r_raw': r_raw,
-        'r_structural': r_struct,
-        'improvement': r_struct - r_raw
-    })
+    print(f'  N experiments: {int(row.n)}')
+    print(f'  R_raw:        {row.R_raw:.3f} [{row.R_raw_ci_low:.3f}, {row.R_raw_ci_high:.3f}]')
+    print(f'  R_structural: {row.R_structural:.3f} [{row.R_structural_ci_low:.3f}, {row.R_structural_ci_high:.3f}]')
+    print(f'  Improvement:  {row.delta:.3f} ({row.delta_pct:.1f}%)')
 
 # ============================================================================
 # SECTION 3: CONTRACT COMPARISON
@@ -97,22 +62,10 @@ print('\n' + '='*80)
 print('SECTION 3: CONTRACT COMPARISON')
 print('='*80)
 
-contract_stats = []
-for contract in sorted(df['contract_id'].unique()):
-    contract_df = df[df['contract_id'] == contract]
-    r_raw = contract_df['R_raw'].mean()
-    r_struct = contract_df['R_structural'].mean()
-    
+for contract, row in engine.improvement('contract').iterrows():
     print(f'\n{contract}:')
-    print(f'  R_raw: {r_raw:.3f} → R_structural: {r_struct:.3f}')
-    print(f'  Improvement: {r_struct - r_raw:.3f} ({100*(r_struct - r_raw)/max(r_raw, 0.001):.1f}%)')
-    
-    contract_stats.append({
-        'contract': contract,
-        'r_raw': r_raw,
-        'r_structural': r_struct,
-        'improvement': r_struct - r_raw
-    })
+    print(f'  R_raw: {row.R_raw:.3f} → R_structural: {row.R_structural:.3f}')
+    print(f'  Improvement: {row.delta:.3f} ({100*row.delta/max(row.R_raw, 0.001):.1f}%)')
 
 # ============================================================================
 # SECTION 4: TEMPERATURE EFFECT
@@ -123,12 +76,10 @@ print('='*80)
 
 print('\nTemp    R_raw   R_struct  Improvement')
 print('-' * 45)
-for temp in sorted(df['decoding_temperature'].unique()):
-    temp_df = df[df['decoding_temperature'] == temp]
-    r_raw = temp_df['R_raw'].mean()
-    r_struct = temp_df['R_structural'].mean()
-    imp = r_struct - r_raw
-    print(f'{temp:.1f}     {r_raw:.3f}    {r_struct:.3f}     {imp:+.3f} ({100*imp/max(r_raw,0.001):+.1f}%)')
+temperatures = engine.improvement('temperature')
+for temp, row in temperatures.iterrows():
+    imp = row.delta
+    print(f'{temp:.1f}     {row.R_raw:.3f}    {row.R_structural:.3f}     {imp:+.3f} ({100*imp/max(row.R_raw,0.001):+.1f}%)')
 
 # ============================================================================
 # SECTION 5: STATISTICAL TESTS (Prof. Nasser's Methods)
@@ -141,39 +92,19 @@ print('='*80)
 print('\nFisher\'s Exact Tests (per contract):')
 print('-' * 70)
 
-p_values = []
-results = []
-for contract in sorted(df['contract_id'].unique()):
-    contract_df = df[df['contract_id'] == contract]
-    # Aggregate across all temps/models for this contract
-    n_runs = 20 * len(contract_df)  # 20 runs per config
-    raw_successes = int(round(contract_df['R_raw'].mean() * n_runs))
-    struct_successes = int(round(contract_df['R_structural'].mean() * n_runs))
-    
-    fisher = fishers_exact_test(raw_successes, n_runs, struct_successes, n_runs)
-    effect = effect_size_proportions(raw_successes, n_runs, struct_successes, n_runs)
-    
-    sig = '*' if fisher['p_value'] < 0.05 else ''
-    print(f'{contract:25} p={fisher["p_value"]:.4f}{sig:2} OR={fisher["odds_ratio"]:.2f}  h={effect["cohens_h"]:.3f} ({effect["effect_size_interpretation"]})')
-    
-    p_values.append(fisher['p_value'])
-    results.append({
-        'contract': contract,
-        'p_value': fisher['p_value'],
-        'odds_ratio': fisher['odds_ratio'],
-        'cohens_h': effect['cohens_h'],
-        'interpretation': effect['effect_size_interpretation']
-    })
+significance = engine.significance()
+for contract, row in significance.iterrows():
+    sig = '*' if row.p_value < 0.05 else ''
+    print(f'{contract:25} p={row.p_value:.4f}{sig:2} OR={row.odds_ratio:.2f}  h={row.cohens_h:.3f} ({row.effect_size})')
 
 # Holm-Bonferroni correction
 print('\n' + '-' * 70)
-correction = holm_bonferroni_correction(p_values, alpha=0.05)
+n_rejected = int(significance['significant'].sum())
 print(f'Holm-Bonferroni Correction (α=0.05):')
-print(f'  Total tests: {correction["n_tests"]}')
-print(f'  Significant after correction: {correction["n_rejected"]}')
-if correction['n_rejected'] > 0:
-    sig_contracts = [sorted(df['contract_id'].unique())[i] for i in correction['rejected_indices']]
-    print(f'  Significant contracts: {", ".join(sig_contracts)}')
+print(f'  Total tests: {len(significance)}')
+print(f'  Significant after correction: {n_rejected}')
+if n_rejected > 0:
+    print(f'  Significant contracts: {", ".join(significance.index[significance["significant"]])}')
 
 # ============================================================================
 # SECTION 6: SUMMARY FOR PAPER
@@ -182,8 +113,8 @@ print('\n' + '='*80)
 print('SECTION 6: SUMMARY FOR CAMERA-READY PAPER')
 print('='*80)
 
-overall_r_raw = df['R_raw'].mean()
-overall_r_struct = df['R_structural'].mean()
+overall_r_raw = overall.loc['R_raw', 'mean']
+overall_r_struct = overall.loc['R_structural', 'mean']
 overall_imp = overall_r_struct - overall_r_raw
 
 print(f'''
@@ -191,7 +122,7 @@ KEY FINDINGS:
 
 1. BASELINE REPEATABILITY
    - Raw repeatability (R_raw): {overall_r_raw:.1%} mean across all configs
-   - Temperature effect: {df[df['decoding_temperature']==0.0]['R_raw'].mean():.1%} at T=0.0 → {df[df['decoding_temperature']==1.0]['R_raw'].mean():.1%} at T=1.0
+   - Temperature effect: {temperatures.loc[0.0, 'R_raw']:.1%} at T=0.0 → {temperatures.loc[1.0, 'R_raw']:.1%} at T=1.0
 
 2. SKYT IMPROVEMENT
    - Structural repeatability (R_structural): {overall_r_struct:.1%} mean
@@ -199,12 +130,12 @@ KEY FINDINGS:
    - Relative improvement: {100*overall_imp/overall_r_raw:.1f}%
 
 3. STATISTICAL SIGNIFICANCE
-   - {correction['n_rejected']}/{correction['n_tests']} contracts show significant improvement (Holm-Bonferroni, α=0.05)
+   - {n_rejected}/{len(significance)} contracts show significant improvement (Holm-Bonferroni, α=0.05)
    
 4. EFFECT SIZES
-   - Contracts with large effect (Cohen's h ≥ 0.8): {sum(1 for r in results if r['cohens_h'] >= 0.8)}
-   - Contracts with medium effect (0.5 ≤ h < 0.8): {sum(1 for r in results if 0.5 <= r['cohens_h'] < 0.8)}
-   - Contracts with small effect (0.2 ≤ h < 0.5): {sum(1 for r in results if 0.2 <= r['cohens_h'] < 0.5)}
+   - Contracts with large effect (Cohen's h ≥ 0.8): {int((significance['cohens_h'] >= 0.8).sum())}
+   - Contracts with medium effect (0.5 ≤ h < 0.8): {int(significance['cohens_h'].between(0.5, 0.8, inclusive='left').sum())}
+   - Contracts with small effect (0.2 ≤ h < 0.5): {int(significance['cohens_h'].between(0.2, 0.5, inclusive='left').sum())}
 
 5. MODEL COMPARISON
    - All 3 models show similar baseline and improvement patterns
@@ -219,6 +150,8 @@ print('='*80)
 print('ANALYSIS COMPLETE')
 print('='*80)
 
+engine.save_cache()
+
 # Save summary to file
 summary_file = 'outputs/statistical_analysis_summary.txt'
 print(f'\nSaving summary to {summary_file}...')
@@ -24,7 +24,8 @@ import traceback
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from src.llm_client import LLMClient
+from src.http_pool import get_client_pool
+from src.tracing import configure_tracing, traced
 from src.contract import Contract
 from src.oracle_system import OracleSystem
 from src.canon_system import CanonSystem
@@ -79,6 +80,13 @@ class ExperimentRunner:
         self.checkpoint_file = self.output_dir / "checkpoint.json"
         self.checkpoint_interval = 100
         
+        # Shared components: one keep-alive connection pool per provider/model,
+        # one oracle/canon/transformer for every generation
+        self.client_pool = get_client_pool()
+        self.oracle = OracleSystem()
+        self.canon_system = CanonSystem()
+        self.transformer = CodeTransformer(self.canon_system)
+        
         self.logger.info(f"Initialized {phase} experiment")
         self.logger.info(f"Total calls: {self.total_calls}")
         self.logger.info(f"Models: {', '.join(self.models)}")
@@ -148,6 +156,9 @@ class ExperimentRunner:
         with open(self.checkpoint_file, 'w') as f:
             json.dump(checkpoint, f, indent=2)
     
+    @traced("experiment.generation", lambda a: {"contract_id": a["contract_id"], "model": a["model"],
+                                                "temperature": a["temperature"],
+                                                "run": a["run_number"]})
     def run_single_generation(
         self,
         contract_id: str,
@@ -163,11 +174,11 @@ class ExperimentRunner:
             # Load contract
             contract = Contract.from_template(contract_id)
             
-            # Initialize components
-            llm_client = LLMClient(model=model)
-            oracle = OracleSystem()
-            canon_system = CanonSystem()
-            transformer = CodeTransformer()
+            # Shared components (LLM client is pooled per model)
+            llm_client = self.client_pool.llm_client(model)
+            oracle = self.oracle
+            canon_system = self.canon_system
+            transformer = self.transformer
             
             # Generate code
             self.logger.info(f"Generating: {config_id}")
@@ -237,6 +248,7 @@ class ExperimentRunner:
             # Stop on error (Option C)
             raise RuntimeError(f"Experiment halted on error: {config_id}") from e
     
+    @traced("experiment.contract", lambda a: {"contract_id": a["contract_id"]})
     def run_contract(self, contract_id: str) -> List[Dict[str, Any]]:
         """Run all configurations for a single contract"""
         results = []
@@ -263,6 +275,7 @@ class ExperimentRunner:
         
         return results
     
+    @traced("experiment.metrics")
     def calculate_metrics(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calculate metrics for all results"""
         self.logger.info("Calculating metrics...")
@@ -351,6 +364,7 @@ class ExperimentRunner:
         with open(aggregate_file, 'w') as f:
             json.dump(metrics["aggregate"], f, indent=2)
     
+    @traced("experiment.statistics")
     def run_statistical_analysis(self, results: List[Dict[str, Any]]):
         """Run comprehensive statistical analysis"""
         self.logger.info("Running statistical analysis...")
@@ -417,13 +431,16 @@ class ExperimentRunner:
             self.logger.info(f"Failed calls: {self.failed_calls}")
             self.logger.info(f"Elapsed time: {elapsed_time/3600:.2f} hours")
             self.logger.info(f"Results saved to: {self.output_dir}")
+            for pool_key, pool_stats in self.client_pool.stats().items():
+                self.logger.info(f"HTTP pool {pool_key}: {pool_stats}")
             
             return {
                 "success": True,
                 "total_calls": self.completed_calls,
                 "failed_calls": self.failed_calls,
                 "elapsed_time": elapsed_time,
-                "metrics": metrics
+                "metrics": metrics,
+                "http_pools": self.client_pool.stats()
             }
             
         except Exception as e:
@@ -459,6 +476,12 @@ def main():
         default=None,
         help="Output directory (default: outputs/full_experiment_YYYY-MM-DD)"
     )
+    parser.add_argument(
+        "--trace",
+        choices=["jsonl", "chrome"],
+        default=None,
+        help="Record stage spans to <output-dir>/trace.jsonl or trace.json (Chrome trace)"
+    )
     
     args = parser.parse_args()
     
@@ -471,6 +494,10 @@ def main():
     
     output_dir.mkdir(parents=True, exist_ok=True)
     
+    if args.trace:
+        trace_name = "trace.jsonl" if args.trace == "jsonl" else "trace.json"
+        configure_tracing(str(output_dir / trace_name), args.trace)
+    
     # Run experiment
     runner = ExperimentRunner(str(output_dir), phase=args.phase)
     result = runner.run()
@@ -4,6 +4,13 @@ Phase 2 Full Experiment Runner
 12 contracts × 3 models × 5 temps × 20 runs = 3,600 generations
 Estimated time: 7-9 hours
 Estimated cost: ~$16
+
+Pass --adaptive to stop each configuration early once its R_raw and
+R_anchor_post confidence intervals are tight (RUNS_PER_CONFIG is then the
+maximum budget), and --resume to continue an interrupted sweep from the run
+journals (finished configurations are skipped, partial ones completed).
+Pass --enqueue to put every configuration on the job queue instead, then run
+`python -m src.worker` in as many processes (or machines) as wanted.
 """
 
 import subprocess
@@ -36,6 +43,9 @@ MODELS = [
 
 TEMPERATURES = [0.0, 0.3, 0.5, 0.7, 1.0]
 RUNS_PER_CONFIG = 20
+ADAPTIVE_SAMPLING = "--adaptive" in sys.argv[1:]
+RESUME = "--resume" in sys.argv[1:]
+ENQUEUE = "--enqueue" in sys.argv[1:]
 
 def run_experiment(contract, model, temperature, runs):
     """Run single experiment configuration"""
@@ -46,6 +56,12 @@ def run_experiment(contract, model, temperature, runs):
         "--temperature", str(temperature),
         "--model", model
     ]
+    if ADAPTIVE_SAMPLING:
+        cmd.append("--adaptive")
+    if RESUME:
+        cmd.append("--resume")
+    if ENQUEUE:
+        cmd.append("--enqueue")
     
     try:
         result = subprocess.run(
@@ -82,7 +98,7 @@ def main():
     print(f"Contracts: {len(CONTRACTS)}")
     print(f"Models: {len(MODELS)}")
     print(f"Temperatures: {len(TEMPERATURES)}")
-    print(f"Runs per config: {RUNS_PER_CONFIG}")
+    print(f"Runs per config: {RUNS_PER_CONFIG}" + (" (max, adaptive sampling)" if ADAPTIVE_SAMPLING else ""))
     print(f"Total generations: {len(CONTRACTS) * len(MODELS) * len(TEMPERATURES) * RUNS_PER_CONFIG}")
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 80)
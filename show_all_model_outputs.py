@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import json
+from src.result_io import load_result
 
 # Load canon
 with open('outputs/canon/is_prime_strict_canon.json', 'r', encoding='utf-8') as f:
@@ -18,8 +19,7 @@ files = {
 }
 
 for model, filepath in files.items():
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_result(filepath)
     
     output = data['raw_outputs'][0]
     
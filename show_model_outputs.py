@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 import json
-import glob
+from src.result_io import load_result, result_files
 
-files = sorted(glob.glob('outputs/is_prime_strict_temp*.json'))[-15:]
+files = sorted(result_files('outputs/is_prime_strict_temp*.json'))[-15:]
 
 print("="*80)
 print("CANON CODE:")
@@ -14,8 +14,7 @@ with open('outputs/canon/is_prime_strict_canon.json', 'r', encoding='utf-8') as
 models_shown = set()
 
 for filepath in files:
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_result(filepath)
     
     model = data.get('model', 'unknown')
     
@@ -0,0 +1,147 @@
+# src/adaptive_sampling.py
+"""
+Adaptive sequential sampling for repeatability experiments
+Instead of spending a fixed number of generations per configuration, keep
+sampling until the Wilson confidence intervals of R_raw and R_anchor_post are
+narrower than a target width, or until the run budget is spent.
+
+The rule is only evaluated once min_runs generations have been attempted, and
+every check is recorded so the achieved precision and the stopping reason are
+part of the experiment results. R_raw (share of the most common output) is
+treated as a binomial proportion, as in the paper's interval reporting.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from .enhanced_stats import wilson_confidence_interval
+from .config import ADAPTIVE_MIN_RUNS, ADAPTIVE_CI_WIDTH, ADAPTIVE_CONFIDENCE, ADAPTIVE_BATCH_SIZE
+
+# Stopping reasons
+STOP_CI_WIDTH = "ci_width"        # Both intervals narrower than the target
+STOP_MAX_RUNS = "max_runs"        # Budget spent before the intervals were tight
+STOP_FIXED = "fixed_budget"       # Non-adaptive run
+
+
+@dataclass
+class AdaptiveSamplingConfig:
+    """Stopping rule parameters (the maximum budget is the experiment's num_runs)"""
+    min_runs: int = ADAPTIVE_MIN_RUNS
+    target_ci_width: float = ADAPTIVE_CI_WIDTH
+    confidence: float = ADAPTIVE_CONFIDENCE
+    batch_size: int = ADAPTIVE_BATCH_SIZE
+
+    def __post_init__(self):
+        if self.min_runs < 1:
+            raise ValueError("min_runs must be at least 1")
+        if self.batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if not 0.0 < self.target_ci_width <= 1.0:
+            raise ValueError("target_ci_width must be in (0, 1]")
+        if not 0.0 < self.confidence < 1.0:
+            raise ValueError("confidence must be in (0, 1)")
+
+
+def proportion_interval(successes: int, trials: int, confidence: float) -> Dict[str, Any]:
+    """Point estimate and Wilson interval of a proportion"""
+    lower, upper = wilson_confidence_interval(successes, trials, confidence)
+    return {
+        "estimate": successes / trials if trials else 0.0,
+        "ci": [lower, upper],
+        "width": upper - lower
+    }
+
+
+class SequentialStopper:
+    """
+    Decides after each new sample whether a configuration has been sampled enough
+
+    Usage:
+        stopper = SequentialStopper(config, max_runs=20)
+        while True:
+            ...generate stopper.next_batch(runs_attempted) samples...
+            if stopper.check(runs_attempted, raw_outputs, anchor_matches):
+                break
+        results["sampling"] = stopper.summary()
+    """
+
+    def __init__(self, config: AdaptiveSamplingConfig, max_runs: int):
+        self.config = config
+        self.max_runs = max(1, max_runs)
+        self.min_runs = min(config.min_runs, self.max_runs)
+        self.checks: List[Dict[str, Any]] = []
+        self.stopping_reason: Optional[str] = None
+        self.runs_used = 0
+
+    def next_batch(self, runs_attempted: int) -> int:
+        """Number of generations to request next (all of min_runs at once, then batch_size)"""
+        if runs_attempted < self.min_runs:
+            return self.min_runs - runs_attempted
+        return max(0, min(self.config.batch_size, self.max_runs - runs_attempted))
+
+    def check(self, runs_attempted: int, raw_outputs: Sequence[str],
+              anchor_matches: Optional[Sequence[bool]]) -> Optional[str]:
+        """
+        Evaluate the stopping rule
+
+        Args:
+            runs_attempted: Generations requested so far (failed ones count
+                against the budget)
+            raw_outputs: Successful raw outputs so far
+            anchor_matches: Per raw output, whether its repaired version is at
+                distance 0 from the canon; None while no canon exists
+
+        Returns:
+            Stopping reason, or None to keep sampling
+        """
+        self.runs_used = runs_attempted
+        if runs_attempted < self.min_runs:
+            return None
+
+        check = {"runs": runs_attempted, "successful": len(raw_outputs)}
+        if raw_outputs and anchor_matches is not None and len(anchor_matches) == len(raw_outputs):
+            trials = len(raw_outputs)
+            r_raw = proportion_interval(Counter(raw_outputs).most_common(1)[0][1], trials,
+                                        self.config.confidence)
+            r_anchor_post = proportion_interval(sum(1 for m in anchor_matches if m), trials,
+                                                self.config.confidence)
+            check["R_raw"] = r_raw
+            check["R_anchor_post"] = r_anchor_post
+            tight = max(r_raw["width"], r_anchor_post["width"]) <= self.config.target_ci_width
+        else:
+            tight = False
+        self.checks.append(check)
+
+        if tight:
+            self.stopping_reason = STOP_CI_WIDTH
+        elif runs_attempted >= self.max_runs:
+            self.stopping_reason = STOP_MAX_RUNS
+        return self.stopping_reason
+
+    def summary(self) -> Dict[str, Any]:
+        """Sampling record stored with the experiment results"""
+        last = next((c for c in reversed(self.checks) if "R_raw" in c), {})
+        return {
+            "mode": "adaptive",
+            "stopping_reason": self.stopping_reason,
+            "runs_used": self.runs_used,
+            "min_runs": self.min_runs,
+            "max_runs": self.max_runs,
+            "target_ci_width": self.config.target_ci_width,
+            "confidence": self.config.confidence,
+            "batch_size": self.config.batch_size,
+            "R_raw": last.get("R_raw"),
+            "R_anchor_post": last.get("R_anchor_post"),
+            "checks": self.checks
+        }
+
+
+def fixed_sampling_summary(num_runs: int) -> Dict[str, Any]:
+    """Sampling record for a run with a fixed budget"""
+    return {
+        "mode": "fixed",
+        "stopping_reason": STOP_FIXED,
+        "runs_used": num_runs,
+        "max_runs": num_runs
+    }
@@ -0,0 +1,378 @@
+# src/analysis_engine.py
+"""
+Analysis engine for the paper tables over metrics_summary
+The analysis scripts each re-read metrics_summary.csv, filtered it once per
+model/contract/temperature in Python loops and re-ran the bootstrap for
+every metric. AnalysisEngine does that work once:
+
+- the summary is loaded through MetricsSink (columnar npz plus CSV tail)
+  into one DataFrame, cached per process until the CSV changes
+- per-model/contract/temperature tables are single group-bys
+- bootstrap CIs (percentile method, see STATISTICAL_METHODS.md, or BCa
+  for the scripts that report scipy's BCa intervals) are vectorized and
+  memoized by a hash of their input, in memory and in
+  <output_dir>/bootstrap_cache.json, so reruns skip the resampling
+- significance uses the enhanced_stats tests (Fisher's exact, two-sided or
+  one-sided, Cohen's h, Holm-Bonferroni) on counts from grouped means
+
+Usage:
+    engine = AnalysisEngine(contracts=[...], latest_only=True)
+    engine.improvement("model")
+    engine.significance()
+
+    python -m src.analysis_engine --tables overall significance
+"""
+
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, List, Optional, Iterable, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from .config import OUTPUTS_DIR
+from .metrics_sink import MetricsSink
+from .enhanced_stats import fishers_exact_test, effect_size_proportions, holm_bonferroni_correction
+
+PAPER_METRICS = ("R_raw", "R_behavioral", "R_structural", "Delta_rescue")
+
+# Table names accepted by improvement()/paper_tables() -> metrics_summary column
+GROUPS = {"model": "model", "contract": "contract_id", "temperature": "decoding_temperature"}
+
+CONFIG_COLUMNS = ["contract_id", "model", "decoding_temperature"]
+
+BOOTSTRAP_CACHE_FILENAME = "bootstrap_cache.json"
+
+CI_METHODS = ("percentile", "BCa")
+
+DIFFICULTY_BINS = (0.0, 0.6, 0.8, 1.0)
+DIFFICULTY_LABELS = ("Hard (<60%)", "Medium (60-80%)", "Easy (>80%)")
+
+# Parsed summaries: csv path -> ((size, mtime), frame)
+_FRAMES: Dict[str, Tuple[Tuple[int, int], pd.DataFrame]] = {}
+_FRAMES_LOCK = threading.Lock()
+
+
+def load_summary(output_dir: str = OUTPUTS_DIR) -> pd.DataFrame:
+    """
+    metrics_summary of output_dir as a DataFrame (one row per experiment)
+
+    Parsed once per process and reused until the CSV changes; treat it as
+    read-only.
+    """
+    sink = MetricsSink(output_dir)
+    if not os.path.exists(sink.csv_path):
+        return pd.DataFrame(columns=CONFIG_COLUMNS + list(PAPER_METRICS))
+    stat = os.stat(sink.csv_path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    with _FRAMES_LOCK:
+        cached = _FRAMES.get(sink.csv_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        frame = pd.DataFrame(sink.load_columns())
+        _FRAMES[sink.csv_path] = (signature, frame)
+        return frame
+
+
+def bootstrap_mean_ci(values: Sequence[float], confidence: float = 0.95, n_resamples: int = 10000,
+                      seed: int = 0, method: str = "percentile") -> Tuple[float, float]:
+    """
+    Bootstrap CI of the mean, all resamples drawn at once
+
+    "percentile" is the method of enhanced_stats.bootstrap_confidence_interval,
+    vectorized and reproducible (seeded); "BCa" is scipy.stats.bootstrap's
+    default, seeded.
+    """
+    if method not in CI_METHODS:
+        raise ValueError(f"Unknown bootstrap method: {method}")
+    data = np.asarray(values, dtype=np.float64)
+    if len(data) == 0:
+        return float("nan"), float("nan")
+    rng = np.random.default_rng(seed)
+    if method == "BCa":
+        ci = stats.bootstrap((data,), np.mean, confidence_level=confidence, n_resamples=n_resamples,
+                             method="BCa", random_state=rng).confidence_interval
+        return float(ci.low), float(ci.high)
+    means = np.empty(n_resamples)
+    # Chunked so large inputs do not allocate n_resamples x n indices at once
+    chunk = max(1, 2_000_000 // len(data))
+    for start in range(0, n_resamples, chunk):
+        stop = min(n_resamples, start + chunk)
+        means[start:stop] = data[rng.integers(0, len(data), size=(stop - start, len(data)))].mean(axis=1)
+    alpha = 1 - confidence
+    low, high = np.percentile(means, [100 * alpha / 2, 100 * (1 - alpha / 2)])
+    return float(low), float(high)
+
+
+class BootstrapCache:
+    """
+    Bootstrap CIs memoized by a hash of (values, confidence, resamples, seed, method)
+
+    Args:
+        path: JSON file the results persist in (None: memory only)
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._results: Optional[Dict[str, List[float]]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(values: np.ndarray, confidence: float, n_resamples: int, seed: int,
+            method: str = "percentile") -> str:
+        digest = hashlib.sha256(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+        digest.update(f"|mean|{confidence}|{n_resamples}|{seed}".encode())
+        if method != "percentile":
+            digest.update(f"|{method}".encode())
+        return digest.hexdigest()
+
+    def mean_ci(self, values: Sequence[float], confidence: float = 0.95, n_resamples: int = 10000,
+                seed: int = 0, method: str = "percentile") -> Tuple[float, float]:
+        data = np.asarray(values, dtype=np.float64)
+        key = self.key(data, confidence, n_resamples, seed, method)
+        with self._lock:
+            results = self._load()
+            if key in results:
+                low, high = results[key]
+                return low, high
+        low, high = bootstrap_mean_ci(data, confidence, n_resamples, seed, method)
+        with self._lock:
+            self._results[key] = [low, high]
+            self._dirty = True
+        return low, high
+
+    def _load(self) -> Dict[str, List[float]]:
+        if self._results is None:
+            self._results = {}
+            if self.path and os.path.exists(self.path):
+                try:
+                    with open(self.path) as f:
+                        self._results = json.load(f)
+                except (OSError, ValueError):
+                    pass  # a damaged cache is recomputed
+        return self._results
+
+    def save(self):
+        """Persist new results (merged with what other processes saved meanwhile)"""
+        with self._lock:
+            if not self.path or not self._dirty:
+                return
+            merged = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path) as f:
+                        merged = json.load(f)
+                except (OSError, ValueError):
+                    pass
+            merged.update(self._results)
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(merged, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+class AnalysisEngine:
+    """
+    Paper tables over the metrics_summary of an output directory
+
+    Args:
+        output_dir: Directory with metrics_summary.csv
+        contracts: Keep only these contracts (default: all)
+        latest_only: Keep the last experiment of each contract/model/temperature
+        runs_per_config: Generations per experiment used as trial counts in
+            the significance tests
+        n_resamples / confidence / seed: Bootstrap settings
+        ci_method: Bootstrap CI method, "percentile" or "BCa"
+        cache: Persist bootstrap results in output_dir/bootstrap_cache.json
+    """
+
+    def __init__(self, output_dir: str = OUTPUTS_DIR, contracts: Optional[Iterable[str]] = None,
+                 latest_only: bool = False, runs_per_config: int = 20, n_resamples: int = 10000,
+                 confidence: float = 0.95, seed: int = 0, ci_method: str = "percentile", cache: bool = True):
+        self.output_dir = output_dir
+        self.contracts = list(contracts) if contracts is not None else None
+        self.latest_only = latest_only
+        self.runs_per_config = runs_per_config
+        self.n_resamples = n_resamples
+        self.confidence = confidence
+        self.seed = seed
+        self.ci_method = ci_method
+        self.bootstrap_cache = BootstrapCache(
+            os.path.join(output_dir, BOOTSTRAP_CACHE_FILENAME) if cache else None)
+        self._frame: Optional[pd.DataFrame] = None
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """The selected experiments, one row each"""
+        if self._frame is None:
+            df = load_summary(self.output_dir)
+            if self.contracts is not None:
+                df = df[df["contract_id"].isin(self.contracts)]
+            if self.latest_only:
+                df = df.drop_duplicates(subset=CONFIG_COLUMNS, keep="last")
+            self._frame = df.reset_index(drop=True)
+        return self._frame
+
+    def select(self, **filters) -> pd.DataFrame:
+        """Rows whose columns equal the given values, e.g. select(model="gpt-4o")"""
+        df = self.frame
+        for column, value in filters.items():
+            df = df[df[column] == value]
+        return df
+
+    def mean_ci(self, values: Sequence[float]) -> Tuple[float, float]:
+        """Memoized bootstrap CI of the mean with the engine's settings"""
+        return self.bootstrap_cache.mean_ci(values, self.confidence, self.n_resamples, self.seed, self.ci_method)
+
+    # === Tables ===
+
+    def overall(self, metrics: Sequence[str] = PAPER_METRICS) -> pd.DataFrame:
+        """Mean, std, range and bootstrap CI per metric, plus the R_structural - R_raw improvement"""
+        df = self.frame
+        columns = {metric: df[metric] for metric in metrics}
+        columns["improvement"] = df["R_structural"] - df["R_raw"]
+        rows = {}
+        for name, series in columns.items():
+            values = series.dropna()
+            low, high = self.mean_ci(values.to_numpy())
+            rows[name] = {"n": len(values), "mean": values.mean(), "std": values.std(),
+                          "min": values.min(), "max": values.max(), "ci_low": low, "ci_high": high}
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+    def summary(self, by: str, metrics: Sequence[str] = PAPER_METRICS, sort: bool = True) -> pd.DataFrame:
+        """Count, mean and std of each metric per group (one group-by; sort=False keeps first-seen order)"""
+        column = GROUPS.get(by, by)
+        return self.frame.groupby(column, sort=sort)[list(metrics)].agg(["count", "mean", "std"])
+
+    def improvement(self, by: str, with_ci: bool = False, sort: bool = True) -> pd.DataFrame:
+        """
+        Mean R_raw and R_structural per group with absolute and relative improvement
+
+        Args:
+            by: "model", "contract", "temperature" or a column name
+            with_ci: Add bootstrap CIs of both means (memoized)
+            sort: Groups in sorted order (False: in order of first appearance)
+        """
+        column = GROUPS.get(by, by)
+        df = self.frame
+        table = df.groupby(column, sort=sort).agg(n=("R_raw", "size"), R_raw=("R_raw", "mean"),
+                                                  R_structural=("R_structural", "mean"))
+        table["delta"] = table["R_structural"] - table["R_raw"]
+        table["delta_pct"] = np.where(table["R_raw"] > 0, 100 * table["delta"] / table["R_raw"], 0.0)
+        if with_ci:
+            for metric in ("R_raw", "R_structural"):
+                cis = [self.mean_ci(values.to_numpy()) for _, values in df.groupby(column, sort=sort)[metric]]
+                table[f"{metric}_ci_low"] = [low for low, _ in cis]
+                table[f"{metric}_ci_high"] = [high for _, high in cis]
+        return table
+
+    def significance(self, by: str = "contract", alpha: float = 0.05,
+                     alternative: str = "two-sided") -> pd.DataFrame:
+        """
+        Fisher's exact test and Cohen's h of R_raw vs R_structural per group,
+        with Holm-Bonferroni correction across groups
+
+        Success counts are the group means times runs_per_config x experiments.
+
+        Args:
+            alternative: "two-sided" (STATISTICAL_METHODS.md), or "greater" to
+                test one-sided that R_structural exceeds R_raw
+        """
+        table = self.improvement(by)
+        trials = self.runs_per_config * table["n"]
+        raw = (table["R_raw"] * trials).round().astype(int)
+        structural = (table["R_structural"] * trials).round().astype(int)
+
+        tests = [fishers_exact_test(r, n, s, n, alternative) for r, s, n in zip(raw, structural, trials)]
+        effects = [effect_size_proportions(r, n, s, n) for r, s, n in zip(raw, structural, trials)]
+        table["trials"] = trials
+        table["p_value"] = [test["p_value"] for test in tests]
+        table["odds_ratio"] = [test["odds_ratio"] for test in tests]
+        table["cohens_h"] = [effect["cohens_h"] for effect in effects]
+        table["effect_size"] = [effect["effect_size_interpretation"] for effect in effects]
+
+        correction = holm_bonferroni_correction(table["p_value"].tolist(), alpha=alpha)
+        table["p_adjusted"] = correction["adjusted_p_values"]
+        rejected = np.zeros(len(table), dtype=bool)
+        rejected[list(correction["rejected_indices"])] = True
+        table["significant"] = rejected
+        return table
+
+    def strata(self, bins: Sequence[float] = DIFFICULTY_BINS, labels: Sequence[str] = DIFFICULTY_LABELS,
+               sort: bool = True) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Contracts stratified by baseline difficulty (mean R_raw); sort=False
+        lists contracts in order of first appearance
+
+        Returns:
+            (per-contract table with its stratum, per-stratum table over the
+            experiments of its contracts, with a CI of the per-experiment improvement)
+        """
+        contracts = self.improvement("contract", sort=sort)
+        contracts["stratum"] = pd.cut(contracts["R_raw"], bins=list(bins), labels=list(labels))
+
+        df = self.frame
+        stratum_of = df["contract_id"].map(contracts["stratum"].astype(object))
+        improvement = df["R_structural"] - df["R_raw"]
+        rows = {}
+        for label in labels:
+            mask = (stratum_of == label).to_numpy()
+            members = contracts.index[contracts["stratum"] == label].tolist()
+            low, high = self.mean_ci(improvement[mask].to_numpy()) if mask.any() else (float("nan"),) * 2
+            raw, structural = df["R_raw"][mask].mean(), df["R_structural"][mask].mean()
+            rows[label] = {"contracts": members, "n_contracts": len(members), "n": int(mask.sum()),
+                           "R_raw": raw, "R_structural": structural, "delta": structural - raw,
+                           "delta_ci_low": low, "delta_ci_high": high}
+        return contracts, pd.DataFrame.from_dict(rows, orient="index")
+
+    def paper_tables(self) -> Dict[str, pd.DataFrame]:
+        """Every table, keyed by name"""
+        per_contract, per_stratum = self.strata()
+        tables = {
+            "overall": self.overall(),
+            "models": self.improvement("model", with_ci=True),
+            "contracts": self.improvement("contract"),
+            "temperatures": self.improvement("temperature"),
+            "significance": self.significance(),
+            "contract_strata": per_contract,
+            "strata": per_stratum,
+        }
+        self.save_cache()
+        return tables
+
+    def save_cache(self):
+        """Persist newly computed bootstrap CIs"""
+        self.bootstrap_cache.save()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    table_names = ["overall", "models", "contracts", "temperatures", "significance", "contract_strata", "strata"]
+    parser = argparse.ArgumentParser(description="Paper tables from metrics_summary.csv")
+    parser.add_argument("--output-dir", default=OUTPUTS_DIR, help="Directory with metrics_summary.csv")
+    parser.add_argument("--contracts", nargs="+", default=None, help="Only these contracts")
+    parser.add_argument("--latest", action="store_true",
+                        help="Only the last experiment of each contract/model/temperature")
+    parser.add_argument("--tables", nargs="+", choices=table_names, default=table_names, help="Tables to print")
+    parser.add_argument("--resamples", type=int, default=10000, help="Bootstrap resamples (default: 10000)")
+    parser.add_argument("--export", default=None, help="Also write each table to <dir>/<table>.csv")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write bootstrap_cache.json")
+    args = parser.parse_args()
+
+    engine = AnalysisEngine(args.output_dir, contracts=args.contracts, latest_only=args.latest,
+                            n_resamples=args.resamples, cache=not args.no_cache)
+    tables = engine.paper_tables()
+    print(f"{len(engine.frame)} experiments from {args.output_dir}")
+    for name in args.tables:
+        print(f"\n=== {name} ===")
+        print(tables[name].to_string(float_format="{:.3f}".format))
+        if args.export:
+            os.makedirs(args.export, exist_ok=True)
+            tables[name].to_csv(os.path.join(args.export, f"{name}.csv"))
@@ -0,0 +1,215 @@
+# src/canon_index.py
+"""
+Nearest-canon index for multi-canon anchoring
+Indexes every canon of a contract by AST hash, alpha-renamed hash and a
+compact property vector so a candidate is compared against its closest canon
+without computing the full weighted distance to every one of them
+
+Candidates can also be matched before any property extraction (fast_match):
+by raw text, by Merkle AST hash (same code up to formatting and comments) and
+by α-renamed Merkle hash.
+"""
+
+import ast
+from typing import Dict, Any, List, Optional, Tuple
+from .fingerprint import code_fingerprint
+from .foundational_properties import FoundationalProperties
+from .transformations.ast_hashing import program_hash
+
+
+def property_vector(properties: Dict[str, Any]) -> Tuple[float, ...]:
+    """
+    Project foundational properties onto a small numeric vector
+
+    Only cheap count-style features are used; the vector is a pre-filter for
+    the full calculate_distance, not a replacement for it.
+    """
+    if not properties:
+        return ()
+
+    cf = properties.get("control_flow_signature") or {}
+    complexity = properties.get("complexity_class") or {}
+    recursion = properties.get("recursion_schema") or {}
+    ordering = properties.get("statement_ordering") or {}
+    ast_structure = properties.get("normalized_ast_structure") or {}
+    contracts = properties.get("function_contracts") or {}
+
+    return (
+        float(cf.get("if_statements", 0)),
+        float(cf.get("for_loops", 0)),
+        float(cf.get("while_loops", 0)),
+        float(cf.get("nested_depth", 0)),
+        float(len(cf.get("function_calls", []))),
+        float(complexity.get("recursive_calls", 0)),
+        float(bool(recursion.get("is_recursive"))),
+        float(len(recursion.get("base_cases", []))),
+        float(len(ordering.get("statement_types", []))),
+        float(len(ast_structure.get("node_types", []))),
+        float(ast_structure.get("ast_depth", 0)),
+        float(len(contracts)),
+    )
+
+
+def vector_distance(v1: Tuple[float, ...], v2: Tuple[float, ...]) -> float:
+    """Mean relative difference per component (same scheme as control-flow distance)"""
+    if not v1 or not v2 or len(v1) != len(v2):
+        return 1.0
+
+    total = 0.0
+    for a, b in zip(v1, v2):
+        total += abs(a - b) / max(a, b, 1.0)
+    return total / len(v1)
+
+
+class CanonIndex:
+    """
+    Index over all canons of one contract
+
+    Lookup order:
+        1. exact AST hash (variable-name sensitive)
+        2. alpha-renamed hash (only when the contract allows alpha-renaming)
+        3. nearest neighbour: rank canons by property-vector distance and
+           compute the full weighted distance only for the closest shortlist
+    """
+
+    def __init__(self, canons: List[Dict[str, Any]],
+                 properties_extractor: Optional[FoundationalProperties] = None,
+                 shortlist_size: int = 3):
+        self.properties_extractor = properties_extractor or FoundationalProperties()
+        self.shortlist_size = shortlist_size
+        self.canons: List[Dict[str, Any]] = []
+        self.vectors: List[Tuple[float, ...]] = []
+        self.by_ast_hash: Dict[str, List[int]] = {}
+        self.by_alpha_hash: Dict[str, List[int]] = {}
+
+        # Code-level hashes of each canon's canonical_code (fast_match)
+        self.by_code_text: Dict[str, int] = {}
+        self.by_code_ast: Dict[str, int] = {}
+        self.by_code_alpha: Dict[str, int] = {}
+        self._fresh_properties: Dict[int, Dict[str, Any]] = {}
+
+        for canon in canons:
+            self.add(canon)
+
+    def __len__(self) -> int:
+        return len(self.canons)
+
+    def add(self, canon_data: Dict[str, Any]):
+        """Add one canon entry (as stored by CanonSystem) to the index"""
+        idx = len(self.canons)
+        properties = canon_data.get("foundational_properties") or {}
+        structure = properties.get("normalized_ast_structure") or {}
+
+        self.canons.append(canon_data)
+        self.vectors.append(property_vector(properties))
+
+        if structure.get("ast_hash"):
+            self.by_ast_hash.setdefault(structure["ast_hash"], []).append(idx)
+        if structure.get("alpha_renamed_hash"):
+            self.by_alpha_hash.setdefault(structure["alpha_renamed_hash"], []).append(idx)
+
+        code = canon_data.get("canonical_code") or ""
+        self.by_code_text.setdefault(code_fingerprint(code), idx)
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            return
+        self.by_code_ast.setdefault(program_hash(tree), idx)
+        self.by_code_alpha.setdefault(program_hash(tree, alpha=True), idx)
+
+    def fast_match(self, code: str, contract: Optional[Dict[str, Any]] = None) -> Tuple[str, Optional[int]]:
+        """
+        Match candidate code against the canons without extracting properties
+
+        Tiers, cheapest first:
+            "text_hash"  - byte-identical to a canon
+            "ast_hash"   - same AST (formatting/comments differ)
+            "alpha_hash" - α-equivalent to a canon, when the contract allows
+                           alpha-renaming
+            "full"       - no match
+
+        Returns:
+            (tier, canon position) - position is None for "full"
+        """
+        idx = self.by_code_text.get(code_fingerprint(code))
+        if idx is not None:
+            return "text_hash", idx
+
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            return "full", None
+
+        idx = self.by_code_ast.get(program_hash(tree))
+        if idx is not None:
+            return "ast_hash", idx
+
+        contract = contract or (self.canons[0].get("contract_data") if self.canons else None)
+        if self.properties_extractor._should_use_alpha_renaming(contract):
+            idx = self.by_code_alpha.get(program_hash(tree, alpha=True))
+            if idx is not None:
+                return "alpha_hash", idx
+
+        return "full", None
+
+    def code_properties(self, idx: int) -> Dict[str, Any]:
+        """
+        Properties of canon idx's code, extracted with the current extractor
+
+        Extracted once per index. Code with the same AST has exactly these
+        properties, whatever the stored canon properties were computed with.
+        """
+        if idx not in self._fresh_properties:
+            self._fresh_properties[idx] = self.properties_extractor.extract_all_properties(
+                self.canons[idx].get("canonical_code") or ""
+            )
+        return self._fresh_properties[idx]
+
+    def find_nearest(self, properties: Dict[str, Any],
+                     contract: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Find the canon closest to the given properties
+
+        Args:
+            properties: Foundational properties of the candidate
+            contract: Optional contract (controls alpha-renaming policy)
+
+        Returns:
+            Dict with canon_data, distance, match_tier and candidates_scored,
+            or None if the index is empty
+        """
+        if not self.canons:
+            return None
+
+        structure = (properties or {}).get("normalized_ast_structure") or {}
+        contract = contract or self.canons[0].get("contract_data")
+
+        # Tier 1/2: exact hash lookup
+        candidates = self.by_ast_hash.get(structure.get("ast_hash"), [])
+        tier = "ast_hash"
+        if not candidates and self.properties_extractor._should_use_alpha_renaming(contract):
+            candidates = self.by_alpha_hash.get(structure.get("alpha_renamed_hash"), [])
+            tier = "alpha_hash"
+
+        # Tier 3: property-vector shortlist, re-ranked by full distance
+        if not candidates:
+            tier = "nearest"
+            vector = property_vector(properties)
+            ranked = sorted(range(len(self.canons)),
+                            key=lambda i: vector_distance(vector, self.vectors[i]))
+            candidates = ranked[:self.shortlist_size]
+
+        best_idx, best_distance = None, float("inf")
+        for idx in candidates:
+            distance = self.properties_extractor.calculate_distance(
+                self.canons[idx]["foundational_properties"], properties, contract
+            )
+            if distance < best_distance:
+                best_idx, best_distance = idx, distance
+
+        return {
+            "canon_data": self.canons[best_idx],
+            "distance": best_distance,
+            "match_tier": tier,
+            "candidates_scored": len(candidates)
+        }
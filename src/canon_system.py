@@ -6,8 +6,11 @@ Manages canonical anchors and distance calculations using foundational propertie
 
 import json
 import os
-from typing import Dict, Any, Optional, List
+import copy
+from collections import Counter
+from typing import Dict, Any, Optional, List, Tuple
 from .foundational_properties import FoundationalProperties
+from .canon_index import CanonIndex
 from .contract import Contract
 
 
@@ -20,6 +23,13 @@ class CanonSystem:
         self.properties_extractor = FoundationalProperties()
         self.canon_storage_dir = canon_storage_dir
         os.makedirs(canon_storage_dir, exist_ok=True)
+        
+        # Per-contract nearest-canon indexes, keyed by contract_id and
+        # invalidated when either canon file changes on disk
+        self._index_cache: Dict[str, Any] = {}
+        
+        # How often each comparison tier decided a comparison
+        self.comparison_tier_counts: Counter = Counter()
     
     def create_canon(self, contract: Contract, code: str, 
                     oracle_result: Optional[Dict[str, Any]] = None,
@@ -85,7 +95,7 @@ class CanonSystem:
         Returns:
             Canon data or None if not found
         """
-        canon_path = os.path.join(self.canon_storage_dir, f"{contract_id}_canon.json")
+        canon_path = self._canon_path(contract_id)
         
         if os.path.exists(canon_path):
             with open(canon_path, 'r') as f:
@@ -106,27 +116,24 @@ class CanonSystem:
         Returns:
             Comparison results with distance and property differences
         """
-        canon_data = self.load_canon(contract_id)
+        index = self.get_canon_index(contract_id)
         
-        if not canon_data:
+        if index is None:
             return {
                 "error": "No canon found for contract",
                 "distance": 1.0,
                 "is_identical": False
             }
         
-        # Extract properties from new code
-        new_properties = self.properties_extractor.extract_all_properties(code)
-        canon_properties = canon_data["foundational_properties"]
-        
-        # Get contract from canon data if not provided
-        if contract is None and "contract_data" in canon_data:
-            contract = canon_data["contract_data"]
+        # Extract properties from new code (skipped when it matches a canon's AST)
+        new_properties, tier = self._tiered_properties(index, code, contract)
         
-        # Calculate distance (pass contract for variable naming enforcement)
-        distance = self.properties_extractor.calculate_distance(
-            canon_properties, new_properties, contract
-        )
+        # Compare against the closest canon in the library (pass contract for
+        # variable naming enforcement; falls back to the canon's stored contract)
+        nearest = index.find_nearest(new_properties, contract)
+        canon_data = nearest["canon_data"]
+        canon_properties = canon_data["foundational_properties"]
+        distance = nearest["distance"]
         
         # Check if identical
         is_identical = (distance == 0.0)
@@ -141,15 +148,204 @@ class CanonSystem:
             "new_code": code,
             "property_differences": differences,
             "canon_properties": canon_properties,
-            "new_properties": new_properties
+            "new_properties": new_properties,
+            "canon_variant_id": canon_data.get("variant_id", "primary"),
+            "canon_match_tier": nearest["match_tier"],
+            "comparison_tier": tier
+        }
+    
+    def candidate_properties(self, contract_id: str, code: str,
+                             contract: Optional[Dict[str, Any]] = None,
+                             extractor=None) -> Tuple[Dict[str, Any], str]:
+        """
+        Foundational properties of candidate code, via the cheapest exact tier
+        
+        Code whose text or AST matches a canon reuses that canon's (once
+        extracted) properties; anything else is extracted in full.
+        
+        Args:
+            contract_id: Contract identifier
+            code: Candidate code
+            contract: Optional contract data (alpha-renaming policy)
+            extractor: Extractor for the full tier (default: this system's)
+            
+        Returns:
+            (properties, comparison tier) - see CanonIndex.fast_match for tiers
+        """
+        return self._tiered_properties(self.get_canon_index(contract_id), code, contract, extractor)
+    
+    def _tiered_properties(self, index: Optional[CanonIndex], code: str,
+                           contract: Optional[Dict[str, Any]] = None,
+                           extractor=None) -> Tuple[Dict[str, Any], str]:
+        extractor = extractor or self.properties_extractor
+        tier, idx = index.fast_match(code, contract) if index else ("full", None)
+        self.comparison_tier_counts[tier] += 1
+        
+        if tier in ("text_hash", "ast_hash"):
+            # Properties depend on the AST only: identical to a fresh extraction
+            return copy.deepcopy(index.code_properties(idx)), tier
+        
+        # An alpha match still needs full extraction: function_contracts and
+        # data_dependency_graph record identifier names, so α-equivalent code
+        # is generally not at distance 0 from the canon
+        return extractor.extract_all_properties(code), tier
+    
+    def add_canon_variant(self, contract: Contract, code: str,
+                          oracle_result: Optional[Dict[str, Any]] = None,
+                          require_oracle_pass: bool = True) -> Dict[str, Any]:
+        """
+        Add an alternative canonical implementation to the contract's library
+        
+        Structurally valid alternatives (e.g. iterative vs recursive fibonacci)
+        become additional anchors so candidates are compared against the
+        closest one instead of always being "far" from the single primary canon.
+        
+        Args:
+            contract: Contract specification
+            code: Oracle-passing alternative implementation
+            oracle_result: Oracle test results for validation
+            require_oracle_pass: If True, only accept oracle-passing code
+            
+        Returns:
+            Canon data of the new (or already existing identical) variant
+            
+        Raises:
+            ValueError: If there is no primary canon yet, or the code fails the oracle
+        """
+        contract_id = contract.data["id"]
+        
+        if self.load_canon(contract_id) is None:
+            raise ValueError("Create the primary canon before adding variants")
+        
+        if require_oracle_pass and not (oracle_result and oracle_result.get("passed", False)):
+            raise ValueError("Cannot add canon variant from code that fails the oracle")
+        
+        properties = self.properties_extractor.extract_all_properties(code)
+        ast_hash = (properties.get("normalized_ast_structure") or {}).get("ast_hash")
+        
+        # Don't store the same structure twice
+        for existing in self.load_canon_library(contract_id):
+            existing_structure = existing["foundational_properties"].get("normalized_ast_structure") or {}
+            if ast_hash and existing_structure.get("ast_hash") == ast_hash:
+                return existing
+        
+        variants = self._load_variants(contract_id)
+        canon_data = {
+            "contract_id": contract_id,
+            "variant_id": f"v{len(variants) + 1}",
+            "canonical_code": code,
+            "foundational_properties": properties,
+            "contract_data": contract.data,
+            "created_timestamp": contract.data.get("created_timestamp"),
+            "canon_version": "1.0",
+            "oracle_validated": oracle_result is not None and oracle_result.get("passed", False),
+            "oracle_pass_rate": oracle_result.get("pass_rate", None) if oracle_result else None
         }
+        variants.append(canon_data)
+        
+        library_path = self._library_path(contract_id)
+        with open(library_path, 'w') as f:
+            json.dump({"contract_id": contract_id, "variants": variants}, f, indent=2)
+        self._index_cache.pop(contract_id, None)
+        
+        return canon_data
+    
+    def load_canon_library(self, contract_id: str) -> List[Dict[str, Any]]:
+        """
+        Load all canons for a contract: the primary canon followed by its variants
+        
+        Args:
+            contract_id: Contract identifier
+            
+        Returns:
+            List of canon data dicts (empty if no primary canon exists)
+        """
+        primary = self.load_canon(contract_id)
+        if primary is None:
+            return []
+        
+        primary.setdefault("variant_id", "primary")
+        return [primary] + self._load_variants(contract_id)
+    
+    def get_canon_index(self, contract_id: str) -> Optional[CanonIndex]:
+        """
+        Get the (cached) nearest-canon index for a contract
+        
+        Args:
+            contract_id: Contract identifier
+            
+        Returns:
+            CanonIndex, or None if no canon exists
+        """
+        key = (self._file_stamp(self._canon_path(contract_id)),
+               self._file_stamp(self._library_path(contract_id)))
+        
+        cached = self._index_cache.get(contract_id)
+        if cached and cached[0] == key:
+            return cached[1]
+        
+        library = self.load_canon_library(contract_id)
+        index = CanonIndex(library, self.properties_extractor) if library else None
+        self._index_cache[contract_id] = (key, index)
+        return index
+    
+    def find_nearest_canon(self, contract_id: str, code: Optional[str] = None,
+                           properties: Optional[Dict[str, Any]] = None,
+                           contract: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Find the canon in the contract's library closest to the given code
+        
+        Args:
+            contract_id: Contract identifier
+            code: Candidate code (ignored if properties are given)
+            properties: Precomputed foundational properties of the candidate
+            contract: Optional contract data for variable naming constraints
+            
+        Returns:
+            Dict with canon_data, distance, match_tier and candidates_scored,
+            or None if no canon exists
+        """
+        index = self.get_canon_index(contract_id)
+        if index is None:
+            return None
+        
+        if properties is None:
+            properties = self.properties_extractor.extract_all_properties(code or "")
+        
+        return index.find_nearest(properties, contract)
+    
+    def _canon_path(self, contract_id: str) -> str:
+        return os.path.join(self.canon_storage_dir, f"{contract_id}_canon.json")
+    
+    def _library_path(self, contract_id: str) -> str:
+        return os.path.join(self.canon_storage_dir, f"{contract_id}_canon_library.json")
+    
+    def _load_variants(self, contract_id: str) -> List[Dict[str, Any]]:
+        """Load alternative canons (excluding the primary)"""
+        library_path = self._library_path(contract_id)
+        
+        if os.path.exists(library_path):
+            with open(library_path, 'r') as f:
+                return json.load(f).get("variants", [])
+        
+        return []
+    
+    @staticmethod
+    def _file_stamp(path: str) -> Optional[tuple]:
+        """(mtime_ns, size) of a file, or None if it doesn't exist"""
+        try:
+            stat = os.stat(path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
     
     def _save_canon(self, contract_id: str, canon_data: Dict[str, Any]):
         """Save canon data to disk"""
-        canon_path = os.path.join(self.canon_storage_dir, f"{contract_id}_canon.json")
+        canon_path = self._canon_path(contract_id)
         
         with open(canon_path, 'w') as f:
             json.dump(canon_data, f, indent=2)
+        self._index_cache.pop(contract_id, None)
     
     def _find_property_differences(self, canon_props: Dict[str, Any], 
                                  new_props: Dict[str, Any]) -> List[Dict[str, Any]]:
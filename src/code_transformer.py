@@ -8,7 +8,10 @@ import ast
 import re
 from typing import Dict, Any, List, Optional, Tuple
 from .foundational_properties import FoundationalProperties
+from .incremental_properties import IncrementalPropertyExtractor
 from .canon_system import CanonSystem
+from .tracing import traced
+from .transformations.ast_hashing import nodes_equal
 
 
 class CodeTransformer:
@@ -19,6 +22,8 @@ class CodeTransformer:
     def __init__(self, canon_system: CanonSystem):
         self.canon_system = canon_system
         self.properties_extractor = FoundationalProperties()
+        # Level 2 edits a few statements: re-extract only the changed ones
+        self.incremental_extractor = IncrementalPropertyExtractor(self.properties_extractor)
         
         # Import and initialize the new modular transformation system
         try:
@@ -40,6 +45,7 @@ class CodeTransformer:
             ("normalize_whitespace", self._normalize_whitespace)
         ]
     
+    @traced("transform.to_canon", lambda a: {"contract_id": a["contract_id"]})
     def transform_to_canon(self, code: str, contract_id: str, 
                           max_iterations: int = 5, contract: Dict[str, Any] = None,
                           oracle_system = None) -> Dict[str, Any]:
@@ -73,14 +79,24 @@ class CodeTransformer:
                 "transformed_code": code,
                 "transformations_applied": [],
                 "final_distance": 1.0,
-                "transformation_level": 0
+                "transformation_level": 0,
+                "comparison_tier": None
             }
         
+        # Target the cheapest anchor: the closest canon in the contract's library
+        initial_properties, comparison_tier = self.canon_system.candidate_properties(
+            contract_id, code, contract=contract, extractor=self.incremental_extractor
+        )
+        nearest = self.canon_system.find_nearest_canon(
+            contract_id, properties=initial_properties, contract=contract
+        )
+        if nearest:
+            canon_data = nearest["canon_data"]
+        
         canon_code = canon_data.get("canonical_code", "")
         canon_properties = canon_data.get("foundational_properties", {})
         
         # Calculate initial distance
-        initial_properties = self.properties_extractor.extract_all_properties(code)
         initial_distance = self.properties_extractor.calculate_distance(
             canon_properties, initial_properties
         )
@@ -93,6 +109,8 @@ class CodeTransformer:
                 "transformed_code": code,
                 "final_distance": initial_distance,
                 "transformation_level": 0,
+                "canon_variant_id": canon_data.get("variant_id", "primary"),
+                "comparison_tier": comparison_tier,
                 "transformations_applied": [],
                 "iterations": 0
             }
@@ -106,7 +124,7 @@ class CodeTransformer:
                 
                 if level2_result.get('success'):
                     # Check if it matches canon now
-                    level2_properties = self.properties_extractor.extract_all_properties(
+                    level2_properties = self.incremental_extractor.extract_all_properties(
                         level2_result['transformed_code']
                     )
                     level2_distance = self.properties_extractor.calculate_distance(
@@ -121,6 +139,8 @@ class CodeTransformer:
                             "transformed_code": level2_result['transformed_code'],
                             "final_distance": level2_distance,
                             "transformation_level": 2,
+                            "canon_variant_id": canon_data.get("variant_id", "primary"),
+                            "comparison_tier": comparison_tier,
                             "transformations_applied": level2_result.get('removed_statements', []),
                             "iterations": 1
                         }
@@ -150,6 +170,8 @@ class CodeTransformer:
                             "transformed_code": code,
                             "final_distance": initial_distance,
                             "transformation_level": 0,
+                            "canon_variant_id": canon_data.get("variant_id", "primary"),
+                            "comparison_tier": comparison_tier,
                             "transformations_applied": [],
                             "iterations": 0
                         }
@@ -161,16 +183,17 @@ class CodeTransformer:
                     "transformed_code": level3_result['transformed_code'],
                     "final_distance": 0.0,  # Exact match to canon
                     "transformation_level": 3,
+                    "canon_variant_id": canon_data.get("variant_id", "primary"),
+                    "comparison_tier": comparison_tier,
                     "transformations_applied": level3_result.get('transformations', []),
                     "iterations": 1
                 }
         except ImportError:
             pass  # Level 3 not available
         
-        # All transformations failed
-        final_properties = self.properties_extractor.extract_all_properties(code)
+        # All transformations failed: the code is unchanged since the start
         final_distance = self.properties_extractor.calculate_distance(
-            canon_properties, final_properties
+            canon_properties, initial_properties
         )
         
         return {
@@ -180,6 +203,8 @@ class CodeTransformer:
             "transformed_code": code,
             "final_distance": final_distance,
             "transformation_level": 0,
+            "canon_variant_id": canon_data.get("variant_id", "primary"),
+            "comparison_tier": comparison_tier,
             "transformations_applied": [],
             "iterations": 0
         }
@@ -396,7 +421,7 @@ class CodeTransformer:
                         nested_if = node.body[0]
                         
                         # Check if conditions are the same (simplified check)
-                        if ast.dump(node.test) == ast.dump(nested_if.test):
+                        if nodes_equal(node.test, nested_if.test):
                             # Flatten the nested structure
                             node.body = nested_if.body
                             if nested_if.orelse:
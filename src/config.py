@@ -10,11 +10,38 @@ TEMPERATURE = float(os.environ.get("SKYT_TEMPERATURE", "0.0"))
 TARGET_RUNS_PER_PROMPT = 5
 OUTPUT_DIR_TEMPLATE = "outputs/temp_{temperature}"
 
+# Adaptive sampling: stop a configuration early once the Wilson CIs of
+# R_raw and R_anchor_post are narrower than ADAPTIVE_CI_WIDTH
+ADAPTIVE_MIN_RUNS = 5
+ADAPTIVE_CI_WIDTH = 0.3
+ADAPTIVE_CONFIDENCE = 0.95
+ADAPTIVE_BATCH_SIZE = 1
+
 # Simplified SKYT - Focus on core metrics
 CORE_METRICS = ["R_raw", "R_canon"]
 DEFAULT_ALGORITHM = "fibonacci"
 
+# Concurrent oracle checks during canon selection (each runs in its own sandbox worker)
+ORACLE_MAX_WORKERS = int(os.environ.get("SKYT_ORACLE_WORKERS", min(8, max(2, os.cpu_count() or 1))))
+
+# Worker mode (see job_queue): a claimed job is handed to another worker if its
+# lease is not renewed within JOB_LEASE_SECONDS; jobs are tried JOB_MAX_ATTEMPTS times
+JOB_LEASE_SECONDS = float(os.environ.get("SKYT_JOB_LEASE", "300"))
+JOB_MAX_ATTEMPTS = 3
+
+# metrics_summary.csv is compacted into its columnar copy every N appended rows
+METRICS_COMPACT_ROWS = 25
+
+# Result files: gzip-compress (<experiment_id>.json.gz); repeated values of at
+# least RESULT_SHARE_MIN_CHARS serialized characters are stored once per file
+RESULTS_GZIP = os.environ.get("SKYT_RESULTS_GZIP", "0") == "1"
+RESULT_SHARE_MIN_CHARS = 64
+
 # Paths
 CONTRACTS_DIR = "contracts"
 OUTPUTS_DIR = "outputs"
 RESULTS_FILE = "results.csv"
+
+# Tracing: set SKYT_TRACE to an output file to record pipeline stage spans
+TRACE_FILE = os.environ.get("SKYT_TRACE")
+TRACE_FORMAT = os.environ.get("SKYT_TRACE_FORMAT", "jsonl")  # "jsonl" or "chrome"
@@ -190,4 +190,5 @@ def parse_ood(spec_dict: Optional[Dict[str, Any]]) -> OODSpec:
         return_value=spec_dict.get("return_value"),
         examples=spec_dict.get("examples", []),
         max_checks=spec_dict.get("max_checks", 3),
+        example_timeout=spec_dict.get("example_timeout", 1.0),
     )
@@ -4,138 +4,306 @@ Validates code against contract rules (MISRA C, NASA P10, etc.)
 """
 
 import ast
-from typing import Dict, Any, List, Tuple
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple, Optional, Type
 
 
-def check_contract_compliance(code: str, contract: Dict[str, Any]) -> Tuple[bool, List[str]]:
+@dataclass
+class Violation:
+    """One contract violation with the source location that caused it"""
+    rule: str
+    message: str
+    lineno: Optional[int] = None
+    col_offset: Optional[int] = None
+    
+    def __str__(self) -> str:
+        if self.lineno is None:
+            return self.message
+        return f"{self.message} (line {self.lineno})"
+
+
+class PatternMatcher:
     """
-    Check if code complies with contract rules (MISRA C, NASA P10, forbidden/required patterns)
+    Finds which of a fixed set of substrings occur in a text in one scan
+    
+    All patterns are compiled into one lookahead alternation (longest first),
+    so every start position is tried once. A pattern only shadowed by a
+    longer pattern starting at the same position is a substring of it, so it
+    is reported whenever the longer one is.
+    """
+    
+    def __init__(self, patterns: Tuple[str, ...]):
+        self.patterns = tuple(dict.fromkeys(patterns))
+        searchable = sorted((p for p in self.patterns if p), key=len, reverse=True)
+        self._regex = (re.compile("(?=(" + "|".join(re.escape(p) for p in searchable) + "))")
+                       if searchable else None)
+        # Patterns implied by each pattern (substrings of it)
+        self._implied = {p: [q for q in searchable if q != p and q in p] for p in searchable}
+    
+    def find(self, text: str) -> Dict[str, int]:
+        """Map each pattern present in text to the offset of an occurrence"""
+        found = {p: 0 for p in self.patterns if not p}  # "" is in every string
+        if self._regex is None:
+            return found
+        
+        for match in self._regex.finditer(text):
+            pattern = match.group(1)
+            if pattern in found:
+                continue
+            found[pattern] = match.start()
+            for implied in self._implied[pattern]:
+                if implied not in found:
+                    found[implied] = match.start() + pattern.index(implied)
+        return found
+
+
+@lru_cache(maxsize=128)
+def _compile_patterns(patterns: Tuple[str, ...]) -> PatternMatcher:
+    return PatternMatcher(patterns)
+
+
+class _FunctionFrame:
+    """A function being traversed: its name and how many returns it contains"""
+    __slots__ = ("name", "node", "returns")
+    
+    def __init__(self, node: ast.FunctionDef):
+        self.name = node.name
+        self.node = node
+        self.returns = 0
+
+
+class ComplianceRule:
+    """
+    Base class for AST compliance rules
+    
+    A rule names the constraint family and key that enable it and registers
+    handlers per node type in `handlers` (node class -> method name). The
+    engine calls each handler as handler(node, function_stack) during one
+    shared traversal; `function_stack` lists the enclosing FunctionDefs,
+    outermost first. Handlers return a list of Violations.
+    """
+    family: str = ""
+    key: str = ""
+    label: str = ""
+    handlers: Dict[Type[ast.AST], str] = {}
+    
+    def violation(self, message: str, node: Optional[ast.AST] = None) -> Violation:
+        return Violation(
+            rule=self.label,
+            message=f"{self.label}: {message}",
+            lineno=getattr(node, "lineno", None),
+            col_offset=getattr(node, "col_offset", None)
+        )
+    
+    def finish_function(self, frame: _FunctionFrame) -> List[Violation]:
+        """Called after a FunctionDef and all its children were visited"""
+        return []
+
+
+_RULES: List[ComplianceRule] = []
+
+
+def register_rule(rule_class: Type[ComplianceRule]) -> Type[ComplianceRule]:
+    """Class decorator: add a rule to the engine (evaluated in registration order)"""
+    _RULES.append(rule_class())
+    return rule_class
+
+
+@register_rule
+class SingleExitRule(ComplianceRule):
+    """MISRA 15.5: a function has a single exit point"""
+    family, key, label = "misra_c_rules", "rule_15_5", "MISRA 15.5"
+    handlers = {ast.If: "visit_if"}
+    
+    def visit_if(self, node: ast.If, function_stack: List[_FunctionFrame]) -> List[Violation]:
+        # Reported once per enclosing function, as nested functions count
+        # towards every function around them
+        for child in node.body:
+            if isinstance(child, ast.Return):
+                return [self.violation("Early return inside conditional", child)
+                        for _ in function_stack]
+        return []
+    
+    def finish_function(self, frame: _FunctionFrame) -> List[Violation]:
+        if frame.returns > 1:
+            return [self.violation("Multiple return statements (should have single exit point)",
+                                   frame.node)]
+        return []
+
+
+@register_rule
+class NoBreakContinueRule(ComplianceRule):
+    """MISRA 15.4: no break/continue"""
+    family, key, label = "misra_c_rules", "rule_15_4", "MISRA 15.4"
+    handlers = {ast.Break: "visit_jump", ast.Continue: "visit_jump"}
+    
+    def visit_jump(self, node: ast.stmt, function_stack: List[_FunctionFrame]) -> List[Violation]:
+        statement = "break" if isinstance(node, ast.Break) else "continue"
+        return [self.violation(f"{statement} statement not allowed", node)]
+
+
+class _NoRecursionRule(ComplianceRule):
+    """Direct recursion: a call to any enclosing function by name"""
+    handlers = {ast.Call: "visit_call"}
+    
+    def visit_call(self, node: ast.Call, function_stack: List[_FunctionFrame]) -> List[Violation]:
+        if not isinstance(node.func, ast.Name):
+            return []
+        return [self.violation(f"Recursive call to {frame.name}", node)
+                for frame in function_stack if frame.name == node.func.id]
+
+
+class _NoDynamicMemoryRule(ComplianceRule):
+    """Dynamic memory: importing collections"""
+    handlers = {ast.Import: "visit_import", ast.ImportFrom: "visit_import_from"}
+    
+    def visit_import(self, node: ast.Import, function_stack: List[_FunctionFrame]) -> List[Violation]:
+        return [self.violation("collections import not allowed", node)
+                for alias in node.names if alias.name == 'collections']
+    
+    def visit_import_from(self, node: ast.ImportFrom,
+                          function_stack: List[_FunctionFrame]) -> List[Violation]:
+        if node.module and 'collections' in node.module:
+            return [self.violation("collections import not allowed", node)]
+        return []
+
+
+@register_rule
+class MisraNoRecursionRule(_NoRecursionRule):
+    """MISRA 17.2: no recursion"""
+    family, key, label = "misra_c_rules", "rule_17_2", "MISRA 17.2"
+
+
+@register_rule
+class MisraNoDynamicMemoryRule(_NoDynamicMemoryRule):
+    """MISRA 21.3: no dynamic memory (stdlib imports)"""
+    family, key, label = "misra_c_rules", "rule_21_3", "MISRA 21.3"
+
+
+@register_rule
+class NasaNoRecursionRule(_NoRecursionRule):
+    """NASA P10-1: no recursion (same as MISRA 17.2)"""
+    family, key, label = "nasa_power_of_10", "p10_1", "NASA P10-1"
+
+
+@register_rule
+class NasaNoDynamicMemoryRule(_NoDynamicMemoryRule):
+    """NASA P10-3: no dynamic memory imports"""
+    family, key, label = "nasa_power_of_10", "p10_3", "NASA P10-3"
+
+
+def _run_rules(tree: ast.AST, rules: List[ComplianceRule]) -> List[Violation]:
+    """
+    Evaluate all rules in a single pre-order traversal of the tree
+    
+    Violations are grouped per rule (in registration order) and in source
+    traversal order within each rule.
+    """
+    dispatch: Dict[Type[ast.AST], List[Tuple[int, Any]]] = {}
+    for index, rule in enumerate(rules):
+        for node_type, method_name in rule.handlers.items():
+            dispatch.setdefault(node_type, []).append((index, getattr(rule, method_name)))
+    
+    per_rule: List[List[Violation]] = [[] for _ in rules]
+    function_stack: List[_FunctionFrame] = []
+    exit_marker = object()
+    
+    # Iterative traversal: deeply nested generated code must not hit the recursion limit
+    pending: List[Any] = [tree]
+    while pending:
+        node = pending.pop()
+        
+        if node is exit_marker:
+            frame = function_stack.pop()
+            for index, rule in enumerate(rules):
+                per_rule[index].extend(rule.finish_function(frame))
+            continue
+        
+        if isinstance(node, ast.Return):
+            for frame in function_stack:
+                frame.returns += 1
+        
+        for index, handler in dispatch.get(type(node), ()):
+            per_rule[index].extend(handler(node, function_stack))
+        
+        if isinstance(node, ast.FunctionDef):
+            function_stack.append(_FunctionFrame(node))
+            pending.append(exit_marker)
+        
+        pending.extend(reversed(list(ast.iter_child_nodes(node))))
+    
+    return [violation for violations in per_rule for violation in violations]
+
+
+def find_violations(code: str, contract: Dict[str, Any]) -> List[Violation]:
+    """
+    Check code against contract rules and return structured violations
     
     Args:
         code: The code to check
         contract: Contract data with constraints
         
     Returns:
-        Tuple of (is_compliant, list_of_violations)
+        Violations (with source locations where available), in the order:
+        forbidden patterns, required patterns, MISRA C rules, NASA P10 rules
     """
     violations = []
     constraints = contract.get('constraints', {})
     
-    # Check forbidden patterns (string-based)
+    # Forbidden/required patterns (substring-based, one scan for both lists)
     forbidden = constraints.get('forbidden_patterns', [])
-    for pattern in forbidden:
-        if pattern in code:
-            violations.append(f"Forbidden pattern: '{pattern}'")
-    
-    # Check required patterns (string-based)
     required = constraints.get('required_patterns', [])
-    for pattern in required:
-        if pattern not in code:
-            violations.append(f"Missing required pattern: '{pattern}'")
-    
-    # Check MISRA C rules
-    misra_rules = constraints.get('misra_c_rules', {})
-    if misra_rules:
-        misra_violations = _check_misra_rules(code, misra_rules)
-        violations.extend(misra_violations)
-    
-    # Check NASA P10 rules
-    nasa_rules = constraints.get('nasa_power_of_10', {})
-    if nasa_rules:
-        nasa_violations = _check_nasa_p10_rules(code, nasa_rules)
-        violations.extend(nasa_violations)
+    if forbidden or required:
+        found = _compile_patterns(tuple(forbidden) + tuple(required)).find(code)
+        
+        for pattern in forbidden:
+            if pattern in found:
+                offset = found[pattern]
+                violations.append(Violation(
+                    rule="forbidden_patterns",
+                    message=f"Forbidden pattern: '{pattern}'",
+                    lineno=code.count("\n", 0, offset) + 1,
+                    col_offset=offset - (code.rfind("\n", 0, offset) + 1)
+                ))
+        
+        for pattern in required:
+            if pattern not in found:
+                violations.append(Violation(rule="required_patterns",
+                                            message=f"Missing required pattern: '{pattern}'"))
     
-    is_compliant = len(violations) == 0
-    return is_compliant, violations
-
-
-def _check_misra_rules(code: str, rules: Dict[str, str]) -> List[str]:
-    """Check MISRA C rules"""
-    violations = []
+    # MISRA C / NASA P10 rules share one parse and one traversal
+    families = [family for family in ('misra_c_rules', 'nasa_power_of_10') if constraints.get(family)]
+    if not families:
+        return violations
     
     try:
         tree = ast.parse(code)
     except SyntaxError:
-        return ["Code has syntax errors"]
-    
-    # MISRA 15.5: Single exit point
-    if 'rule_15_5' in rules:
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                returns = [n for n in ast.walk(node) if isinstance(n, ast.Return)]
-                if len(returns) > 1:
-                    violations.append("MISRA 15.5: Multiple return statements (should have single exit point)")
-                # Check for early returns (return not at end of function)
-                for stmt in ast.walk(node):
-                    if isinstance(stmt, ast.If):
-                        for child in stmt.body:
-                            if isinstance(child, ast.Return):
-                                violations.append("MISRA 15.5: Early return inside conditional")
-                                break
-    
-    # MISRA 15.4: No break/continue
-    if 'rule_15_4' in rules:
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Break):
-                violations.append("MISRA 15.4: break statement not allowed")
-            if isinstance(node, ast.Continue):
-                violations.append("MISRA 15.4: continue statement not allowed")
-    
-    # MISRA 17.2: No recursion
-    if 'rule_17_2' in rules:
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                func_name = node.name
-                for call in ast.walk(node):
-                    if isinstance(call, ast.Call):
-                        if isinstance(call.func, ast.Name) and call.func.id == func_name:
-                            violations.append(f"MISRA 17.2: Recursive call to {func_name}")
-    
-    # MISRA 21.3: No dynamic memory (stdlib imports)
-    if 'rule_21_3' in rules:
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    if alias.name == 'collections':
-                        violations.append("MISRA 21.3: collections import not allowed")
-            if isinstance(node, ast.ImportFrom):
-                if node.module and 'collections' in node.module:
-                    violations.append("MISRA 21.3: collections import not allowed")
+        violations.extend(Violation(rule=family, message="Code has syntax errors") for family in families)
+        return violations
     
+    active = [rule for rule in _RULES if rule.key in (constraints.get(rule.family) or {})]
+    violations.extend(_run_rules(tree, active))
     return violations
 
 
-def _check_nasa_p10_rules(code: str, rules: Dict[str, str]) -> List[str]:
-    """Check NASA Power of 10 rules"""
-    violations = []
+def check_contract_compliance(code: str, contract: Dict[str, Any]) -> Tuple[bool, List[str]]:
+    """
+    Check if code complies with contract rules (MISRA C, NASA P10, forbidden/required patterns)
     
-    try:
-        tree = ast.parse(code)
-    except SyntaxError:
-        return ["Code has syntax errors"]
-    
-    # P10-1: No recursion (same as MISRA 17.2)
-    if 'p10_1' in rules:
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                func_name = node.name
-                for call in ast.walk(node):
-                    if isinstance(call, ast.Call):
-                        if isinstance(call.func, ast.Name) and call.func.id == func_name:
-                            violations.append(f"NASA P10-1: Recursive call to {func_name}")
-    
-    # P10-3: No dynamic memory imports
-    if 'p10_3' in rules:
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    if alias.name == 'collections':
-                        violations.append("NASA P10-3: collections import not allowed")
-            if isinstance(node, ast.ImportFrom):
-                if node.module and 'collections' in node.module:
-                    violations.append("NASA P10-3: collections import not allowed")
+    Args:
+        code: The code to check
+        contract: Contract data with constraints
+        
+    Returns:
+        Tuple of (is_compliant, list_of_violations)
+    """
+    violations = [str(violation) for violation in find_violations(code, contract)]
     
-    return violations
+    is_compliant = len(violations) == 0
+    return is_compliant, violations
 
 
 def make_compliant(code: str, contract: Dict[str, Any]) -> str:
@@ -3,9 +3,10 @@ Contract-Aware Validator for SKYT Transformations
 Validates transformations based on contract domain and oracle compliance
 """
 
-from typing import Tuple, Dict, Any, Callable
+from typing import Tuple, Dict, Any, Callable, Optional, List
 import ast
 from src.policies.out_of_domain import OODPolicy
+from src.sandbox import ExecutionSandbox, get_default_sandbox
 
 
 def parse_domain(contract: Dict[str, Any]) -> Callable:
@@ -93,16 +94,12 @@ def run_oracle_in_domain(code: str, contract: Dict[str, Any]) -> Tuple[bool, lis
     if not domain_cases:
         return True, []  # No in-domain tests = vacuously true
     
-    # Execute code and run tests
-    try:
-        # Create execution namespace
-        namespace = {}
-        exec(code, namespace)
-        
-        # Find the function (use contract's function_name)
-        func_name = contract.get("constraints", {}).get("function_name", "fibonacci")
+    # Find the function (use contract's function_name)
+    func_name = contract.get("constraints", {}).get("function_name", "fibonacci")
+    
+    def run_cases(namespace):
         if func_name not in namespace:
-            return False, ["Function not found in code"]
+            return None
         
         func = namespace[func_name]
         
@@ -110,20 +107,23 @@ def run_oracle_in_domain(code: str, contract: Dict[str, Any]) -> Tuple[bool, lis
         results = []
         for case in domain_cases:
             try:
-                input_val = case.get("input")
-                expected = case.get("expected")
-                
-                result = func(input_val)
-                passed = (result == expected)
-                results.append(passed)
-                
-            except Exception as e:
+                result = func(case.get("input"))
+                results.append(result == case.get("expected"))
+            except Exception:
                 results.append(False)
-        
-        return all(results), results
-        
-    except Exception as e:
-        return False, [f"Execution error: {str(e)}"]
+        return results
+    
+    # Execute code and run tests inside the sandbox
+    execution = get_default_sandbox().execute(code, run_cases)
+    
+    if not execution.success:
+        return False, [f"Execution error: {execution.error}"]
+    
+    results = execution.value
+    if results is None:
+        return False, ["Function not found in code"]
+    
+    return all(results), results
 
 
 def calculate_distance_to_canon(code: str, contract_id: str) -> float:
@@ -220,21 +220,13 @@ def validate_transformation(
     if ood_spec and hasattr(ood_spec, 'policy'):
         # Only run OOD checks if policy is not "allow"
         if ood_spec.policy != "allow":
-            try:
-                # Extract functions from code
-                pre_func = _extract_function(pre_code, contract)
-                post_func = _extract_function(post_code, contract)
-                
-                if pre_func and post_func:
-                    ood_policy = OODPolicy(ood_spec)
-                    
-                    # Check if post-transformation code conforms to OOD policy
-                    if not ood_policy.check_examples(post_func, baseline_fn=pre_func):
-                        return False, "Transformation violates out-of-domain policy"
-            except Exception as e:
-                # If OOD check fails with exception, log but don't reject
-                # (allows for future-proofing and graceful degradation)
-                pass
+            # Both versions and all examples are checked inside one sandbox worker
+            verdicts = check_ood_examples(pre_code, post_code, contract, ood_spec)
+            
+            # If the OOD check itself fails (worker error, missing function), log
+            # but don't reject (allows for future-proofing and graceful degradation)
+            if verdicts is not None and not all(verdicts):
+                return False, "Transformation violates out-of-domain policy"
     
     return True, f"Contract-compliant and closer to canon (delta_d={d_pre-d_post:.3f})"
 
@@ -243,6 +235,8 @@ def _extract_function(code: str, contract: Dict[str, Any]) -> Callable:
     """
     Extract executable function from code string
     
+    Only call this inside a sandbox worker - it executes the code in-process.
+    
     Args:
         code: Python code containing function definition
         contract: Contract with function name specification
@@ -264,6 +258,57 @@ def _extract_function(code: str, contract: Dict[str, Any]) -> Callable:
         return None
 
 
+def _check_ood_policy(pre_code: str, post_code: str, contract: Dict[str, Any],
+                      ood_spec) -> Optional[List[bool]]:
+    """
+    Sandbox entry point: check post-transformation code against the OOD policy
+    
+    Returns:
+        Verdict per example, or None if either function couldn't be extracted
+    """
+    pre_func = _extract_function(pre_code, contract)
+    post_func = _extract_function(post_code, contract)
+    
+    if not (pre_func and post_func):
+        return None
+    
+    return OODPolicy(ood_spec).evaluate(post_func, baseline_fn=pre_func)
+
+
+def check_ood_examples(pre_code: str, post_code: str, contract: Dict[str, Any],
+                       ood_spec, sandbox: Optional[ExecutionSandbox] = None) -> Optional[List[bool]]:
+    """
+    Batched out-of-domain check: one sandbox worker executes the candidate
+    (and its baseline for forbid_transform) on every example
+    
+    Each example call is bounded by ood_spec.example_timeout, and the worker's
+    wall-clock budget grows with the number of examples.
+    
+    Args:
+        pre_code: Code before transformation (baseline)
+        post_code: Code after transformation (candidate)
+        contract: Contract with function name specification
+        ood_spec: Parsed OODSpec
+        sandbox: Sandbox to run in (default: shared sandbox)
+        
+    Returns:
+        Verdict per example, or None if the check could not be completed
+    """
+    sandbox = sandbox or get_default_sandbox()
+    num_examples = len(OODPolicy(ood_spec).examples)
+    
+    timeout = sandbox.limits.timeout
+    if ood_spec.example_timeout:
+        # Candidate + baseline per example, plus the usual budget for setup
+        timeout += 2 * num_examples * ood_spec.example_timeout
+    
+    execution = sandbox.run(_check_ood_policy, pre_code, post_code, contract, ood_spec,
+                            timeout=timeout)
+    if not execution.success or execution.value is None:
+        return None
+    return execution.value
+
+
 def check_out_of_domain_change(pre_code: str, post_code: str, contract: Dict[str, Any]) -> bool:
     """
     Check if transformation only changed behavior outside contract domain
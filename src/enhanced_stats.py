@@ -119,19 +119,22 @@ def descriptive_statistics_with_ci(data: List[float], name: str = "metric",
 
 
 def fishers_exact_test(before_successes: int, before_trials: int,
-                       after_successes: int, after_trials: int) -> Dict[str, Any]:
+                       after_successes: int, after_trials: int,
+                       alternative: str = 'two-sided') -> Dict[str, Any]:
     """
     Fisher's exact test for comparing two proportions (recommended for small samples)
     
     Tests if transformation significantly improves success rate.
     H0: No difference in success rates
-    H1: Success rates are different (two-sided)
+    H1: Success rates are different (two-sided), or the success rate after
+        transformation is higher (alternative='greater', one-sided)
     
     Args:
         before_successes: Number of successes before transformation
         before_trials: Total trials before transformation
         after_successes: Number of successes after transformation
         after_trials: Total trials after transformation
+        alternative: 'two-sided', 'greater' or 'less' (scipy.stats.fisher_exact)
         
     Returns:
         Dictionary with test results
@@ -147,7 +150,7 @@ def fishers_exact_test(before_successes: int, before_trials: int,
     ]
     
     # Fisher's exact test
-    odds_ratio, p_value = stats.fisher_exact(table, alternative='two-sided')
+    odds_ratio, p_value = stats.fisher_exact(table, alternative=alternative)
     
     # Calculate proportions
     p_before = before_successes / before_trials if before_trials > 0 else 0
@@ -0,0 +1,99 @@
+# src/fingerprint.py
+"""
+Stable, process-independent fingerprints for SKYT
+Python's built-in hash() is salted per process (PYTHONHASHSEED), so anything
+that must be persisted, cached on disk or compared across worker processes
+uses these fingerprints instead
+"""
+
+import json
+import hashlib
+from typing import Any, Dict, Iterable, Optional
+
+
+# Bump when the serialization or digest changes; old fingerprints then no
+# longer compare equal to new ones instead of silently colliding
+FINGERPRINT_VERSION = "fp1"
+
+# Properties that define structural sameness for R_structural
+STRUCTURAL_KEY_PROPERTIES = [
+    "control_flow_signature",
+    "complexity_class",
+    "side_effect_profile",
+    "normalized_ast_structure"
+]
+
+
+def _normalize(obj: Any) -> Any:
+    """Convert obj into JSON-serializable data with a deterministic layout"""
+    if isinstance(obj, dict):
+        return {str(k): _normalize(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_normalize(v) for v in obj]
+    if isinstance(obj, (set, frozenset)):
+        return sorted((_normalize(v) for v in obj), key=lambda v: json.dumps(v, sort_keys=True))
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    # NumPy scalars and other numbers
+    if hasattr(obj, "item"):
+        return obj.item()
+    return repr(obj)
+
+
+def _json_default(obj: Any) -> Any:
+    """json.dumps hook for the few non-JSON types found in property dicts"""
+    if isinstance(obj, (set, frozenset)):
+        return _normalize(obj)
+    if hasattr(obj, "item"):
+        return obj.item()
+    return repr(obj)
+
+
+def canonical_serialize(obj: Any) -> bytes:
+    """
+    Deterministic byte serialization of nested dicts/lists/sets
+
+    Keys are sorted, sets become sorted lists and separators are fixed, so the
+    same value always serializes to the same bytes in any process.
+    """
+    try:
+        # Fast path: property dicts are plain JSON data almost always
+        text = json.dumps(obj, sort_keys=True, separators=(",", ":"),
+                          ensure_ascii=False, default=_json_default)
+    except TypeError:
+        # Mixed-type or tuple keys can't be sorted/encoded directly
+        text = json.dumps(_normalize(obj), sort_keys=True, separators=(",", ":"),
+                          ensure_ascii=False)
+    return text.encode("utf-8")
+
+
+def digest(data: bytes) -> str:
+    """128-bit BLAKE2b hex digest (stdlib, fast, stable across platforms)"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def fingerprint(obj: Any) -> str:
+    """
+    Versioned fingerprint of any property-like value
+
+    Returns:
+        String of the form "fp1:<32 hex chars>"
+    """
+    return f"{FINGERPRINT_VERSION}:{digest(canonical_serialize(obj))}"
+
+
+def code_fingerprint(code: Optional[str]) -> str:
+    """Fingerprint of raw code text (cache keys, deduplication of outputs)"""
+    return f"{FINGERPRINT_VERSION}:{digest((code or '').encode('utf-8'))}"
+
+
+def structural_fingerprint(properties: Dict[str, Any],
+                           key_properties: Iterable[str] = STRUCTURAL_KEY_PROPERTIES) -> str:
+    """
+    Fingerprint of the structural key properties of one output
+
+    Missing or empty properties are treated as None, matching the previous
+    "None" placeholder in structural signatures.
+    """
+    properties = properties or {}
+    return fingerprint({name: properties.get(name) or None for name in key_properties})
@@ -9,6 +9,50 @@ import hashlib
 from typing import Dict, Any, List, Set, Tuple, Optional
 from collections import defaultdict
 import json
+from .sandbox import get_default_sandbox
+from .property_records import PropertyRecord, FrozenMap
+
+
+class AlphaRenamer(ast.NodeTransformer):
+    """
+    Renames parameters to p0, p1... and other names to v0, v1... in visit order
+    
+    The mapping is shared across the whole visit, so visiting top-level
+    statements one by one with the same instance matches visiting the module.
+    """
+    
+    def __init__(self):
+        self.var_map = {}
+        self.counter = 0
+        self.param_names = set()  # Track parameter names to rename consistently
+        
+    def visit_FunctionDef(self, node):
+        # First pass: collect parameter names
+        for arg in node.args.args:
+            if arg.arg not in self.var_map:
+                # Keep param names as p0, p1, p2... for clarity
+                self.var_map[arg.arg] = f"p{len(self.param_names)}"
+                self.param_names.add(arg.arg)
+        
+        # Process function body
+        self.generic_visit(node)
+        
+        # Rename parameters
+        for arg in node.args.args:
+            if arg.arg in self.var_map:
+                arg.arg = self.var_map[arg.arg]
+        
+        # Don't rename function names (they're part of the contract)
+        return node
+    
+    def visit_Name(self, node):
+        # Rename variable references
+        if node.id not in ['range', 'len', 'print', 'max', 'min', 'sum', 'abs']:  # Built-ins
+            if node.id not in self.var_map:
+                self.var_map[node.id] = f"v{self.counter}"
+                self.counter += 1
+            node.id = self.var_map[node.id]
+        return node
 
 
 class FoundationalProperties:
@@ -115,19 +159,25 @@ class FoundationalProperties:
     
     def _extract_data_dependency_graph(self, tree: ast.AST, code: str) -> Dict[str, Any]:
         """Extract variable dependency relationships"""
-        dependencies = defaultdict(set)
-        assignments = {}
+        return self._fold_dependency_events(self._collect_dependency_events(tree))
+    
+    def _collect_dependency_events(self, tree: ast.AST) -> List[Tuple[str, List[str], str]]:
+        """
+        Collect assignments in visit order as (variable, dependencies, value dump)
+        
+        Kept separate from the fold so per-statement summaries can be replayed
+        in program order with exactly the same result (see incremental_properties)
+        """
+        events = []
         
         class DependencyVisitor(ast.NodeVisitor):
             def visit_Assign(self, node):
                 # Get assigned variables
                 for target in node.targets:
                     if isinstance(target, ast.Name):
-                        var_name = target.id
                         # Get dependencies from the value
                         deps = self._get_dependencies(node.value)
-                        dependencies[var_name].update(deps)
-                        assignments[var_name] = ast.dump(node.value)
+                        events.append((target.id, list(deps), ast.dump(node.value)))
                 self.generic_visit(node)
             
             def _get_dependencies(self, node):
@@ -145,6 +195,17 @@ class FoundationalProperties:
         visitor = DependencyVisitor()
         visitor.visit(tree)
         
+        return events
+    
+    def _fold_dependency_events(self, events: List[Tuple[str, List[str], str]]) -> Dict[str, Any]:
+        """Build the data dependency graph from collected assignment events"""
+        dependencies = defaultdict(set)
+        assignments = {}
+        
+        for var_name, deps, value_dump in events:
+            dependencies[var_name].update(deps)
+            assignments[var_name] = value_dump
+        
         return {
             "dependencies": {k: list(v) for k, v in dependencies.items()},
             "assignments": assignments
@@ -210,20 +271,25 @@ class FoundationalProperties:
     
     def _extract_complexity_class(self, tree: ast.AST, code: str) -> Dict[str, Any]:
         """Extract algorithmic complexity (O-notation)"""
-        complexity = {
-            "nested_loops": 0,
-            "recursive_calls": 0,
-            "estimated_complexity": "O(1)"
-        }
+        events, max_loop_depth = self._collect_complexity_events(tree)
+        return self._fold_complexity_events(events, max_loop_depth)
+    
+    def _collect_complexity_events(self, tree: ast.AST) -> Tuple[List[Tuple[str, str]], int]:
+        """
+        Collect function definitions and calls in visit order plus the loop depth
+        
+        Whether a call counts as recursive depends on every function defined
+        before it in the whole program, so the events are folded separately.
+        """
+        events = []
         
         class ComplexityVisitor(ast.NodeVisitor):
             def __init__(self):
                 self.loop_depth = 0
                 self.max_loop_depth = 0
-                self.function_names = set()
                 
             def visit_FunctionDef(self, node):
-                self.function_names.add(node.name)
+                events.append(("def", node.name))
                 self.generic_visit(node)
                 
             def visit_For(self, node):
@@ -239,14 +305,30 @@ class FoundationalProperties:
                 self.loop_depth -= 1
                 
             def visit_Call(self, node):
-                if isinstance(node.func, ast.Name) and node.func.id in self.function_names:
-                    complexity["recursive_calls"] += 1
+                if isinstance(node.func, ast.Name):
+                    events.append(("call", node.func.id))
                 self.generic_visit(node)
         
         visitor = ComplexityVisitor()
         visitor.visit(tree)
         
-        complexity["nested_loops"] = visitor.max_loop_depth
+        return events, visitor.max_loop_depth
+    
+    def _fold_complexity_events(self, events: List[Tuple[str, str]],
+                                max_loop_depth: int) -> Dict[str, Any]:
+        """Build the complexity class from collected definition/call events"""
+        complexity = {
+            "nested_loops": max_loop_depth,
+            "recursive_calls": 0,
+            "estimated_complexity": "O(1)"
+        }
+        
+        function_names = set()
+        for kind, name in events:
+            if kind == "def":
+                function_names.add(name)
+            elif name in function_names:
+                complexity["recursive_calls"] += 1
         
         # Estimate complexity
         if complexity["recursive_calls"] > 0:
@@ -400,14 +482,7 @@ class FoundationalProperties:
             "alpha_renamed_hash": ""
         }
         
-        def get_ast_info(node, depth=0):
-            structure["node_types"].append(type(node).__name__)
-            structure["ast_depth"] = max(structure["ast_depth"], depth)
-            
-            for child in ast.iter_child_nodes(node):
-                get_ast_info(child, depth + 1)
-        
-        get_ast_info(tree)
+        structure["node_types"], structure["ast_depth"] = self._collect_ast_shape(tree)
         
         # Create normalized AST hash (original, variable-name-sensitive)
         ast_dump = ast.dump(tree, annotate_fields=False)
@@ -424,6 +499,22 @@ class FoundationalProperties:
         
         return structure
     
+    def _collect_ast_shape(self, tree: ast.AST) -> Tuple[List[str], int]:
+        """Pre-order node type names and maximum depth of an AST"""
+        node_types = []
+        max_depth = 0
+        
+        def get_ast_info(node, depth=0):
+            nonlocal max_depth
+            node_types.append(type(node).__name__)
+            max_depth = max(max_depth, depth)
+            
+            for child in ast.iter_child_nodes(node):
+                get_ast_info(child, depth + 1)
+        
+        get_ast_info(tree)
+        return node_types, max_depth
+    
     def _alpha_rename_ast(self, tree: ast.AST) -> ast.AST:
         """
         Apply α-renaming to AST: systematically rename variables to v0, v1, v2...
@@ -432,40 +523,6 @@ class FoundationalProperties:
         import copy
         tree = copy.deepcopy(tree)
         
-        class AlphaRenamer(ast.NodeTransformer):
-            def __init__(self):
-                self.var_map = {}
-                self.counter = 0
-                self.param_names = set()  # Track parameter names to rename consistently
-                
-            def visit_FunctionDef(self, node):
-                # First pass: collect parameter names
-                for arg in node.args.args:
-                    if arg.arg not in self.var_map:
-                        # Keep param names as p0, p1, p2... for clarity
-                        self.var_map[arg.arg] = f"p{len(self.param_names)}"
-                        self.param_names.add(arg.arg)
-                
-                # Process function body
-                self.generic_visit(node)
-                
-                # Rename parameters
-                for arg in node.args.args:
-                    if arg.arg in self.var_map:
-                        arg.arg = self.var_map[arg.arg]
-                
-                # Don't rename function names (they're part of the contract)
-                return node
-            
-            def visit_Name(self, node):
-                # Rename variable references
-                if node.id not in ['range', 'len', 'print', 'max', 'min', 'sum', 'abs']:  # Built-ins
-                    if node.id not in self.var_map:
-                        self.var_map[node.id] = f"v{self.counter}"
-                        self.counter += 1
-                    node.id = self.var_map[node.id]
-                return node
-        
         renamer = AlphaRenamer()
         return renamer.visit(tree)
     
@@ -535,11 +592,7 @@ class FoundationalProperties:
             "test_results": []
         }
         
-        try:
-            # Execute code safely in isolated namespace
-            namespace = {}
-            exec(code, namespace)
-            
+        def run_seed_inputs(namespace):
             # Find the main function
             main_func = None
             for name, obj in namespace.items():
@@ -547,44 +600,42 @@ class FoundationalProperties:
                     main_func = obj
                     break
             
-            if main_func:
-                signature["can_execute"] = True
-                
-                # Run on canonical seed inputs (algorithm-agnostic)
-                test_inputs = [0, 1, 2, 5, 10]
-                io_pairs = []
-                
-                for inp in test_inputs:
-                    try:
-                        # Capture stdout for side-effect detection
-                        import io as io_module
-                        import sys
-                        old_stdout = sys.stdout
-                        sys.stdout = captured_output = io_module.StringIO()
-                        
+            if not main_func:
+                return None
+            
+            # Run on canonical seed inputs (algorithm-agnostic)
+            io_pairs = []
+            for inp in [0, 1, 2, 5, 10]:
+                try:
+                    # Capture stdout for side-effect detection
+                    import io as io_module
+                    from contextlib import redirect_stdout
+                    captured_output = io_module.StringIO()
+                    
+                    with redirect_stdout(captured_output):
                         result = main_func(inp)
-                        
-                        sys.stdout = old_stdout
-                        output_text = captured_output.getvalue()
-                        
-                        # Record I/O pair
-                        io_pairs.append((inp, result, bool(output_text)))
-                        
-                        if output_text:
-                            signature["side_effects_detected"].append("stdout")
-                        
-                    except Exception as e:
-                        # Record exception type as part of behavior
-                        io_pairs.append((inp, f"Exception:{type(e).__name__}", False))
-                
-                # Create hash of I/O behavior
-                io_str = str(sorted(io_pairs))
-                signature["io_signature_hash"] = hashlib.md5(io_str.encode()).hexdigest()
-                signature["test_results"] = io_pairs[:3]  # Store first 3 for debugging
-                
-        except Exception:
-            # Can't execute code safely
-            signature["can_execute"] = False
+                    
+                    # Record I/O pair
+                    io_pairs.append((inp, result, bool(captured_output.getvalue())))
+                    
+                except Exception as e:
+                    # Record exception type as part of behavior
+                    io_pairs.append((inp, f"Exception:{type(e).__name__}", False))
+            
+            return io_pairs
+        
+        # Execute code inside the execution sandbox
+        execution = get_default_sandbox().execute(code, run_seed_inputs)
+        io_pairs = execution.value if execution.success else None
+        
+        if io_pairs is not None:
+            signature["can_execute"] = True
+            signature["side_effects_detected"] = ["stdout" for _, _, printed in io_pairs if printed]
+            
+            # Create hash of I/O behavior
+            io_str = str(sorted(io_pairs))
+            signature["io_signature_hash"] = hashlib.md5(io_str.encode()).hexdigest()
+            signature["test_results"] = io_pairs[:3]  # Store first 3 for debugging
         
         return signature
     
@@ -651,7 +702,10 @@ class FoundationalProperties:
         visitor = RecursionVisitor()
         visitor.visit(tree)
         
-        # Classify recursion pattern
+        return self._classify_recursion_pattern(schema)
+    
+    def _classify_recursion_pattern(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill in recursion_pattern from the collected base cases and recursive calls"""
         if schema["is_recursive"]:
             num_recursive_calls = len(schema["recursive_calls"])
             if num_recursive_calls == 1:
@@ -685,6 +739,9 @@ class FoundationalProperties:
         if not props1 or not props2:
             return 1.0
         
+        if isinstance(props1, PropertyRecord) and isinstance(props2, PropertyRecord):
+            return self._calculate_record_distance(props1, props2, contract)
+        
         total_distance = 0.0
         property_count = 0
         
@@ -698,6 +755,29 @@ class FoundationalProperties:
         
         return total_distance / property_count if property_count > 0 else 1.0
     
+    def _calculate_record_distance(self, rec1: PropertyRecord, rec2: PropertyRecord,
+                                   contract: Optional[Dict[str, Any]] = None) -> float:
+        """
+        calculate_distance on compact records: equal (usually shared) property
+        values cost nothing, only differing ones are thawed and compared
+        """
+        total_distance = 0.0
+        property_count = 0
+        
+        for prop_name in self.properties:
+            if prop_name in rec1 and prop_name in rec2:
+                value1, value2 = rec1.frozen(prop_name), rec2.frozen(prop_name)
+                # Equal dict-valued properties are at distance 0 (not so for
+                # behavioral signatures that could not be executed)
+                if not ((value1 is value2 or value1 == value2) and isinstance(value1, FrozenMap)
+                        and prop_name != "behavioral_signature"):
+                    total_distance += self._calculate_property_distance(
+                        rec1[prop_name], rec2[prop_name], prop_name, contract
+                    )
+                property_count += 1
+        
+        return total_distance / property_count if property_count > 0 else 1.0
+    
     def _calculate_property_distance(self, prop1: Any, prop2: Any, prop_name: str,
                                     contract: Optional[Dict[str, Any]] = None) -> float:
         """Calculate distance for a specific property"""
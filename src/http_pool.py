@@ -0,0 +1,146 @@
+# src/http_pool.py
+"""
+Shared, instrumented HTTP connection pools for LLM providers
+One keep-alive HTTP client per (provider, model) is reused by every LLMClient
+(and agent chat model) so repeated generations skip client construction and
+TLS handshakes. Each pool records connections opened/reused and latencies.
+"""
+
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+
+class PoolStats:
+    """Thread-safe connection and latency counters for one HTTP client"""
+
+    def __init__(self, max_samples: int = 10000):
+        self._lock = threading.Lock()
+        self._started: Dict[int, float] = {}
+        # Live network streams by id; entries go away when a connection is closed
+        self._streams: "weakref.WeakValueDictionary[int, Any]" = weakref.WeakValueDictionary()
+        self.requests = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.latencies = deque(maxlen=max_samples)
+
+    def on_request(self, request):
+        with self._lock:
+            self._started[id(request)] = time.perf_counter()
+
+    def on_response(self, response):
+        now = time.perf_counter()
+        stream = response.extensions.get("network_stream")
+
+        with self._lock:
+            started = self._started.pop(id(response.request), None)
+            self.requests += 1
+            if started is not None:
+                self.latencies.append(now - started)
+
+            if stream is not None:
+                if self._streams.get(id(stream)) is stream:
+                    self.connections_reused += 1
+                else:
+                    self._streams[id(stream)] = stream
+                    self.connections_opened += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters plus latency percentiles (seconds, time to response headers)"""
+        with self._lock:
+            latencies = np.array(self.latencies, dtype=float)
+            stats = {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "connections_reused": self.connections_reused,
+            }
+
+        for name, q in (("latency_p50", 50), ("latency_p95", 95), ("latency_p99", 99)):
+            stats[name] = float(np.percentile(latencies, q)) if latencies.size else None
+        return stats
+
+
+class ClientPool:
+    """
+    Registry of shared HTTP clients and LLM clients
+
+    http_client() returns one keep-alive client per (provider, model) built
+    by the provider SDK's DefaultHttpxClient, instrumented with PoolStats.
+    llm_client() returns one LLMClient per (model, api_key) on top of it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._http_clients: Dict[Tuple[str, Optional[str]], Any] = {}
+        self._stats: Dict[Tuple[str, Optional[str]], PoolStats] = {}
+        self._llm_clients: Dict[Tuple[str, Optional[str]], Any] = {}
+
+    def http_client(self, provider: str, model: Optional[str] = None):
+        """Shared keep-alive HTTP client for a provider/model"""
+        key = (provider, model)
+        with self._lock:
+            if key not in self._http_clients:
+                stats = PoolStats()
+                client_class = self._default_client_class(provider)
+                self._http_clients[key] = client_class(
+                    event_hooks={"request": [stats.on_request], "response": [stats.on_response]}
+                )
+                self._stats[key] = stats
+            return self._http_clients[key]
+
+    def llm_client(self, model: Optional[str] = None, api_key: Optional[str] = None):
+        """Shared LLMClient for a model, using the pooled HTTP client"""
+        from .llm_client import LLMClient
+        from .config import MODEL
+
+        model = model or MODEL
+        key = (model, api_key)
+        with self._lock:
+            client = self._llm_clients.get(key)
+        if client is not None:
+            return client
+
+        client = LLMClient(api_key=api_key, model=model, client_pool=self)
+        with self._lock:
+            return self._llm_clients.setdefault(key, client)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Pool statistics keyed by "provider/model" """
+        with self._lock:
+            items = list(self._stats.items())
+        return {f"{provider}/{model or '*'}": stats.snapshot() for (provider, model), stats in items}
+
+    def close(self):
+        """Close all pooled connections and forget shared clients"""
+        with self._lock:
+            clients = list(self._http_clients.values())
+            self._http_clients.clear()
+            self._stats.clear()
+            self._llm_clients.clear()
+        for client in clients:
+            client.close()
+
+    def _default_client_class(self, provider: str):
+        """The httpx client class the provider SDK expects (same defaults/timeouts)"""
+        if provider == "anthropic":
+            import anthropic
+            return anthropic.DefaultHttpxClient
+        import openai
+        return openai.DefaultHttpxClient
+
+
+_default_pool: Optional[ClientPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_client_pool() -> ClientPool:
+    """Process-wide client pool"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ClientPool()
+        return _default_pool
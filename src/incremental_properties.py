@@ -0,0 +1,395 @@
+# src/incremental_properties.py
+"""
+Incremental foundational property extraction
+Transformers usually edit one statement at a time, so properties are kept as
+per-unit summaries (top-level statements and methods of plain classes) and
+recombined into program-level properties. After an edit only the units whose
+AST changed are re-extracted; the result equals extract_all_properties.
+"""
+
+import ast
+import copy
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+
+from .foundational_properties import FoundationalProperties, AlphaRenamer
+
+
+# Placeholder statement spliced out of container dumps when composing hashes
+_SENTINEL = ast.Expr(value=ast.Constant(value="__skyt_units__"))
+_SENTINEL_DUMP = ast.dump(_SENTINEL, annotate_fields=False)
+
+# Properties extracted per unit and merged by _merge_* below; anything else
+# (e.g. behavioral_signature) is extracted on the whole tree
+_LOCAL_PROPERTIES = [
+    "control_flow_signature",
+    "execution_paths",
+    "function_contracts",
+    "side_effect_profile",
+    "termination_properties",
+    "algebraic_structure",
+    "numerical_behavior",
+    "logical_equivalence",
+    "operator_precedence",
+    "statement_ordering",
+    "recursion_schema"
+]
+
+
+@dataclass
+class _UnitSummary:
+    """Properties of one unit, extracted as if it were a module on its own"""
+    props: Dict[str, Any]
+    dependency_events: List[Tuple[str, List[str], str]]
+    complexity_events: List[Tuple[str, str]]
+    max_loop_depth: int
+    node_types: List[str]
+    ast_depth: int
+    dump: str
+    # Alpha-renamed dump, valid only for the renamer state it was computed from
+    alpha_state_in: Optional[Tuple] = None
+    alpha_state_out: Optional[Tuple] = None
+    alpha_dump: Optional[str] = None
+
+
+class IncrementalPropertyExtractor:
+    """
+    Drop-in replacement for FoundationalProperties.extract_all_properties that
+    reuses the summaries of unchanged statements between calls
+
+    Units are keyed by their AST dump, so a summary is reused wherever the
+    same statement appears again, whatever its position or formatting.
+    """
+
+    def __init__(self, extractor: Optional[FoundationalProperties] = None,
+                 max_cached_units: int = 4096):
+        self.extractor = extractor or FoundationalProperties()
+        self.max_cached_units = max_cached_units
+        self._units: "OrderedDict[Tuple[str, str], _UnitSummary]" = OrderedDict()
+        self.stats = {"units_reused": 0, "units_extracted": 0, "full_extractions": 0}
+
+    def clear(self):
+        """Drop all cached unit summaries"""
+        self._units.clear()
+
+    def extract_all_properties(self, code: str) -> Dict[str, Any]:
+        """
+        Extract all foundational properties, reusing cached unit summaries
+
+        Args:
+            code: Python code string
+
+        Returns:
+            Same dictionary as FoundationalProperties.extract_all_properties
+        """
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            return {prop: None for prop in self.extractor.properties}
+
+        if not tree.body:
+            self.stats["full_extractions"] += 1
+            return self.extractor.extract_all_properties(code)
+
+        units, layout = self._collect_units(tree)
+        summaries = [summary for summary, _, _ in units]
+
+        properties = {}
+        for prop_name in self.extractor.properties:
+            if prop_name == "data_dependency_graph":
+                properties[prop_name] = self.extractor._fold_dependency_events(
+                    [e for summary in summaries for e in summary.dependency_events]
+                )
+            elif prop_name == "complexity_class":
+                properties[prop_name] = self.extractor._fold_complexity_events(
+                    [e for summary in summaries for e in summary.complexity_events],
+                    max(summary.max_loop_depth for summary in summaries)
+                )
+            elif prop_name == "normalized_ast_structure":
+                properties[prop_name] = self._merge_ast_structure(tree, units, layout)
+            elif prop_name in _MERGERS:
+                properties[prop_name] = _MERGERS[prop_name](
+                    self.extractor, [summary.props[prop_name] for summary in summaries]
+                )
+            else:
+                method = getattr(self.extractor, f"_extract_{prop_name}", None)
+                properties[prop_name] = method(tree, code) if method else None
+
+        return properties
+
+    def _collect_units(self, tree: ast.Module) -> Tuple[List[Tuple[_UnitSummary, int, ast.AST]], List[Any]]:
+        """
+        Split the module into units and look up or extract their summaries
+
+        Plain classes (no decorators or type parameters) become a header unit
+        plus one unit per body statement, so editing one method does not
+        re-extract the whole class.
+
+        Returns:
+            (units, layout): units are (summary, depth offset, node) in
+            pre-order; layout has one entry per top-level statement, either a
+            unit index or (header index, [member indices]) for split classes
+        """
+        units, layout = [], []
+
+        for stmt in tree.body:
+            header = self._class_header(stmt)
+            if header is None:
+                layout.append(len(units))
+                units.append((self._summary(stmt, "unit"), 0, stmt))
+                continue
+
+            header_index = len(units)
+            units.append((self._summary(header, "class"), 0, header))
+            members = []
+            for member in stmt.body:
+                members.append(len(units))
+                units.append((self._summary(member, "unit"), 1, member))
+            layout.append((header_index, members))
+
+        return units, layout
+
+    def _class_header(self, stmt: ast.stmt) -> Optional[ast.ClassDef]:
+        """Copy of a splittable class with its body replaced by the sentinel"""
+        if (not isinstance(stmt, ast.ClassDef) or stmt.decorator_list
+                or getattr(stmt, "type_params", None)):
+            return None
+
+        header = copy.copy(stmt)
+        header.body = [_SENTINEL]
+        if ast.dump(header, annotate_fields=False).count(_SENTINEL_DUMP) != 1:
+            return None  # The sentinel text occurs in the class header itself
+        return header
+
+    def _summary(self, node: ast.AST, kind: str) -> _UnitSummary:
+        """Cached summary of one unit, extracting it on a miss"""
+        dump = ast.dump(node, annotate_fields=False)
+        key = (kind, dump)
+        summary = self._units.get(key)
+
+        if summary is not None:
+            self._units.move_to_end(key)
+            self.stats["units_reused"] += 1
+            return summary
+
+        summary = self._extract_unit(node, dump, kind)
+        self._units[key] = summary
+        if len(self._units) > self.max_cached_units:
+            self._units.popitem(last=False)
+        self.stats["units_extracted"] += 1
+        return summary
+
+    def _extract_unit(self, node: ast.AST, dump: str, kind: str) -> _UnitSummary:
+        """Extract the properties of one unit wrapped in its own module"""
+        extractor = self.extractor
+        if kind == "class":
+            # The header contributes the class itself, its bases and keywords
+            node = copy.copy(node)
+            node.body = []
+        module = ast.Module(body=[node], type_ignores=[])
+
+        props = {}
+        for prop_name in _LOCAL_PROPERTIES:
+            props[prop_name] = getattr(extractor, f"_extract_{prop_name}")(module, "")
+
+        complexity_events, max_loop_depth = extractor._collect_complexity_events(module)
+        node_types, ast_depth = extractor._collect_ast_shape(module)
+
+        return _UnitSummary(
+            props=props,
+            dependency_events=extractor._collect_dependency_events(module),
+            complexity_events=complexity_events,
+            max_loop_depth=max_loop_depth,
+            node_types=node_types[1:],  # Drop the wrapper "Module"
+            ast_depth=ast_depth,
+            dump=dump
+        )
+
+    def _merge_ast_structure(self, tree: ast.Module, units: List[Tuple[_UnitSummary, int, ast.AST]],
+                             layout: List[Any]) -> Dict[str, Any]:
+        """Recombine node types, depth and both AST hashes from unit summaries"""
+        structure = {
+            "node_types": ["Module"],
+            "ast_depth": 0,
+            "ast_hash": "",
+            "alpha_renamed_hash": ""
+        }
+        for summary, offset, _ in units:
+            structure["node_types"].extend(summary.node_types)
+            structure["ast_depth"] = max(structure["ast_depth"], summary.ast_depth + offset)
+
+        module_template = ast.dump(ast.Module(body=[_SENTINEL], type_ignores=tree.type_ignores),
+                                   annotate_fields=False)
+
+        dumps = [summary.dump for summary, _, _ in units]
+        ast_dump = _compose(module_template, dumps, layout)
+        structure["ast_hash"] = hashlib.md5(ast_dump.encode()).hexdigest()
+
+        try:
+            alpha_dumps = self._alpha_rename_units(units)
+            alpha_dump = _compose(module_template, alpha_dumps, layout)
+            structure["alpha_renamed_hash"] = hashlib.md5(alpha_dump.encode()).hexdigest()
+        except Exception:
+            # Fallback to original hash if α-renaming fails
+            structure["alpha_renamed_hash"] = structure["ast_hash"]
+
+        return structure
+
+    def _alpha_rename_units(self, units: List[Tuple[_UnitSummary, int, ast.AST]]) -> List[str]:
+        """
+        Alpha-renamed dumps of all units, renaming in program order
+
+        The renamer state threads through the units, so a unit's cached
+        renamed dump is reused only when it is entered with the same state.
+        """
+        renamer = AlphaRenamer()
+        alpha_dumps = []
+
+        for summary, _, node in units:
+            state = (dict(renamer.var_map), renamer.counter, frozenset(renamer.param_names))
+
+            if summary.alpha_dump is None or summary.alpha_state_in != state:
+                renamed = renamer.visit(copy.deepcopy(node))
+                summary.alpha_dump = ast.dump(renamed, annotate_fields=False)
+                summary.alpha_state_in = state
+                summary.alpha_state_out = (dict(renamer.var_map), renamer.counter,
+                                           frozenset(renamer.param_names))
+            else:
+                var_map, counter, param_names = summary.alpha_state_out
+                renamer.var_map = dict(var_map)
+                renamer.counter = counter
+                renamer.param_names = set(param_names)
+
+            alpha_dumps.append(summary.alpha_dump)
+
+        return alpha_dumps
+
+
+def _compose(module_template: str, dumps: List[str], layout: List[Any]) -> str:
+    """Splice unit dumps into the module template (and class header templates)"""
+    statements = []
+    for part in layout:
+        if isinstance(part, int):
+            statements.append(dumps[part])
+        else:
+            header_index, members = part
+            body = ", ".join(dumps[i] for i in members)
+            statements.append(dumps[header_index].replace(_SENTINEL_DUMP, body, 1))
+
+    return module_template.replace(_SENTINEL_DUMP, ", ".join(statements), 1)
+
+
+def _merge_control_flow(extractor: FoundationalProperties, parts: List[Dict]) -> Dict[str, Any]:
+    return {
+        "if_statements": sum(p["if_statements"] for p in parts),
+        "for_loops": sum(p["for_loops"] for p in parts),
+        "while_loops": sum(p["while_loops"] for p in parts),
+        "function_calls": [c for p in parts for c in p["function_calls"]],
+        "nested_depth": max(p["nested_depth"] for p in parts),
+        "branch_patterns": [b for p in parts for b in p["branch_patterns"]]
+    }
+
+
+def _merge_execution_paths(extractor: FoundationalProperties, parts: List[Dict]) -> Dict[str, Any]:
+    # Copies throughout: callers must not be able to mutate cached summaries
+    return {"execution_paths": [list(path) for p in parts for path in p["execution_paths"]]}
+
+
+def _merge_function_contracts(extractor: FoundationalProperties, parts: List[Dict]) -> Dict[str, Any]:
+    contracts = {}
+    for p in parts:
+        for name, contract in p.items():
+            contracts[name] = dict(contract, args=list(contract["args"]))
+    return contracts
+
+
+def _merge_side_effect_profile(extractor: FoundationalProperties, parts: List[Dict]) -> Dict[str, Any]:
+    return {
+        "has_print": any(p["has_print"] for p in parts),
+        "has_global_access": any(p["has_global_access"] for p in parts),
+        "has_file_io": any(p["has_file_io"] for p in parts),
+        "modifies_arguments": any(p["modifies_arguments"] for p in parts),
+        "is_pure": all(p["is_pure"] for p in parts)
+    }
+
+
+def _merge_termination_properties(extractor: FoundationalProperties, parts: List[Dict]) -> Dict[str, Any]:
+    return {
+        "has_base_case": any(p["has_base_case"] for p in parts),
+        "has_bounded_loops": any(p["has_bounded_loops"] for p in parts),
+        "recursive_depth": max(p["recursive_depth"] for p in parts)
+    }
+
+
+def _merge_algebraic_structure(extractor: FoundationalProperties, parts: List[Dict]) -> Dict[str, Any]:
+    return {
+        "commutative_ops": [o for p in parts for o in p["commutative_ops"]],
+        "associative_ops": [o for p in parts for o in p["associative_ops"]],
+        "binary_operations": [o for p in parts for o in p["binary_operations"]]
+    }
+
+
+def _merge_numerical_behavior(extractor: FoundationalProperties, parts: List[Dict]) -> Dict[str, Any]:
+    return {
+        "uses_integers": any(p["uses_integers"] for p in parts),
+        "uses_floats": any(p["uses_floats"] for p in parts),
+        "has_arithmetic": any(p["has_arithmetic"] for p in parts),
+        "numeric_constants": [c for p in parts for c in p["numeric_constants"]]
+    }
+
+
+def _merge_logical_equivalence(extractor: FoundationalProperties, parts: List[Dict]) -> Dict[str, Any]:
+    return {
+        "boolean_ops": [o for p in parts for o in p["boolean_ops"]],
+        "comparisons": [c for p in parts for c in p["comparisons"]],
+        "logical_patterns": [l for p in parts for l in p["logical_patterns"]]
+    }
+
+
+def _merge_operator_precedence(extractor: FoundationalProperties, parts: List[Dict]) -> Dict[str, Any]:
+    levels = {}
+    for p in parts:
+        levels.update(p["precedence_levels"])
+    return {
+        "operator_sequence": [o for p in parts for o in p["operator_sequence"]],
+        "precedence_levels": levels
+    }
+
+
+def _merge_statement_ordering(extractor: FoundationalProperties, parts: List[Dict]) -> Dict[str, Any]:
+    statement_types = [t for p in parts for t in p["statement_types"]]
+    return {
+        "statement_types": statement_types,
+        # Sequence numbers are global, so they are renumbered after merging
+        "statement_sequence": [f"{t}_{i}" for i, t in enumerate(statement_types)],
+        "control_flow_order": [t for p in parts for t in p["control_flow_order"]]
+    }
+
+
+def _merge_recursion_schema(extractor: FoundationalProperties, parts: List[Dict]) -> Dict[str, Any]:
+    schema = {
+        "is_recursive": any(p["is_recursive"] for p in parts),
+        "base_cases": [dict(b) for p in parts for b in p["base_cases"]],
+        "recursive_calls": [dict(c, arg_patterns=list(c["arg_patterns"]))
+                            for p in parts for c in p["recursive_calls"]],
+        "recursion_pattern": None,
+        "termination_guards": [g for p in parts for g in p["termination_guards"]]
+    }
+    return extractor._classify_recursion_pattern(schema)
+
+
+_MERGERS = {
+    "control_flow_signature": _merge_control_flow,
+    "execution_paths": _merge_execution_paths,
+    "function_contracts": _merge_function_contracts,
+    "side_effect_profile": _merge_side_effect_profile,
+    "termination_properties": _merge_termination_properties,
+    "algebraic_structure": _merge_algebraic_structure,
+    "numerical_behavior": _merge_numerical_behavior,
+    "logical_equivalence": _merge_logical_equivalence,
+    "operator_precedence": _merge_operator_precedence,
+    "statement_ordering": _merge_statement_ordering,
+    "recursion_schema": _merge_recursion_schema
+}
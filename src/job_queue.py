@@ -0,0 +1,227 @@
+# src/job_queue.py
+"""
+SQLite-backed job queue with lease/heartbeat semantics
+Lets independent worker processes (on one machine, or several machines
+sharing the outputs directory) split up experiment work without an external
+broker.
+
+A worker claims a job by taking a lease on it; while working it renews the
+lease with heartbeat(). If the worker dies, the lease expires and the job is
+handed to the next worker that asks (up to max_attempts claims). Jobs carry a
+group and may wait on another group ("after"): they are not claimable while
+any job of that group is still pending or leased. Jobs sharing an "exclusive"
+key (e.g. jobs writing the same canon) are never leased at the same time.
+
+The database uses SQLite's default rollback journal rather than WAL, because
+WAL does not work on network filesystems.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Iterable
+
+from .config import OUTPUTS_DIR, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS
+
+QUEUE_FILENAME = "job_queue.sqlite"
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    stage TEXT NOT NULL,
+    group_key TEXT NOT NULL,
+    after TEXT,
+    exclusive TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    enqueued REAL NOT NULL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, stage);
+CREATE INDEX IF NOT EXISTS idx_jobs_group ON jobs (group_key, status);
+CREATE INDEX IF NOT EXISTS idx_jobs_exclusive ON jobs (exclusive, status);
+"""
+
+
+@dataclass
+class Job:
+    """A claimed job"""
+    id: int
+    key: str
+    stage: str
+    group_key: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+class JobQueue:
+    """
+    Persistent work queue in a SQLite file
+
+    Args:
+        db_path: Queue database (default: outputs/job_queue.sqlite)
+        lease_seconds: Lease granted by claim() and renewed by heartbeat()
+        max_attempts: Claims per job before it is marked failed
+
+    Usage:
+        queue = JobQueue()
+        queue.enqueue("generate:fib:0", "generate", "fib", {"run": 0})
+        job = queue.claim("host:123", stages=["generate"])
+        queue.complete(job, "host:123", {"code": "..."})
+    """
+
+    def __init__(self, db_path: Optional[str] = None, lease_seconds: float = JOB_LEASE_SECONDS,
+                 max_attempts: int = JOB_MAX_ATTEMPTS):
+        self.db_path = db_path or os.path.join(OUTPUTS_DIR, QUEUE_FILENAME)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        # Autocommit mode; claim() opens its own write transaction
+        self._conn = sqlite3.connect(self.db_path, timeout=60, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+
+    # === Producers ===
+
+    def enqueue(self, key: str, stage: str, group_key: str, payload: Dict[str, Any],
+                after: Optional[str] = None, exclusive: Optional[str] = None) -> bool:
+        """
+        Add a job unless one with the same key already exists
+
+        Returns:
+            True if the job was added
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO jobs (key, stage, group_key, after, exclusive, payload, enqueued) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, stage, group_key, after, exclusive, json.dumps(payload), time.time()))
+        return cursor.rowcount == 1
+
+    # === Workers ===
+
+    def claim(self, worker_id: str, stages: Optional[Iterable[str]] = None) -> Optional[Job]:
+        """
+        Lease the oldest claimable job
+
+        A job is claimable if it is pending, or leased with an expired lease,
+        no job of the group it waits on is still pending or leased, and no
+        other job with its exclusive key holds a live lease.
+
+        Returns:
+            The claimed job, or None if nothing is claimable right now
+        """
+        stages = list(stages) if stages is not None else None
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs whose worker died on every attempt are given up on
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = 'lease expired', finished = ? "
+                    "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                    (FAILED, now, LEASED, now, self.max_attempts))
+
+                query = (
+                    "SELECT * FROM jobs AS j WHERE (j.status = ? OR (j.status = ? AND j.lease_expires < ?)) "
+                    "AND (j.after IS NULL OR NOT EXISTS (SELECT 1 FROM jobs AS d "
+                    "WHERE d.group_key = j.after AND d.status IN (?, ?))) "
+                    "AND (j.exclusive IS NULL OR NOT EXISTS (SELECT 1 FROM jobs AS x "
+                    "WHERE x.exclusive = j.exclusive AND x.id != j.id AND x.status = ? AND x.lease_expires >= ?))")
+                params: List[Any] = [PENDING, LEASED, now, PENDING, LEASED, LEASED, now]
+                if stages is not None:
+                    query += f" AND j.stage IN ({', '.join('?' * len(stages))})"
+                    params.extend(stages)
+                row = self._conn.execute(query + " ORDER BY j.id LIMIT 1", params).fetchone()
+
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, worker = ?, lease_expires = ?, attempts = attempts + 1 "
+                        "WHERE id = ?",
+                        (LEASED, worker_id, now + self.lease_seconds, row["id"]))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        if row is None:
+            return None
+        return Job(row["id"], row["key"], row["stage"], row["group_key"],
+                   json.loads(row["payload"]), row["attempts"] + 1)
+
+    def heartbeat(self, job: Job, worker_id: str) -> bool:
+        """
+        Renew the lease on a claimed job
+
+        Returns:
+            False if the lease was lost (it expired and the job was reclaimed)
+        """
+        return self._update_leased(job, worker_id, "lease_expires = ?", time.time() + self.lease_seconds)
+
+    def complete(self, job: Job, worker_id: str, result: Any = None) -> bool:
+        """Mark a claimed job done and store its JSON-serializable result"""
+        return self._update_leased(job, worker_id, "status = ?, result = ?, error = NULL, finished = ?",
+                                   DONE, json.dumps(result), time.time())
+
+    def fail(self, job: Job, worker_id: str, error: str, retry: bool = True) -> bool:
+        """Give a claimed job back for another attempt, or mark it failed (after max_attempts or without retry)"""
+        status = PENDING if retry and job.attempts < self.max_attempts else FAILED
+        return self._update_leased(job, worker_id, "status = ?, error = ?, lease_expires = NULL, finished = ?",
+                                   status, error, time.time() if status == FAILED else None)
+
+    def _update_leased(self, job: Job, worker_id: str, assignments: str, *values) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND worker = ? AND status = ?",
+                (*values, job.id, worker_id, LEASED))
+        return cursor.rowcount == 1
+
+    # === Inspection ===
+
+    def results(self, group_key: str, stage: str) -> List[Any]:
+        """Results of the done jobs of one group and stage, in enqueue order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT result FROM jobs WHERE group_key = ? AND stage = ? AND status = ? ORDER BY id",
+                (group_key, stage, DONE)).fetchall()
+        return [json.loads(row["result"]) for row in rows]
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """Number of jobs per stage and status"""
+        counts: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            for row in self._conn.execute("SELECT stage, status, COUNT(*) AS n FROM jobs GROUP BY stage, status"):
+                counts.setdefault(row["stage"], {})[row["status"]] = row["n"]
+        return counts
+
+    def unfinished(self, stages: Optional[Iterable[str]] = None) -> int:
+        """Number of jobs (of the given stages) still pending or leased"""
+        query, params = "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", [PENDING, LEASED]
+        if stages is not None:
+            stages = list(stages)
+            query += f" AND stage IN ({', '.join('?' * len(stages))})"
+            params.extend(stages)
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
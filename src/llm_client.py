@@ -6,20 +6,54 @@ Focuses on clean code generation without complex middleware
 
 import openai
 import re
-from typing import Optional
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, List, Dict, Any, Callable
 from .config import OPENAI_API_KEY, MODEL
+from .tracing import traced
 import os
 
 
+SYSTEM_PROMPT = "You are a Python code generator. Generate only clean, working Python code without explanations."
+
+# What each provider can do to return several samples for one prompt.
+#   choices_per_request: max samples in one synchronous request (1 = no `n`)
+#   batch_api: asynchronous batch jobs exist (hours of latency, so they are
+#              not used for interactive sweeps)
+PROVIDER_CAPABILITIES = {
+    "openai": {"choices_per_request": 128, "batch_api": True},
+    "anthropic": {"choices_per_request": 1, "batch_api": True},
+}
+
+
+def _llm_span_attributes(args: Dict[str, Any]) -> Dict[str, Any]:
+    """Tracing attributes for LLMClient calls"""
+    return {"provider": args["self"].provider, "model": args["self"].model,
+            "temperature": args["temperature"]}
+
+
 class LLMClient:
     """Multi-provider LLM client for code generation (OpenAI and Anthropic)"""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = MODEL):
+    def __init__(self, api_key: Optional[str] = None, model: str = MODEL,
+                 max_concurrency: int = 8, client_pool=None):
+        """
+        Args:
+            api_key: Provider API key (defaults to the environment)
+            model: Model name; the provider is detected from it
+            max_concurrency: Parallel requests in generate_samples fallbacks
+            client_pool: Optional http_pool.ClientPool whose keep-alive HTTP
+                client for this provider/model is used for all requests
+        """
         self.model = model
         self.provider = self._detect_provider(model)
+        self.max_concurrency = max_concurrency
+        http_kwargs = {}
+        if client_pool is not None:
+            http_kwargs["http_client"] = client_pool.http_client(self.provider, model)
         
         if self.provider == "openai":
-            self.client = openai.OpenAI(api_key=api_key or OPENAI_API_KEY)
+            self.client = openai.OpenAI(api_key=api_key or OPENAI_API_KEY, **http_kwargs)
             if not (api_key or OPENAI_API_KEY):
                 raise ValueError("OpenAI API key required. Set OPENAI_API_KEY environment variable.")
         elif self.provider == "anthropic":
@@ -28,7 +62,7 @@ class LLMClient:
                 anthropic_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
                 if not anthropic_key:
                     raise ValueError("Anthropic API key required. Set ANTHROPIC_API_KEY environment variable.")
-                self.client = anthropic.Anthropic(api_key=anthropic_key)
+                self.client = anthropic.Anthropic(api_key=anthropic_key, **http_kwargs)
             except ImportError:
                 raise ImportError("anthropic package required for Claude models. Install with: pip install anthropic")
         else:
@@ -44,6 +78,7 @@ class LLMClient:
             # Default to OpenAI for backward compatibility
             return "openai"
     
+    @traced("llm.generate_code", _llm_span_attributes)
     def generate_code(self, prompt: str, temperature: float = 0.0) -> str:
         """
         Generate code from prompt
@@ -56,12 +91,7 @@ class LLMClient:
             Generated code as string
         """
         try:
-            if self.provider == "openai":
-                raw_output = self._generate_openai(prompt, temperature)
-            elif self.provider == "anthropic":
-                raw_output = self._generate_anthropic(prompt, temperature)
-            else:
-                raise ValueError(f"Unsupported provider: {self.provider}")
+            raw_output = self._generate_raw(prompt, temperature)
             
             # Extract Python code from response
             code = self._extract_python_code(raw_output)
@@ -71,38 +101,144 @@ class LLMClient:
         except Exception as e:
             raise RuntimeError(f"LLM generation failed: {e}")
     
-    def _generate_openai(self, prompt: str, temperature: float) -> str:
-        """Generate code using OpenAI API"""
+    @traced("llm.generate_samples", lambda a: dict(_llm_span_attributes(a), n=a["n"]))
+    def generate_samples(self, prompt: str, temperature: float = 0.0, n: int = 1,
+                         on_sample: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Generate n independent samples for one prompt in as few requests as possible
+        
+        Providers that return several choices per request (see
+        PROVIDER_CAPABILITIES) get ceil(n / limit) requests; otherwise, or if
+        a multi-choice request fails, samples are fetched with concurrent
+        single requests.
+        
+        Note: choices of one request share a single API call, which can hide
+        call-to-call nondeterminism. The "mode" in each sample's provenance
+        records how it was obtained.
+        
+        Args:
+            prompt: The code generation prompt
+            temperature: Sampling temperature
+            n: Number of samples
+            on_sample: Called with each sample as soon as it is final (e.g. to
+                persist it), in completion order
+            
+        Returns:
+            One dict per run index (0..n-1), in order: run_index, code,
+            raw_output, success, error and provenance (provider, model, mode,
+            request_index, choice_index, response_id)
+        """
+        samples: List[Optional[Dict[str, Any]]] = [None] * n
+        per_request = PROVIDER_CAPABILITIES.get(self.provider, {}).get("choices_per_request", 1)
+        pending = list(range(n))
+        
+        if per_request > 1 and n > 1:
+            pending = []
+            for request_index, start in enumerate(range(0, n, per_request)):
+                run_indices = list(range(start, min(start + per_request, n)))
+                try:
+                    response_id, outputs = self._generate_openai_choices(
+                        prompt, temperature, len(run_indices)
+                    )
+                except Exception:
+                    pending.extend(run_indices)  # Retried as single requests below
+                    continue
+                
+                for choice_index, run_index in enumerate(run_indices):
+                    provenance = {"mode": "multi_choice", "request_index": request_index,
+                                  "choice_index": choice_index, "response_id": response_id}
+                    raw_output = outputs[choice_index] if choice_index < len(outputs) else None
+                    if raw_output is None:
+                        pending.append(run_index)
+                    else:
+                        samples[run_index] = self._make_sample(run_index, raw_output, None, provenance)
+                        if on_sample:
+                            on_sample(samples[run_index])
+        
+        if pending:
+            def fetch(run_index: int) -> Dict[str, Any]:
+                provenance = {"mode": "single", "request_index": None,
+                              "choice_index": 0, "response_id": None}
+                try:
+                    return self._make_sample(run_index, self._generate_raw(prompt, temperature),
+                                             None, provenance)
+                except Exception as e:
+                    return self._make_sample(run_index, None, f"LLM generation failed: {e}", provenance)
+            
+            # Each worker runs in a copy of this context so its spans nest under ours
+            contexts = [contextvars.copy_context() for _ in pending]
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(pending)))) as pool:
+                futures = [pool.submit(ctx.run, fetch, i) for ctx, i in zip(contexts, pending)]
+                for future in as_completed(futures):
+                    sample = future.result()
+                    samples[sample["run_index"]] = sample
+                    if on_sample:
+                        on_sample(sample)
+        
+        return samples
+    
+    def _make_sample(self, run_index: int, raw_output: Optional[str], error: Optional[str],
+                     provenance: Dict[str, Any]) -> Dict[str, Any]:
+        """One generate_samples entry with provider/model provenance"""
+        return {
+            "run_index": run_index,
+            "code": self._extract_python_code(raw_output) if raw_output is not None else None,
+            "raw_output": raw_output,
+            "success": raw_output is not None,
+            "error": error,
+            "provenance": {"provider": self.provider, "model": self.model, **provenance}
+        }
+    
+    @traced("llm.request", _llm_span_attributes)
+    def _generate_raw(self, prompt: str, temperature: float) -> str:
+        """One request, raw model text"""
+        if self.provider == "openai":
+            return self._generate_openai(prompt, temperature)
+        elif self.provider == "anthropic":
+            return self._generate_anthropic(prompt, temperature)
+        raise ValueError(f"Unsupported provider: {self.provider}")
+    
+    def _openai_request_kwargs(self, prompt: str, temperature: float) -> Dict[str, Any]:
+        """Chat completion arguments shared by single and multi-choice requests"""
+        kwargs = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": temperature
+        }
         # GPT-5+ models use max_completion_tokens instead of max_tokens
         if self.model.startswith("gpt-5") or self.model.startswith("o1"):
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a Python code generator. Generate only clean, working Python code without explanations."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=temperature,
-                max_completion_tokens=1000
-            )
+            kwargs["max_completion_tokens"] = 1000
         else:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a Python code generator. Generate only clean, working Python code without explanations."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=temperature,
-                max_tokens=1000
-            )
+            kwargs["max_tokens"] = 1000
+        return kwargs
+    
+    def _generate_openai(self, prompt: str, temperature: float) -> str:
+        """Generate code using OpenAI API"""
+        response = self.client.chat.completions.create(**self._openai_request_kwargs(prompt, temperature))
         return response.choices[0].message.content
     
+    @traced("llm.request", lambda a: dict(_llm_span_attributes(a), n=a["n"]))
+    def _generate_openai_choices(self, prompt: str, temperature: float, n: int):
+        """One OpenAI request returning n choices: (response id, texts by choice index)"""
+        response = self.client.chat.completions.create(
+            n=n, **self._openai_request_kwargs(prompt, temperature)
+        )
+        outputs = [None] * n
+        for choice in response.choices:
+            if 0 <= choice.index < n:
+                outputs[choice.index] = choice.message.content
+        return getattr(response, "id", None), outputs
+    
     def _generate_anthropic(self, prompt: str, temperature: float) -> str:
         """Generate code using Anthropic API"""
         response = self.client.messages.create(
             model=self.model,
             max_tokens=1000,
             temperature=temperature,
-            system="You are a Python code generator. Generate only clean, working Python code without explanations.",
+            system=SYSTEM_PROMPT,
             messages=[
                 {"role": "user", "content": prompt}
             ]
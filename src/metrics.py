@@ -13,6 +13,10 @@ import numpy as np
 from .oracle_system import OracleSystem
 from .foundational_properties import FoundationalProperties
 from .canon_system import CanonSystem
+from .structural_clustering import MinHashLSHClusterer
+from .fingerprint import structural_fingerprint
+from .property_records import PropertyTable
+from .tracing import traced
 
 
 class ComprehensiveMetrics:
@@ -22,10 +26,13 @@ class ComprehensiveMetrics:
         self.oracle_system = OracleSystem()
         self.properties_extractor = FoundationalProperties()
         self.canon_system = canon_system
+        self.structural_clusterer = MinHashLSHClusterer()
         
         # Default thresholds for R_repair@k
         self.repair_thresholds = [0.05, 0.1, 0.15, 0.2]
     
+    @traced("metrics.comprehensive", lambda a: {"contract_id": a["contract_id"],
+                                                "num_outputs": len(a["raw_outputs"])})
     def calculate_comprehensive_metrics(self, raw_outputs: List[str],
                                         repaired_outputs: List[str],
                                         contract: Dict[str, Any],
@@ -132,6 +139,7 @@ class ComprehensiveMetrics:
             "rescue_rate": rescue_rate,
             "R_behavioral": r_behavioral,
             "R_structural": r_structural,
+            "R_structural_near_duplicate": structural_stats["R_structural_near_duplicate"],
             
             # === LEGACY COMPATIBILITY ===
             "R_canon": r_canon,
@@ -204,18 +212,21 @@ class ComprehensiveMetrics:
                                           contract_id: str) -> tuple[float, Dict[str, Any]]:
         """Calculate structural equivalence using foundational properties"""
         structural_groups = {}
-        property_results = []
+        # Compact records sharing identical property values across outputs
+        property_results = PropertyTable()
         distances = []
         
         # Get canon if available
         canon_data = None
+        canon_properties = None
         if self.canon_system:
             canon_data = self.canon_system.load_canon(contract_id)
+        if canon_data:
+            canon_properties = property_results.record(canon_data["foundational_properties"])
         
         for i, code in enumerate(raw_outputs):
             # Extract foundational properties
-            properties = self.properties_extractor.extract_all_properties(code)
-            property_results.append(properties)
+            properties = property_results.add(self.properties_extractor.extract_all_properties(code))
             
             # Create structural signature
             signature = self._create_structural_signature(properties)
@@ -226,7 +237,7 @@ class ComprehensiveMetrics:
             # Calculate distance to canon if available
             if canon_data:
                 distance = self.properties_extractor.calculate_distance(
-                    canon_data["foundational_properties"], properties
+                    canon_properties, properties
                 )
                 distances.append(distance)
         
@@ -237,10 +248,18 @@ class ComprehensiveMetrics:
         else:
             r_structural = 0.0
         
+        # Near-duplicate clusters (MinHash/LSH over AST node-type shingles)
+        near_duplicate_clusters = self.structural_clusterer.cluster([
+            (properties.get("normalized_ast_structure") or {}).get("node_types")
+            for properties in property_results
+        ])
+        
         stats = {
             "unique_structures": len(structural_groups),
             "property_results": property_results,
             "structural_groups": structural_groups,
+            "near_duplicate_clusters": near_duplicate_clusters,
+            "R_structural_near_duplicate": near_duplicate_clusters["modal_cluster_share"],
             "distances_to_canon": distances,
             "mean_distance": np.mean(distances) if distances else None,
             "std_distance": np.std(distances) if distances else None
@@ -300,38 +319,13 @@ class ComprehensiveMetrics:
         return "".join(signature_parts)
     
     def _create_structural_signature(self, properties: Dict[str, Any]) -> str:
-        """Create signature from foundational properties"""
-        # Create a hash-like signature from key structural properties
-        signature_parts = []
-        
-        key_properties = [
-            "control_flow_signature",
-            "complexity_class", 
-            "side_effect_profile",
-            "normalized_ast_structure"
-        ]
-        
-        for prop_name in key_properties:
-            prop_value = properties.get(prop_name)
-            if prop_value:
-                if isinstance(prop_value, dict):
-                    # Convert dict to hashable form, handling nested lists/dicts
-                    try:
-                        hashable_items = []
-                        for k, v in prop_value.items():
-                            if isinstance(v, (list, dict)):
-                                hashable_items.append((k, str(v)))
-                            else:
-                                hashable_items.append((k, v))
-                        signature_parts.append(str(hash(frozenset(hashable_items))))
-                    except:
-                        signature_parts.append(str(hash(str(prop_value))))
-                else:
-                    signature_parts.append(str(hash(str(prop_value))))
-            else:
-                signature_parts.append("None")
+        """
+        Create signature from foundational properties
         
-        return "_".join(signature_parts)
+        Uses a stable fingerprint (not the per-process salted hash()) so
+        signatures can be persisted and compared across worker processes.
+        """
+        return structural_fingerprint(properties)
     
     def _calculate_entropy(self, counts: List[int]) -> float:
         """Calculate Shannon entropy of distribution"""
@@ -369,11 +363,14 @@ class ComprehensiveMetrics:
         
         exact_matches = 0
         distances = []
+        comparison_tiers = {}
         
         for code in outputs:
             comparison = self.canon_system.compare_to_canon(contract_id, code)
             distance = comparison.get("distance", float('inf'))
             distances.append(distance)
+            tier = comparison.get("comparison_tier", "full")
+            comparison_tiers[tier] = comparison_tiers.get(tier, 0) + 1
             
             if distance == 0.0 or comparison.get("is_identical", False):
                 exact_matches += 1
@@ -385,7 +382,8 @@ class ComprehensiveMetrics:
             "total_outputs": len(outputs),
             "distances": distances,
             "mean_distance": np.mean(distances) if distances else 0.0,
-            "min_distance": np.min(distances) if distances else 0.0
+            "min_distance": np.min(distances) if distances else 0.0,
+            "comparison_tiers": comparison_tiers
         }
         
         return r_anchor, stats
@@ -0,0 +1,302 @@
+# src/metrics_sink.py
+"""
+Concurrency-safe metrics_summary writer and column reader
+One row per experiment is appended to outputs/metrics_summary.csv, with the
+columns declared once in METRICS_SCHEMA. Each row is a single write under an
+advisory lock on a sidecar lock file, so parallel configurations (worker
+mode, several processes) never interleave rows or race on the header.
+
+The CSV stays the source of truth for existing pandas analyses. Every
+METRICS_COMPACT_ROWS appended rows it is compacted into a columnar
+metrics_summary.npz (one array per column). Readers load only the columns
+they ask for from the npz and parse just the CSV rows appended since.
+"""
+
+import io
+import os
+import csv
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Callable, Iterable, Tuple
+
+import numpy as np
+
+from .config import OUTPUTS_DIR, METRICS_COMPACT_ROWS
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+SUMMARY_FILENAME = "metrics_summary.csv"
+COMPACT_FILENAME = "metrics_summary.npz"
+
+# npz members describing which prefix of the CSV they cover
+_COVERED_BYTES = "__csv_bytes__"
+_COVERED_HEADER = "__csv_header__"
+_COVERED_LAST_ROW = "__csv_last_row__"
+
+
+@dataclass(frozen=True)
+class MetricColumn:
+    """One metrics_summary column: name, value type and how to get it from a result"""
+    name: str
+    dtype: str  # "str", "int" or "float"
+    get: Callable[[Dict[str, Any]], Any]
+    fmt: Callable[[Any], str] = str
+
+
+def _metric(name: str) -> MetricColumn:
+    return MetricColumn(name, "float", lambda r: r["metrics"][name], "{:.3f}".format)
+
+
+def _nested(name: str, group: str, key: str) -> MetricColumn:
+    return MetricColumn(name, "float", lambda r: r["metrics"].get(group, {}).get(key, 0.0), "{:.3f}".format)
+
+
+METRICS_SCHEMA: Tuple[MetricColumn, ...] = (
+    MetricColumn("experiment_id", "str", lambda r: r["experiment_id"]),
+    MetricColumn("repo_commit", "str", lambda r: "unknown"),  # can be added via git integration
+    MetricColumn("contract_id", "str", lambda r: r["contract_id"]),
+    MetricColumn("canon_id", "str", lambda r: (r.get("canon_data") or {}).get("canon_id", "unknown")),
+    MetricColumn("model", "str", lambda r: r.get("model", "unknown")),
+    MetricColumn("decoding_temperature", "float", lambda r: r["temperature"]),
+    MetricColumn("runs", "int", lambda r: r["successful_runs"]),
+    MetricColumn("timestamp", "str", lambda r: r["timestamp"]),
+    # Core metrics
+    _metric("R_raw"),
+    _metric("R_anchor_pre"),
+    _metric("R_anchor_post"),
+    _metric("Delta_rescue"),
+    *(_nested(f"R_repair_at_{k}_pre", "R_repair_at_k_pre", f"k={k}") for k in ("0.05", "0.1", "0.15", "0.2")),
+    *(_nested(f"R_repair_at_{k}_post", "R_repair_at_k_post", f"k={k}") for k in ("0.05", "0.1", "0.15", "0.2")),
+    # Distributional metrics
+    _metric("mean_distance_pre"),
+    _metric("std_distance_pre"),
+    _metric("mean_distance_post"),
+    _metric("std_distance_post"),
+    _metric("Delta_mu"),
+    *(_nested(f"Delta_P_tau_{tau}", "Delta_P_tau", f"tau={tau}") for tau in ("0.05", "0.1", "0.15", "0.2")),
+    # Complementary metrics
+    _metric("canon_coverage"),
+    _metric("rescue_rate"),
+    _metric("R_behavioral"),
+    _metric("R_structural"),
+    # Sweep info (empty for individual experiments)
+    MetricColumn("sweep_id", "str", lambda r: ""),
+    MetricColumn("notes", "str", lambda r: ""),
+)
+
+_DTYPES = {column.name: column.dtype for column in METRICS_SCHEMA}
+
+
+def summary_row(result: Dict[str, Any]) -> Dict[str, str]:
+    """Formatted metrics_summary row of an experiment result"""
+    return {column.name: column.fmt(column.get(result)) for column in METRICS_SCHEMA}
+
+
+def _parse(value: str, dtype: str) -> Any:
+    if dtype == "float":
+        return float(value) if value else float("nan")
+    if dtype == "int":
+        return int(float(value)) if value else 0
+    return value
+
+
+@contextmanager
+def _file_lock(path: str):
+    """Exclusive advisory lock on path (created if missing)"""
+    with open(path, "a+b") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class MetricsSink:
+    """
+    metrics_summary.csv of an output directory
+
+    Usage:
+        sink = MetricsSink("outputs")
+        sink.append(experiment_result)
+        columns = sink.load_columns(["contract_id", "R_raw"])
+    """
+
+    def __init__(self, output_dir: str = OUTPUTS_DIR, compact_rows: int = METRICS_COMPACT_ROWS):
+        self.csv_path = os.path.join(output_dir, SUMMARY_FILENAME)
+        self.compact_path = os.path.join(output_dir, COMPACT_FILENAME)
+        self.lock_path = self.csv_path + ".lock"
+        self.compact_rows = compact_rows
+
+    # === Writing ===
+
+    def append(self, result: Dict[str, Any]) -> str:
+        """
+        Append the summary row of an experiment result
+
+        Returns:
+            Path of the CSV
+        """
+        row = summary_row(result)
+        os.makedirs(os.path.dirname(os.path.abspath(self.csv_path)), exist_ok=True)
+        with _file_lock(self.lock_path):
+            header = self._read_header()
+            # Rows follow the file's own header, so older files keep their layout
+            columns = header or [column.name for column in METRICS_SCHEMA]
+            line = _format_line([row.get(name, "") for name in columns])
+            if not header:
+                line = _format_line(columns) + line
+
+            fd = os.open(self.csv_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line.encode("utf-8"))
+            finally:
+                os.close(fd)
+
+            covered, npz = self._compacted_prefix()
+            if npz is not None:
+                npz.close()
+            if self._count_rows_after(covered) >= self.compact_rows:
+                self._compact()
+        return self.csv_path
+
+    def compact(self):
+        """Rewrite the columnar copy to cover the whole CSV"""
+        with _file_lock(self.lock_path):
+            self._compact()
+
+    def _compact(self):
+        header, rows = self._parse_csv(0)
+        if header is None:
+            return
+        arrays = {name: self._column_array(name, [_field(row, i) for row in rows]) for i, name in enumerate(header)}
+        arrays[_COVERED_BYTES] = np.array(os.path.getsize(self.csv_path))
+        arrays[_COVERED_HEADER] = np.array(header)
+        arrays[_COVERED_LAST_ROW] = np.array(self._last_row(int(arrays[_COVERED_BYTES])))
+
+        tmp_path = self.compact_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, self.compact_path)
+
+    @staticmethod
+    def _column_array(name: str, values: List[str]) -> np.ndarray:
+        dtype = _DTYPES.get(name, "str")
+        parsed = [_parse(value, dtype) for value in values]
+        return np.array(parsed, dtype={"float": np.float64, "int": np.int64}.get(dtype, str))
+
+    # === Reading ===
+
+    def load_columns(self, columns: Optional[Iterable[str]] = None) -> Dict[str, List[Any]]:
+        """
+        Selected columns (default: all) as name -> list of typed values
+
+        Columns come from the compacted npz where it is current, plus the CSV
+        rows appended after it.
+        """
+        header = self._read_header()
+        if header is None:
+            return {name: [] for name in (columns or [])}
+        wanted = list(columns) if columns is not None else header
+        missing = [name for name in wanted if name not in header]
+        if missing:
+            raise KeyError(f"Unknown metrics_summary column(s): {', '.join(missing)}")
+
+        values: Dict[str, List[Any]] = {name: [] for name in wanted}
+        covered, npz = self._compacted_prefix(header)
+        if npz is not None:
+            with npz:
+                for name in wanted:
+                    values[name].extend(npz[name].tolist())
+
+        _, rows = self._parse_csv(covered)
+        for name in wanted:
+            i, dtype = header.index(name), _DTYPES.get(name, "str")
+            values[name].extend(_parse(_field(row, i), dtype) for row in rows)
+        return values
+
+    def load_rows(self, columns: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Selected columns (default: all) as one dict per experiment"""
+        values = self.load_columns(columns)
+        return [dict(zip(values, row)) for row in zip(*values.values())]
+
+    # === Internals ===
+
+    def _read_header(self) -> Optional[List[str]]:
+        if not os.path.exists(self.csv_path):
+            return None
+        with open(self.csv_path, "r", encoding="utf-8", newline="") as f:
+            first = f.readline()
+        return next(csv.reader([first]), None) if first.endswith("\n") else None
+
+    def _compacted_prefix(self, header: Optional[List[str]] = None):
+        """(CSV bytes covered by the npz, open npz) - (0, None) if it is missing or stale"""
+        if not os.path.exists(self.compact_path):
+            return 0, None
+        npz = np.load(self.compact_path, allow_pickle=False)
+        covered = int(npz[_COVERED_BYTES])
+        header = header or self._read_header()
+        csv_size = os.path.getsize(self.csv_path) if os.path.exists(self.csv_path) else 0
+        if (covered > csv_size or header != npz[_COVERED_HEADER].tolist()
+                or self._last_row(covered) != npz[_COVERED_LAST_ROW].item()):
+            npz.close()  # CSV was rewritten since the last compaction
+            return 0, None
+        return covered, npz
+
+    def _last_row(self, end: int) -> bytes:
+        """The line ending at byte offset end"""
+        with open(self.csv_path, "rb") as f:
+            f.seek(max(0, end - 4096))
+            data = f.read(end - max(0, end - 4096))
+        return data[data.rfind(b"\n", 0, len(data) - 1) + 1:]
+
+    def _count_rows_after(self, offset: int) -> int:
+        with open(self.csv_path, "rb") as f:
+            f.seek(offset)
+            return f.read().count(b"\n") - (1 if offset == 0 else 0)
+
+    def _parse_csv(self, offset: int) -> Tuple[Optional[List[str]], List[List[str]]]:
+        """Header and the complete rows starting at byte offset (0: whole file)"""
+        if not os.path.exists(self.csv_path):
+            return None, []
+        with open(self.csv_path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        data = data[:data.rfind(b"\n") + 1]  # a row being appended right now
+        rows = [row for row in csv.reader(io.StringIO(data.decode("utf-8"), newline="")) if row]
+        if offset == 0:
+            return (rows[0] if rows else None), rows[1:]
+        return None, rows
+
+
+def _field(row: List[str], index: int) -> str:
+    return row[index] if index < len(row) else ""
+
+
+def _format_line(values: List[Any]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerow(values)
+    return buffer.getvalue()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compact metrics_summary.csv into its columnar copy")
+    parser.add_argument("--output-dir", default=OUTPUTS_DIR, help="Directory with metrics_summary.csv")
+    args = parser.parse_args()
+
+    sink = MetricsSink(args.output_dir)
+    sink.compact()
+    print(f"Compacted {sink.csv_path} -> {sink.compact_path}")
@@ -5,10 +5,12 @@ Implements acceptance tests for different algorithm families
 """
 
 import ast
-import sys
-import io
-from typing import Dict, Any, List, Callable, Optional
-from contextlib import redirect_stdout, redirect_stderr
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Callable, Optional, Tuple
+from .sandbox import ExecutionSandbox
+from .tracing import traced
+from .config import ORACLE_MAX_WORKERS
 
 
 class OracleSystem:
@@ -16,7 +18,8 @@ class OracleSystem:
     Behavioral testing system using algorithm-specific oracles
     """
     
-    def __init__(self):
+    def __init__(self, sandbox: Optional[ExecutionSandbox] = None):
+        self.sandbox = sandbox or ExecutionSandbox()
         self.algorithm_oracles = {
             "fibonacci": self._fibonacci_oracle,
             "merge_sort": self._merge_sort_oracle,
@@ -33,9 +36,11 @@ class OracleSystem:
             "is_prime": self._is_prime_oracle
         }
     
+    @traced("oracle.run_tests", lambda a: {"contract_id": a["contract"].get("id"),
+                                           "algorithm_family": a["contract"].get("algorithm_family")})
     def run_oracle_tests(self, code: str, contract: Dict[str, Any], timeout: int = 5) -> Dict[str, Any]:
         """
-        Run oracle tests for given code and contract with timeout protection
+        Run oracle tests for given code and contract inside the execution sandbox
         
         Args:
             code: Python code to test
@@ -43,11 +48,8 @@ class OracleSystem:
             timeout: Maximum seconds to wait for tests (default 5)
             
         Returns:
-            Test results with pass/fail status and details
+            Test results with pass/fail status, details and resource usage
         """
-        import threading
-        import time
-        
         algorithm_family = contract.get("algorithm_family", "fibonacci")
         oracle_requirements = contract.get("oracle_requirements", {})
         
@@ -58,41 +60,43 @@ class OracleSystem:
                 "test_results": []
             }
         
-        # Use threading to implement timeout
-        result = [None]
-        error = [None]
-        
-        def run_tests():
-            try:
-                # Execute the code safely
-                namespace = {}
-                exec(code, namespace)
-                
-                # Run algorithm-specific oracle
-                oracle_func = self.algorithm_oracles[algorithm_family]
-                result[0] = oracle_func(namespace, oracle_requirements)
-            except Exception as e:
-                error[0] = e
-        
-        thread = threading.Thread(target=run_tests, daemon=True)
-        thread.start()
-        thread.join(timeout=timeout)
+        oracle_func = self.algorithm_oracles[algorithm_family]
+        execution = self.sandbox.execute(
+            code, lambda namespace: oracle_func(namespace, oracle_requirements), timeout=timeout
+        )
         
-        if thread.is_alive():
+        if execution.timed_out:
             # Timeout - code is hanging (likely infinite loop)
             return {
                 "passed": False,
                 "error": f"Oracle tests timed out after {timeout}s (likely infinite loop in code)",
-                "test_results": []
+                "test_results": [],
+                "resource_usage": execution.resource_usage
             }
-        elif error[0]:
+        elif not execution.success:
             return {
                 "passed": False,
-                "error": f"Code execution failed: {str(error[0])}",
-                "test_results": []
+                "error": f"Code execution failed: {execution.error}",
+                "test_results": [],
+                "resource_usage": execution.resource_usage
             }
         else:
-            return result[0]
+            result = execution.value
+            result["resource_usage"] = execution.resource_usage
+            return result
+    
+    def speculate(self, codes: List[str], contract: Dict[str, Any],
+                  extra_check: Optional[Callable[[str, Dict[str, Any]], Any]] = None,
+                  max_workers: int = ORACLE_MAX_WORKERS,
+                  known_results: Optional[Dict[int, Dict[str, Any]]] = None) -> "SpeculativeChecks":
+        """
+        Start oracle tests (and extra_check on oracle-passing code) for every
+        candidate concurrently; see SpeculativeChecks
+        
+        known_results maps candidate indices to oracle results obtained
+        earlier (e.g. replayed from a run journal); those are not re-run.
+        """
+        return SpeculativeChecks(self, codes, contract, extra_check, max_workers, known_results)
     
     def _fibonacci_oracle(self, namespace: Dict, requirements: Dict) -> Dict[str, Any]:
         """Oracle tests for Fibonacci implementations"""
@@ -1054,3 +1058,60 @@ class OracleSystem:
         
         pass_rate = passed_tests / len(test_cases) if test_cases else 0.0
         return {"passed": pass_rate >= requirements.get("required_pass_rate", 0.8), "pass_rate": pass_rate, "passed_tests": passed_tests, "total_tests": len(test_cases), "test_results": test_results}
+
+
+
+class SpeculativeChecks:
+    """
+    Oracle checks of a candidate list, run concurrently in sandbox workers and
+    consumed in index order
+
+    Callers that pick the first qualifying candidate read result(0),
+    result(1), ... exactly as in a serial loop, so the choice is unchanged;
+    later candidates are already being checked meanwhile. cancel() (or
+    leaving the with-block) drops checks that have not started once the
+    winner is known; running ones finish in the background. Identical
+    candidates share one check.
+    """
+    
+    def __init__(self, oracle: OracleSystem, codes: List[str], contract: Dict[str, Any],
+                 extra_check: Optional[Callable[[str, Dict[str, Any]], Any]] = None,
+                 max_workers: int = ORACLE_MAX_WORKERS,
+                 known_results: Optional[Dict[int, Dict[str, Any]]] = None):
+        self.oracle = oracle
+        self.contract = contract
+        self.extra_check = extra_check
+        self._pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(codes))))
+        # Each worker runs in a copy of this context so its spans nest under ours
+        known_results = known_results or {}
+        by_code: Dict[str, Future] = {}
+        self._futures: List[Future] = []
+        for i, code in enumerate(codes):
+            known = known_results.get(i)
+            future = by_code.get(code) if known is None else None
+            if future is None:
+                future = self._pool.submit(contextvars.copy_context().run, self._check, code, known)
+                if known is None:
+                    by_code[code] = future
+            self._futures.append(future)
+    
+    def _check(self, code: str, known: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], Any]:
+        oracle_result = known if known is not None else self.oracle.run_oracle_tests(code, self.contract)
+        extra = None
+        if self.extra_check is not None and oracle_result["passed"]:
+            extra = self.extra_check(code, self.contract)
+        return oracle_result, extra
+    
+    def result(self, index: int) -> Tuple[Dict[str, Any], Any]:
+        """(oracle_result, extra_check result or None) of candidate index, waiting if needed"""
+        return self._futures[index].result()
+    
+    def cancel(self):
+        """Drop checks that have not started"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+    
+    def __enter__(self) -> "SpeculativeChecks":
+        return self
+    
+    def __exit__(self, *exc):
+        self.cancel()
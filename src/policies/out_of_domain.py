@@ -10,9 +10,13 @@ Policy Types:
 - must_return: OOD inputs must return specified value
 - forbid_transform: OOD behavior must remain unchanged from baseline
 
-All checks are example-based, deterministic, and capped to avoid performance issues.
+All checks are example-based, deterministic, and capped by max_checks. Each
+example can run under its own timeout (see OODPolicy.evaluate), so large
+example sets are practical when checked in one sandbox worker.
 """
 
+import signal
+import threading
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Literal, Callable
 
@@ -27,6 +31,42 @@ class OODSpec:
     return_value: Optional[Any] = None
     examples: List[Dict[str, Any]] = field(default_factory=list)
     max_checks: int = 3
+    example_timeout: Optional[float] = 1.0  # Seconds per example call (None = no limit)
+
+
+class OODExampleTimeout(BaseException):
+    """Raised inside an example call that exceeded its timeout
+
+    Derives from BaseException so `except Exception` in the code under test
+    cannot swallow it.
+    """
+
+
+def _raise_example_timeout(signum, frame):
+    raise OODExampleTimeout()
+
+
+def _with_timeout(fn: Optional[Callable[..., Any]], seconds: Optional[float]) -> Optional[Callable[..., Any]]:
+    """
+    Wrap fn so each call is interrupted after `seconds` (SIGALRM interval timer)
+
+    Only possible on POSIX in the main thread - which is where sandbox workers
+    run. Elsewhere fn is returned unchanged.
+    """
+    if (fn is None or not seconds or not hasattr(signal, "setitimer")
+            or threading.current_thread() is not threading.main_thread()):
+        return fn
+
+    def bounded(**kwargs):
+        previous = signal.signal(signal.SIGALRM, _raise_example_timeout)
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+        try:
+            return fn(**kwargs)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+    return bounded
 
 
 class OODPolicy:
@@ -49,7 +89,7 @@ class OODPolicy:
             spec: Policy specification. If None, defaults to "allow" policy.
         """
         self.spec = spec or OODSpec()
-        # Cap examples by max_checks to avoid performance issues
+        # Cap examples by max_checks
         self.examples = (self.spec.examples or [])[: self.spec.max_checks]
 
     def check_examples(
@@ -80,6 +120,43 @@ class OODPolicy:
         
         return True
 
+    def evaluate(
+        self,
+        impl_fn: Callable[..., Any],
+        baseline_fn: Optional[Callable[..., Any]] = None,
+        example_timeout: Optional[float] = None,
+    ) -> List[bool]:
+        """
+        Verdict for every example, without stopping at the first failure.
+        
+        Each call to impl_fn / baseline_fn is bounded by example_timeout
+        (default: spec.example_timeout); an example that times out counts as
+        a violation. Intended to run inside a sandbox worker, where the
+        timeouts can interrupt runaway code.
+        
+        Args:
+            impl_fn: The implementation function to validate
+            baseline_fn: Pre-transformation function (only used for forbid_transform)
+            example_timeout: Per-call timeout override in seconds
+            
+        Returns:
+            One bool per checked example, in example order
+        """
+        if self.spec.policy == "allow":
+            return [True] * len(self.examples)
+
+        timeout = self.spec.example_timeout if example_timeout is None else example_timeout
+        impl_fn = _with_timeout(impl_fn, timeout)
+        baseline_fn = _with_timeout(baseline_fn, timeout)
+
+        verdicts = []
+        for args in self.examples:
+            try:
+                verdicts.append(self._check_one(impl_fn, baseline_fn, args))
+            except OODExampleTimeout:
+                verdicts.append(False)
+        return verdicts
+
     # --- Internal validation methods ---
     
     def _check_one(
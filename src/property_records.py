@@ -0,0 +1,242 @@
+# src/property_records.py
+"""
+Compact foundational property records
+extract_all_properties returns ~14 nested dicts per output. Kept for every
+output in structural_stats["property_results"] and written into each result
+JSON, they dominated both memory and file size. PropertyRecord holds the same
+information in frozen form:
+
+- dicts become FrozenMap (a tuple of pairs), lists tuples, strings are interned
+- identical property values (most of them, across the outputs of one
+  configuration) are shared through the PropertyTable they were added to
+- statement_ordering.statement_sequence ("If_3", ...) is not stored; it is
+  rebuilt from statement_types
+
+A record is a read-only mapping, so code reading property dicts works on it
+unchanged, and to_dict() returns exactly the extract_all_properties
+dictionary. PropertyTable serializes its records as per-property tables of
+distinct values plus one row of indices per output.
+"""
+
+import sys
+import json
+from collections.abc import Mapping, Sequence
+from typing import Dict, Any, List, Iterable, Tuple
+
+TABLE_FORMAT = "property_table/1"
+
+# Stands in for statement_sequence when it is derivable from statement_types
+_DERIVED_SEQUENCE = sys.intern("=statement_types")
+
+# JSON key of a packed (space-joined) list of strings
+_PACKED = "~"
+
+# Row entry of a property an output does not have
+_ABSENT = "-"
+
+
+class FrozenMap(tuple):
+    """Immutable dict stand-in: a tuple of (key, value) pairs in insertion order"""
+    __slots__ = ()
+
+
+def freeze(value: Any) -> Any:
+    """Immutable, string-interned copy of a JSON-like value"""
+    if isinstance(value, dict):
+        return FrozenMap((sys.intern(key) if isinstance(key, str) else key, freeze(item))
+                         for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Mutable dict/list copy of a frozen value"""
+    if isinstance(value, FrozenMap):
+        return {key: thaw(item) for key, item in value}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def _freeze_property(name: str, value: Any) -> Any:
+    frozen = freeze(value)
+    if name == "statement_ordering" and isinstance(frozen, FrozenMap):
+        fields = dict(frozen)
+        sequence = fields.get("statement_sequence")
+        types = fields.get("statement_types")
+        if types is not None and sequence == _statement_sequence(types):
+            frozen = FrozenMap((key, _DERIVED_SEQUENCE if key == "statement_sequence" else item)
+                               for key, item in frozen)
+    return frozen
+
+
+def _thaw_property(value: Any) -> Any:
+    thawed = thaw(value)
+    if isinstance(thawed, dict) and thawed.get("statement_sequence") == _DERIVED_SEQUENCE:
+        thawed["statement_sequence"] = list(_statement_sequence(thawed["statement_types"]))
+    return thawed
+
+
+def _statement_sequence(statement_types: Iterable[str]) -> Tuple[str, ...]:
+    return tuple(f"{stmt_type}_{i}" for i, stmt_type in enumerate(statement_types))
+
+
+class PropertyRecord(Mapping):
+    """
+    Foundational properties of one output
+
+    names is shared by every record of a table; values holds one frozen
+    (and, within a table, shared) value per property.
+    """
+    __slots__ = ("names", "values")
+
+    def __init__(self, names: Tuple[str, ...], values: Tuple[Any, ...]):
+        self.names = names
+        self.values = values
+
+    def frozen(self, name: str) -> Any:
+        """Frozen value of a property (KeyError if absent)"""
+        try:
+            return self.values[self.names.index(name)]
+        except ValueError:
+            raise KeyError(name) from None
+
+    def __getitem__(self, name: str) -> Any:
+        return _thaw_property(self.frozen(name))
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.names
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The extract_all_properties dictionary this record was built from"""
+        return {name: _thaw_property(value) for name, value in zip(self.names, self.values)}
+
+    def __repr__(self) -> str:
+        return f"PropertyRecord({', '.join(self.names)})"
+
+
+class PropertyTable(Sequence):
+    """
+    Records of the outputs of one experiment, sharing identical property values
+
+    Usage:
+        table = PropertyTable()
+        record = table.add(extractor.extract_all_properties(code))
+        json.dumps(table.to_json())
+    """
+
+    def __init__(self):
+        self._records: List[PropertyRecord] = []
+        self._names: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        # Per property: JSON text of a value -> (index, frozen value)
+        self._values: Dict[str, Dict[str, Tuple[int, Any]]] = {}
+
+    def record(self, properties: Dict[str, Any]) -> PropertyRecord:
+        """Compact record of a properties dict, sharing this table's values, without adding it"""
+        if isinstance(properties, PropertyRecord):
+            properties = properties.to_dict()
+        names = tuple(sys.intern(name) for name in properties)
+        names = self._names.setdefault(names, names)
+        return PropertyRecord(names, tuple(self._intern(name, properties[name]) for name in names))
+
+    def add(self, properties: Dict[str, Any]) -> PropertyRecord:
+        """Append the record of one output's properties and return it"""
+        record = self.record(properties)
+        self._records.append(record)
+        return record
+
+    def _intern(self, name: str, value: Any) -> Any:
+        # Keyed by JSON text, which (unlike ==) tells False from 0 and 1 from 1.0
+        key = json.dumps(value, separators=(",", ":"), default=str)
+        values = self._values.setdefault(name, {})
+        if key not in values:
+            values[key] = (len(values), _freeze_property(name, value))
+        return values[key][1]
+
+    def __getitem__(self, index):
+        return self._records[index]
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    # === Serialization ===
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        JSON form: distinct values per property, and per output one row of
+        space-separated value indices ("-" for an absent property)
+        """
+        names: List[str] = []
+        for record in self._records:
+            names.extend(name for name in record.names if name not in names)
+
+        # Only values referenced by a row are written, in order of first use
+        tables: Dict[str, List[Any]] = {name: [] for name in names}
+        positions: Dict[str, Dict[int, int]] = {name: {} for name in names}
+        rows = []
+        for record in self._records:
+            row = []
+            for name in names:
+                if name not in record:
+                    row.append(_ABSENT)
+                    continue
+                frozen = record.frozen(name)
+                if id(frozen) not in positions[name]:
+                    positions[name][id(frozen)] = len(tables[name])
+                    tables[name].append(_pack(thaw(frozen)))
+                row.append(str(positions[name][id(frozen)]))
+            rows.append(" ".join(row))
+        return {"format": TABLE_FORMAT, "properties": names, "values": tables, "rows": rows}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "PropertyTable":
+        """Inverse of to_json"""
+        if data.get("format") != TABLE_FORMAT:
+            raise ValueError(f"Not a {TABLE_FORMAT} object")
+        table = cls()
+        names = data["properties"]
+        for row in data["rows"]:
+            table.add({name: _unpack(data["values"][name][int(index)])
+                       for name, index in zip(names, row.split(" ")) if index != _ABSENT})
+        return table
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """The extract_all_properties dictionaries of all outputs"""
+        return [record.to_dict() for record in self._records]
+
+
+def load_property_results(value: Any) -> List[Dict[str, Any]]:
+    """property_results of a result file as dictionaries (table or legacy list form)"""
+    if isinstance(value, dict):
+        return PropertyTable.from_json(value).to_dicts()
+    return list(value or [])
+
+
+def _pack(value: Any) -> Any:
+    """Space-join lists of strings (AST node types, statement types, ...) for JSON"""
+    if isinstance(value, dict):
+        return {key: _pack(item) for key, item in value.items()}
+    if isinstance(value, list):
+        if len(value) > 1 and all(isinstance(item, str) and " " not in item for item in value):
+            return {_PACKED: " ".join(value)}
+        return [_pack(item) for item in value]
+    return value
+
+
+def _unpack(value: Any) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1 and _PACKED in value:
+            return value[_PACKED].split(" ")
+        return {key: _unpack(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_unpack(item) for item in value]
+    return value
@@ -0,0 +1,308 @@
+# src/result_io.py
+"""
+Streaming writer and reader for experiment result files
+A result JSON repeats a lot: every code string appears in llm_results,
+raw_outputs and transformation_results, the contract again inside
+canon_data, the canon properties twice. write_result stores such values once:
+
+- one pass converts NumPy values in bulk (ndarray.tolist(), scalar .item())
+  and gives every value a structural id, so repeats are found in linear time
+- a repeated value of at least RESULT_SHARE_MIN_CHARS characters is written
+  once under "_shared" and referenced as {"$ref": "<n>"} everywhere else
+- the file is streamed one top-level field (one element of the list fields)
+  per line, each encoded by the C JSON encoder, optionally through gzip
+
+The file stays one JSON object whose top-level fields are those of the
+result, plus "_format" and "_shared", so the results catalog indexes it as
+before. load_result reads both these files and plain legacy result JSONs
+(compressed or not) and returns the original dictionary; references are
+resolved to one shared object per value.
+"""
+
+import os
+import io
+import glob
+import gzip
+import json
+from typing import Dict, Any, List, Optional, Tuple, IO
+
+import numpy as np
+
+from .config import RESULTS_GZIP, RESULT_SHARE_MIN_CHARS
+from .property_records import PropertyTable
+
+RESULT_FORMAT = "skyt_result/1"
+GZIP_SUFFIX = ".gz"
+
+_FORMAT_KEY = "_format"
+_SHARED_KEY = "_shared"
+_REF_KEY = "$ref"
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+class _Preparer:
+    """
+    Single pass over a result: JSON-ready copy plus a structural key per value
+
+    Values with equal structure (and equal JSON types: False is not 0) get
+    equal keys. Values of at least min_chars serialized characters - the only
+    ones worth sharing - are registered as numbered nodes with a use count.
+    """
+
+    def __init__(self, min_chars: int):
+        self.min_chars = min_chars
+        self.ids: Dict[Any, int] = {}
+        self.counts: List[int] = []
+        # id(prepared value) -> node, for registered values
+        self.of: Dict[int, int] = {}
+        # id(original container) -> (original, prepared, key, size); keeps originals alive
+        self._seen: Dict[int, Tuple[Any, Any, Any, int]] = {}
+
+    def prepare(self, value: Any) -> Any:
+        return self._visit(value)[0]
+
+    def _visit(self, value: Any) -> Tuple[Any, Any, int]:
+        """(prepared value, key, serialized size estimate)"""
+        cls = type(value)
+        if cls is str:
+            size = len(value) + 2
+            return value, (self._node(value, value) if size >= self.min_chars else value), size
+        if cls is int or cls is float or cls is bool or value is None:
+            return value, (cls, value), 6
+        if cls is not dict and cls is not list:
+            if isinstance(value, np.generic):
+                return self._visit(value.item())
+            if not isinstance(value, (dict, list, tuple, np.ndarray, PropertyTable)):
+                return value, (cls, id(value)), 6  # json.dumps reports it if not serializable
+
+        seen = self._seen.get(id(value))
+        if seen is not None:
+            _, prepared, key, size = seen
+            if type(key) is int:
+                self.counts[key] += 1
+            return prepared, key, size
+
+        if isinstance(value, PropertyTable):
+            prepared, key, size = self._visit(value.to_json())
+        elif isinstance(value, np.ndarray):
+            prepared, key, size = self._visit(value.tolist())
+        elif isinstance(value, dict):
+            prepared, keys, size = {}, ["d"], 2
+            for name, item in value.items():
+                prepared[name], child, child_size = self._visit(item)
+                keys.append(name)
+                keys.append(child)
+                size += len(str(name)) + 4 + child_size
+            key = tuple(keys)
+        else:
+            prepared, keys, size = [], ["l"], 2
+            for item in value:
+                item, child, child_size = self._visit(item)
+                prepared.append(item)
+                keys.append(child)
+                size += 1 + child_size
+            key = tuple(keys)
+
+        if size >= self.min_chars and type(key) is not int:
+            key = self._node(key, prepared)
+        self._seen[id(value)] = (value, prepared, key, size)
+        return prepared, key, size
+
+    def _node(self, key: Any, prepared: Any) -> int:
+        node = self.ids.get(key)
+        if node is None:
+            node = self.ids[key] = len(self.counts)
+            self.counts.append(0)
+        self.counts[node] += 1
+        self.of[id(prepared)] = node
+        return node
+
+
+class _Sharer:
+    """Replaces repeated values of a prepared result with references"""
+
+    def __init__(self, preparer: _Preparer):
+        self.preparer = preparer
+        self.refs: Dict[int, str] = {}
+        self.shared: Dict[str, Any] = {}
+
+    def share(self, value: Any) -> Any:
+        node = self.preparer.of.get(id(value))
+        if node is None:
+            return value  # too small to hold anything shared
+        if self.preparer.counts[node] > 1:
+            ref = self.refs.get(node)
+            if ref is None:
+                ref = self.refs[node] = str(len(self.refs))
+                self.shared[ref] = self.expand(value)
+            return {_REF_KEY: ref}
+        return self.expand(value)
+
+    def expand(self, value: Any) -> Any:
+        """value with its repeated parts (but not itself) replaced by references"""
+        if type(value) is dict:
+            return {key: self.share(item) for key, item in value.items()}
+        if type(value) is list:
+            return [self.share(item) for item in value]
+        return value
+
+
+def write_result(path: str, result: Dict[str, Any], compress: bool = RESULTS_GZIP,
+                 min_shared_chars: int = RESULT_SHARE_MIN_CHARS) -> str:
+    """
+    Write an experiment result (any JSON-like dict, NumPy values allowed)
+
+    Args:
+        path: Target file; GZIP_SUFFIX is appended when compressing
+        compress: gzip the file
+        min_shared_chars: Smallest repeated value stored once and referenced
+
+    Returns:
+        Path of the written file
+    """
+    if compress and not path.endswith(GZIP_SUFFIX):
+        path += GZIP_SUFFIX
+
+    preparer = _Preparer(min_shared_chars)
+    prepared = preparer.prepare(result)
+    sharer = _Sharer(preparer)
+    fields = [(key, sharer.share(value)) for key, value in prepared.items()]
+
+    # Written next to the target and renamed, so readers never see a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with _open_write(tmp_path, compress) as f:
+            f.write("{" + _ENCODER.encode(_FORMAT_KEY) + ":" + _ENCODER.encode(RESULT_FORMAT))
+            for key, value in fields:
+                _write_field(f, key, value)
+            _write_field(f, _SHARED_KEY, sharer.shared)
+            f.write("}\n")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def _write_field(f: IO[str], key: str, value: Any):
+    f.write(",\n" + _ENCODER.encode(key) + ":")
+    if isinstance(value, list) and value:
+        f.write("[\n" + ",\n".join(_ENCODER.encode(item) for item in value) + "]")
+    elif key == _SHARED_KEY and value:
+        f.write("{\n" + ",\n".join(_ENCODER.encode(ref) + ":" + _ENCODER.encode(item)
+                                   for ref, item in value.items()) + "}")
+    else:
+        f.write(_ENCODER.encode(value))
+
+
+def _open_write(path: str, compress: bool) -> IO[str]:
+    if compress:
+        return io.TextIOWrapper(gzip.open(path, "wb", compresslevel=6), encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+# === Reading ===
+
+def resolve_path(path: str) -> str:
+    """path, or its compressed sibling if only that exists"""
+    if not os.path.exists(path) and os.path.exists(path + GZIP_SUFFIX):
+        return path + GZIP_SUFFIX
+    return path
+
+
+def open_result(path: str) -> IO[bytes]:
+    """Binary, seekable stream of a result file's JSON text (decompressed if gzipped)"""
+    f = open(resolve_path(path), "rb")
+    if f.read(2) == _GZIP_MAGIC:
+        f.seek(0)
+        return gzip.GzipFile(fileobj=f, mode="rb")
+    f.seek(0)
+    return f
+
+
+def read_result_text(path: str) -> str:
+    """JSON text of a result file"""
+    with open_result(path) as f:
+        return f.read().decode("utf-8")
+
+
+def load_result(path: str) -> Dict[str, Any]:
+    """
+    Experiment result as originally written, from any result file
+
+    Shared values are returned as one object referenced from every place the
+    value occurred; copy before modifying them in place.
+    """
+    return unpack_result(json.loads(read_result_text(path)))
+
+
+def unpack_result(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve the references of a decoded result object (legacy results pass through)"""
+    if not isinstance(data, dict) or data.get(_FORMAT_KEY) != RESULT_FORMAT:
+        return data
+    shared = data.get(_SHARED_KEY) or {}
+    return resolve_refs({key: value for key, value in data.items() if key not in (_FORMAT_KEY, _SHARED_KEY)},
+                        shared)
+
+
+def resolve_refs(value: Any, shared: Dict[str, Any], _resolved: Optional[Dict[str, Any]] = None) -> Any:
+    """value with every {"$ref": n} replaced by the (resolved) shared value n"""
+    resolved = {} if _resolved is None else _resolved
+    if isinstance(value, dict):
+        if len(value) == 1 and _REF_KEY in value:
+            ref = value[_REF_KEY]
+            if ref not in resolved:
+                resolved[ref] = resolve_refs(shared[ref], shared, resolved)
+            return resolved[ref]
+        return {key: resolve_refs(item, shared, resolved) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_refs(item, shared, resolved) for item in value]
+    return value
+
+
+def result_files(pattern: str) -> List[str]:
+    """Result files matching a glob pattern such as "outputs/*.json", compressed ones included"""
+    return glob.glob(pattern) + glob.glob(pattern + GZIP_SUFFIX)
+
+
+def convert_results(output_dir: str, compress: bool = RESULTS_GZIP) -> Tuple[int, int, int]:
+    """
+    Rewrite the result files of output_dir with write_result
+
+    Returns:
+        (files converted, bytes before, bytes after)
+    """
+    converted, before, after = 0, 0, 0
+    for path in sorted(result_files(os.path.join(output_dir, "*.json"))):
+        try:
+            result = load_result(path)
+        except (OSError, ValueError):
+            continue
+        if not isinstance(result, dict):
+            continue
+        size = os.path.getsize(path)
+        target = path[:-len(GZIP_SUFFIX)] if path.endswith(GZIP_SUFFIX) else path
+        written = write_result(target, result, compress=compress)
+        if written != path:
+            os.remove(path)
+        converted += 1
+        before += size
+        after += os.path.getsize(written)
+    return converted, before, after
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from .config import OUTPUTS_DIR
+
+    parser = argparse.ArgumentParser(description="Rewrite result JSON files in the shared-value format")
+    parser.add_argument("--output-dir", default=OUTPUTS_DIR, help="Directory with result JSON files")
+    parser.add_argument("--gzip", action="store_true", default=RESULTS_GZIP, help="Also gzip-compress them")
+    args = parser.parse_args()
+
+    count, before, after = convert_results(args.output_dir, compress=args.gzip)
+    print(f"Converted {count} file(s): {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB")
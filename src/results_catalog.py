@@ -0,0 +1,419 @@
+# src/results_catalog.py
+"""
+SQLite metadata catalog over the experiment result files in outputs/
+Indexes experiment id, contract, model, temperature, timestamp, scalar
+metrics and the byte span of every top-level field of each result JSON
+(of its decompressed text for .json.gz files, see result_io), so
+analysis scripts can select experiments without parsing every file and then
+load only the fields they need.
+
+The catalog is a derived cache: it is updated by
+ComprehensiveExperiment._save_experiment_results and can always be rebuilt
+from the JSON files with refresh().
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Union, Iterable
+
+from .config import OUTPUTS_DIR
+from .result_io import read_result_text, open_result, result_files, unpack_result, resolve_refs
+
+CATALOG_FILENAME = "catalog.sqlite"
+
+# Bump when the schema or what gets indexed changes; the catalog is rebuilt
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    experiment_id TEXT
+);
+CREATE TABLE IF NOT EXISTS experiments (
+    experiment_id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    contract_id TEXT,
+    model TEXT,
+    temperature REAL,
+    timestamp TEXT,
+    num_runs INTEGER,
+    successful_runs INTEGER
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    experiment_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (experiment_id, name)
+);
+CREATE TABLE IF NOT EXISTS fields (
+    experiment_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    PRIMARY KEY (experiment_id, name)
+);
+CREATE INDEX IF NOT EXISTS idx_experiments_contract ON experiments (contract_id);
+CREATE INDEX IF NOT EXISTS idx_experiments_model ON experiments (model);
+CREATE INDEX IF NOT EXISTS idx_experiments_temperature ON experiments (temperature);
+CREATE INDEX IF NOT EXISTS idx_experiments_timestamp ON experiments (timestamp);
+CREATE INDEX IF NOT EXISTS idx_metrics_name ON metrics (name, value);
+"""
+
+_WHITESPACE = " \t\n\r"
+
+_ORDER_COLUMNS = {"path", "timestamp", "contract_id", "model", "temperature", "experiment_id"}
+
+
+def scan_top_level(text: str) -> Tuple[Dict[str, Any], Dict[str, Tuple[int, int]]]:
+    """
+    Parse a JSON object one top-level value at a time
+
+    Returns:
+        (values, spans): the decoded top-level values, and for each key the
+        (byte offset, byte length) of its value in the UTF-8 encoded text
+    """
+    decoder = json.JSONDecoder()
+    values: Dict[str, Any] = {}
+    spans: Dict[str, Tuple[int, int]] = {}
+
+    # Character -> byte offsets, advanced incrementally (text is usually ASCII)
+    byte_pos, char_pos = 0, 0
+
+    def to_bytes(index: int) -> int:
+        nonlocal byte_pos, char_pos
+        byte_pos += len(text[char_pos:index].encode("utf-8"))
+        char_pos = index
+        return byte_pos
+
+    def skip(index: int) -> int:
+        while index < len(text) and text[index] in _WHITESPACE:
+            index += 1
+        return index
+
+    index = skip(0)
+    if not text.startswith("{", index):
+        raise ValueError("Result file is not a JSON object")
+    index = skip(index + 1)
+
+    while index < len(text) and text[index] != "}":
+        key, index = decoder.raw_decode(text, index)
+        index = skip(index)
+        if text[index] != ":":
+            raise ValueError(f"Expected ':' after key {key!r}")
+        start = skip(index + 1)
+        value, end = decoder.raw_decode(text, start)
+
+        values[key] = value
+        byte_start = to_bytes(start)
+        spans[key] = (byte_start, to_bytes(end) - byte_start)
+
+        index = skip(end)
+        if index < len(text) and text[index] == ",":
+            index = skip(index + 1)
+
+    return values, spans
+
+
+def flatten_metrics(metrics: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Numeric metrics as name -> value
+
+    One level of nesting is flattened with a dot, e.g. R_repair_at_k_pre.k=0.1
+    """
+    flat = {}
+    for name, value in (metrics or {}).items():
+        if isinstance(value, (int, float)):
+            flat[name] = float(value)
+        elif isinstance(value, dict):
+            for sub_name, sub_value in value.items():
+                if isinstance(sub_value, (int, float)):
+                    flat[f"{name}.{sub_name}"] = float(sub_value)
+    return flat
+
+
+def _as_list(value: Union[None, str, float, Iterable]) -> Optional[List]:
+    if value is None:
+        return None
+    if isinstance(value, (str, int, float)):
+        return [value]
+    return list(value)
+
+
+class ResultsCatalog:
+    """
+    Indexed metadata over the experiment result JSON files in output_dir
+
+    Args:
+        output_dir: Directory holding the <experiment_id>.json result files
+        db_path: Catalog database (default: output_dir/catalog.sqlite)
+    """
+
+    def __init__(self, output_dir: str = OUTPUTS_DIR, db_path: Optional[str] = None):
+        self.output_dir = output_dir
+        self.db_path = db_path or os.path.join(output_dir, CATALOG_FILENAME)
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._ensure_schema()
+
+    def _ensure_schema(self):
+        with self._lock, self._conn:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                for table in ("files", "experiments", "metrics", "fields"):
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # === Indexing ===
+
+    def record(self, json_path: str) -> Optional[str]:
+        """
+        Index (or re-index) one result file
+
+        Returns:
+            The experiment id, or None if the file is not an experiment result
+        """
+        path = os.path.abspath(json_path)
+        stat = os.stat(path)
+        values, spans = scan_top_level(read_result_text(path))
+        values = unpack_result(values)
+
+        experiment_id = values.get("experiment_id")
+        if not isinstance(experiment_id, str):
+            experiment_id = None  # e.g. temperature sweep summaries
+
+        with self._lock, self._conn:
+            self._forget(path)
+            self._conn.execute("INSERT INTO files (path, size, mtime, experiment_id) VALUES (?, ?, ?, ?)",
+                               (path, stat.st_size, stat.st_mtime, experiment_id))
+            if experiment_id is None:
+                return None
+
+            self._conn.execute("DELETE FROM experiments WHERE experiment_id = ?", (experiment_id,))
+            self._conn.execute("DELETE FROM metrics WHERE experiment_id = ?", (experiment_id,))
+            self._conn.execute("DELETE FROM fields WHERE experiment_id = ?", (experiment_id,))
+
+            self._conn.execute(
+                "INSERT INTO experiments (experiment_id, path, contract_id, model, temperature, "
+                "timestamp, num_runs, successful_runs) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (experiment_id, path, values.get("contract_id"), values.get("model", "unknown"),
+                 values.get("temperature"), values.get("timestamp"),
+                 values.get("num_runs"), values.get("successful_runs")))
+            self._conn.executemany(
+                "INSERT INTO metrics (experiment_id, name, value) VALUES (?, ?, ?)",
+                [(experiment_id, name, value)
+                 for name, value in flatten_metrics(values.get("metrics")).items()])
+            self._conn.executemany(
+                "INSERT INTO fields (experiment_id, name, offset, length) VALUES (?, ?, ?, ?)",
+                [(experiment_id, name, offset, length) for name, (offset, length) in spans.items()])
+
+        return experiment_id
+
+    def _forget(self, path: str):
+        """Drop everything indexed from path (caller holds the lock)"""
+        row = self._conn.execute("SELECT experiment_id FROM files WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return
+        if row["experiment_id"] is not None:
+            for table in ("experiments", "metrics", "fields"):
+                self._conn.execute(f"DELETE FROM {table} WHERE experiment_id = ?", (row["experiment_id"],))
+        self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def refresh(self) -> int:
+        """
+        Bring the catalog in line with the files on disk
+
+        New or modified result files are indexed, deleted ones dropped.
+
+        Returns:
+            Number of files (re)indexed
+        """
+        on_disk = {}
+        for path in result_files(os.path.join(self.output_dir, "*.json")):
+            stat = os.stat(path)
+            on_disk[os.path.abspath(path)] = (stat.st_size, stat.st_mtime)
+
+        with self._lock:
+            known = {row["path"]: (row["size"], row["mtime"])
+                     for row in self._conn.execute("SELECT path, size, mtime FROM files")}
+
+        with self._lock, self._conn:
+            for path in known.keys() - on_disk.keys():
+                self._forget(path)
+
+        changed = sorted(path for path, signature in on_disk.items() if known.get(path) != signature)
+        for path in changed:
+            try:
+                self.record(path)
+            except (OSError, ValueError):
+                continue  # Partially written or not a JSON object; retried on next refresh
+        return len(changed)
+
+    # === Queries ===
+
+    def query(self, contract_id: Union[None, str, Iterable[str]] = None,
+              model: Union[None, str, Iterable[str]] = None,
+              temperature: Union[None, float, Iterable[float]] = None,
+              model_like: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None,
+              metrics: Optional[Iterable[str]] = None,
+              order_by: str = "path", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Experiments matching all given filters
+
+        Args:
+            contract_id: Contract id or ids
+            model: Exact model name or names
+            temperature: Temperature or temperatures
+            model_like: Case-insensitive SQL LIKE pattern on the model, e.g. "%claude%"
+            since / until: Inclusive ISO timestamp bounds
+            metrics: Metric names to attach under "metrics" (flattened names)
+            order_by: Column to sort by ("path" matches sorted(glob(...)))
+            limit: Keep only the last `limit` experiments in that order
+
+        Returns:
+            One dict per experiment with experiment_id, path, contract_id,
+            model, temperature, timestamp, num_runs, successful_runs
+        """
+        if order_by not in _ORDER_COLUMNS:
+            raise ValueError(f"Cannot order by {order_by!r}")
+
+        clauses, params = [], []
+        for column, value in (("contract_id", contract_id), ("model", model)):
+            values = _as_list(value)
+            if values is not None:
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+
+        temperatures = _as_list(temperature)
+        if temperatures is not None:
+            clauses.append("(" + " OR ".join("ABS(temperature - ?) < 1e-9" for _ in temperatures) + ")")
+            params.extend(float(t) for t in temperatures)
+
+        if model_like is not None:
+            clauses.append("LOWER(model) LIKE LOWER(?)")
+            params.append(model_like)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp <= ?")
+            params.append(until)
+
+        sql = "SELECT * FROM experiments"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order_by}, experiment_id"
+
+        with self._lock:
+            rows = [dict(row) for row in self._conn.execute(sql, params)]
+        if limit is not None:
+            rows = rows[-limit:] if limit > 0 else []
+
+        if metrics is not None:
+            values = self.metrics([row["experiment_id"] for row in rows], metrics)
+            for row in rows:
+                row["metrics"] = values.get(row["experiment_id"], {})
+        return rows
+
+    def metrics(self, experiment_ids: Iterable[str],
+                names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, float]]:
+        """Indexed metric values as {experiment_id: {name: value}}"""
+        experiment_ids = list(experiment_ids)
+        result: Dict[str, Dict[str, float]] = {eid: {} for eid in experiment_ids}
+        names = _as_list(names)
+
+        # Chunked to stay under SQLite's bound-parameter limit
+        for i in range(0, len(experiment_ids), 500):
+            chunk = experiment_ids[i:i + 500]
+            sql = f"SELECT * FROM metrics WHERE experiment_id IN ({', '.join('?' * len(chunk))})"
+            params = list(chunk)
+            if names is not None:
+                sql += f" AND name IN ({', '.join('?' * len(names))})"
+                params.extend(names)
+            with self._lock:
+                for row in self._conn.execute(sql, params):
+                    result[row["experiment_id"]][row["name"]] = row["value"]
+        return result
+
+    def load_fields(self, experiment: Union[str, Dict[str, Any]], *names: str) -> Dict[str, Any]:
+        """
+        Decode only the named top-level fields of an experiment's result file
+
+        Fields missing from the file are omitted. A file modified since it
+        was indexed is re-indexed first.
+
+        Args:
+            experiment: Experiment id, or a row returned by query()
+            names: Top-level keys, e.g. "llm_outputs", "transformation_results"
+        """
+        experiment_id = experiment["experiment_id"] if isinstance(experiment, dict) else experiment
+        spans, path = self._spans(experiment_id)
+
+        stat = os.stat(path)
+        with self._lock:
+            signature = self._conn.execute("SELECT size, mtime FROM files WHERE path = ?", (path,)).fetchone()
+        if signature is None or (signature["size"], signature["mtime"]) != (stat.st_size, stat.st_mtime):
+            self.record(path)
+            spans, path = self._spans(experiment_id)
+
+        fields = {}
+        with open_result(path) as f:
+            def read(name):
+                offset, length = spans[name]
+                f.seek(offset)
+                return f.read(length).decode("utf-8")
+
+            texts = {name: read(name) for name in names if name in spans}
+            # Values stored once per file are referenced from the fields
+            shared = None
+            if "_shared" in spans and any('"$ref"' in text for text in texts.values()):
+                shared = json.loads(read("_shared"))
+        for name, text in texts.items():
+            fields[name] = json.loads(text) if shared is None else resolve_refs(json.loads(text), shared)
+        return fields
+
+    def _spans(self, experiment_id: str) -> Tuple[Dict[str, Tuple[int, int]], str]:
+        with self._lock:
+            row = self._conn.execute("SELECT path FROM experiments WHERE experiment_id = ?",
+                                     (experiment_id,)).fetchone()
+            if row is None:
+                raise KeyError(f"Experiment {experiment_id!r} is not in the catalog")
+            spans = {r["name"]: (r["offset"], r["length"]) for r in self._conn.execute(
+                "SELECT name, offset, length FROM fields WHERE experiment_id = ?", (experiment_id,))}
+        return spans, row["path"]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM experiments").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_catalog(output_dir: str = OUTPUTS_DIR, refresh: bool = True) -> ResultsCatalog:
+    """Catalog for output_dir, brought up to date with the files on disk"""
+    catalog = ResultsCatalog(output_dir)
+    if refresh:
+        catalog.refresh()
+    return catalog
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rebuild or refresh the results catalog")
+    parser.add_argument("--output-dir", default=OUTPUTS_DIR, help="Directory with result JSON files")
+    args = parser.parse_args()
+
+    catalog = ResultsCatalog(args.output_dir)
+    updated = catalog.refresh()
+    print(f"Indexed {updated} changed file(s); {len(catalog)} experiments in {catalog.db_path}")
@@ -0,0 +1,151 @@
+# src/run_journal.py
+"""
+Append-only per-configuration run journal
+Every generation, canon-candidate oracle verdict and transformation result
+of run_full_experiment is appended as one JSON line the moment it is known
+(flushed and fsynced), so a crashed or killed configuration can be resumed:
+the journal is replayed and only the missing work is performed.
+
+Record types:
+- header: configuration identity (contract, model, temperature, num_runs)
+- generation: one llm_results entry
+- oracle: oracle verdict of a canon candidate (keyed by code_sha)
+- transformation: repaired code and transformation record of one output
+- complete: experiment_id and result file of the finished configuration
+
+A torn last line (process killed mid-write) is ignored on replay.
+"""
+
+import os
+import re
+import json
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+JOURNAL_DIRNAME = "journals"
+
+
+def journal_path(output_dir: str, contract_id: str, model: str, temperature: float) -> str:
+    """Journal file of one contract/model/temperature configuration"""
+    model_name = re.sub(r"[^A-Za-z0-9_.-]", "_", model or "unknown")
+    return os.path.join(output_dir, JOURNAL_DIRNAME, f"{contract_id}_{model_name}_temp{temperature}.jsonl")
+
+
+def code_sha(code: str) -> str:
+    """Key of an oracle verdict record"""
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class JournalReplay:
+    """State recovered from an existing journal"""
+    llm_results: List[Dict[str, Any]] = field(default_factory=list)
+    oracle_verdicts: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    transformations: Dict[int, Tuple[str, Dict[str, Any]]] = field(default_factory=dict)
+    complete: Optional[Dict[str, Any]] = None
+
+    @property
+    def empty(self) -> bool:
+        return not (self.llm_results or self.transformations or self.complete)
+
+
+class RunJournal:
+    """
+    JSON-lines journal of one experiment configuration
+
+    The file is opened per record, so there is nothing to close and an
+    exception anywhere in the pipeline cannot lose appended records.
+
+    Usage:
+        journal, replay = RunJournal.open(path, header, resume=True)
+        journal.append("generation", result=llm_result)
+    """
+
+    def __init__(self, path: str, json_encoder: Optional[Type[json.JSONEncoder]] = None):
+        self.path = path
+        self.json_encoder = json_encoder
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    @classmethod
+    def open(cls, path: str, header: Dict[str, Any], resume: bool = False,
+             json_encoder: Optional[Type[json.JSONEncoder]] = None) -> Tuple["RunJournal", JournalReplay]:
+        """
+        Open the journal of a configuration
+
+        With resume, an existing journal whose header matches is replayed and
+        appended to; otherwise the journal is started afresh.
+
+        Returns:
+            Tuple of (journal, replayed state)
+        """
+        replay = JournalReplay()
+        if resume and os.path.exists(path):
+            records = read_records(path)
+            if records and records[0].get("type") == "header" and _same_config(records[0], header):
+                replay = replay_records(records)
+                journal = cls(path, json_encoder)
+                journal._truncate_torn_tail()
+                return journal, replay
+            print(f"  ⚠️  Journal {path} is for a different configuration; starting afresh")
+
+        if os.path.exists(path):
+            os.remove(path)
+        journal = cls(path, json_encoder)
+        journal.append("header", **header)
+        return journal, replay
+
+    def append(self, record_type: str, **fields):
+        """Append one record and force it to disk"""
+        line = json.dumps({"type": record_type, **fields}, cls=self.json_encoder, ensure_ascii=False)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _truncate_torn_tail(self):
+        """Drop a partial last line so new records start on a fresh line"""
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+
+def read_records(path: str) -> List[Dict[str, Any]]:
+    """Parsed records of a journal, stopping at the first unreadable line"""
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break  # Torn write
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+    return records
+
+
+def replay_records(records: List[Dict[str, Any]]) -> JournalReplay:
+    """
+    Rebuild experiment state from journal records
+
+    Only successful generations are replayed (renumbered in order); failed
+    ones count as missing work and are generated again on resume.
+    """
+    replay = JournalReplay()
+    for record in records:
+        record_type = record.get("type")
+        if record_type == "generation" and record["result"].get("success"):
+            result = dict(record["result"], run_id=len(replay.llm_results) + 1)
+            replay.llm_results.append(result)
+        elif record_type == "oracle":
+            replay.oracle_verdicts[record["code_sha"]] = record["result"]
+        elif record_type == "transformation":
+            replay.transformations[record["index"]] = (record["repaired"], record["record"])
+        elif record_type == "complete":
+            replay.complete = record
+    return replay
+
+
+def _same_config(recorded: Dict[str, Any], header: Dict[str, Any]) -> bool:
+    return all(recorded.get(key) == header.get(key) for key in ("contract_id", "model", "temperature"))
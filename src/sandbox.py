@@ -0,0 +1,302 @@
+# src/sandbox.py
+"""
+Resource-limited execution sandbox for LLM-generated code
+Every exec of candidate code goes through here so that runaway allocations,
+deep recursion or CPU-bound loops cannot take down the experiment process
+"""
+
+import io
+import os
+import sys
+import time
+import pickle
+import signal
+import threading
+import multiprocessing
+from dataclasses import dataclass, field
+from contextlib import redirect_stdout, redirect_stderr
+from typing import Dict, Any, Optional, Callable
+
+try:
+    import resource  # POSIX only
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+
+@dataclass
+class SandboxLimits:
+    """Resource caps applied to each sandboxed execution"""
+    timeout: float = 5.0           # Wall-clock seconds before the worker is killed
+    cpu_seconds: int = 10          # RLIMIT_CPU
+    memory_mb: int = 512           # Address space headroom above the forked baseline
+    max_open_files: int = 64       # RLIMIT_NOFILE
+    recursion_limit: int = 2000    # sys.setrecursionlimit inside the worker
+    max_output_chars: int = 10000  # Truncate captured stdout/stderr
+
+
+@dataclass
+class SandboxResult:
+    """Outcome of a sandboxed execution"""
+    success: bool
+    value: Any = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+    timed_out: bool = False
+    stdout: str = ""
+    stderr: str = ""
+    resource_usage: Dict[str, Any] = field(default_factory=dict)
+
+
+def _fork_available() -> bool:
+    """Forked workers need POSIX fork plus the resource module"""
+    return resource is not None and "fork" in multiprocessing.get_all_start_methods()
+
+
+def _current_address_space() -> Optional[int]:
+    """Current virtual memory size of this process in bytes (Linux only)"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[0])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _picklable(value: Any) -> Any:
+    """Convert a worker return value into something that survives the pipe"""
+    try:
+        pickle.dumps(value)
+        return value
+    except Exception:
+        pass
+
+    if isinstance(value, dict):
+        return {_picklable(k): _picklable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_picklable(v) for v in value)
+    return repr(value)
+
+
+def _apply_limits(limits: SandboxLimits):
+    """Install rlimits and the recursion cap in the forked worker"""
+    resource.setrlimit(resource.RLIMIT_CPU, (limits.cpu_seconds, limits.cpu_seconds + 1))
+
+    baseline = _current_address_space()
+    if baseline is not None and hasattr(resource, "RLIMIT_AS"):
+        cap = baseline + limits.memory_mb * 1024 * 1024
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            cap = min(cap, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (cap, hard))
+
+    _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    soft = limits.max_open_files if hard == resource.RLIM_INFINITY else min(limits.max_open_files, hard)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+    sys.setrecursionlimit(limits.recursion_limit)
+
+
+def _worker_main(conn, func: Callable, args: tuple, limits: SandboxLimits):
+    """Entry point of the forked worker: apply limits, run, report back"""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    payload = {"success": False}
+
+    try:
+        _apply_limits(limits)
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            value = func(*args)
+        payload = {"success": True, "value": _picklable(value)}
+    except BaseException as e:
+        payload = {"success": False, "error": str(e), "error_type": type(e).__name__}
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    payload["stdout"] = stdout.getvalue()[:limits.max_output_chars]
+    payload["stderr"] = stderr.getvalue()[:limits.max_output_chars]
+    payload["cpu_time"] = usage.ru_utime + usage.ru_stime
+    payload["max_rss_kb"] = usage.ru_maxrss
+
+    try:
+        conn.send(payload)
+    except Exception as e:
+        conn.send({"success": False, "error": f"Unable to return result: {e}",
+                   "error_type": type(e).__name__})
+    finally:
+        conn.close()
+        os._exit(0)
+
+
+def _exec_and_run(code: str, runner: Optional[Callable[[Dict[str, Any]], Any]]) -> Any:
+    """Execute code in a fresh namespace and hand the namespace to runner"""
+    namespace = {}
+    exec(code, namespace)
+    return runner(namespace) if runner else None
+
+
+class ExecutionSandbox:
+    """
+    Runs untrusted code in forked workers with CPU, memory, open-file and
+    recursion caps, capturing stdout/stderr and reporting resource usage.
+
+    Falls back to a daemon thread with a wall-clock timeout on platforms
+    without fork/resource (e.g. Windows), matching the previous behaviour.
+    """
+
+    # Exit signals that indicate the worker hit a resource cap
+    _SIGNAL_MESSAGES = {
+        getattr(signal, "SIGXCPU", None): "CPU time limit exceeded",
+        getattr(signal, "SIGKILL", None): "Worker killed (resource limit exceeded)",
+        getattr(signal, "SIGSEGV", None): "Worker crashed (segmentation fault)",
+    }
+
+    def __init__(self, limits: Optional[SandboxLimits] = None):
+        self.limits = limits or SandboxLimits()
+        self.use_fork = _fork_available()
+        self._context = multiprocessing.get_context("fork") if self.use_fork else None
+
+    def execute(self, code: str, runner: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                timeout: Optional[float] = None) -> SandboxResult:
+        """
+        Execute code and optionally call runner(namespace) inside the sandbox
+
+        Args:
+            code: Python source to exec
+            runner: Callable receiving the populated namespace; its return value
+                    becomes SandboxResult.value (must be picklable or is repr'd)
+            timeout: Wall-clock timeout override in seconds
+
+        Returns:
+            SandboxResult with value, error details, captured output and usage
+        """
+        return self.run(_exec_and_run, code, runner, timeout=timeout)
+
+    def run(self, func: Callable, *args, timeout: Optional[float] = None) -> SandboxResult:
+        """
+        Call func(*args) inside the sandbox
+
+        With fork, func and args are inherited by the worker rather than
+        pickled, so closures and bound methods are fine.
+        """
+        timeout = self.limits.timeout if timeout is None else timeout
+
+        if self.use_fork:
+            return self._run_forked(func, args, timeout)
+        return self._run_threaded(func, args, timeout)
+
+    def _run_forked(self, func: Callable, args: tuple, timeout: float) -> SandboxResult:
+        """Run in a forked worker process with rlimits"""
+        parent_conn, child_conn = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_worker_main, args=(child_conn, func, args, self.limits), daemon=True
+        )
+
+        start = time.perf_counter()
+        process.start()
+        child_conn.close()
+
+        payload = None
+        timed_out = False
+        try:
+            if parent_conn.poll(timeout):
+                payload = parent_conn.recv()
+            else:
+                timed_out = True
+        except (EOFError, OSError):
+            payload = None  # Worker died before reporting
+        finally:
+            parent_conn.close()
+
+        if timed_out and process.is_alive():
+            process.kill()
+        process.join(1.0)
+        wall_time = time.perf_counter() - start
+
+        usage = {"wall_time": wall_time, "exitcode": process.exitcode}
+
+        if timed_out:
+            return SandboxResult(
+                success=False,
+                error=f"Execution timed out after {timeout}s",
+                error_type="TimeoutError",
+                timed_out=True,
+                resource_usage=usage
+            )
+
+        if payload is None:
+            signum = -process.exitcode if process.exitcode and process.exitcode < 0 else None
+            message = self._SIGNAL_MESSAGES.get(signum, f"Worker exited unexpectedly (exit code {process.exitcode})")
+            return SandboxResult(
+                success=False,
+                error=message,
+                error_type="ResourceLimitExceeded",
+                resource_usage=usage
+            )
+
+        usage["cpu_time"] = payload.get("cpu_time")
+        usage["max_rss_kb"] = payload.get("max_rss_kb")
+
+        return SandboxResult(
+            success=payload["success"],
+            value=payload.get("value"),
+            error=payload.get("error"),
+            error_type=payload.get("error_type"),
+            stdout=payload.get("stdout", ""),
+            stderr=payload.get("stderr", ""),
+            resource_usage=usage
+        )
+
+    def _run_threaded(self, func: Callable, args: tuple, timeout: float) -> SandboxResult:
+        """Fallback: daemon thread with wall-clock timeout only"""
+        outcome = {}
+        stdout, stderr = io.StringIO(), io.StringIO()
+
+        def target():
+            try:
+                with redirect_stdout(stdout), redirect_stderr(stderr):
+                    outcome["value"] = func(*args)
+            except BaseException as e:
+                outcome["error"] = e
+
+        start = time.perf_counter()
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(timeout=timeout)
+        usage = {"wall_time": time.perf_counter() - start}
+
+        if thread.is_alive():
+            return SandboxResult(
+                success=False,
+                error=f"Execution timed out after {timeout}s",
+                error_type="TimeoutError",
+                timed_out=True,
+                resource_usage=usage
+            )
+
+        if "error" in outcome:
+            error = outcome["error"]
+            return SandboxResult(
+                success=False,
+                error=str(error),
+                error_type=type(error).__name__,
+                stdout=stdout.getvalue()[:self.limits.max_output_chars],
+                stderr=stderr.getvalue()[:self.limits.max_output_chars],
+                resource_usage=usage
+            )
+
+        return SandboxResult(
+            success=True,
+            value=outcome.get("value"),
+            stdout=stdout.getvalue()[:self.limits.max_output_chars],
+            stderr=stderr.getvalue()[:self.limits.max_output_chars],
+            resource_usage=usage
+        )
+
+
+_default_sandbox: Optional[ExecutionSandbox] = None
+
+
+def get_default_sandbox() -> ExecutionSandbox:
+    """Shared sandbox for module-level helpers that don't own one"""
+    global _default_sandbox
+    if _default_sandbox is None:
+        _default_sandbox = ExecutionSandbox()
+    return _default_sandbox
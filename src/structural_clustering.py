@@ -0,0 +1,150 @@
+# src/structural_clustering.py
+"""
+Approximate structural clustering of LLM outputs with MinHash + LSH
+Groups near-duplicate programs in near-linear time so R_structural can be
+reported over thousands of samples without O(n^2) calculate_distance calls
+"""
+
+import zlib
+from typing import Dict, Any, List, Optional, Sequence, Set
+import numpy as np
+
+
+# Largest 31-bit prime: keeps a * h + b inside uint64 for 31-bit h
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+def node_type_shingles(node_types: Optional[Sequence[str]], ngram: int = 3) -> Set[str]:
+    """
+    Shingle a pre-order AST node-type sequence into n-grams
+
+    Args:
+        node_types: normalized_ast_structure["node_types"] of one output
+        ngram: Shingle length
+
+    Returns:
+        Set of "Type1|Type2|Type3" shingles (empty for unparseable code)
+    """
+    if not node_types:
+        return set()
+    if len(node_types) < ngram:
+        return {"|".join(node_types)}
+    return {"|".join(node_types[i:i + ngram]) for i in range(len(node_types) - ngram + 1)}
+
+
+class _UnionFind:
+    """Minimal union-find over integer ids"""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+class MinHashLSHClusterer:
+    """
+    MinHash sketches of AST node-type shingles, bucketed with banded LSH
+
+    Two outputs end up in the same cluster when they share at least one LSH
+    band and their estimated Jaccard similarity reaches the threshold.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, ngram: int = 3,
+                 threshold: float = 0.8, seed: int = 1):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram = ngram
+        self.threshold = threshold
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm).astype(np.uint64)
+
+    def signature(self, shingles: Set[str]) -> np.ndarray:
+        """MinHash signature (num_perm,) for a shingle set"""
+        if not shingles:
+            return np.full(self.num_perm, _MERSENNE_PRIME, dtype=np.uint64)
+
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode()) % _MERSENNE_PRIME for s in sorted(shingles)),
+            dtype=np.uint64, count=len(shingles)
+        )
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME
+        return permuted.min(axis=0)
+
+    def estimate_similarity(self, sig1: np.ndarray, sig2: np.ndarray) -> float:
+        """Estimated Jaccard similarity from two signatures"""
+        return float(np.mean(sig1 == sig2))
+
+    def cluster(self, node_type_sequences: List[Optional[Sequence[str]]]) -> Dict[str, Any]:
+        """
+        Cluster outputs by approximate structural similarity
+
+        Args:
+            node_type_sequences: One node-type list per output (None if unparseable)
+
+        Returns:
+            Cluster structure: clusters (lists of output indices, largest first),
+            cluster sizes, modal cluster share and parameters used
+        """
+        n = len(node_type_sequences)
+        if n == 0:
+            return {"clusters": [], "cluster_sizes": [], "num_clusters": 0,
+                    "modal_cluster_share": 0.0}
+
+        shingle_sets = [node_type_shingles(seq, self.ngram) for seq in node_type_sequences]
+        signatures = [self.signature(shingles) for shingles in shingle_sets]
+        union_find = _UnionFind(n)
+
+        for band in range(self.bands):
+            start = band * self.rows
+            buckets: Dict[bytes, List[int]] = {}
+
+            for i, sig in enumerate(signatures):
+                if not shingle_sets[i]:
+                    continue  # Unparseable outputs stay singletons
+                key = sig[start:start + self.rows].tobytes()
+                representatives = buckets.setdefault(key, [])
+
+                # Only compare against one member per distinct cluster in the bucket
+                for rep in representatives:
+                    if union_find.find(rep) == union_find.find(i):
+                        break
+                    if self.estimate_similarity(signatures[rep], sig) >= self.threshold:
+                        union_find.union(rep, i)
+                        break
+                else:
+                    representatives.append(i)
+
+        groups: Dict[int, List[int]] = {}
+        for i in range(n):
+            groups.setdefault(union_find.find(i), []).append(i)
+
+        clusters = sorted(groups.values(), key=lambda members: (-len(members), members[0]))
+        sizes = [len(members) for members in clusters]
+
+        return {
+            "clusters": clusters,
+            "cluster_sizes": sizes,
+            "num_clusters": len(clusters),
+            "modal_cluster_share": sizes[0] / n,
+            "parameters": {
+                "num_perm": self.num_perm,
+                "bands": self.bands,
+                "ngram": self.ngram,
+                "threshold": self.threshold
+            }
+        }
@@ -0,0 +1,231 @@
+# src/tracing.py
+"""
+Lightweight stage-level tracing for the SKYT pipeline
+Context-manager spans with parent/child links, durations and attributes,
+exported as JSON lines (one span per line, written as spans end) or as a
+Chrome trace (chrome://tracing / Perfetto, written on close).
+
+Tracing is off unless configure_tracing() is called or SKYT_TRACE names an
+output file; disabled spans are a shared no-op object.
+"""
+
+import os
+import json
+import time
+import atexit
+import inspect
+import itertools
+import threading
+import functools
+import contextvars
+from typing import Dict, Any, Optional, Callable, List
+
+from .config import TRACE_FILE, TRACE_FORMAT
+
+TRACE_FORMATS = ("jsonl", "chrome")
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("skyt_current_span", default=None)
+_span_ids = itertools.count(1)
+
+
+class Span:
+    """One timed pipeline stage; use as a context manager"""
+
+    __slots__ = ("tracer", "name", "attributes", "span_id", "parent_id",
+                 "start", "start_ns", "duration_ns", "status", "error", "thread_id", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.span_id = next(_span_ids)
+        self.parent_id = None
+        self.start = None
+        self.start_ns = None
+        self.duration_ns = None
+        self.status = "ok"
+        self.error = None
+        self.thread_id = None
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def __enter__(self):
+        parent = _current_span.get()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.thread_id = threading.get_ident()
+        self._token = _current_span.set(self)
+        self.start = time.time()
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_ns = time.perf_counter_ns() - self.start_ns
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.status = "error"
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.tracer._record(self)
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration_ms": self.duration_ns / 1e6,
+            "status": self.status,
+            "error": self.error,
+            "thread_id": self.thread_id,
+            "pid": os.getpid(),
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Shared stand-in returned while tracing is disabled"""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    Span factory and exporter
+
+    Args:
+        path: Output file, or None to keep spans in memory only (see .spans)
+        fmt: "jsonl" (appended per span) or "chrome" (trace event JSON on close)
+    """
+
+    def __init__(self, path: Optional[str] = None, fmt: str = "jsonl"):
+        if fmt not in TRACE_FORMATS:
+            raise ValueError(f"Unknown trace format: {fmt} (expected one of {TRACE_FORMATS})")
+        self.path = path
+        self.fmt = fmt
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._file = None
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if fmt == "jsonl":
+                self._file = open(path, "a", buffering=1)
+
+    def span(self, name: str, **attributes) -> Span:
+        return Span(self, name, attributes)
+
+    def _record(self, span: Span):
+        record = span.to_dict()
+        with self._lock:
+            if self._file is not None:
+                self._file.write(json.dumps(record, default=str) + "\n")
+            else:
+                self.spans.append(record)
+
+    def close(self):
+        """Flush and close the output file (chrome traces are written here)"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            elif self.path and self.fmt == "chrome":
+                with open(self.path, "w") as f:
+                    json.dump({"traceEvents": [_chrome_event(s) for s in self.spans],
+                               "displayTimeUnit": "ms"}, f, default=str)
+
+
+def _chrome_event(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Complete ("X") trace event for one span record"""
+    args = dict(record["attributes"], span_id=record["span_id"], parent_id=record["parent_id"])
+    if record["error"]:
+        args["error"] = record["error"]
+    return {
+        "name": record["name"],
+        "ph": "X",
+        "ts": record["start"] * 1e6,
+        "dur": record["duration_ms"] * 1e3,
+        "pid": record["pid"],
+        "tid": record["thread_id"],
+        "args": args,
+    }
+
+
+_tracer: Optional[Tracer] = None
+
+
+def configure_tracing(path: Optional[str] = None, fmt: str = "jsonl") -> Tracer:
+    """Enable tracing process-wide (replacing any previous tracer) and return the tracer"""
+    global _tracer
+    previous, _tracer = _tracer, Tracer(path, fmt)
+    if previous is not None:
+        previous.close()
+    return _tracer
+
+
+def disable_tracing():
+    """Close the active tracer and turn tracing off"""
+    global _tracer
+    previous, _tracer = _tracer, None
+    if previous is not None:
+        previous.close()
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+def span(name: str, **attributes):
+    """Context manager timing one stage; a no-op while tracing is disabled"""
+    if _tracer is None:
+        return NOOP_SPAN
+    return _tracer.span(name, **attributes)
+
+
+def traced(name: str, attributes: Optional[Callable[..., Dict[str, Any]]] = None):
+    """
+    Decorator wrapping every call of a function in a span
+
+    Args:
+        name: Span name
+        attributes: Optional callable receiving the call's arguments by
+            parameter name (defaults applied) and returning span attributes;
+            only evaluated while tracing is on
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            attrs = {}
+            if attributes is not None:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                attrs = attributes(bound.arguments)
+            with _tracer.span(name, **attrs):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+if TRACE_FILE:
+    configure_tracing(TRACE_FILE, TRACE_FORMAT)
+
+atexit.register(disable_tracing)
@@ -0,0 +1,169 @@
+"""
+Merkle Hashing for ASTs
+Bottom-up structural hashes for every node of a tree, computed in one pass
+and cached on the nodes, so statement/node equality, statement diffing and
+program hashing are digest comparisons instead of ast.dump string compares.
+
+Two variants:
+- structural_hash: equal iff ast.dump() of the two nodes is equal
+  (field values and node types; line/column attributes ignored)
+- alpha_hash: equal iff the nodes are equal after α-renaming with the same
+  scheme as foundational_properties.AlphaRenamer (parameters -> p0, p1...,
+  other names -> v0, v1... in visit order)
+
+Hashes are cached on the nodes. A tree that is mutated after hashing must be
+passed to clear_hashes() before it is hashed again.
+"""
+
+import ast
+import hashlib
+from typing import Any, Dict, Iterable, List, Set
+
+_HASH_ATTR = "_skyt_merkle"
+_ALPHA_ATTR = "_skyt_merkle_alpha"
+
+# Names AlphaRenamer leaves untouched
+ALPHA_KEPT_NAMES = frozenset(['range', 'len', 'print', 'max', 'min', 'sum', 'abs'])
+
+_DIGEST_SIZE = 16
+
+
+def _new_hasher(node: ast.AST):
+    h = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    h.update(type(node).__name__.encode())
+    return h
+
+
+def _update_leaf(h, value: Any):
+    """Length-prefixed, type-tagged encoding of a non-AST field value"""
+    data = f"{type(value).__name__}:{value!r}".encode("utf-8", "surrogatepass")
+    h.update(b"L%d:" % len(data))
+    h.update(data)
+
+
+def structural_hash(node: ast.AST) -> bytes:
+    """
+    Merkle digest of node, cached on it and on every descendant
+
+    Returns:
+        16-byte digest; two nodes have the same digest iff their ast.dump()
+        output is the same
+    """
+    cached = node.__dict__.get(_HASH_ATTR)
+    if cached is not None:
+        return cached
+
+    h = _new_hasher(node)
+    for field in node._fields:
+        value = getattr(node, field, None)
+        if isinstance(value, ast.AST):
+            h.update(b"N")
+            h.update(structural_hash(value))
+        elif isinstance(value, list):
+            h.update(b"[%d:" % len(value))
+            for item in value:
+                if isinstance(item, ast.AST):
+                    h.update(b"N")
+                    h.update(structural_hash(item))
+                else:
+                    _update_leaf(h, item)
+        else:
+            _update_leaf(h, value)
+
+    digest = h.digest()
+    setattr(node, _HASH_ATTR, digest)
+    return digest
+
+
+class _AlphaHasher:
+    """
+    Single pass hashing a subtree as if AlphaRenamer had been applied to it
+
+    The renaming depends on the whole subtree (first occurrence order), so
+    alpha digests of children are not reusable by their parents; only the
+    digest of the requested root is cached.
+    """
+
+    def __init__(self):
+        self.var_map: Dict[str, str] = {}
+        self.counter = 0
+        self.param_names: Set[str] = set()
+        self.renamed_args: Set[int] = set()  # id() of FunctionDef positional arg nodes
+
+    def hash(self, node: ast.AST) -> bytes:
+        if isinstance(node, ast.FunctionDef):
+            for arg in node.args.args:
+                if arg.arg not in self.var_map:
+                    self.var_map[arg.arg] = f"p{len(self.param_names)}"
+                    self.param_names.add(arg.arg)
+                self.renamed_args.add(id(arg))
+
+        h = _new_hasher(node)
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(node, ast.Name) and field == "id":
+                value = self._rename(value)
+            elif isinstance(node, ast.arg) and field == "arg" and id(node) in self.renamed_args:
+                value = self.var_map.get(value, value)
+
+            if isinstance(value, ast.AST):
+                h.update(b"N")
+                h.update(self.hash(value))
+            elif isinstance(value, list):
+                h.update(b"[%d:" % len(value))
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        h.update(b"N")
+                        h.update(self.hash(item))
+                    else:
+                        _update_leaf(h, item)
+            else:
+                _update_leaf(h, value)
+        return h.digest()
+
+    def _rename(self, name: str) -> str:
+        if name in ALPHA_KEPT_NAMES:
+            return name
+        if name not in self.var_map:
+            self.var_map[name] = f"v{self.counter}"
+            self.counter += 1
+        return self.var_map[name]
+
+
+def alpha_hash(node: ast.AST) -> bytes:
+    """Variable-name-agnostic Merkle digest of node (cached on node)"""
+    cached = node.__dict__.get(_ALPHA_ATTR)
+    if cached is not None:
+        return cached
+    digest = _AlphaHasher().hash(node)
+    setattr(node, _ALPHA_ATTR, digest)
+    return digest
+
+
+def nodes_equal(node1: ast.AST, node2: ast.AST, alpha: bool = False) -> bool:
+    """Structural equality of two nodes (ast.dump equality, or α-equivalence)"""
+    if node1 is node2:
+        return True
+    if type(node1) is not type(node2):
+        return False
+    if alpha:
+        return alpha_hash(node1) == alpha_hash(node2)
+    return structural_hash(node1) == structural_hash(node2)
+
+
+def statement_hashes(statements: Iterable[ast.AST], alpha: bool = False) -> List[bytes]:
+    """Digests of a statement list, e.g. a function body"""
+    hasher = alpha_hash if alpha else structural_hash
+    return [hasher(stmt) for stmt in statements]
+
+
+def program_hash(tree: ast.AST, alpha: bool = False) -> str:
+    """Hex digest of a whole tree"""
+    return (alpha_hash(tree) if alpha else structural_hash(tree)).hex()
+
+
+def clear_hashes(tree: ast.AST):
+    """Drop cached digests from tree and all descendants (call after mutating it)"""
+    for node in ast.walk(tree):
+        node.__dict__.pop(_HASH_ATTR, None)
+        node.__dict__.pop(_ALPHA_ATTR, None)
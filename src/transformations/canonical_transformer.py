@@ -19,10 +19,12 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 try:
     from remove_optimization_prechecks import remove_optimization_prechecks
     from convert_to_simple_algorithm import convert_to_simple_algorithm
+    from ast_hashing import structural_hash
 except ImportError:
     # Fallback for when run as module
     from .remove_optimization_prechecks import remove_optimization_prechecks
     from .convert_to_simple_algorithm import convert_to_simple_algorithm
+    from .ast_hashing import structural_hash
 
 def transform_to_canonical(code: str, canon_code: str, contract: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -87,11 +89,8 @@ def _matches_canon(code: str, canon_code: str) -> bool:
         code_tree = ast.parse(code)
         canon_tree = ast.parse(canon_code)
         
-        # Compare AST dumps (normalized)
-        code_dump = ast.dump(code_tree)
-        canon_dump = ast.dump(canon_tree)
-        
-        return code_dump == canon_dump
+        # Compare Merkle hashes (normalized, no dump strings)
+        return structural_hash(code_tree) == structural_hash(canon_tree)
     except:
         return code.strip() == canon_code.strip()
 
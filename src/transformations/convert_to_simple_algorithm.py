@@ -135,25 +135,26 @@ if __name__ == "__main__":
     print("VERIFICATION")
     print("="*80)
     
-    # Execute both and compare
-    exec_globals = {}
-    exec(gpt4o_code, exec_globals)
-    is_prime_original = exec_globals['is_prime']
-    
-    exec_globals = {}
-    exec(result['transformed_code'], exec_globals)
-    is_prime_transformed = exec_globals['is_prime']
+    # Execute both inside the execution sandbox and compare
+    import os
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from sandbox import ExecutionSandbox
     
+    sandbox = ExecutionSandbox()
     test_cases = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 17, 25, 29, 100]
-    all_match = True
     
-    for n in test_cases:
-        orig = is_prime_original(n)
-        trans = is_prime_transformed(n)
+    def run_cases(namespace):
+        return [namespace['is_prime'](n) for n in test_cases]
+    
+    original_results = sandbox.execute(gpt4o_code, run_cases).value or []
+    transformed_results = sandbox.execute(result['transformed_code'], run_cases).value or []
+    all_match = len(original_results) == len(test_cases) and original_results == transformed_results
+    
+    for n, orig, trans in zip(test_cases, original_results, transformed_results):
         match = orig == trans
         if not match:
             print(f"  n={n}: original={orig}, transformed={trans} ❌")
-            all_match = False
     
     if all_match:
         print(f"✅ All {len(test_cases)} test cases match!")
@@ -16,6 +16,11 @@ import astor
 from typing import Dict, Any, List, Tuple
 import copy
 
+try:
+    from .ast_hashing import nodes_equal, structural_hash
+except ImportError:  # Imported as top-level "transformations" package
+    from ast_hashing import nodes_equal, structural_hash
+
 class StatementRemovalTester:
     """Tests if removing a statement preserves behavior"""
     
@@ -70,7 +75,7 @@ class StatementRemovalTester:
             
             def _statements_equal(self, s1, s2):
                 """Check if two statements are structurally equal"""
-                return ast.dump(s1) == ast.dump(s2)
+                return nodes_equal(s1, s2)
         
         remover = StatementRemover(stmt_to_remove)
         return remover.visit(copy.deepcopy(tree))
@@ -96,14 +101,13 @@ class ASTDiffer:
         if not code_func or not canon_func:
             return []
         
-        # Get statement dumps for comparison
-        canon_stmts = {ast.dump(stmt) for stmt in canon_func.body}
+        # Get statement hashes for comparison
+        canon_stmts = {structural_hash(stmt) for stmt in canon_func.body}
         
         # Find statements in code but not in canon
         extra_statements = []
         for stmt in code_func.body:
-            stmt_dump = ast.dump(stmt)
-            if stmt_dump not in canon_stmts:
+            if structural_hash(stmt) not in canon_stmts:
                 extra_statements.append(stmt)
         
         return extra_statements
@@ -210,14 +214,19 @@ if __name__ == "__main__":
         }
     }
     
+    # Candidate code only ever runs inside the execution sandbox
+    import os
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from sandbox import ExecutionSandbox
+    
+    sandbox = ExecutionSandbox()
+    
     # Mock oracle system for testing
     class MockOracle:
         def run_oracle_tests(self, code, contract):
-            # Execute code and test
-            try:
-                exec_globals = {}
-                exec(code, exec_globals)
-                is_prime = exec_globals['is_prime']
+            def run_tests(namespace):
+                is_prime = namespace['is_prime']
                 
                 # Test cases
                 tests = [
@@ -225,13 +234,11 @@ if __name__ == "__main__":
                     (6, False), (7, True), (11, True), (15, False)
                 ]
                 
-                for n, expected in tests:
-                    if is_prime(n) != expected:
-                        return {'passed': False}
-                
-                return {'passed': True}
-            except:
-                return {'passed': False}
+                return all(is_prime(n) == expected for n, expected in tests)
+            
+            execution = sandbox.execute(code, run_tests)
+            return {'passed': execution.success and execution.value is True,
+                    'resource_usage': execution.resource_usage}
     
     print("="*80)
     print("INTELLIGENT SIMPLIFIER TEST")
@@ -261,23 +268,19 @@ if __name__ == "__main__":
     print("="*80)
     
     # Verify transformed code matches canon behavior
-    exec_globals_canon = {}
-    exec(canon_code, exec_globals_canon)
-    is_prime_canon = exec_globals_canon['is_prime']
+    test_cases = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 17, 25, 29, 100]
     
-    exec_globals_trans = {}
-    exec(result['transformed_code'], exec_globals_trans)
-    is_prime_trans = exec_globals_trans['is_prime']
+    def run_cases(namespace):
+        return [namespace['is_prime'](n) for n in test_cases]
     
-    test_cases = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 17, 25, 29, 100]
-    all_match = True
-    
-    for n in test_cases:
-        canon_result = is_prime_canon(n)
-        trans_result = is_prime_trans(n)
-        if canon_result != trans_result:
-            print(f"  n={n}: canon={canon_result}, transformed={trans_result} ❌")
-            all_match = False
+    canon_results = sandbox.execute(canon_code, run_cases).value
+    trans_results = sandbox.execute(result['transformed_code'], run_cases).value
+    all_match = canon_results is not None and canon_results == trans_results
+    
+    if not all_match:
+        for n, canon_result, trans_result in zip(test_cases, canon_results or [], trans_results or []):
+            if canon_result != trans_result:
+                print(f"  n={n}: canon={canon_result}, transformed={trans_result} ❌")
     
     if all_match:
         print(f"✅ All {len(test_cases)} test cases match!")
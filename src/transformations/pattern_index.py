@@ -0,0 +1,72 @@
+"""
+Pattern Index
+Parse-once node-type index used to dispatch AST patterns to candidate nodes
+"""
+
+import ast
+from typing import Optional, Dict, Any, List, Tuple, Iterable, Iterator, Type
+
+
+class ASTNodeIndex:
+    """
+    All nodes of one parsed tree in ast.walk (breadth-first) order, indexed by
+    node type so a pattern only visits the node types it can match
+    """
+
+    def __init__(self, tree: ast.AST):
+        self.tree = tree
+        self.nodes: List[ast.AST] = list(ast.walk(tree))
+        self.by_type: Dict[Type[ast.AST], List[ast.AST]] = {}
+
+        for node in self.nodes:
+            self.by_type.setdefault(type(node), []).append(node)
+
+    @classmethod
+    def from_code(cls, code: str) -> Optional["ASTNodeIndex"]:
+        """Parse code and index it, or None if it does not parse"""
+        try:
+            return cls(ast.parse(code))
+        except SyntaxError:
+            return None
+
+    def candidates(self, node_types: Optional[Tuple[Type[ast.AST], ...]]) -> Iterator[ast.AST]:
+        """
+        Nodes a pattern has to be tried on, in ast.walk order
+
+        Args:
+            node_types: Node types the pattern can match, or None for all nodes
+        """
+        if node_types is None:
+            return iter(self.nodes)
+        if len(node_types) == 1:
+            return iter(self.by_type.get(node_types[0], []))
+
+        wanted = set(node_types)
+        return (node for node in self.nodes if type(node) in wanted)
+
+
+Span = Tuple[Tuple[int, int], Tuple[int, int]]
+
+
+def node_span(node: ast.AST) -> Optional[Span]:
+    """((line, col), (end_line, end_col)) source span of a node, if it has one"""
+    if getattr(node, "end_lineno", None) is None:
+        return None
+    return (node.lineno, node.col_offset), (node.end_lineno, node.end_col_offset)
+
+
+def match_span(match: Dict[str, Any]) -> Optional[Span]:
+    """Source span covered by a pattern match ('original_node' or 'original_nodes')"""
+    nodes: Iterable[ast.AST] = match.get('original_nodes') or ()
+    if match.get('original_node') is not None:
+        nodes = [match['original_node']]
+
+    spans = [span for span in (node_span(node) for node in nodes) if span]
+    if not spans:
+        return None
+    return min(start for start, _ in spans), max(end for _, end in spans)
+
+
+def spans_overlap(a: Span, b: Span) -> bool:
+    """Half-open interval overlap of two source spans"""
+    return a[0] < b[1] and b[0] < a[1]
@@ -7,6 +7,7 @@ import ast
 from typing import Dict, Any, Optional, List
 from ..transformations.transformation_base import TransformationBase, TransformationResult
 from ..foundational_properties import FoundationalProperties
+from ..incremental_properties import IncrementalPropertyExtractor
 from .property_diff_analyzer import PropertyDiffAnalyzer, PropertyMismatch
 from .transformation_registry import TransformationRegistry
 from .transformation_selector import TransformationSelector, SelectedTransformation
@@ -30,6 +31,8 @@ class PropertyDrivenTransformer(TransformationBase):
         
         # Initialize components
         self.props_extractor = FoundationalProperties()
+        # Strategies edit one statement at a time: re-extract only what changed
+        self.incremental_extractor = IncrementalPropertyExtractor(self.props_extractor)
         
         # NEW: Property explainers and transformation strategies
         from .property_explainers import (
@@ -100,13 +103,15 @@ class PropertyDrivenTransformer(TransformationBase):
         current_code = code
         max_iterations = 5
         
+        # The canon never changes between iterations
+        canon_props = self._extract_properties(canon_code)
+        
         for iteration in range(max_iterations):
             if self.debug_mode:
                 print(f"\n[PropertyDrivenTransformer] Iteration {iteration + 1}")
             
             # Step 1: Extract properties
             code_props = self._extract_properties(current_code)
-            canon_props = self._extract_properties(canon_code)
             
             if not code_props or not canon_props:
                 break
@@ -195,7 +200,7 @@ class PropertyDrivenTransformer(TransformationBase):
     def _extract_properties(self, code: str) -> Optional[Dict[str, Any]]:
         """Extract foundational properties from code"""
         try:
-            return self.props_extractor.extract_all_properties(code)
+            return self.incremental_extractor.extract_all_properties(code)
         except Exception as e:
             if self.debug_mode:
                 print(f"[PropertyDrivenTransformer] Property extraction failed: {e}")
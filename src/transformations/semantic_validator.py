@@ -8,12 +8,18 @@ Uses execution-based testing to ensure transformations preserve code behavior.
 import ast
 from typing import Dict, List, Any, Optional
 
+try:
+    from ..sandbox import ExecutionSandbox
+except ImportError:  # Imported as top-level "transformations" package
+    from sandbox import ExecutionSandbox
+
 
 class SemanticValidator:
     """Validates that code transformations preserve semantic behavior"""
     
-    def __init__(self):
+    def __init__(self, sandbox: Optional[ExecutionSandbox] = None):
         self.test_inputs = [0, 1, 2, 5, 10, -1, 100]  # Standard test inputs
+        self.sandbox = sandbox or ExecutionSandbox()
     
     def are_semantically_equivalent(self, code1: str, code2: str) -> bool:
         """
@@ -27,62 +33,48 @@ class SemanticValidator:
         Returns True if equivalent, False otherwise
         """
         try:
-            # Extract and execute both functions
-            func1 = self._extract_and_execute(code1)
-            func2 = self._extract_and_execute(code2)
+            outcomes1 = self._extract_and_execute(code1)
+            outcomes2 = self._extract_and_execute(code2)
             
-            if func1 is None or func2 is None:
+            if outcomes1 is None or outcomes2 is None:
                 return False
             
-            # Test on multiple inputs
-            for test_input in self.test_inputs:
-                result1, error1 = self._safe_execute(func1, test_input)
-                result2, error2 = self._safe_execute(func2, test_input)
-                
-                # Both should succeed or both should fail
-                if (error1 is None) != (error2 is None):
-                    return False
-                
-                # If both succeeded, results must match
-                if error1 is None and result1 != result2:
-                    return False
-                
-                # If both failed, exception types should match
-                if error1 is not None and type(error1) != type(error2):
-                    return False
-            
-            return True
+            # Both should succeed or both should fail with the same exception type
+            return outcomes1 == outcomes2
             
         except Exception:
             # If we can't validate, assume not equivalent (conservative)
             return False
     
-    def _extract_and_execute(self, code: str) -> Optional[callable]:
-        """Extract the main function from code and return it"""
-        try:
-            namespace = {}
-            exec(code, namespace)
-            
+    def _extract_and_execute(self, code: str) -> Optional[List[tuple]]:
+        """
+        Execute code in the sandbox and run its main function on all test inputs
+        
+        Returns list of ("ok", result) / ("exc", exception_name) outcomes,
+        or None if the code can't be executed or has no public function
+        """
+        test_inputs = self.test_inputs
+        
+        def run_main(namespace):
             # Find the first function that's not a helper
             for name, obj in namespace.items():
                 if callable(obj) and not name.startswith('_'):
-                    return obj
-            
-            return None
-        except:
+                    return [self._safe_execute(obj, test_input) for test_input in test_inputs]
             return None
+        
+        execution = self.sandbox.execute(code, run_main)
+        return execution.value if execution.success else None
     
     def _safe_execute(self, func: callable, input_value: Any) -> tuple:
         """
         Safely execute function with input
         
-        Returns (result, error) tuple
+        Returns ("ok", result) or ("exc", exception_name) tuple
         """
         try:
-            result = func(input_value)
-            return (result, None)
+            return ("ok", func(input_value))
         except Exception as e:
-            return (None, e)
+            return ("exc", type(e).__name__)
     
     def calculate_behavioral_distance(self, code1: str, code2: str) -> float:
         """
@@ -94,25 +86,16 @@ class SemanticValidator:
         - 1.0 if completely different or can't compare
         """
         try:
-            func1 = self._extract_and_execute(code1)
-            func2 = self._extract_and_execute(code2)
+            outcomes1 = self._extract_and_execute(code1)
+            outcomes2 = self._extract_and_execute(code2)
             
-            if func1 is None or func2 is None:
+            if outcomes1 is None or outcomes2 is None:
                 return 1.0
             
-            matches = 0
+            # Matching results or matching exception types both count
+            matches = sum(1 for o1, o2 in zip(outcomes1, outcomes2) if o1 == o2)
             total = len(self.test_inputs)
             
-            for test_input in self.test_inputs:
-                result1, error1 = self._safe_execute(func1, test_input)
-                result2, error2 = self._safe_execute(func2, test_input)
-                
-                # Check if results match
-                if error1 is None and error2 is None and result1 == result2:
-                    matches += 1
-                elif error1 is not None and error2 is not None and type(error1) == type(error2):
-                    matches += 1
-            
             # Return distance (0 = identical, 1 = completely different)
             return 1.0 - (matches / total)
             
@@ -3,8 +3,10 @@ Transformation Registry
 Central registry for all transformation rules
 """
 
-from typing import List, Dict, Optional
+import ast
+from typing import List, Dict, Optional, Iterable, Any
 from .transformation_rule import TransformationRule, create_rule
+from .pattern_index import ASTNodeIndex
 from . import ast_patterns
 
 
@@ -74,6 +76,59 @@ class TransformationRegistry:
         """Get all rules sorted by priority (highest first)"""
         return sorted(self.rules, key=lambda r: r.priority, reverse=True)
     
+    def match_rules(self, rules: Iterable[TransformationRule], code: str,
+                    index: Optional[ASTNodeIndex] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Match the AST patterns of several rules against code in one pass
+        
+        The code is parsed once; every node is visited once and handed only to
+        the patterns registered for its node type. Each rule gets its first
+        match in ast.walk order, the same result as ASTPattern.match.
+        
+        Args:
+            rules: Rules to match
+            code: Code to match against
+            index: Optional pre-built node index of code
+            
+        Returns:
+            Dict of rule_id -> match dictionary (None if the rule doesn't match)
+        """
+        rules = list({rule.rule_id: rule for rule in rules}.values())
+        results: Dict[str, Optional[Dict[str, Any]]] = {rule.rule_id: None for rule in rules}
+        
+        index = index or ASTNodeIndex.from_code(code)
+        if index is None or not rules:
+            return results
+        
+        dispatch: Dict[type, List[TransformationRule]] = {}
+        any_node: List[TransformationRule] = []
+        for rule in rules:
+            node_types = rule.ast_pattern.node_types
+            if node_types is None:
+                any_node.append(rule)
+            else:
+                for node_type in node_types:
+                    dispatch.setdefault(node_type, []).append(rule)
+        
+        done = set()
+        for node in index.nodes:
+            for rule in dispatch.get(type(node), []) + any_node:
+                if rule.rule_id in done:
+                    continue
+                try:
+                    match = rule.ast_pattern.match_func(node)
+                except Exception:
+                    # A failing matcher makes the rule inapplicable, as before
+                    done.add(rule.rule_id)
+                    continue
+                if match:
+                    results[rule.rule_id] = match
+                    done.add(rule.rule_id)
+            if len(done) == len(rules):
+                break
+        
+        return results
+    
     # ========================================================================
     # BUILT-IN RULE REGISTRATION
     # ========================================================================
@@ -104,7 +159,8 @@ class TransformationRegistry:
                     'after': 'return not stack',
                     'description': 'Empty check simplification'
                 }
-            ]
+            ],
+            node_types=(ast.Compare,)
         )
         self.register_rule(rule)
         
@@ -125,7 +181,8 @@ class TransformationRegistry:
                     'after': 'if x: return y',
                     'description': 'Boolean redundancy removal'
                 }
-            ]
+            ],
+            node_types=(ast.Compare,)
         )
         self.register_rule(rule)
     
@@ -149,7 +206,8 @@ class TransformationRegistry:
                     'after': 'return 1 if n > 0 else 0',
                     'description': 'Ternary conversion'
                 }
-            ]
+            ],
+            node_types=(ast.If,)
         )
         self.register_rule(rule)
     
@@ -173,7 +231,8 @@ class TransformationRegistry:
                     'after': 'result = [x for x in items]',
                     'description': 'List comprehension conversion'
                 }
-            ]
+            ],
+            node_types=(ast.Module,)
         )
         self.register_rule(rule)
         
@@ -194,7 +253,8 @@ class TransformationRegistry:
                     'after': 'result = "".join(text)',
                     'description': 'String join conversion'
                 }
-            ]
+            ],
+            node_types=(ast.Module,)
         )
         self.register_rule(rule)
         
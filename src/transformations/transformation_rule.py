@@ -4,8 +4,9 @@ Defines the structure and behavior of transformation rules
 """
 
 import ast
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, Tuple, Type
 from dataclasses import dataclass, field
+from .pattern_index import ASTNodeIndex
 
 
 @dataclass
@@ -17,30 +18,30 @@ class ASTPattern:
     match_func: Callable[[ast.AST], Optional[Dict[str, Any]]]
     replace_func: Callable[[Dict[str, Any]], Optional[str]]
     description: str = ""
+    # Node types match_func can match; None means any node. Patterns that scan
+    # the whole tree themselves declare (ast.Module,)
+    node_types: Optional[Tuple[Type[ast.AST], ...]] = None
     
     def match(self, code: str) -> Optional[Dict[str, Any]]:
         """
         Try to match pattern in code
         Returns match dictionary if found, None otherwise
         """
-        try:
-            tree = ast.parse(code)
-            
-            # Try matching on whole tree first
-            match = self.match_func(tree)
+        index = ASTNodeIndex.from_code(code)
+        if index is None:
+            return None
+        return self.match_index(index)
+    
+    def match_index(self, index: ASTNodeIndex) -> Optional[Dict[str, Any]]:
+        """
+        Try to match pattern on an already indexed tree
+        Returns the first match in ast.walk order, None otherwise
+        """
+        for node in index.candidates(self.node_types):
+            match = self.match_func(node)
             if match:
                 return match
-            
-            # Try matching on individual nodes
-            for node in ast.walk(tree):
-                match = self.match_func(node)
-                if match:
-                    return match
-            
-            return None
-            
-        except SyntaxError:
-            return None
+        return None
     
     def replace(self, match: Dict[str, Any]) -> Optional[str]:
         """
@@ -67,13 +68,15 @@ class TransformationRule:
     description: str = ""
     examples: list = field(default_factory=list)
     
-    def matches(self, mismatch_type: str, code: str) -> Optional[Dict[str, Any]]:
+    def matches(self, mismatch_type: str, code: str,
+                index: Optional[ASTNodeIndex] = None) -> Optional[Dict[str, Any]]:
         """
         Check if this rule matches the given mismatch and code
         
         Args:
             mismatch_type: Type of property mismatch
             code: Code to check
+            index: Optional pre-built node index of code (avoids re-parsing)
             
         Returns:
             Match dictionary if applicable, None otherwise
@@ -83,6 +86,8 @@ class TransformationRule:
             return None
         
         # Check if AST pattern matches
+        if index is not None:
+            return self.ast_pattern.match_index(index)
         return self.ast_pattern.match(code)
     
     def apply(self, code: str, match: Dict[str, Any]) -> Optional[str]:
@@ -240,7 +245,8 @@ def create_rule(rule_id: str,
                 semantic_class: str,
                 priority: int = 1,
                 description: str = "",
-                examples: list = None) -> TransformationRule:
+                examples: list = None,
+                node_types: Optional[Tuple[Type[ast.AST], ...]] = None) -> TransformationRule:
     """
     Helper function to create a transformation rule
     
@@ -255,6 +261,7 @@ def create_rule(rule_id: str,
         priority: Priority (higher = applied first)
         description: Human-readable description
         examples: List of example transformations
+        node_types: AST node types match_func can match (None = any node)
         
     Returns:
         TransformationRule instance
@@ -263,7 +270,8 @@ def create_rule(rule_id: str,
         pattern_type=pattern_type,
         match_func=match_func,
         replace_func=replace_func,
-        description=description
+        description=description,
+        node_types=node_types
     )
     
     return TransformationRule(
@@ -4,11 +4,13 @@ Selects applicable transformations based on property mismatches
 """
 
 import ast
+import bisect
 from typing import List, Optional
 from dataclasses import dataclass
 from .transformation_rule import TransformationRule
 from .transformation_registry import TransformationRegistry
 from .property_diff_analyzer import PropertyMismatch
+from .pattern_index import match_span, spans_overlap
 
 
 @dataclass
@@ -44,13 +46,18 @@ class TransformationSelector:
         """
         selections = []
         
+        # Match every candidate rule in one parse and one pass over the tree
+        candidate_rules = [rule for mismatch in mismatches
+                           for rule in self.registry.get_rules_for_mismatch(mismatch.mismatch_type)]
+        matches = self.registry.match_rules(candidate_rules, code)
+        
         for mismatch in mismatches:
             # Get rules that handle this mismatch type
             rules = self.registry.get_rules_for_mismatch(mismatch.mismatch_type)
             
             for rule in rules:
                 # Check if rule is applicable
-                confidence, match_details = self._check_applicability(rule, mismatch, code)
+                confidence, match_details = self._score_match(rule, mismatch, matches.get(rule.rule_id))
                 
                 if confidence > 0.0 and match_details:
                     selections.append(SelectedTransformation(
@@ -81,7 +88,22 @@ class TransformationSelector:
         try:
             # Try to match the rule's pattern in the code
             match = rule.matches(mismatch.mismatch_type, code)
-            
+        except Exception:
+            return 0.0, None
+        
+        return self._score_match(rule, mismatch, match)
+    
+    def _score_match(self, rule: TransformationRule,
+                     mismatch: PropertyMismatch,
+                     match: Optional[dict]) -> tuple[float, Optional[dict]]:
+        """
+        Confidence and match details for an already computed pattern match
+        
+        Returns:
+            (confidence, match_details) tuple
+            confidence is 0.0 if not applicable
+        """
+        try:
             if not match:
                 return 0.0, None
             
@@ -109,43 +131,42 @@ class TransformationSelector:
         Detect and resolve conflicts between transformations
         
         Conflicts occur when:
-        - Two transformations target the same AST node
+        - Two transformations target overlapping source spans (the same AST
+          node, or one node nested inside the other)
         - Transformations have incompatible effects
         
-        Resolution: Keep higher priority/confidence transformation
+        Resolution: Keep higher priority/confidence transformation. Selections
+        are accepted greedily by priority * confidence; accepted spans are
+        disjoint and kept sorted, so each overlap check is a binary search.
         """
         if len(selections) <= 1:
             return selections
         
-        # Group by target node (if available)
-        node_groups = {}
-        no_node = []
-        
-        for selection in selections:
-            node = selection.match_details.get('original_node')
-            if node:
-                node_id = id(node)
-                if node_id not in node_groups:
-                    node_groups[node_id] = []
-                node_groups[node_id].append(selection)
-            else:
-                no_node.append(selection)
-        
-        # Resolve conflicts within each group
         resolved = []
+        accepted_starts = []  # Sorted start positions of accepted spans
+        accepted_spans = []   # Accepted spans, same order as accepted_starts
+        
+        ranked = sorted(enumerate(selections),
+                        key=lambda item: (-item[1].rule.priority * item[1].confidence, item[0]))
+        
+        for position, selection in ranked:
+            span = match_span(selection.match_details)
+            if span is None:
+                # Selections without node conflicts
+                resolved.append((position, selection))
+                continue
+            
+            slot = bisect.bisect_left(accepted_starts, span[0])
+            neighbours = accepted_spans[max(slot - 1, 0):slot + 1]
+            if any(spans_overlap(span, other) for other in neighbours):
+                continue
+            
+            accepted_starts.insert(slot, span[0])
+            accepted_spans.insert(slot, span)
+            resolved.append((position, selection))
         
-        for group in node_groups.values():
-            if len(group) == 1:
-                resolved.extend(group)
-            else:
-                # Keep the one with highest priority * confidence
-                best = max(group, key=lambda s: s.rule.priority * s.confidence)
-                resolved.append(best)
-        
-        # Add selections without node conflicts
-        resolved.extend(no_node)
-        
-        return resolved
+        # Keep the original selection order for the stable priority sort
+        return [selection for _, selection in sorted(resolved, key=lambda item: item[0])]
     
     def _sort_by_priority(self, selections: List[SelectedTransformation]) -> List[SelectedTransformation]:
         """
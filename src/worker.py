@@ -0,0 +1,210 @@
+# src/worker.py
+"""
+Worker mode: experiment stages as jobs on the SQLite job queue
+main.py --enqueue splits each contract/model/temperature configuration into
+jobs; any number of worker processes (sharing the outputs directory) claim
+and run them.
+
+Stages:
+- generate: one LLM run of a configuration (ComprehensiveExperiment.generate_run)
+- evaluate: canon selection, oracle checks, repair, metrics and saving of a
+  configuration (run_full_experiment over the generated runs); claimable once
+  all generate jobs of the configuration are finished. Evaluate jobs of the
+  same contract share its canon and never run concurrently.
+
+Usage:
+    python -m src.worker                      # all stages, exit when drained
+    python -m src.worker --stages generate    # generation only
+    python -m src.worker --status             # job counts per stage
+"""
+
+import os
+import time
+import socket
+import threading
+from typing import Dict, Any, Optional, Iterable, Callable, Tuple
+
+from .job_queue import JobQueue, Job
+from .comprehensive_experiment import ComprehensiveExperiment, ExperimentAborted
+from .config import OUTPUTS_DIR
+
+STAGE_GENERATE = "generate"
+STAGE_EVALUATE = "evaluate"
+STAGES = (STAGE_GENERATE, STAGE_EVALUATE)
+
+
+class PermanentJobError(Exception):
+    """Job failure that another attempt would not fix"""
+
+
+def configuration_key(contract_id: str, model: str, temperature: float) -> str:
+    """Group key of the generate jobs of one configuration"""
+    return f"{contract_id}:{model}:temp{temperature}"
+
+
+def enqueue_experiment(queue: JobQueue, contract_template_path: str, contract_id: str, model: str,
+                       temperature: float, num_runs: int, output_dir: str = OUTPUTS_DIR) -> int:
+    """
+    Enqueue the generate jobs and the evaluate job of one configuration
+
+    Jobs already in the queue (same configuration and run) are left alone,
+    so enqueueing a sweep again only adds what is missing.
+
+    Returns:
+        Number of jobs added
+    """
+    group = configuration_key(contract_id, model, temperature)
+    payload = {"templates": contract_template_path, "contract_id": contract_id, "model": model,
+               "temperature": temperature, "output_dir": output_dir}
+
+    added = sum(queue.enqueue(f"{STAGE_GENERATE}:{group}:run{run_idx}", STAGE_GENERATE, group,
+                              dict(payload, run_idx=run_idx))
+                for run_idx in range(num_runs))
+    added += queue.enqueue(f"{STAGE_EVALUATE}:{group}", STAGE_EVALUATE, f"{STAGE_EVALUATE}:{group}",
+                           dict(payload, num_runs=num_runs, generated=group),
+                           after=group, exclusive=f"canon:{contract_id}")
+    return added
+
+
+class Worker:
+    """
+    Claims jobs of the given stages and runs them until the queue is drained
+
+    Args:
+        queue: Job queue to work on
+        worker_id: Lease owner name (default: hostname:pid)
+        stages: Stages this worker takes on
+        experiment_factory: (output_dir, model) -> ComprehensiveExperiment
+    """
+
+    def __init__(self, queue: JobQueue, worker_id: Optional[str] = None, stages: Iterable[str] = STAGES,
+                 experiment_factory: Optional[Callable[[str, str], ComprehensiveExperiment]] = None):
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.stages = list(stages)
+        self.experiment_factory = experiment_factory or (
+            lambda output_dir, model: ComprehensiveExperiment(output_dir, model=model))
+        self._experiments: Dict[Tuple[str, str], ComprehensiveExperiment] = {}
+
+    def run(self, max_jobs: Optional[int] = None, wait: bool = False, poll_interval: float = 5.0) -> int:
+        """
+        Process jobs
+
+        Args:
+            max_jobs: Stop after this many jobs
+            wait: Keep polling for new jobs once the queue is drained
+            poll_interval: Seconds between claims while nothing is claimable
+
+        Returns:
+            Number of jobs processed
+        """
+        processed = 0
+        while max_jobs is None or processed < max_jobs:
+            job = self.queue.claim(self.worker_id, self.stages)
+            if job is None:
+                if not wait and self.queue.unfinished(self.stages) == 0:
+                    break
+                time.sleep(poll_interval)
+                continue
+            self.process(job)
+            processed += 1
+        return processed
+
+    def process(self, job: Job):
+        """Run one claimed job, renewing its lease until it is finished"""
+        print(f"\n👷 {self.worker_id}: {job.key} (attempt {job.attempts})")
+        stop, lease_lost = threading.Event(), threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, stop, lease_lost), daemon=True)
+        heartbeat.start()
+        try:
+            result = self.run_job(job, lease_lost)
+        except ExperimentAborted:
+            # Another worker has re-claimed the job; it owns the journal now
+            print(f"⚠️  Lease on {job.key} was lost; aborted")
+        except PermanentJobError as e:
+            print(f"❌ {job.key} failed: {e}")
+            self.queue.fail(job, self.worker_id, str(e), retry=False)
+        except Exception as e:
+            print(f"❌ {job.key} failed (will retry): {e}")
+            self.queue.fail(job, self.worker_id, f"{type(e).__name__}: {e}")
+        else:
+            if not self.queue.complete(job, self.worker_id, result):
+                print(f"⚠️  Lease on {job.key} was lost; result discarded")
+        finally:
+            stop.set()
+            heartbeat.join()
+
+    def run_job(self, job: Job, lease_lost: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """
+        Run the experiment stage of a job and return its result
+
+        Args:
+            job: Claimed job
+            lease_lost: Set when the lease is lost; the evaluate stage then
+                stops at its next stage boundary with ExperimentAborted
+        """
+        payload = job.payload
+        experiment = self._experiment(payload["output_dir"], payload["model"])
+
+        if job.stage == STAGE_GENERATE:
+            result = experiment.generate_run(payload["templates"], payload["contract_id"],
+                                             payload["temperature"], payload["run_idx"])
+            if not result["success"]:
+                raise RuntimeError(result["error"])
+            return result
+
+        if job.stage == STAGE_EVALUATE:
+            # A re-claimed evaluate job continues from the run journal of its
+            # previous attempt; the first attempt starts it afresh
+            experiment.abort_event = lease_lost
+            try:
+                result = experiment.run_full_experiment(
+                    payload["templates"], payload["contract_id"], payload["num_runs"], payload["temperature"],
+                    resume=job.attempts > 1, pregenerated=self.queue.results(payload["generated"], STAGE_GENERATE))
+            finally:
+                experiment.abort_event = None
+            if "error" in result:
+                raise PermanentJobError(result["error"])
+            return {"experiment_id": result["experiment_id"], "num_runs": result["num_runs"]}
+
+        raise PermanentJobError(f"Unknown stage: {job.stage}")
+
+    def _experiment(self, output_dir: str, model: str) -> ComprehensiveExperiment:
+        key = (output_dir, model)
+        if key not in self._experiments:
+            self._experiments[key] = self.experiment_factory(output_dir, model)
+        return self._experiments[key]
+
+    def _heartbeat(self, job: Job, stop: threading.Event, lease_lost: threading.Event):
+        while not stop.wait(self.queue.lease_seconds / 3):
+            if not self.queue.heartbeat(job, self.worker_id):
+                print(f"⚠️  Lease on {job.key} expired; stopping at the next stage")
+                lease_lost.set()
+                return
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run experiment jobs from the SQLite job queue")
+    parser.add_argument("--queue", default=None, help="Job queue database (default: outputs/job_queue.sqlite)")
+    parser.add_argument("--stages", default=",".join(STAGES),
+                        help=f"Comma-separated stages to take on (default: {','.join(STAGES)})")
+    parser.add_argument("--max-jobs", type=int, default=None, help="Stop after this many jobs")
+    parser.add_argument("--wait", action="store_true", help="Keep polling once the queue is drained")
+    parser.add_argument("--poll", type=float, default=5.0, help="Seconds between claims while idle (default: 5)")
+    parser.add_argument("--status", action="store_true", help="Print job counts per stage and exit")
+    args = parser.parse_args()
+
+    job_queue = JobQueue(args.queue)
+    if args.status:
+        for stage, counts in sorted(job_queue.counts().items()):
+            print(f"{stage}: " + ", ".join(f"{status}={n}" for status, n in sorted(counts.items())))
+    else:
+        stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+        unknown = set(stages) - set(STAGES)
+        if unknown:
+            parser.error(f"Unknown stage(s): {', '.join(sorted(unknown))}")
+        done = Worker(job_queue, stages=stages).run(max_jobs=args.max_jobs, wait=args.wait,
+                                                    poll_interval=args.poll)
+        print(f"\n🏁 Processed {done} job(s)")
@@ -6,9 +6,8 @@ Tests model attribution, metrics calculation, file I/O, and data integrity
 
 import os
 import sys
-import json
 import pandas as pd
-from pathlib import Path
+from src.result_io import load_result, result_files
 
 def test_model_attribution():
     """Test that model names are correctly tracked"""
@@ -39,14 +38,13 @@ def test_model_attribution():
         print(f"  ✓ Experiment completed")
         
         # Check if model was saved correctly in JSON
-        json_files = sorted(Path("outputs").glob(f"{test_contract}_temp{test_temp}_*.json"))
+        json_files = sorted(result_files(f"outputs/{test_contract}_temp{test_temp}_*.json"))
         if not json_files:
             print(f"  ❌ FAILED: No JSON output found")
             return False
         
         latest_json = json_files[-1]
-        with open(latest_json) as f:
-            data = json.load(f)
+        data = load_result(latest_json)
         
         saved_model = data.get("model", "NOT_FOUND")
         print(f"  Model in JSON: {saved_model}")
@@ -0,0 +1,166 @@
+"""
+Tests for adaptive sequential sampling in the experiment runner
+"""
+
+import sys
+import os
+import json
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.adaptive_sampling import (AdaptiveSamplingConfig, SequentialStopper, STOP_CI_WIDTH,
+                                   STOP_MAX_RUNS, STOP_FIXED)
+from src.enhanced_stats import wilson_confidence_interval
+from src.comprehensive_experiment import ComprehensiveExperiment
+
+TEMPLATES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "contracts", "templates.json")
+
+FIB = ("def fibonacci(n):\n    if n <= 1:\n        return n\n    a, b = 0, 1\n"
+       "    for _ in range(2, n + 1):\n        a, b = b, a + b\n    return b\n")
+FIB_RENAMED = FIB.replace("a, b", "prev, curr").replace("a + b", "prev + curr").replace("return b", "return curr")
+
+
+class ScriptedClient:
+    """LLM client stand-in returning a fixed sequence of outputs"""
+    model = "scripted"
+
+    def __init__(self, outputs):
+        self.outputs = list(outputs)
+        self.requests = []
+
+    def generate_samples(self, prompt, temperature=0.0, n=1, on_sample=None):
+        self.requests.append(n)
+        samples = []
+        for i in range(n):
+            code = self.outputs.pop(0)
+            samples.append({"run_index": i, "code": code, "raw_output": code, "success": True,
+                            "error": None, "provenance": {"mode": "scripted"}})
+            if on_sample:
+                on_sample(samples[-1])
+        return samples
+
+
+def make_experiment(output_dir, client):
+    experiment = ComprehensiveExperiment(str(output_dir), llm_client=client)
+    # Plotting is not under test here
+    experiment.bell_curve_analyzer = SimpleNamespace(plot_pre_post_comparison=lambda *a, **k: {})
+    return experiment
+
+
+def run_until_stop(stopper, outputs, matches):
+    raw, anchor = [], []
+    while True:
+        for _ in range(stopper.next_batch(len(raw))):
+            raw.append(outputs[len(raw)])
+            anchor.append(matches[len(anchor)])
+        reason = stopper.check(len(raw), raw, anchor)
+        if reason:
+            return reason, len(raw)
+
+
+def test_identical_outputs_stop_once_interval_is_tight():
+    config = AdaptiveSamplingConfig(min_runs=5, target_ci_width=0.3)
+    stopper = SequentialStopper(config, max_runs=20)
+    reason, runs = run_until_stop(stopper, ["x = 1"] * 20, [True] * 20)
+
+    lower, upper = wilson_confidence_interval(runs, runs)
+    prev_lower, prev_upper = wilson_confidence_interval(runs - 1, runs - 1)
+    assert reason == STOP_CI_WIDTH and 5 < runs < 20
+    assert upper - lower <= 0.3 < prev_upper - prev_lower
+
+    summary = stopper.summary()
+    assert summary["runs_used"] == runs and summary["stopping_reason"] == STOP_CI_WIDTH
+    assert summary["R_raw"]["estimate"] == 1.0
+    assert [c["runs"] for c in summary["checks"]] == list(range(5, runs + 1))
+
+
+def test_mixed_outputs_exhaust_budget():
+    stopper = SequentialStopper(AdaptiveSamplingConfig(min_runs=3, target_ci_width=0.2), max_runs=12)
+    outputs = [f"x = {i % 2}" for i in range(12)]
+    assert run_until_stop(stopper, outputs, [True] * 12) == (STOP_MAX_RUNS, 12)
+
+
+def test_no_stop_without_canon_and_config_validation():
+    stopper = SequentialStopper(AdaptiveSamplingConfig(min_runs=2, target_ci_width=0.9), max_runs=4)
+    assert stopper.check(2, ["x = 1", "x = 1"], None) is None
+    assert stopper.check(3, ["x = 1"] * 3, [True] * 3) == STOP_CI_WIDTH
+
+    with pytest.raises(ValueError):
+        AdaptiveSamplingConfig(target_ci_width=0.0)
+    with pytest.raises(ValueError):
+        AdaptiveSamplingConfig(min_runs=0)
+
+
+@pytest.mark.parametrize("outputs, expected_runs, expected_reason", [
+    ([FIB] * 20, 12, STOP_CI_WIDTH),
+    ([FIB, FIB_RENAMED] * 10, 20, STOP_MAX_RUNS),
+])
+def test_experiment_records_adaptive_sampling(tmp_path, outputs, expected_runs, expected_reason):
+    client = ScriptedClient(outputs)
+    experiment = make_experiment(tmp_path, client)
+    config = AdaptiveSamplingConfig(min_runs=5, target_ci_width=0.25)
+
+    result = experiment.run_full_experiment(TEMPLATES, "fibonacci_basic",
+                                            num_runs=20, temperature=0.0, adaptive=config)
+
+    assert "error" not in result
+    assert result["num_runs"] == expected_runs == sum(client.requests)
+    assert client.requests[0] == 5 and set(client.requests[1:]) <= {1}
+    assert len(result["raw_outputs"]) == len(result["repaired_outputs"]) == expected_runs
+    assert result["sampling"]["stopping_reason"] == expected_reason
+    assert result["sampling"]["R_anchor_post"]["estimate"] == pytest.approx(result["metrics"]["R_anchor_post"])
+    assert result["sampling"]["R_raw"]["estimate"] == pytest.approx(result["metrics"]["R_raw"])
+
+    saved = [f for f in os.listdir(tmp_path) if f.startswith("fibonacci_basic_temp") and f.endswith(".json")]
+    with open(os.path.join(tmp_path, saved[0])) as f:
+        assert json.load(f)["sampling"]["runs_used"] == expected_runs
+
+
+def test_fixed_budget_is_recorded(tmp_path):
+    client = ScriptedClient([FIB] * 3)
+    experiment = make_experiment(tmp_path, client)
+    result = experiment.run_full_experiment(TEMPLATES, "fibonacci_basic", num_runs=3)
+
+    assert client.requests == [3]
+    assert result["num_runs"] == 3
+    assert result["sampling"] == {"mode": "fixed", "stopping_reason": STOP_FIXED, "runs_used": 3, "max_runs": 3}
+
+
+def test_canon_search_checks_each_output_once(tmp_path):
+    failing = [f"def fibonacci(n):\n    return n + {i} * 0\n" for i in range(8)]
+    experiment = make_experiment(tmp_path, ScriptedClient(failing + [FIB] * 12))
+    checked = []
+    run_oracle_tests = experiment.oracle_system.run_oracle_tests
+    experiment.oracle_system.run_oracle_tests = lambda code, contract: (checked.append(code),
+                                                                        run_oracle_tests(code, contract))[1]
+
+    result = experiment.run_full_experiment(TEMPLATES, "fibonacci_basic", num_runs=20, temperature=0.0,
+                                            adaptive=AdaptiveSamplingConfig(min_runs=5, target_ci_width=0.25))
+
+    assert "error" not in result and result["canon_data"]["canonical_code"] == FIB
+    assert sorted(code for code in checked if code in failing) == sorted(failing)
+
+
+def test_repair_reports_anchor_matches_without_recomparing(tmp_path):
+    from src.contract import Contract
+
+    experiment = make_experiment(tmp_path, ScriptedClient([]))
+    contract = Contract.from_template(TEMPLATES, "fibonacci_basic")
+    experiment.canon_system.create_canon(contract, FIB, require_oracle_pass=False)
+    failing = "def fibonacci(n):\n    return n\n"
+    compared = []
+    compare_to_canon = experiment.canon_system.compare_to_canon
+    experiment.canon_system.compare_to_canon = lambda contract_id, code, *args: (
+        compared.append(code), compare_to_canon(contract_id, code, *args))[1]
+
+    repaired, records = [], []
+    outputs = [FIB, FIB_RENAMED, failing]
+    matches = experiment._repair_outputs(contract, "fibonacci_basic", outputs, repaired, records)
+
+    assert compared == outputs
+    assert matches == [compare_to_canon("fibonacci_basic", code)["distance"] == 0.0 for code in repaired]
+    assert matches[0] and len(matches) == 3
@@ -0,0 +1,131 @@
+"""
+Tests for the agent tool runtime: worker pool offload, memoization and bounded fan-out
+"""
+
+import sys
+import os
+import time
+import asyncio
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.tool_runtime import (ToolRuntime, ToolResultCache, tool_key, load_contract,
+                                 extract_properties, oracle_check)
+
+
+FIB = "def fibonacci(n):\n    if n <= 1:\n        return n\n    return fibonacci(n - 1) + fibonacci(n - 2)\n"
+
+
+class CountingTool:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, value):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return value * 2
+
+
+def test_results_memoized_across_sessions():
+    cache = ToolResultCache()
+    tool = CountingTool()
+
+    async def session(runtime):
+        return await runtime.run(tool_key("double", "x = 1", "demo"), tool, 21)
+
+    first, second = ToolRuntime(cache=cache), ToolRuntime(cache=cache)
+    assert asyncio.run(session(first)) == 42
+    assert asyncio.run(session(second)) == 42
+    assert second.run_sync(tool_key("double", "x = 1", "demo"), tool, 21) == 42
+
+    assert tool.calls == 1
+    assert cache.stats == {"entries": 1, "hits": 2, "misses": 1}
+    assert tool_key("double", "x = 1", "demo") != tool_key("double", "x = 2", "demo")
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    runtime = ToolRuntime()
+    tool = CountingTool(delay=0.05)
+    key = tool_key("double", FIB)
+
+    async def main():
+        return await asyncio.gather(*(runtime.run(key, tool, 1) for _ in range(5)))
+
+    assert asyncio.run(main()) == [2] * 5
+    assert tool.calls == 1
+
+
+def test_offload_keeps_event_loop_responsive():
+    runtime = ToolRuntime(max_workers=2)
+    tool = CountingTool(delay=0.2)
+    ticks = []
+
+    async def heartbeat():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.02)
+
+    async def main():
+        await asyncio.gather(runtime.run(tool_key("slow", "a"), tool, 1), heartbeat())
+
+    asyncio.run(main())
+    assert len(ticks) == 5 and ticks[-1] - ticks[0] < 0.19
+
+
+def test_bounded_batch_preserves_order():
+    runtime = ToolRuntime(max_workers=8)
+    tool = CountingTool(delay=0.02)
+
+    async def main():
+        factories = [lambda i=i: runtime.run(tool_key("double", str(i)), tool, i) for i in range(10)]
+        return await runtime.gather_bounded(factories, max_concurrency=3)
+
+    assert asyncio.run(main()) == [i * 2 for i in range(10)]
+    assert tool.calls == 10
+    assert tool.max_active <= 3
+
+
+def test_worker_functions_in_process_pool():
+    runtime = ToolRuntime(max_workers=2, use_processes=True)
+    contract = load_contract("fibonacci_basic").data
+
+    async def main():
+        return await asyncio.gather(
+            runtime.run(tool_key("properties", FIB), extract_properties, FIB),
+            runtime.run(tool_key("oracle", FIB, "fibonacci_basic"), oracle_check, FIB, contract),
+        )
+
+    try:
+        properties, oracle_result = asyncio.run(main())
+    finally:
+        runtime.shutdown()
+
+    assert properties == extract_properties(FIB)
+    assert oracle_result["passed"]
+
+
+def test_transform_key_covers_canon_variants(tmp_path):
+    from src.canon_system import CanonSystem
+    from agents.tool_runtime import canon_library_fingerprint
+
+    canon_system = CanonSystem(str(tmp_path))
+    contract = load_contract("fibonacci_basic")
+    canon_system.create_canon(contract, FIB, require_oracle_pass=False)
+    before = canon_library_fingerprint(canon_system, "fibonacci_basic")
+
+    iterative = "def fibonacci(n):\n    a, b = 0, 1\n    for _ in range(n):\n        a, b = b, a + b\n    return a\n"
+    canon_system.add_canon_variant(contract, iterative, require_oracle_pass=False)
+    after = canon_library_fingerprint(canon_system, "fibonacci_basic")
+    assert before != after
+    assert tool_key("transform", FIB, "fibonacci_basic", before) != tool_key("transform", FIB, "fibonacci_basic", after)
@@ -0,0 +1,122 @@
+"""
+Tests for the cached, vectorized analysis engine behind the paper tables
+"""
+
+import sys
+import os
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.analysis_engine as analysis_engine
+from src.analysis_engine import AnalysisEngine, load_summary, bootstrap_mean_ci, BOOTSTRAP_CACHE_FILENAME
+from src.metrics_sink import MetricsSink
+from src.enhanced_stats import fishers_exact_test, effect_size_proportions
+
+CONTRACTS = ["binary_search", "gcd", "slugify"]
+MODELS = ["gpt-4o-mini", "gpt-4o"]
+TEMPERATURES = [0.0, 0.5, 1.0]
+
+
+def make_result(i, contract_id, model, temperature):
+    rng = np.random.default_rng(i)
+    r_raw = round(float(rng.uniform(0.2, 0.9)), 2)
+    metrics = {name: 0.0 for name in (
+        "R_anchor_pre", "R_anchor_post", "mean_distance_pre", "std_distance_pre", "mean_distance_post",
+        "std_distance_post", "Delta_mu", "canon_coverage", "rescue_rate")}
+    metrics.update(R_raw=r_raw, R_structural=min(1.0, r_raw + 0.05 * (i % 4)), R_behavioral=1.0,
+                   Delta_rescue=0.05 * (i % 3))
+    return {"experiment_id": f"{contract_id}_temp{temperature}_{i:04d}", "contract_id": contract_id,
+            "model": model, "temperature": temperature, "successful_runs": 20,
+            "timestamp": "2026-01-23T09:43:05", "metrics": metrics}
+
+
+@pytest.fixture
+def output_dir(tmp_path):
+    sink = MetricsSink(str(tmp_path), compact_rows=10)
+    configs = list(itertools.product(CONTRACTS, MODELS, TEMPERATURES))
+    # Every configuration twice; the second run is the "latest"
+    for i, config in enumerate(configs + configs):
+        sink.append(make_result(i, *config))
+    return str(tmp_path)
+
+
+def test_tables_match_per_group_filtering(output_dir):
+    engine = AnalysisEngine(output_dir, contracts=["binary_search", "slugify"], latest_only=True, n_resamples=500)
+    df = pd.read_csv(os.path.join(output_dir, "metrics_summary.csv"))
+    df = df[df["contract_id"].isin(["binary_search", "slugify"])]
+    df = df.drop_duplicates(subset=["contract_id", "model", "decoding_temperature"], keep="last")
+    assert len(engine.frame) == len(df) == 12
+
+    for by, column in (("model", "model"), ("contract", "contract_id"), ("temperature", "decoding_temperature")):
+        table = engine.improvement(by)
+        for value, row in table.iterrows():
+            group = df[df[column] == value]
+            assert row.n == len(group)
+            assert row.R_raw == pytest.approx(group["R_raw"].mean())
+            assert row.delta == pytest.approx(group["R_structural"].mean() - group["R_raw"].mean())
+
+    significance = engine.significance()
+    for contract, row in significance.iterrows():
+        group = df[df["contract_id"] == contract]
+        n = 20 * len(group)
+        raw, structural = round(group["R_raw"].mean() * n), round(group["R_structural"].mean() * n)
+        assert row.p_value == pytest.approx(fishers_exact_test(raw, n, structural, n)["p_value"])
+        assert row.cohens_h == pytest.approx(effect_size_proportions(raw, n, structural, n)["cohens_h"])
+    one_sided = engine.significance(alternative="greater")
+    assert (one_sided["p_value"] <= significance["p_value"]).all()
+    for contract, row in one_sided.iterrows():
+        n = int(row.trials)
+        raw, structural = round(row.R_raw * n), round(row.R_structural * n)
+        assert row.p_value == pytest.approx(fishers_exact_test(raw, n, structural, n, "greater")["p_value"])
+
+    assert list(engine.improvement("model", sort=False).index) == list(df["model"].unique()) == MODELS
+    assert list(engine.improvement("model").index) == sorted(MODELS)
+    per_contract, _ = engine.strata(sort=False)
+    assert list(per_contract.index) == list(df["contract_id"].unique())
+
+    tables = engine.paper_tables()
+    assert set(tables) == {"overall", "models", "contracts", "temperatures", "significance",
+                           "contract_strata", "strata"}
+    assert tables["overall"].loc["R_raw", "mean"] == pytest.approx(df["R_raw"].mean())
+    assert sum(tables["strata"]["n"]) == len(df)
+
+
+def test_bootstrap_results_are_memoized_across_runs(output_dir, monkeypatch):
+    values = np.linspace(0.1, 0.9, 40)
+    low, high = bootstrap_mean_ci(values, n_resamples=2000, seed=3)
+    assert (low, high) == bootstrap_mean_ci(values, n_resamples=2000, seed=3)
+    assert low < values.mean() < high
+    bca = bootstrap_mean_ci(values, n_resamples=2000, seed=3, method="BCa")
+    assert bca == bootstrap_mean_ci(values, n_resamples=2000, seed=3, method="BCa") != (low, high)
+    assert bca[0] < values.mean() < bca[1]
+
+    first = AnalysisEngine(output_dir, n_resamples=2000)
+    overall = first.overall()
+    first.save_cache()
+    assert os.path.exists(os.path.join(output_dir, BOOTSTRAP_CACHE_FILENAME))
+
+    def no_resampling(*args, **kwargs):
+        raise AssertionError("bootstrap recomputed")
+
+    monkeypatch.setattr(analysis_engine, "bootstrap_mean_ci", no_resampling)
+    second = AnalysisEngine(output_dir, n_resamples=2000)
+    pd.testing.assert_frame_equal(second.overall(), overall)
+    with pytest.raises(AssertionError):
+        AnalysisEngine(output_dir, n_resamples=2001).overall()
+
+
+def test_summary_is_parsed_once_until_it_changes(output_dir):
+    first = load_summary(output_dir)
+    assert load_summary(output_dir) is first
+    assert len(first) == 36
+
+    MetricsSink(output_dir).append(make_result(99, "gcd", "gpt-4o", 0.7))
+    refreshed = load_summary(output_dir)
+    assert refreshed is not first and len(refreshed) == 37
+    assert AnalysisEngine(output_dir).improvement("temperature").loc[0.7, "n"] == 1
@@ -0,0 +1,81 @@
+"""
+Tests for Merkle AST hashing in the transformation package
+"""
+
+import sys
+import os
+import ast
+import copy
+import itertools
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.foundational_properties import AlphaRenamer
+from src.transformations.ast_hashing import (structural_hash, alpha_hash, nodes_equal,
+                                             program_hash, clear_hashes)
+from src.transformations.intelligent_simplifier import ASTDiffer
+from benchmarks.stress_corpus import load_canons, generate_variants
+
+
+def corpus_nodes():
+    """Statements and expressions from canons and stress variants (many near-duplicates)"""
+    nodes = []
+    for entry in list(load_canons().values())[:6]:
+        for code in [entry["canon_code"]] + generate_variants(entry["canon_code"], 4, seed=3):
+            tree = ast.parse(code)
+            nodes.append(tree)
+            nodes.extend(n for n in ast.walk(tree) if isinstance(n, (ast.stmt, ast.expr)))
+    return nodes
+
+
+def alpha_dump(node):
+    return ast.dump(AlphaRenamer().visit(copy.deepcopy(node)))
+
+
+def test_hash_equality_matches_dump_equality():
+    nodes = corpus_nodes()
+    dumps = [ast.dump(n) for n in nodes]
+    alpha_dumps = [alpha_dump(n) for n in nodes]
+    hashes = [structural_hash(n) for n in nodes]
+    alpha_hashes = [alpha_hash(n) for n in nodes]
+
+    pairs = 0
+    for i, j in itertools.combinations(range(0, len(nodes), 3), 2):
+        assert (hashes[i] == hashes[j]) == (dumps[i] == dumps[j])
+        assert (alpha_hashes[i] == alpha_hashes[j]) == (alpha_dumps[i] == alpha_dumps[j])
+        pairs += 1
+    assert pairs > 10000
+
+
+def test_positions_ignored_and_renaming_detected():
+    a = ast.parse("def f(n):\n    total = n + 1\n    return total\n")
+    b = ast.parse("\n\ndef f(n):\n    total = n + 1  # comment\n\n    return total\n")
+    c = ast.parse("def f(x):\n    acc = x + 1\n    return acc\n")
+
+    assert program_hash(a) == program_hash(b)
+    assert program_hash(a) != program_hash(c)
+    assert program_hash(a, alpha=True) == program_hash(c, alpha=True)
+    assert nodes_equal(a.body[0].body[1], c.body[0].body[1], alpha=True)
+    assert not nodes_equal(ast.parse("x = 1").body[0], ast.parse("x = True").body[0])
+
+
+def test_hashes_cached_until_cleared():
+    tree = ast.parse("def f(n):\n    if n < 0:\n        return 0\n    return n\n")
+    before = structural_hash(tree)
+    assert all("_skyt_merkle" in node.__dict__ for node in ast.walk(tree))
+
+    tree.body[0].body.pop(0)
+    assert structural_hash(tree) == before  # stale until cleared
+    clear_hashes(tree)
+    assert structural_hash(tree) == structural_hash(ast.parse("def f(n):\n    return n\n"))
+
+
+def test_ast_differ_finds_extra_statements():
+    canon = "def f(n):\n    if n <= 1:\n        return n\n    return f(n - 1) + f(n - 2)\n"
+    code = ("def f(n):\n    if n < 0:\n        raise ValueError()\n    if n <= 1:\n        return n\n"
+            "    return f(n - 1) + f(n - 2)\n")
+
+    extra = ASTDiffer.find_extra_statements(code, canon, "f")
+    assert [ast.unparse(s) for s in extra] == ["if n < 0:\n    raise ValueError()"]
+    assert ASTDiffer.find_extra_statements(canon, canon, "f") == []
@@ -0,0 +1,62 @@
+"""
+Tests for the benchmark suite: corpus building, summaries and regression flags
+"""
+
+import sys
+import os
+import json
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.build_corpus import build_corpus
+from benchmarks.run_benchmarks import (run_benchmarks, summarize, compare_to_baseline,
+                                       DEFAULT_CORPUS, ALL_CONTRACTS)
+
+
+def test_summarize_percentiles_and_throughput():
+    row = summarize([0.001, 0.002, 0.003, 0.004], snippets=4)
+
+    assert row["calls"] == 4
+    assert abs(row["throughput"] - 400.0) < 1e-6
+    assert abs(row["p50_ms"] - 2.5) < 1e-9
+    assert row["p50_ms"] <= row["p95_ms"] <= 4.0
+
+
+def test_compare_flags_only_real_regressions():
+    baseline = {"results": {"extract_properties": {
+        "a": {"p50_ms": 10.0}, "b": {"p50_ms": 10.0}, "c": {"p50_ms": 0.02}}}}
+    current = {"results": {"extract_properties": {
+        "a": {"p50_ms": 14.0}, "b": {"p50_ms": 11.0}, "c": {"p50_ms": 0.04},
+        "new": {"p50_ms": 99.0}}}}
+
+    regressions = compare_to_baseline(current, baseline, threshold=0.25)
+
+    assert [(r["contract_id"], round(r["ratio"], 2)) for r in regressions] == [("a", 1.4)]
+
+
+def test_build_corpus_dedupes_and_caps(tmp_path):
+    result = {"contract_id": "demo", "contract": {"id": "demo"},
+              "canon_data": {"canonical_code": "def f():\n    return 1\n"},
+              "raw_outputs": ["x = 1", "x = 1", "x = 2", "x = 3"],
+              "repaired_outputs": ["x = 1", "x = 1", "x = 2", "x = 3"]}
+    (tmp_path / "demo_temp0.0.json").write_text(json.dumps(result))
+    (tmp_path / "notes.json").write_text("[]")
+
+    corpus = build_corpus(str(tmp_path), per_contract=2)
+
+    assert [s["raw"] for s in corpus["contracts"]["demo"]["snippets"]] == ["x = 1", "x = 2"]
+
+
+def test_run_on_committed_corpus():
+    with open(DEFAULT_CORPUS, "r") as f:
+        corpus = json.load(f)
+    contract_id = next(iter(corpus["contracts"]))
+
+    results = run_benchmarks(corpus, ["extract_properties", "calculate_distance"],
+                             contracts=[contract_id], repeat=1, warmup=0)
+
+    snippets = len(corpus["contracts"][contract_id]["snippets"])
+    for target in ("extract_properties", "calculate_distance"):
+        assert set(results["results"][target]) == {contract_id, ALL_CONTRACTS}
+        assert results["results"][target][contract_id]["calls"] == snippets
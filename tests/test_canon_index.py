@@ -0,0 +1,168 @@
+"""
+Tests for multi-canon libraries and the nearest-canon index
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.canon_system import CanonSystem
+from src.canon_index import CanonIndex, property_vector, vector_distance
+from src.contract import Contract
+
+
+ITERATIVE = """def fibonacci(n):
+    if n <= 1:
+        return n
+    a, b = 0, 1
+    for _ in range(2, n + 1):
+        a, b = b, a + b
+    return b
+"""
+
+RECURSIVE = """def fibonacci(n):
+    if n <= 1:
+        return n
+    return fibonacci(n - 1) + fibonacci(n - 2)
+"""
+
+RECURSIVE_RENAMED = """def fibonacci(k):
+    if k <= 1:
+        return k
+    return fibonacci(k - 1) + fibonacci(k - 2)
+"""
+
+ITERATIVE_RENAMED = """def fibonacci(n):
+    if n <= 1:
+        return n
+    prev, curr = 0, 1
+    for _ in range(2, n + 1):
+        prev, curr = curr, prev + curr
+    return curr
+"""
+
+PASSED = {"passed": True, "pass_rate": 1.0}
+
+
+@pytest.fixture
+def contract():
+    return Contract({
+        "id": "fibonacci_multi",
+        "task_intent": "Compute fibonacci",
+        "prompt": "Write fibonacci(n)",
+        "language": "python",
+        "contract_version": "2.0",
+        "created_timestamp": "2026-01-01T00:00:00",
+        "algorithm_family": "fibonacci",
+        "constraints": {"function_name": "fibonacci"}
+    })
+
+
+@pytest.fixture
+def canon_system(tmp_path, contract):
+    system = CanonSystem(str(tmp_path / "canon"))
+    system.create_canon(contract, ITERATIVE, oracle_result=PASSED)
+    return system
+
+
+def test_single_canon_library(canon_system):
+    library = canon_system.load_canon_library("fibonacci_multi")
+
+    assert len(library) == 1
+    assert library[0]["variant_id"] == "primary"
+
+
+def test_variant_is_closest_anchor(canon_system, contract):
+    before = canon_system.compare_to_canon("fibonacci_multi", RECURSIVE)
+    assert before["distance"] > 0.0
+
+    variant = canon_system.add_canon_variant(contract, RECURSIVE, oracle_result=PASSED)
+    assert variant["variant_id"] == "v1"
+
+    after = canon_system.compare_to_canon("fibonacci_multi", RECURSIVE)
+    assert after["is_identical"]
+    assert after["canon_variant_id"] == "v1"
+    assert after["canon_match_tier"] == "ast_hash"
+
+
+def test_alpha_hash_lookup(canon_system, contract):
+    canon_system.add_canon_variant(contract, RECURSIVE, oracle_result=PASSED)
+
+    nearest = canon_system.find_nearest_canon("fibonacci_multi", code=RECURSIVE_RENAMED)
+    assert nearest["match_tier"] == "alpha_hash"
+    assert nearest["canon_data"]["variant_id"] == "v1"
+
+
+def test_duplicate_variant_not_stored(canon_system, contract):
+    canon_system.add_canon_variant(contract, RECURSIVE, oracle_result=PASSED)
+    canon_system.add_canon_variant(contract, RECURSIVE, oracle_result=PASSED)
+    canon_system.add_canon_variant(contract, ITERATIVE, oracle_result=PASSED)
+
+    assert len(canon_system.load_canon_library("fibonacci_multi")) == 2
+
+
+def test_variant_requires_oracle_pass(canon_system, contract):
+    with pytest.raises(ValueError):
+        canon_system.add_canon_variant(contract, RECURSIVE, oracle_result={"passed": False})
+
+
+def test_nearest_scores_only_shortlist(canon_system):
+    props = canon_system.properties_extractor.extract_all_properties(RECURSIVE)
+    canons = [canon_system.load_canon("fibonacci_multi")] * 10
+    index = CanonIndex(canons, shortlist_size=2)
+
+    result = index.find_nearest(props)
+    assert result["match_tier"] == "nearest"
+    assert result["candidates_scored"] == 2
+
+
+def test_property_vector_distance():
+    assert vector_distance((1.0, 2.0), (1.0, 2.0)) == 0.0
+    assert vector_distance((), (1.0,)) == 1.0
+    assert property_vector({}) == ()
+
+
+def _slow_compare(canon_system, code, contract=None):
+    """compare_to_canon with the fast tiers disabled"""
+    index = canon_system.get_canon_index("fibonacci_multi")
+    properties = canon_system.properties_extractor.extract_all_properties(code)
+    return properties, index.find_nearest(properties, contract)
+
+
+@pytest.mark.parametrize("code, tier", [
+    (ITERATIVE, "text_hash"),
+    ("# reformatted\n" + ITERATIVE.replace("a, b = 0, 1", "a, b = (0, 1)  # seed"), "ast_hash"),
+    (ITERATIVE_RENAMED, "alpha_hash"),
+    (RECURSIVE, "full"),
+])
+def test_comparison_tiers_match_full_comparison(canon_system, code, tier):
+    result = canon_system.compare_to_canon("fibonacci_multi", code)
+    properties, nearest = _slow_compare(canon_system, code)
+
+    assert result["comparison_tier"] == tier
+    assert result["new_properties"] == properties
+    assert result["distance"] == nearest["distance"]
+    assert result["canon_match_tier"] == nearest["match_tier"]
+    assert canon_system.comparison_tier_counts[tier] == 1
+
+
+def test_alpha_tier_respects_strict_naming(canon_system):
+    strict = {"constraints": {"variable_naming": {"naming_policy": "strict"}}}
+    assert canon_system.compare_to_canon("fibonacci_multi", ITERATIVE_RENAMED, strict)["comparison_tier"] == "full"
+    properties, tier = canon_system.candidate_properties("fibonacci_multi", ITERATIVE, strict)
+    assert tier == "text_hash" and properties == _slow_compare(canon_system, ITERATIVE)[0]
+
+
+def test_transform_results_report_comparison_tier(canon_system):
+    from src.code_transformer import CodeTransformer
+
+    transformer = CodeTransformer(canon_system)
+    assert transformer.transform_to_canon(ITERATIVE, "fibonacci_multi")["comparison_tier"] == "text_hash"
+    result = transformer.transform_to_canon(RECURSIVE, "fibonacci_multi")
+    assert result["transformation_level"] != 0 or not result["success"]
+    assert result["comparison_tier"] == "full"
+    assert transformer.transform_to_canon(RECURSIVE, "missing_contract")["comparison_tier"] is None
@@ -0,0 +1,96 @@
+"""
+Tests for speculative (concurrent) oracle checks during canon selection
+"""
+
+import sys
+import os
+import time
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.contract import Contract
+from src.contract_compliance import check_contract_compliance
+from src.oracle_system import OracleSystem
+from src.comprehensive_experiment import ComprehensiveExperiment
+
+TEMPLATES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "contracts", "templates.json")
+
+FIB = ("def fibonacci(n):\n    if n <= 1:\n        return n\n    a, b = 0, 1\n"
+       "    for _ in range(2, n + 1):\n        a, b = b, a + b\n    return b\n")
+FIB_SLOW_WRONG = "import time\ntime.sleep(0.3)\ndef fibonacci(n):\n    return n\n"
+FIB_SLOW = "import time\ntime.sleep(0.3)\n" + FIB
+
+PRIME_WHILE = ("def is_prime(n):\n    if n < 2:\n        return False\n    i = 2\n    while i * i <= n:\n"
+               "        if n % i == 0:\n            return False\n        i += 1\n    return True\n")
+PRIME_FOR = ("def is_prime(n):\n    if n < 2:\n        return False\n    for i in range(2, n):\n"
+             "        if n % i == 0:\n            return False\n    return True\n")
+
+
+class CountingOracle(OracleSystem):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def run_oracle_tests(self, code, contract, timeout=5):
+        with self._lock:
+            self.calls += 1
+        return super().run_oracle_tests(code, contract, timeout)
+
+
+def make_experiment(output_dir):
+    experiment = ComprehensiveExperiment(str(output_dir), llm_client=type("Client", (), {"model": "none"})())
+    experiment.oracle_system = CountingOracle()
+    return experiment
+
+
+def test_speculative_verdicts_match_serial_checks():
+    contract = Contract.from_template(TEMPLATES, "is_prime_strict").data
+    oracle = OracleSystem()
+    codes = [PRIME_WHILE, "def is_prime(n):\n    return True\n", PRIME_FOR, "def is_prime(n) return"]
+
+    with oracle.speculate(codes, contract, check_contract_compliance, max_workers=4) as checks:
+        speculative = [checks.result(i) for i in range(len(codes))]
+
+    for code, (oracle_result, compliance) in zip(codes, speculative):
+        serial = oracle.run_oracle_tests(code, contract)
+        assert oracle_result["passed"] == serial["passed"]
+        assert compliance == (check_contract_compliance(code, contract) if serial["passed"] else None)
+
+
+def test_failing_candidates_checked_concurrently():
+    contract = Contract.from_template(TEMPLATES, "fibonacci_basic").data
+    oracle = OracleSystem()
+    codes = [FIB_SLOW_WRONG] * 4 + [FIB]
+
+    start = time.perf_counter()
+    with oracle.speculate(codes, contract, max_workers=5) as checks:
+        verdicts = [checks.result(i)[0]["passed"] for i in range(len(codes))]
+    elapsed = time.perf_counter() - start
+
+    assert verdicts == [False] * 4 + [True]
+    assert elapsed < 4 * 0.3
+
+
+def test_lowest_index_wins_and_pending_checks_are_cancelled(tmp_path):
+    experiment = make_experiment(tmp_path)
+    contract = Contract.from_template(TEMPLATES, "fibonacci_basic")
+    outputs = [FIB_SLOW_WRONG, FIB_SLOW, FIB] + [FIB] * 60
+
+    canon_data, created = experiment._establish_canon(contract, "fibonacci_basic", outputs)
+
+    assert created
+    assert canon_data["canonical_code"] == FIB_SLOW  # run 2 wins although run 3 finishes first
+    assert experiment.oracle_system.calls < len(outputs)
+
+
+def test_strict_contract_picks_first_compliant_output(tmp_path):
+    experiment = make_experiment(tmp_path)
+    contract = Contract.from_template(TEMPLATES, "is_prime_strict")
+    outputs = ["def is_prime(n):\n    return True\n", PRIME_WHILE, PRIME_FOR, PRIME_FOR.replace("n % i", "n % i ")]
+
+    canon_data, created = experiment._establish_canon(contract, "is_prime_strict", outputs)
+
+    assert created and canon_data["canonical_code"] == PRIME_FOR
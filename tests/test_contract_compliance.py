@@ -0,0 +1,103 @@
+"""
+Tests for the single-traversal contract compliance rule engine
+"""
+
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.contract_compliance import check_contract_compliance, find_violations, PatternMatcher
+
+
+STRICT = {
+    "constraints": {
+        "misra_c_rules": {"rule_15_5": "single exit", "rule_15_4": "no break",
+                          "rule_17_2": "no recursion", "rule_21_3": "no dynamic memory"},
+        "nasa_power_of_10": {"p10_1": "no recursion", "p10_3": "no dynamic memory"}
+    }
+}
+
+VIOLATING = """from collections import deque
+
+def search(items, target):
+    for i in range(len(items)):
+        if items[i] == target:
+            return i
+        if i > 100:
+            break
+    return search(items[1:], target)
+"""
+
+COMPLIANT = """def search(items, target):
+    result = -1
+    i = 0
+    while i < len(items) and result == -1:
+        if items[i] == target:
+            result = i
+        i += 1
+    return result
+"""
+
+
+def test_compliant_code():
+    assert check_contract_compliance(COMPLIANT, STRICT) == (True, [])
+
+
+def test_violations_with_locations():
+    violations = find_violations(VIOLATING, STRICT)
+    by_rule = {}
+    for violation in violations:
+        by_rule.setdefault(violation.rule, []).append(violation)
+
+    assert [v.lineno for v in by_rule["MISRA 15.5"]] == [6, 3]
+    assert by_rule["MISRA 15.4"][0].lineno == 8
+    assert by_rule["MISRA 17.2"][0].message == "MISRA 17.2: Recursive call to search"
+    assert by_rule["NASA P10-1"][0].lineno == 9
+    assert by_rule["MISRA 21.3"][0].lineno == 1
+    assert by_rule["NASA P10-3"][0].lineno == 1
+
+    is_compliant, messages = check_contract_compliance(VIOLATING, STRICT)
+    assert not is_compliant
+    assert "MISRA 15.4: break statement not allowed (line 8)" in messages
+
+
+def test_nested_function_counts_for_both_functions():
+    code = """def outer(n):
+    def inner(m):
+        if m:
+            return outer(m)
+        return 0
+    return inner(n)
+"""
+    messages = [v.message for v in find_violations(code, STRICT)]
+
+    # The early return inside inner also belongs to outer, as before
+    assert messages.count("MISRA 15.5: Early return inside conditional") == 2
+    assert messages.count("MISRA 17.2: Recursive call to outer") == 1
+
+
+def test_syntax_error_reported_per_rule_family():
+    _, messages = check_contract_compliance("def broken(:", STRICT)
+    assert messages == ["Code has syntax errors", "Code has syntax errors"]
+
+
+def test_forbidden_and_required_patterns():
+    contract = {"constraints": {"forbidden_patterns": ["while True", "print("],
+                                "required_patterns": ["return", "yield"]}}
+    code = "def f():\n    while True:\n        return 1\n"
+
+    is_compliant, messages = check_contract_compliance(code, contract)
+
+    assert not is_compliant
+    assert messages == ["Forbidden pattern: 'while True' (line 2)",
+                        "Missing required pattern: 'yield'"]
+
+
+def test_pattern_matcher_overlaps():
+    matcher = PatternMatcher(("abc", "cd", "bc", "", "zz"))
+    found = matcher.find("xabcd")
+
+    assert set(found) == {"abc", "cd", "bc", ""}
+    assert found["bc"] == 2
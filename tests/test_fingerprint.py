@@ -0,0 +1,69 @@
+"""
+Tests for stable, process-independent fingerprints
+"""
+
+import sys
+import os
+import subprocess
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fingerprint import (
+    fingerprint,
+    code_fingerprint,
+    structural_fingerprint,
+    canonical_serialize,
+    FINGERPRINT_VERSION
+)
+from src.foundational_properties import FoundationalProperties
+from src.metrics import ComprehensiveMetrics
+
+
+CODE = """def fibonacci(n):
+    if n <= 1:
+        return n
+    return fibonacci(n - 1) + fibonacci(n - 2)
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_serialization_is_order_independent():
+    assert canonical_serialize({"b": 1, "a": [1, 2]}) == canonical_serialize({"a": [1, 2], "b": 1})
+    assert canonical_serialize({"s": {3, 1, 2}}) == canonical_serialize({"s": {2, 3, 1}})
+
+
+def test_mixed_keys_fall_back():
+    assert fingerprint({1: "a", "b": 2}) == fingerprint({"b": 2, 1: "a"})
+    assert fingerprint({(1, 2): "x"}).startswith(FINGERPRINT_VERSION + ":")
+
+
+def test_fingerprint_is_versioned():
+    assert fingerprint({"a": 1}).startswith(f"{FINGERPRINT_VERSION}:")
+    assert code_fingerprint(CODE) != code_fingerprint(CODE + "\n")
+
+
+def test_structural_signature_uses_fingerprint():
+    props = FoundationalProperties().extract_all_properties(CODE)
+    metrics = ComprehensiveMetrics()
+
+    assert metrics._create_structural_signature(props) == structural_fingerprint(props)
+
+
+def test_stable_across_hash_seeds():
+    script = (
+        "import sys; sys.path.insert(0, %r)\n"
+        "from src.foundational_properties import FoundationalProperties\n"
+        "from src.fingerprint import structural_fingerprint\n"
+        "print(structural_fingerprint(FoundationalProperties().extract_all_properties(%r)))\n"
+    ) % (ROOT, CODE)
+
+    outputs = set()
+    for seed in ("1", "2", "3"):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        result = subprocess.run([sys.executable, "-c", script], env=env,
+                                capture_output=True, text=True, check=True)
+        outputs.add(result.stdout.strip())
+
+    assert len(outputs) == 1
@@ -0,0 +1,94 @@
+"""
+Tests for pooled keep-alive HTTP clients and shared LLM clients
+"""
+
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.http_pool import ClientPool, PoolStats
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1/models"
+    server.shutdown()
+    server.server_close()
+
+
+def test_connection_reused_across_requests(stub_url):
+    pytest.importorskip("openai")
+    pool = ClientPool()
+    try:
+        client = pool.http_client("openai", "stub")
+        for _ in range(5):
+            assert client.get(stub_url).status_code == 200
+
+        stats = pool.stats()["openai/stub"]
+        assert stats["requests"] == 5
+        assert stats["connections_opened"] == 1
+        assert stats["connections_reused"] == 4
+        assert 0 < stats["latency_p50"] <= stats["latency_p95"] <= stats["latency_p99"]
+    finally:
+        pool.close()
+
+
+def test_clients_shared_per_key():
+    pytest.importorskip("openai")
+    pool = ClientPool()
+    try:
+        assert pool.http_client("openai", "a") is pool.http_client("openai", "a")
+        assert pool.http_client("openai", "a") is not pool.http_client("openai", "b")
+
+        llm = pool.llm_client("gpt-4o-mini", api_key="sk-test")
+        assert pool.llm_client("gpt-4o-mini", api_key="sk-test") is llm
+        assert llm.client._client is pool.http_client("openai", "gpt-4o-mini")
+        assert pool.stats()["openai/a"]["latency_p50"] is None
+    finally:
+        pool.close()
+
+
+def test_closed_streams_are_not_retained():
+    class Stream:
+        pass
+
+    class Response:
+        def __init__(self, stream):
+            self.request = object()
+            self.extensions = {"network_stream": stream}
+
+    stats = PoolStats()
+    stream = Stream()
+    for _ in range(3):
+        stats.on_response(Response(stream))
+    for _ in range(50):
+        stats.on_response(Response(Stream()))
+
+    assert stats.connections_opened == 51 and stats.connections_reused == 2
+    assert len(stats._streams) == 1
+    del stream
+    assert len(stats._streams) == 0
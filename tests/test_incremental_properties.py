@@ -0,0 +1,108 @@
+"""
+Tests for incremental foundational property extraction
+"""
+
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.foundational_properties import FoundationalProperties
+from src.incremental_properties import IncrementalPropertyExtractor
+
+
+LRU_CACHE = """from collections import OrderedDict
+
+class LRUCache(object):
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.cache = OrderedDict()
+
+    def get(self, key):
+        if key not in self.cache:
+            return -1
+        self.cache.move_to_end(key)
+        return self.cache[key]
+
+    def put(self, key, value):
+        if key in self.cache:
+            self.cache.move_to_end(key)
+        self.cache[key] = value
+        if len(self.cache) > self.capacity:
+            self.cache.popitem(last=False)
+"""
+
+LRU_CACHE_EDITED = LRU_CACHE.replace("return -1", "result = -1\n            return result")
+
+MIXED = """import math
+
+def helper(x):
+    y = x * 2 + 1
+    return y
+
+def fibonacci(n):
+    if n <= 1:
+        return n
+    total = helper(n) + fibonacci(n - 1) + fibonacci(n - 2)
+    for i in range(n):
+        while total > 0:
+            total -= i
+    return total
+
+@decorated
+class Node:
+    value = 0
+
+x = fibonacci(3); y = x
+"""
+
+
+def test_matches_full_extraction():
+    full = FoundationalProperties()
+    incremental = IncrementalPropertyExtractor()
+
+    for code in (LRU_CACHE, LRU_CACHE_EDITED, MIXED, "x = 1", ""):
+        assert incremental.extract_all_properties(code) == full.extract_all_properties(code)
+
+
+def test_edit_reextracts_only_changed_method():
+    incremental = IncrementalPropertyExtractor()
+    incremental.extract_all_properties(LRU_CACHE)
+    extracted_before = incremental.stats["units_extracted"]
+
+    result = incremental.extract_all_properties(LRU_CACHE_EDITED)
+
+    assert incremental.stats["units_extracted"] == extracted_before + 1
+    assert result == FoundationalProperties().extract_all_properties(LRU_CACHE_EDITED)
+
+
+def test_alpha_hash_tracks_renaming_state():
+    incremental = IncrementalPropertyExtractor()
+    first = "a = 1\nb = a\n"
+    second = "c = 1\nb = c\n"
+
+    hash1 = incremental.extract_all_properties(first)["normalized_ast_structure"]["alpha_renamed_hash"]
+    hash2 = incremental.extract_all_properties(second)["normalized_ast_structure"]["alpha_renamed_hash"]
+
+    assert hash1 == hash2
+    assert incremental.extract_all_properties("b = 1\nb = b\n") == \
+        FoundationalProperties().extract_all_properties("b = 1\nb = b\n")
+
+
+def test_syntax_error_returns_empty_properties():
+    incremental = IncrementalPropertyExtractor()
+    props = incremental.extract_all_properties("def broken(:")
+
+    assert set(props) == set(incremental.extractor.properties)
+    assert all(value is None for value in props.values())
+
+
+def test_results_do_not_alias_cache():
+    incremental = IncrementalPropertyExtractor()
+    props = incremental.extract_all_properties(MIXED)
+    props["function_contracts"]["helper"]["args"].append("mutated")
+    props["execution_paths"]["execution_paths"][0].append("mutated")
+
+    assert incremental.extract_all_properties(MIXED) == \
+        FoundationalProperties().extract_all_properties(MIXED)
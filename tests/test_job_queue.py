@@ -0,0 +1,179 @@
+"""
+Tests for the SQLite job queue and the experiment worker mode
+"""
+
+import sys
+import os
+import time
+import threading
+from types import SimpleNamespace
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.job_queue import JobQueue, LEASED, DONE, FAILED
+from src.worker import Worker, enqueue_experiment, STAGE_GENERATE, STAGE_EVALUATE
+from src.comprehensive_experiment import ComprehensiveExperiment
+from src.result_io import load_result
+
+TEMPLATES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "contracts", "templates.json")
+
+FIB = ("def fibonacci(n):\n    if n <= 1:\n        return n\n    a, b = 0, 1\n"
+       "    for _ in range(2, n + 1):\n        a, b = b, a + b\n    return b\n")
+FIB_VARIANT = ("def fibonacci(n):\n    if n <= 1:\n        return n\n    a, b = 0, 1\n"
+               "    for i in range(2, n + 1):\n        a, b = b, a + b\n    return b\n")
+
+
+class SequenceClient:
+    """Thread-safe scripted client; None in the sequence is a failed request"""
+    model = "scripted"
+
+    def __init__(self, outputs):
+        self.outputs = list(outputs)
+        self.lock = threading.Lock()
+
+    def generate_samples(self, prompt, temperature=0.0, n=1, on_sample=None):
+        samples = []
+        for i in range(n):
+            with self.lock:
+                code = self.outputs.pop(0)
+            if code is None:
+                samples.append({"run_index": i, "code": None, "raw_output": None, "success": False,
+                                "error": "rate limited", "provenance": {"mode": "scripted"}})
+            else:
+                samples.append({"run_index": i, "code": code, "raw_output": code, "success": True,
+                                "error": None, "provenance": {"mode": "scripted"}})
+            if on_sample:
+                on_sample(samples[-1])
+        return samples
+
+
+def factory(client):
+    def make(output_dir, model):
+        experiment = ComprehensiveExperiment(output_dir, llm_client=client)
+        # Plotting is not under test here
+        experiment.bell_curve_analyzer = SimpleNamespace(plot_pre_post_comparison=lambda *a, **k: {})
+        return experiment
+    return make
+
+
+def test_dependencies_exclusivity_and_idempotent_enqueue(tmp_path):
+    queue = JobQueue(str(tmp_path / "q.sqlite"))
+    assert queue.enqueue("gen:0", "generate", "cfg", {"run": 0})
+    assert queue.enqueue("gen:1", "generate", "cfg", {"run": 1})
+    assert not queue.enqueue("gen:1", "generate", "cfg", {"run": 1})
+    queue.enqueue("eval:a", "evaluate", "eval", {}, after="cfg", exclusive="canon")
+    queue.enqueue("eval:b", "evaluate", "eval", {}, exclusive="canon")
+
+    first = queue.claim("w1", ["generate", "evaluate"])
+    assert first.key == "gen:0" and first.attempts == 1
+    # eval:a waits on the generate group; eval:b is free
+    second = queue.claim("w2", ["evaluate"])
+    assert second.key == "eval:b"
+    assert queue.claim("w2", ["evaluate"]) is None
+
+    assert queue.complete(first, "w1", {"code": "x"})
+    gen1 = queue.claim("w1", ["generate"])
+    assert queue.complete(gen1, "w1", {"code": "y"})
+    assert queue.results("cfg", "generate") == [{"code": "x"}, {"code": "y"}]
+
+    # Dependencies are done but eval:b holds the canon
+    assert queue.claim("w3", ["evaluate"]) is None
+    assert queue.fail(second, "w2", "no valid outputs", retry=False)
+    assert queue.claim("w3", ["evaluate"]).key == "eval:a"
+    assert queue.counts() == {"generate": {DONE: 2}, "evaluate": {FAILED: 1, LEASED: 1}}
+
+
+def test_expired_lease_is_reclaimed_then_given_up(tmp_path):
+    queue = JobQueue(str(tmp_path / "q.sqlite"), lease_seconds=0.05, max_attempts=2)
+    queue.enqueue("job", "generate", "cfg", {})
+
+    crashed = queue.claim("w1")
+    assert queue.claim("w2") is None
+    time.sleep(0.1)
+    retried = queue.claim("w2")
+    assert retried.key == "job" and retried.attempts == 2
+
+    # The first worker lost its lease and cannot finish the job any more
+    assert not queue.heartbeat(crashed, "w1")
+    assert not queue.complete(crashed, "w1", "late")
+    assert queue.heartbeat(retried, "w2")
+
+    time.sleep(0.1)
+    assert queue.claim("w3") is None
+    assert queue.counts() == {"generate": {FAILED: 1}}
+    assert queue.unfinished() == 0
+
+
+def test_concurrent_claims_lease_each_job_once(tmp_path):
+    path = str(tmp_path / "q.sqlite")
+    producer = JobQueue(path)
+    for i in range(40):
+        producer.enqueue(f"job:{i}", "generate", "cfg", {"i": i})
+
+    claimed = []
+
+    def drain(worker_id):
+        queue = JobQueue(path)
+        while True:
+            job = queue.claim(worker_id)
+            if job is None:
+                return
+            claimed.append(job.payload["i"])
+            queue.complete(job, worker_id, job.payload["i"])
+
+    threads = [threading.Thread(target=drain, args=(f"w{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == list(range(40))
+    assert producer.results("cfg", "generate") == list(range(40))
+
+
+def test_workers_generate_then_evaluate_configuration(tmp_path):
+    output_dir = str(tmp_path / "outputs")
+    queue = JobQueue(str(tmp_path / "q.sqlite"))
+    assert enqueue_experiment(queue, TEMPLATES, "fibonacci_basic", "scripted", 0.0, 4, output_dir) == 5
+    assert enqueue_experiment(queue, TEMPLATES, "fibonacci_basic", "scripted", 0.0, 4, output_dir) == 0
+
+    # One failed request is retried by the generate worker
+    client = SequenceClient([FIB, None, FIB, FIB_VARIANT, FIB])
+    assert queue.claim("evaluator", [STAGE_EVALUATE]) is None  # waits for its generate jobs
+
+    generator = Worker(queue, "generator", [STAGE_GENERATE], factory(client))
+    evaluator = Worker(queue, "evaluator", [STAGE_EVALUATE], factory(client))
+    assert generator.run() == 5
+    assert evaluator.run() == 1
+
+    assert queue.counts() == {STAGE_GENERATE: {DONE: 4}, STAGE_EVALUATE: {DONE: 1}}
+    experiment_id = queue.results(f"{STAGE_EVALUATE}:fibonacci_basic:scripted:temp0.0", STAGE_EVALUATE)[0]["experiment_id"]
+    result = load_result(os.path.join(output_dir, f"{experiment_id}.json"))
+    assert result["raw_outputs"] == [FIB, FIB, FIB_VARIANT, FIB]
+    assert [r["run_id"] for r in result["llm_results"]] == [1, 2, 3, 4]
+    assert result["metrics"]["R_raw"] == 0.75
+
+
+def test_evaluate_job_stops_once_its_lease_is_lost(tmp_path):
+    output_dir = str(tmp_path / "outputs")
+    queue = JobQueue(str(tmp_path / "q.sqlite"))
+    enqueue_experiment(queue, TEMPLATES, "fibonacci_basic", "scripted", 0.0, 2, output_dir)
+    client = SequenceClient([FIB, FIB_VARIANT])
+    assert Worker(queue, "generator", [STAGE_GENERATE], factory(client)).run() == 2
+
+    def slow_factory(output_dir, model):
+        experiment = factory(client)(output_dir, model)
+        oracle = experiment.oracle_system.run_oracle_tests
+        experiment.oracle_system.run_oracle_tests = lambda *args: (time.sleep(0.2), oracle(*args))[1]
+        return experiment
+
+    # Another worker has taken the job over: renewals are refused
+    queue.lease_seconds = 0.15
+    queue.heartbeat = lambda job, worker_id: False
+    evaluator = Worker(queue, "evaluator", [STAGE_EVALUATE], slow_factory)
+    assert evaluator.run(max_jobs=1) == 1
+
+    assert queue.counts()[STAGE_EVALUATE] == {LEASED: 1}
+    assert not [f for f in os.listdir(output_dir) if f.startswith("fibonacci_basic_temp")]
+    assert not os.path.exists(os.path.join(output_dir, "canon", "fibonacci_basic_canon.json"))
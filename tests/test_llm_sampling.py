@@ -0,0 +1,73 @@
+"""
+Tests for multi-sample generation (LLMClient.generate_samples)
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("openai")
+
+from src.llm_client import LLMClient
+
+
+def _response(n, response_id="resp-1"):
+    choices = [SimpleNamespace(index=i, message=SimpleNamespace(content=f"```python\nx = {i}\n```"))
+               for i in range(n)]
+    return SimpleNamespace(id=response_id, choices=choices)
+
+
+class FakeCompletions:
+    """Records chat.completions.create calls instead of hitting the API"""
+
+    def __init__(self, reject_n=False):
+        self.calls = []
+        self.reject_n = reject_n
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.reject_n and "n" in kwargs:
+            raise RuntimeError("n is not supported for this model")
+        return _response(kwargs.get("n", 1))
+
+
+def _client(completions):
+    client = LLMClient(api_key="test-key", model="gpt-4o-mini")
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return client
+
+
+def test_openai_samples_use_one_request():
+    completions = FakeCompletions()
+    samples = _client(completions).generate_samples("prompt", temperature=0.7, n=5)
+
+    assert len(completions.calls) == 1
+    assert completions.calls[0]["n"] == 5
+    assert [s["run_index"] for s in samples] == list(range(5))
+    assert [s["code"] for s in samples] == [f"x = {i}" for i in range(5)]
+    assert all(s["provenance"]["mode"] == "multi_choice" for s in samples)
+    assert samples[3]["provenance"]["choice_index"] == 3
+    assert samples[0]["provenance"]["response_id"] == "resp-1"
+
+
+def test_fallback_to_single_requests():
+    completions = FakeCompletions(reject_n=True)
+    samples = _client(completions).generate_samples("prompt", temperature=0.7, n=3)
+
+    # One rejected multi-choice request, then one request per sample
+    assert len(completions.calls) == 4
+    assert all(s["success"] for s in samples)
+    assert all(s["provenance"]["mode"] == "single" for s in samples)
+
+
+def test_single_sample_skips_multi_choice():
+    completions = FakeCompletions()
+    samples = _client(completions).generate_samples("prompt", n=1)
+
+    assert "n" not in completions.calls[0]
+    assert samples[0]["provenance"]["model"] == "gpt-4o-mini"
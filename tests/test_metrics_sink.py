@@ -0,0 +1,89 @@
+"""
+Tests for the locked, schema-driven metrics_summary writer and its column reader
+"""
+
+import sys
+import os
+import csv
+import multiprocessing
+
+import pandas as pd
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.metrics_sink import MetricsSink, METRICS_SCHEMA, summary_row
+
+REPO_SUMMARY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "outputs", "metrics_summary.csv")
+
+
+def make_result(i, contract_id="fibonacci_basic"):
+    metrics = {name: (i % 10) / 10 for name in (
+        "R_raw", "R_anchor_pre", "R_anchor_post", "Delta_rescue", "mean_distance_pre", "std_distance_pre",
+        "mean_distance_post", "std_distance_post", "Delta_mu", "canon_coverage", "rescue_rate",
+        "R_behavioral", "R_structural")}
+    metrics["R_repair_at_k_pre"] = {"k=0.1": 0.5}
+    metrics["Delta_P_tau"] = {"tau=0.2": 0.25}
+    return {"experiment_id": f"{contract_id}_temp0.5_{i:04d}", "contract_id": contract_id,
+            "canon_data": {"canon_id": "c1"}, "model": "gpt-4o-mini", "temperature": 0.5,
+            "successful_runs": 20, "timestamp": "2026-01-23T09:43:05", "metrics": metrics}
+
+
+def append_many(output_dir, start, count):
+    sink = MetricsSink(output_dir, compact_rows=7)
+    for i in range(start, start + count):
+        sink.append(make_result(i))
+
+
+def test_schema_matches_existing_summary_header():
+    with open(REPO_SUMMARY, newline="") as f:
+        header = next(csv.reader(f))
+    assert [column.name for column in METRICS_SCHEMA] == header
+
+    row = summary_row(make_result(3))
+    assert row["R_raw"] == "0.300" and row["R_repair_at_0.1_pre"] == "0.500"
+    assert row["R_repair_at_0.05_post"] == "0.000" and row["Delta_P_tau_0.2"] == "0.250"
+    assert row["canon_id"] == "c1" and row["runs"] == "20" and row["sweep_id"] == ""
+
+
+def test_parallel_appends_keep_rows_whole(tmp_path):
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=append_many, args=(str(tmp_path), start, 15))
+               for start in range(0, 60, 15)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert all(worker.exitcode == 0 for worker in workers)
+
+    df = pd.read_csv(tmp_path / "metrics_summary.csv")
+    assert len(df) == 60 and df["experiment_id"].is_unique
+    assert list(df.columns) == [column.name for column in METRICS_SCHEMA]
+    assert (tmp_path / "metrics_summary.npz").exists()
+
+    columns = MetricsSink(str(tmp_path)).load_columns(["experiment_id", "R_raw", "runs"])
+    assert columns["experiment_id"] == list(df["experiment_id"])
+    assert columns["R_raw"] == list(df["R_raw"]) and columns["runs"] == [20] * 60
+
+
+def test_reader_combines_compacted_columns_with_new_rows(tmp_path):
+    sink = MetricsSink(str(tmp_path), compact_rows=3)
+    for i in range(5):
+        sink.append(make_result(i))
+    # Three rows are compacted, two only in the CSV
+    assert sink.load_columns(["R_raw"]) == {"R_raw": [0.0, 0.1, 0.2, 0.3, 0.4]}
+
+    rows = sink.load_rows(["contract_id", "decoding_temperature"])
+    assert rows[-1] == {"contract_id": "fibonacci_basic", "decoding_temperature": 0.5}
+    with pytest.raises(KeyError):
+        sink.load_columns(["no_such_metric"])
+
+    # A rewritten CSV makes the columnar copy stale; it is ignored
+    df = pd.read_csv(sink.csv_path).head(2)
+    df.to_csv(sink.csv_path, index=False)
+    assert sink.load_columns(["experiment_id"])["experiment_id"] == list(df["experiment_id"])
+    df = pd.concat([pd.read_csv(sink.csv_path)] * 4)
+    df.to_csv(sink.csv_path, index=False)
+    assert sink.load_columns(["experiment_id"])["experiment_id"] == list(df["experiment_id"])
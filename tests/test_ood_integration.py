@@ -9,7 +9,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.policies.out_of_domain import OODSpec, OODPolicy
-from src.contract_validator import validate_transformation
+from src.contract_validator import validate_transformation, check_ood_examples
 
 
 # Test code samples
@@ -377,6 +377,37 @@ def test_no_ood_spec_works():
     print(f"✓ test_no_ood_spec_works: {message}")
 
 
+def test_batched_ood_check_handles_many_examples():
+    """Hundreds of OOD examples are checked in one sandbox worker"""
+    contract = {"constraints": {"function_name": "fibonacci"}}
+    spec = OODSpec(
+        policy="forbid_transform",
+        examples=[{"n": -i} for i in range(1, 301)],
+        max_checks=300
+    )
+    
+    verdicts = check_ood_examples(FIBONACCI_RETURN_ZERO, FIBONACCI_RETURN_MINUS_ONE, contract, spec)
+    assert verdicts == [False] * 300
+    
+    verdicts = check_ood_examples(FIBONACCI_WITH_RAISE, FIBONACCI_WITH_RAISE, contract, spec)
+    assert verdicts == [True] * 300
+
+
+def test_batched_ood_check_survives_hanging_candidate():
+    """A candidate that loops forever out of domain fails only the affected examples"""
+    hanging = FIBONACCI_RETURN_ZERO.replace("if n <= 0:", "while n < 0:\n        pass\n    if n <= 0:")
+    contract = {"constraints": {"function_name": "fibonacci"}}
+    spec = OODSpec(
+        policy="must_return",
+        return_value=0,
+        examples=[{"n": 0}, {"n": -1}, {"n": -2}],
+        example_timeout=0.1
+    )
+    
+    assert check_ood_examples(FIBONACCI_RETURN_ZERO, hanging, contract, spec) == [True, False, False]
+    assert check_ood_examples(FIBONACCI_RETURN_ZERO, "x = 1", contract, spec) is None
+
+
 if __name__ == "__main__":
     test_functions = [
         test_allow_policy_in_validator,
@@ -388,6 +419,8 @@ if __name__ == "__main__":
         test_forbid_transform_rejects_changed,
         test_ood_only_checked_after_oracle_passes,
         test_no_ood_spec_works,
+        test_batched_ood_check_handles_many_examples,
+        test_batched_ood_check_survives_hanging_candidate,
     ]
     
     passed = 0
@@ -388,6 +388,40 @@ def test_all_examples_must_pass():
     assert policy.check_examples(fails_on_minus_2) == False
 
 
+# Test: batched evaluation
+
+def test_evaluate_returns_verdict_per_example():
+    """evaluate() checks every example instead of stopping at the first failure"""
+    spec = OODSpec(
+        policy="must_return",
+        return_value=0,
+        examples=[{"n": -1}, {"n": -2}, {"n": 0}, {"n": 3}],
+        max_checks=10
+    )
+    policy = OODPolicy(spec)
+    
+    assert policy.evaluate(fibonacci_return_zero) == [True, True, True, False]
+    assert policy.evaluate(fibonacci_with_raise) == [False, False, True, False]
+
+
+def test_evaluate_times_out_runaway_example():
+    """An example that exceeds example_timeout is a violation, the rest still run"""
+    def hangs_on_negative(n):
+        while n < 0:
+            pass
+        return 0
+    
+    spec = OODSpec(
+        policy="must_return",
+        return_value=0,
+        examples=[{"n": 0}, {"n": -1}, {"n": 1}],
+        example_timeout=0.05
+    )
+    policy = OODPolicy(spec)
+    
+    assert policy.evaluate(hangs_on_negative) == [True, False, True]
+
+
 if __name__ == "__main__":
     # Run all test functions
     test_functions = [
@@ -413,6 +447,8 @@ if __name__ == "__main__":
         test_empty_examples_list,
         test_multiple_parameters_in_examples,
         test_all_examples_must_pass,
+        test_evaluate_returns_verdict_per_example,
+        test_evaluate_times_out_runaway_example,
     ]
     
     passed = 0
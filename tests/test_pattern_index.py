@@ -0,0 +1,98 @@
+"""
+Tests for parse-once, node-type indexed rule matching and span-based conflicts
+"""
+
+import sys
+import os
+import ast
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.transformations.pattern_index import ASTNodeIndex, match_span, spans_overlap
+from src.transformations.transformation_registry import TransformationRegistry
+from src.transformations.transformation_selector import TransformationSelector, SelectedTransformation
+from src.transformations.property_diff_analyzer import PropertyMismatch
+
+
+CODE = """def check(stack, flag):
+    if len(stack) == 0:
+        return 1
+    else:
+        return 0
+
+def other(flag):
+    return flag == True
+"""
+
+
+def test_index_candidates_follow_walk_order():
+    index = ASTNodeIndex.from_code(CODE)
+
+    compares = list(index.candidates((ast.Compare,)))
+    assert [c.lineno for c in compares] == [2, 8]
+    assert list(index.candidates(None)) == list(ast.walk(index.tree))
+    assert ASTNodeIndex.from_code("def broken(:") is None
+
+
+def test_match_rules_equals_individual_matches():
+    registry = TransformationRegistry()
+    matches = registry.match_rules(registry.rules, CODE)
+
+    for rule in registry.rules:
+        single = rule.ast_pattern.match(CODE)
+        combined = matches[rule.rule_id]
+        if single is None:
+            assert combined is None
+        else:
+            assert match_span(single) == match_span(combined)
+
+    assert matches["len_zero_to_not"]["target"] == "stack"
+    assert matches["boolean_redundancy_removal"]["target"] == "flag"
+    assert matches["if_else_to_ternary"]["original_node"].lineno == 2
+
+
+def _selection(rule, node, priority_confidence):
+    mismatch = PropertyMismatch("logical_equivalence", rule.mismatch_pattern, 0.5, {})
+    return SelectedTransformation(rule=rule, mismatch=mismatch,
+                                  confidence=priority_confidence,
+                                  match_details={"original_node": node})
+
+
+def test_overlapping_spans_keep_best_selection():
+    registry = TransformationRegistry()
+    selector = TransformationSelector(registry)
+    index = ASTNodeIndex.from_code(CODE)
+    if_node = next(index.candidates((ast.If,)))
+    compare_in_if, compare_other = list(index.candidates((ast.Compare,)))
+
+    ternary = registry.get_rule_by_id("if_else_to_ternary")
+    len_rule = registry.get_rule_by_id("len_zero_to_not")
+    bool_rule = registry.get_rule_by_id("boolean_redundancy_removal")
+
+    selections = [
+        _selection(ternary, if_node, 0.6),       # 1 * 0.6: loses to the nested compare
+        _selection(len_rule, compare_in_if, 0.9),
+        _selection(bool_rule, compare_other, 0.9),
+    ]
+    resolved = selector._detect_conflicts(selections)
+
+    assert [s.rule.rule_id for s in resolved] == ["len_zero_to_not", "boolean_redundancy_removal"]
+
+
+def test_select_single_pass():
+    registry = TransformationRegistry()
+    selector = TransformationSelector(registry)
+    mismatches = [
+        PropertyMismatch("logical_equivalence", "empty_check", 0.5, {}),
+        PropertyMismatch("logical_equivalence", "boolean_redundancy", 0.5, {}),
+    ]
+
+    selected = selector.select(mismatches, CODE)
+
+    assert {s.rule.rule_id for s in selected} == {"len_zero_to_not", "boolean_redundancy_removal"}
+
+
+def test_spans_overlap_is_half_open():
+    assert spans_overlap(((1, 0), (1, 5)), ((1, 4), (2, 0)))
+    assert not spans_overlap(((1, 0), (1, 5)), ((1, 5), (2, 0)))
@@ -0,0 +1,74 @@
+"""
+Tests for compact, shared foundational property records
+"""
+
+import sys
+import os
+import json
+import itertools
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.foundational_properties import FoundationalProperties
+from src.property_records import PropertyTable, PropertyRecord, load_property_results
+from src.fingerprint import structural_fingerprint
+from src.comprehensive_experiment import NumpyEncoder
+
+CODES = [
+    "def fibonacci(n):\n    if n <= 1:\n        return n\n    a, b = 0, 1\n"
+    "    for _ in range(2, n + 1):\n        a, b = b, a + b\n    return b\n",
+    "def fibonacci(n):\n    if n <= 1:\n        return n\n    return fibonacci(n - 1) + fibonacci(n - 2)\n",
+    "def fibonacci(n):\n    a, b = 0, 1\n    i = 0\n    while i < n:\n        a, b = b, a + b\n"
+    "        i += 1\n    return a\n",
+    "def is_prime(n):\n    if n < 2:\n        return False\n    for i in range(2, int(n ** 0.5) + 1):\n"
+    "        if n % i == 0 and n != i:\n            return False\n    return True\n",
+    "def broken(:\n",
+]
+
+
+def test_records_convert_back_losslessly():
+    extractor = FoundationalProperties()
+    dicts = [extractor.extract_all_properties(code) for code in CODES]
+    # Values equal under == but of different JSON types, and a non-derivable sequence
+    dicts.append({"side_effect_profile": {"has_print": False}, "statement_ordering": {
+        "statement_types": ["If"], "statement_sequence": ["If_7"], "control_flow_order": []}})
+    dicts.append({"side_effect_profile": {"has_print": 0}, "numerical_behavior": {"numeric_constants": [1, 1.0]}})
+
+    table = PropertyTable()
+    records = [table.add(properties) for properties in dicts]
+
+    assert [record.to_dict() for record in records] == dicts
+    assert [dict(record) for record in records] == dicts
+    assert records[-1]["side_effect_profile"]["has_print"] is not False
+    restored = PropertyTable.from_json(json.loads(json.dumps(table.to_json())))
+    assert restored.to_dicts() == dicts
+    assert load_property_results(table.to_json()) == load_property_results(dicts) == dicts
+
+
+def test_identical_outputs_are_stored_once():
+    extractor = FoundationalProperties()
+    properties = [extractor.extract_all_properties(CODES[i % 2]) for i in range(20)]
+    table = PropertyTable()
+    for props in properties:
+        table.add(props)
+
+    assert table[0].frozen("normalized_ast_structure") is table[18].frozen("normalized_ast_structure")
+    legacy = len(json.dumps(properties, indent=2))
+    compact = len(json.dumps(table, indent=2, cls=NumpyEncoder))
+    assert compact * 10 < legacy
+    assert len(table.to_json()["values"]["statement_ordering"]) == 2
+
+
+def test_record_distance_matches_dict_distance():
+    extractor = FoundationalProperties()
+    dicts = [extractor.extract_all_properties(code) for code in CODES]
+    table = PropertyTable()
+    records = [table.add(properties) for properties in dicts]
+    strict = {"constraints": {"variable_naming": {"naming_policy": "strict"}}}
+
+    for (d1, r1), (d2, r2) in itertools.product(list(zip(dicts, records)), repeat=2):
+        for contract in (None, strict):
+            assert extractor.calculate_distance(r1, r2, contract) == extractor.calculate_distance(d1, d2, contract)
+    assert isinstance(records[0], PropertyRecord)
+    assert [structural_fingerprint(r) for r in records] == [structural_fingerprint(d) for d in dicts]
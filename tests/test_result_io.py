@@ -0,0 +1,111 @@
+"""
+Tests for the streaming, deduplicating result file writer and its reader
+"""
+
+import sys
+import os
+import json
+import glob
+import gzip
+import shutil
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.result_io import write_result, load_result, result_files, convert_results
+from src.results_catalog import ResultsCatalog
+from src.property_records import PropertyTable
+from src.foundational_properties import FoundationalProperties
+from src.comprehensive_experiment import NumpyEncoder
+
+OUTPUTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "outputs")
+
+FIB = ("def fibonacci(n):\n    if n <= 1:\n        return n\n    a, b = 0, 1\n"
+       "    for _ in range(2, n + 1):\n        a, b = b, a + b\n    return b\n")
+FIB_RECURSIVE = "def fibonacci(n):\n    if n <= 1:\n        return n\n    return fibonacci(n - 1) + fibonacci(n - 2)\n"
+
+
+def make_result():
+    contract = {"id": "fibonacci_basic",
+                "task_intent": "Compute the nth Fibonacci number, returning 0 for n = 0 and 1 for n = 1",
+                "constraints": {"variable_naming": {"naming_policy": "flexible"}}}
+    table = PropertyTable()
+    for code in (FIB, FIB_RECURSIVE, FIB):
+        table.add(FoundationalProperties().extract_all_properties(code))
+    return {
+        "experiment_id": "fibonacci_basic_temp0.5_20260101_000000",
+        "contract_id": "fibonacci_basic",
+        "temperature": np.float64(0.5),
+        "successful_runs": np.int64(3),
+        "contract": contract,
+        "canon_data": {"canonical_code": FIB, "contract_data": dict(contract)},
+        "llm_results": [{"run_id": i + 1, "raw_output": code, "success": np.bool_(True)}
+                        for i, code in enumerate((FIB, FIB_RECURSIVE, FIB))],
+        "raw_outputs": [FIB, FIB_RECURSIVE, FIB],
+        "repaired_outputs": [FIB, FIB, FIB],
+        "metrics": {"R_raw": np.float32(2 / 3), "distances": np.array([0.0, 0.25, 0.0]),
+                    "flags": [False, 0, 1, 1.0] * 20, "zeros": [0] * 80,
+                    "structural_stats": {"property_results": table}},
+    }
+
+
+def test_round_trip_stores_repeated_values_once(tmp_path):
+    result = make_result()
+    expected = json.loads(json.dumps(result, cls=NumpyEncoder))
+    path = write_result(str(tmp_path / "result.json"), result, compress=False)
+
+    with open(path) as f:
+        text = f.read()
+    assert text.count("a, b = b, a + b") == 1
+    assert text.count("Compute the nth Fibonacci number") == 1
+    assert json.loads(text)["experiment_id"] == result["experiment_id"]
+
+    loaded = load_result(path)
+    assert loaded == expected
+    # JSON types survive sharing: False and 0 are not the same value
+    assert [type(flag) for flag in loaded["metrics"]["flags"][:4]] == [bool, int, int, float]
+    assert loaded["contract"] is loaded["canon_data"]["contract_data"]
+
+    gz_path = write_result(str(tmp_path / "result.json"), result, compress=True)
+    assert gz_path.endswith(".json.gz") and os.path.getsize(gz_path) < len(text)
+    assert load_result(gz_path) == expected
+    assert not glob.glob(str(tmp_path / "*.tmp"))
+
+
+def test_reads_legacy_results_and_compressed_siblings(tmp_path):
+    legacy = {"experiment_id": "legacy", "raw_outputs": [FIB, FIB], "metrics": {"R_raw": 1.0}}
+    with open(tmp_path / "legacy.json", "w") as f:
+        json.dump(legacy, f, indent=2)
+    with gzip.open(tmp_path / "packed.json.gz", "wt") as f:
+        json.dump(legacy, f)
+
+    assert load_result(str(tmp_path / "legacy.json")) == legacy
+    assert load_result(str(tmp_path / "packed.json")) == legacy
+    assert sorted(os.path.basename(p) for p in result_files(str(tmp_path / "*.json"))) == [
+        "legacy.json", "packed.json.gz"]
+
+
+def test_converted_outputs_shrink_and_stay_indexable(tmp_path):
+    existing = sorted(glob.glob(os.path.join(OUTPUTS, "*_temp*.json")))[-5:]
+    if not existing:
+        pytest.skip("No recorded experiment results")
+    originals = {}
+    for path in existing:
+        shutil.copy(path, tmp_path)
+        with open(path) as f:
+            originals[os.path.basename(path)] = json.load(f)
+
+    count, before, after = convert_results(str(tmp_path), compress=True)
+    assert count == len(existing) and after * 10 < before
+    assert sorted(os.listdir(tmp_path)) == sorted(name + ".gz" for name in originals)
+
+    catalog = ResultsCatalog(str(tmp_path), db_path=str(tmp_path.parent / "catalog.sqlite"))
+    assert catalog.refresh() == len(existing)
+    for name, result in originals.items():
+        assert load_result(str(tmp_path / name)) == result
+        fields = catalog.load_fields(result["experiment_id"], "raw_outputs", "canon_data")
+        assert fields == {"raw_outputs": result["raw_outputs"], "canon_data": result["canon_data"]}
+    catalog.close()
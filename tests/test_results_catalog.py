@@ -0,0 +1,127 @@
+"""
+Tests for the SQLite results catalog over outputs/
+"""
+
+import sys
+import os
+import json
+import glob
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.results_catalog import ResultsCatalog, scan_top_level, flatten_metrics
+from src.metrics_sink import MetricsSink
+from src.comprehensive_experiment import ComprehensiveExperiment
+
+
+def write_result(output_dir, experiment_id, contract_id, model, temperature, r_raw, **extra):
+    result = {
+        "experiment_id": experiment_id,
+        "contract_id": contract_id,
+        "temperature": temperature,
+        "timestamp": f"2026-01-{10 + int(temperature * 10):02d}T12:00:00",
+        "num_runs": 5,
+        "successful_runs": 5,
+        "model": model,
+        "raw_outputs": ["def f():\n    return 'é'\n"] * 3,
+        "metrics": {"R_raw": r_raw, "R_repair_at_k_pre": {"k=0.1": 0.5}, "distances_pre": [0.1, 0.2]},
+        **extra,
+    }
+    path = os.path.join(output_dir, f"{experiment_id}.json")
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    return path, result
+
+
+@pytest.fixture
+def populated(tmp_path):
+    output_dir = str(tmp_path)
+    write_result(output_dir, "fib_temp0.0_a", "fibonacci_basic", "gpt-4o-mini", 0.0, 1.0)
+    write_result(output_dir, "fib_temp0.5_a", "fibonacci_basic", "claude-sonnet-4-5", 0.5, 0.4)
+    write_result(output_dir, "prime_temp0.0_a", "is_prime", "gpt-4o", 0.0, 0.8)
+    with open(os.path.join(output_dir, "sweep.json"), "w") as f:
+        json.dump({"sweep_id": "s1", "individual_results": []}, f)
+    catalog = ResultsCatalog(output_dir)
+    catalog.refresh()
+    yield catalog, output_dir
+    catalog.close()
+
+
+def test_scan_top_level_spans_are_byte_offsets():
+    text = json.dumps({"a": "é" * 3, "b": {"c": [1, 2]}, "d": None}, indent=2, ensure_ascii=False)
+    values, spans = scan_top_level(text)
+    raw = text.encode("utf-8")
+
+    assert values == json.loads(text)
+    for key, (offset, length) in spans.items():
+        assert json.loads(raw[offset:offset + length]) == values[key]
+
+
+def test_flatten_metrics_keeps_numeric_values():
+    flat = flatten_metrics({"R_raw": 0.5, "runs": 3, "nested": {"k=0.1": 0.2, "label": "x"}, "list": [1]})
+    assert flat == {"R_raw": 0.5, "runs": 3.0, "nested.k=0.1": 0.2}
+
+
+def test_query_filters_and_metrics(populated):
+    catalog, _ = populated
+    assert len(catalog) == 3
+
+    fib = catalog.query(contract_id="fibonacci_basic", metrics=["R_raw", "R_repair_at_k_pre.k=0.1"])
+    assert [row["experiment_id"] for row in fib] == ["fib_temp0.0_a", "fib_temp0.5_a"]
+    assert fib[0]["metrics"] == {"R_raw": 1.0, "R_repair_at_k_pre.k=0.1": 0.5}
+
+    assert [r["experiment_id"] for r in catalog.query(temperature=0.0, model=["gpt-4o"])] == ["prime_temp0.0_a"]
+    assert [r["experiment_id"] for r in catalog.query(model_like="%CLAUDE%")] == ["fib_temp0.5_a"]
+    assert [r["experiment_id"] for r in catalog.query(since="2026-01-15")] == ["fib_temp0.5_a"]
+    assert [r["experiment_id"] for r in catalog.query(contract_id="fibonacci_basic", limit=1)] == ["fib_temp0.5_a"]
+
+
+def test_load_fields_reads_only_requested_fields(populated):
+    catalog, output_dir = populated
+    fields = catalog.load_fields("fib_temp0.5_a", "raw_outputs", "model", "missing")
+    assert fields == {"raw_outputs": ["def f():\n    return 'é'\n"] * 3, "model": "claude-sonnet-4-5"}
+
+    # A rewritten file is re-indexed transparently
+    write_result(output_dir, "fib_temp0.5_a", "fibonacci_basic", "claude-sonnet-4-5", 0.5, 0.9,
+                 notes="rerun with a longer payload " * 10)
+    os.utime(os.path.join(output_dir, "fib_temp0.5_a.json"), (1, 1))
+    assert catalog.load_fields("fib_temp0.5_a", "model")["model"] == "claude-sonnet-4-5"
+    assert catalog.metrics(["fib_temp0.5_a"], ["R_raw"]) == {"fib_temp0.5_a": {"R_raw": 0.9}}
+
+
+def test_refresh_tracks_new_and_deleted_files(populated):
+    catalog, output_dir = populated
+    assert catalog.refresh() == 0
+
+    write_result(output_dir, "prime_temp1.0_a", "is_prime", "gpt-4o", 1.0, 0.2)
+    os.remove(os.path.join(output_dir, "fib_temp0.0_a.json"))
+    assert catalog.refresh() == 1
+    assert sorted(r["experiment_id"] for r in catalog.query()) == ["fib_temp0.5_a", "prime_temp0.0_a",
+                                                                    "prime_temp1.0_a"]
+    with pytest.raises(KeyError):
+        catalog.load_fields("fib_temp0.0_a", "model")
+
+
+def test_save_experiment_results_updates_catalog(tmp_path):
+    existing = sorted(glob.glob(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                             "outputs", "*_temp*.json")))
+    if not existing:
+        pytest.skip("No recorded experiment results")
+    with open(existing[-1]) as f:
+        result = json.load(f)
+
+    catalog = ResultsCatalog(str(tmp_path))
+    experiment = SimpleNamespace(output_dir=str(tmp_path), results_catalog=catalog,
+                                 metrics_sink=MetricsSink(str(tmp_path)), compress_results=True)
+    ComprehensiveExperiment._save_experiment_results(experiment, result)
+
+    rows = catalog.query(metrics=["R_raw"])
+    assert [row["experiment_id"] for row in rows] == [result["experiment_id"]]
+    assert rows[0]["metrics"]["R_raw"] == pytest.approx(result["metrics"]["R_raw"])
+    assert catalog.load_fields(rows[0], "transformation_results") == {
+        "transformation_results": result["transformation_results"]}
+    catalog.close()
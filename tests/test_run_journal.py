@@ -0,0 +1,164 @@
+"""
+Tests for the per-configuration run journal and resuming run_full_experiment
+"""
+
+import sys
+import os
+import json
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.run_journal import RunJournal, read_records, journal_path
+from src.comprehensive_experiment import ComprehensiveExperiment
+
+TEMPLATES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "contracts", "templates.json")
+
+FIB = ("def fibonacci(n):\n    if n <= 1:\n        return n\n    a, b = 0, 1\n"
+       "    for _ in range(2, n + 1):\n        a, b = b, a + b\n    return b\n")
+FIB_VARIANT = ("def fibonacci(n):\n    if n <= 1:\n        return n\n    a, b = 0, 1\n"
+               "    for i in range(2, n + 1):\n        a, b = b, a + b\n    return b\n")
+HEADER = {"contract_id": "fibonacci_basic", "model": "scripted", "temperature": 0.0, "num_runs": 4}
+
+
+class FlakyClient:
+    """Scripted client that dies after delivering fail_after samples"""
+    model = "scripted"
+
+    def __init__(self, outputs, fail_after=None):
+        self.outputs = list(outputs)
+        self.fail_after = fail_after
+        self.requests = []
+
+    def generate_samples(self, prompt, temperature=0.0, n=1, on_sample=None):
+        self.requests.append(n)
+        samples = []
+        for i in range(n):
+            if self.fail_after is not None and len(samples) == self.fail_after:
+                raise RuntimeError("connection reset")
+            code = self.outputs.pop(0)
+            samples.append({"run_index": i, "code": code, "raw_output": code, "success": True,
+                            "error": None, "provenance": {"mode": "scripted"}})
+            on_sample(samples[-1])
+        return samples
+
+
+def make_experiment(output_dir, client):
+    experiment = ComprehensiveExperiment(str(output_dir), llm_client=client)
+    # Plotting is not under test here
+    experiment.bell_curve_analyzer = SimpleNamespace(plot_pre_post_comparison=lambda *a, **k: {})
+    return experiment
+
+
+def test_replay_ignores_torn_tail_and_other_configs(tmp_path):
+    path = str(tmp_path / "journals" / "cfg.jsonl")
+    journal, replay = RunJournal.open(path, HEADER)
+    assert replay.empty
+    journal.append("generation", result={"run_id": 1, "raw_output": "a", "success": True})
+    journal.append("generation", result={"run_id": 2, "raw_output": None, "success": False, "error": "x"})
+    journal.append("generation", result={"run_id": 3, "raw_output": "b", "success": True})
+    journal.append("transformation", index=0, repaired="a2", record={"run_id": 1, "original_code": "a"})
+    with open(path, "a") as f:
+        f.write('{"type": "generation", "result": {"run_id": 4, "raw_')
+
+    journal, replay = RunJournal.open(path, HEADER, resume=True)
+    assert [(r["run_id"], r["raw_output"]) for r in replay.llm_results] == [(1, "a"), (2, "b")]
+    assert replay.transformations == {0: ("a2", {"run_id": 1, "original_code": "a"})}
+
+    journal.append("complete", experiment_id="e1", result_file="e1.json")
+    records = read_records(path)
+    assert [r["type"] for r in records][-2:] == ["transformation", "complete"]
+
+    _, replay = RunJournal.open(path, dict(HEADER, temperature=0.5), resume=True)
+    assert replay.empty
+    assert [r["type"] for r in read_records(path)] == ["header"]
+
+
+def test_resume_generates_only_missing_runs(tmp_path):
+    with pytest.raises(RuntimeError):
+        make_experiment(tmp_path, FlakyClient([FIB] * 4, fail_after=4)).run_full_experiment(
+            TEMPLATES, "fibonacci_basic", num_runs=6)
+
+    journal = journal_path(str(tmp_path), "fibonacci_basic", "scripted", 0.0)
+    assert sum(r["type"] == "generation" for r in read_records(journal)) == 4
+
+    client = FlakyClient([FIB_VARIANT] * 2)
+    result = make_experiment(tmp_path, client).run_full_experiment(
+        TEMPLATES, "fibonacci_basic", num_runs=6, resume=True)
+
+    assert client.requests == [2]
+    assert result["raw_outputs"] == [FIB] * 4 + [FIB_VARIANT] * 2
+    assert [r["run_id"] for r in result["llm_results"]] == [1, 2, 3, 4, 5, 6]
+    assert read_records(journal)[-1]["type"] == "complete"
+
+    # A completed configuration is returned from disk without any new work
+    idle = FlakyClient([])
+    again = make_experiment(tmp_path, idle).run_full_experiment(
+        TEMPLATES, "fibonacci_basic", num_runs=6, resume=True)
+    assert idle.requests == [] and again["experiment_id"] == result["experiment_id"]
+
+    # Without resume the journal starts over
+    fresh = FlakyClient([FIB] * 6)
+    make_experiment(tmp_path, fresh).run_full_experiment(TEMPLATES, "fibonacci_basic", num_runs=6)
+    assert fresh.requests == [6]
+
+
+def test_resume_reuses_journaled_repairs_and_verdicts(tmp_path):
+    outputs = ["def fibonacci(n):\n    return n\n", FIB, FIB_VARIANT, FIB_VARIANT]
+    experiment = make_experiment(tmp_path, FlakyClient(outputs))
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("killed during metrics")
+    experiment.metrics_calculator.calculate_comprehensive_metrics = crash
+    with pytest.raises(RuntimeError):
+        experiment.run_full_experiment(TEMPLATES, "fibonacci_basic", num_runs=4)
+    first_repairs = [r["record"] for r in read_records(journal_path(str(tmp_path), "fibonacci_basic",
+                                                                    "scripted", 0.0))
+                     if r["type"] == "transformation"]
+    assert len(first_repairs) == 4
+
+    resumed = make_experiment(tmp_path, FlakyClient([]))
+    os.remove(resumed.canon_system._canon_path("fibonacci_basic"))  # canon re-selected on resume
+    calls = {"transform": 0, "oracle": []}
+    transform, oracle = resumed.code_transformer.transform_to_canon, resumed.oracle_system.run_oracle_tests
+
+    def counting_transform(*args, **kwargs):
+        calls["transform"] += 1
+        return transform(*args, **kwargs)
+
+    def counting_oracle(*args, **kwargs):
+        calls["oracle"].append(args[0])
+        return oracle(*args, **kwargs)
+    resumed.code_transformer.transform_to_canon = counting_transform
+    resumed.oracle_system.run_oracle_tests = counting_oracle
+
+    result = resumed.run_full_experiment(TEMPLATES, "fibonacci_basic", num_runs=4, resume=True)
+
+    # Verdicts of the candidates consumed before the crash are replayed
+    assert calls["transform"] == 0
+    assert not set(outputs[:2]) & set(calls["oracle"])
+    assert json.loads(json.dumps(result["transformation_results"])) == first_repairs
+    assert result["canon_data"]["canonical_code"] == FIB
+
+
+def test_each_distinct_candidate_is_checked_and_journaled_once(tmp_path):
+    failing = "def fibonacci(n):\n    return n\n"
+    experiment = make_experiment(tmp_path, FlakyClient([failing] * 3 + [FIB]))
+    checked = []
+    oracle = experiment.oracle_system.run_oracle_tests
+
+    def counting_oracle(code, contract):
+        checked.append(code)
+        return oracle(code, contract)
+    experiment.oracle_system.run_oracle_tests = counting_oracle
+
+    result = experiment.run_full_experiment(TEMPLATES, "fibonacci_basic", num_runs=4)
+
+    assert result["canon_data"]["canonical_code"] == FIB
+    assert checked.count(failing) == 1
+    records = read_records(journal_path(str(tmp_path), "fibonacci_basic", "scripted", 0.0))
+    oracle_records = [r["code_sha"] for r in records if r["type"] == "oracle"]
+    assert len(oracle_records) == len(set(oracle_records)) == 2
@@ -0,0 +1,112 @@
+"""
+Unit tests for the resource-limited execution sandbox
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.sandbox import ExecutionSandbox, SandboxLimits
+from src.oracle_system import OracleSystem
+
+
+FIBONACCI = """
+def fibonacci(n):
+    if n <= 1:
+        return n
+    return fibonacci(n - 1) + fibonacci(n - 2)
+"""
+
+requires_fork = pytest.mark.skipif(
+    not ExecutionSandbox().use_fork, reason="rlimit enforcement needs fork + resource"
+)
+
+
+def test_execute_returns_runner_value():
+    sandbox = ExecutionSandbox()
+    result = sandbox.execute(FIBONACCI, lambda ns: ns["fibonacci"](10))
+
+    assert result.success
+    assert result.value == 55
+    assert "wall_time" in result.resource_usage
+
+
+def test_stdout_and_stderr_are_captured():
+    sandbox = ExecutionSandbox()
+    code = "import sys\nprint('hello')\nsys.stderr.write('oops')"
+    result = sandbox.execute(code)
+
+    assert result.success
+    assert result.stdout.strip() == "hello"
+    assert result.stderr == "oops"
+
+
+def test_exception_is_reported():
+    sandbox = ExecutionSandbox()
+    result = sandbox.execute("raise ValueError('bad input')")
+
+    assert not result.success
+    assert result.error_type == "ValueError"
+    assert result.error == "bad input"
+
+
+def test_infinite_loop_times_out():
+    sandbox = ExecutionSandbox(SandboxLimits(timeout=0.5))
+    result = sandbox.execute("while True:\n    pass")
+
+    assert not result.success
+    assert result.timed_out
+
+
+@requires_fork
+def test_runaway_allocation_is_contained():
+    sandbox = ExecutionSandbox(SandboxLimits(memory_mb=64, timeout=10))
+    result = sandbox.execute("x = bytearray(1024 * 1024 * 1024)")
+
+    assert not result.success
+    assert result.error_type in ("MemoryError", "ResourceLimitExceeded")
+
+
+@requires_fork
+def test_recursion_is_bounded():
+    sandbox = ExecutionSandbox(SandboxLimits(recursion_limit=200))
+    code = "def f(n):\n    return f(n + 1)\n"
+    result = sandbox.execute(code, lambda ns: ns["f"](0))
+
+    assert not result.success
+    assert result.error_type == "RecursionError"
+
+
+@requires_fork
+def test_cpu_usage_is_reported():
+    sandbox = ExecutionSandbox()
+    result = sandbox.execute(FIBONACCI, lambda ns: ns["fibonacci"](15))
+
+    assert result.success
+    assert result.resource_usage["cpu_time"] is not None
+    assert result.resource_usage["max_rss_kb"] > 0
+
+
+def test_unpicklable_values_are_converted():
+    sandbox = ExecutionSandbox()
+    result = sandbox.execute("gen = (i for i in range(3))", lambda ns: {"gen": ns["gen"]})
+
+    assert result.success
+    assert isinstance(result.value["gen"], str)
+
+
+def test_oracle_routes_through_sandbox():
+    oracle = OracleSystem()
+    result = oracle.run_oracle_tests(FIBONACCI, {"algorithm_family": "fibonacci"})
+
+    assert result["passed"]
+    assert "resource_usage" in result
+
+    hanging = oracle.run_oracle_tests("def fibonacci(n):\n    while True:\n        pass",
+                                      {"algorithm_family": "fibonacci"}, timeout=1)
+    assert not hanging["passed"]
+    assert "timed out" in hanging["error"]
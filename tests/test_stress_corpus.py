@@ -0,0 +1,55 @@
+"""
+Tests for the synthetic stress corpus generator
+"""
+
+import sys
+import os
+import ast
+import random
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stress_corpus import (load_canons, generate_variants, verify_variants,
+                                      synthetic_program, mutate, MUTATORS)
+
+
+CANONS = load_canons()
+
+
+@pytest.mark.parametrize("contract_id", ["fibonacci_basic", "balanced_brackets",
+                                         "binary_search", "lru_cache"])
+def test_variants_are_distinct_and_equivalent(contract_id):
+    entry = CANONS[contract_id]
+    variants = generate_variants(entry["canon_code"], 25, seed=0)
+
+    assert len(variants) == len(set(variants)) == 25
+    assert entry["canon_code"] not in variants
+    assert verify_variants(variants, entry["contract"]) == variants
+
+
+def test_generation_is_deterministic():
+    code = CANONS["is_prime"]["canon_code"]
+    assert generate_variants(code, 10, seed=7) == generate_variants(code, 10, seed=7)
+    assert generate_variants(code, 10, seed=7) != generate_variants(code, 10, seed=8)
+
+
+@pytest.mark.parametrize("mutator", sorted(MUTATORS))
+def test_each_mutator_preserves_behavior(mutator):
+    entry = CANONS["binary_search"]
+    rng = random.Random(1)
+    variants = {mutate(entry["canon_code"], rng, [mutator]) for _ in range(10)}
+
+    assert verify_variants(sorted(variants), entry["contract"]) == sorted(variants)
+
+
+def test_synthetic_program_grows_with_size():
+    codes = [entry["canon_code"] for entry in CANONS.values()]
+    small = synthetic_program(codes, 3)
+    large = synthetic_program(codes, 30)
+
+    defs = [n.name for n in ast.parse(large).body if isinstance(n, (ast.FunctionDef, ast.ClassDef))]
+    assert len(defs) == len(set(defs)) == 30
+    assert len(large.splitlines()) > 5 * len(small.splitlines())
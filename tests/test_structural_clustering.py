@@ -0,0 +1,79 @@
+"""
+Tests for MinHash/LSH structural clustering
+"""
+
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.structural_clustering import MinHashLSHClusterer, node_type_shingles
+from src.foundational_properties import FoundationalProperties
+
+
+ITERATIVE = """def fibonacci(n):
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+"""
+
+ITERATIVE_RENAMED = """def fibonacci(k):
+    x, y = 0, 1
+    for _ in range(k):
+        x, y = y, x + y
+    return x
+"""
+
+RECURSIVE = """def fibonacci(n):
+    if n <= 1:
+        return n
+    return fibonacci(n - 1) + fibonacci(n - 2)
+"""
+
+
+def _node_types(code):
+    props = FoundationalProperties().extract_all_properties(code)
+    structure = props.get("normalized_ast_structure")
+    return structure["node_types"] if structure else None
+
+
+def test_shingles():
+    assert node_type_shingles(["A", "B", "C", "D"], ngram=3) == {"A|B|C", "B|C|D"}
+    assert node_type_shingles(["A"], ngram=3) == {"A"}
+    assert node_type_shingles(None) == set()
+
+
+def test_signature_is_deterministic():
+    shingles = node_type_shingles(_node_types(ITERATIVE))
+    assert (MinHashLSHClusterer().signature(shingles) == MinHashLSHClusterer().signature(shingles)).all()
+
+
+def test_near_duplicates_cluster_together():
+    clusterer = MinHashLSHClusterer()
+    sequences = [_node_types(c) for c in [ITERATIVE, RECURSIVE, ITERATIVE_RENAMED, ITERATIVE]]
+    result = clusterer.cluster(sequences)
+
+    assert result["num_clusters"] == 2
+    assert result["clusters"][0] == [0, 2, 3]
+    assert result["modal_cluster_share"] == 0.75
+
+
+def test_unparseable_outputs_are_singletons():
+    clusterer = MinHashLSHClusterer()
+    result = clusterer.cluster([None, None, _node_types(RECURSIVE)])
+
+    assert result["num_clusters"] == 3
+
+
+def test_empty_input():
+    assert MinHashLSHClusterer().cluster([])["modal_cluster_share"] == 0.0
+
+
+def test_large_sample():
+    clusterer = MinHashLSHClusterer()
+    sequences = [_node_types(ITERATIVE)] * 500 + [_node_types(RECURSIVE)] * 250
+    result = clusterer.cluster(sequences)
+
+    assert result["cluster_sizes"] == [500, 250]
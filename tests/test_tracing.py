@@ -0,0 +1,95 @@
+"""
+Tests for stage-level tracing spans and their exporters
+"""
+
+import sys
+import os
+import json
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tracing import configure_tracing, disable_tracing, span, traced, NOOP_SPAN
+from src.oracle_system import OracleSystem
+
+
+@pytest.fixture(autouse=True)
+def reset_tracing():
+    yield
+    disable_tracing()
+
+
+@traced("demo.double", lambda a: {"value": a["value"], "scale": a["scale"]})
+def double(value, scale=2):
+    with span("demo.inner"):
+        return value * scale
+
+
+def test_disabled_spans_are_noop():
+    disable_tracing()
+    assert span("anything", run=1) is NOOP_SPAN
+    assert double(3) == 6
+
+
+def test_parent_child_and_attributes():
+    tracer = configure_tracing()
+
+    with span("demo.outer", contract_id="fibonacci") as outer:
+        double(5)
+        outer.set_attribute("done", True)
+
+    inner, doubled, outer_record = tracer.spans
+    assert [s["name"] for s in tracer.spans] == ["demo.inner", "demo.double", "demo.outer"]
+    assert inner["parent_id"] == doubled["span_id"]
+    assert doubled["parent_id"] == outer_record["span_id"]
+    assert outer_record["parent_id"] is None
+    assert doubled["attributes"] == {"value": 5, "scale": 2}
+    assert outer_record["attributes"] == {"contract_id": "fibonacci", "done": True}
+    assert outer_record["duration_ms"] >= doubled["duration_ms"] >= 0
+
+
+def test_errors_recorded_and_reraised():
+    tracer = configure_tracing()
+
+    with pytest.raises(ValueError):
+        with span("demo.fail"):
+            raise ValueError("boom")
+
+    assert tracer.spans[0]["status"] == "error"
+    assert tracer.spans[0]["error"] == "ValueError: boom"
+
+
+def test_jsonl_and_chrome_exports(tmp_path):
+    jsonl_path = tmp_path / "trace.jsonl"
+    configure_tracing(str(jsonl_path), "jsonl")
+    double(2)
+    disable_tracing()
+
+    lines = [json.loads(line) for line in jsonl_path.read_text().splitlines()]
+    assert [line["name"] for line in lines] == ["demo.inner", "demo.double"]
+
+    chrome_path = tmp_path / "trace.json"
+    configure_tracing(str(chrome_path), "chrome")
+    double(2)
+    disable_tracing()
+
+    events = json.loads(chrome_path.read_text())["traceEvents"]
+    assert {e["ph"] for e in events} == {"X"}
+    assert events[1]["args"]["value"] == 2
+    assert events[0]["args"]["parent_id"] == events[1]["args"]["span_id"]
+
+    with pytest.raises(ValueError):
+        configure_tracing(str(tmp_path / "x"), "xml")
+
+
+def test_pipeline_stage_is_traced():
+    tracer = configure_tracing()
+    contract = {"id": "fibonacci_basic", "algorithm_family": "fibonacci",
+                "oracle_requirements": {"test_cases": [{"input": 5, "expected": 5}]}}
+
+    OracleSystem().run_oracle_tests("def fibonacci(n):\n    return n\n", contract)
+
+    assert tracer.spans[-1]["name"] == "oracle.run_tests"
+    assert tracer.spans[-1]["attributes"]["contract_id"] == "fibonacci_basic"